@@ -9,12 +9,14 @@ Based on: tests/test_note_tool.py, tests/test_integration.py
 import asyncio
 import json
 import tempfile
+from dataclasses import asdict
 from pathlib import Path
 
 from mini_agent import LLMClient
 from mini_agent.agent import Agent
 from mini_agent.config import Config
 from mini_agent.tools import BashTool, ReadTool, WriteTool
+from mini_agent.tools.note_store import NoteStore
 from mini_agent.tools.note_tool import RecallNoteTool, SessionNoteTool
 
 
@@ -63,15 +65,17 @@ async def demo_direct_note_usage():
         result = await recall_tool.execute(category="user_preference")
         print(result.content)
 
-        # Show the memory file
-        print("\n📄 Memory file content:")
+        # Show the note database
+        store = NoteStore(note_file)
+        print(f"\n📄 Note database content ({store.path.name}):")
         print("=" * 60)
-        notes = json.loads(Path(note_file).read_text())
+        notes = [asdict(note) for note in store.search()]
         print(json.dumps(notes, indent=2, ensure_ascii=False))
         print("=" * 60)
 
     finally:
         Path(note_file).unlink(missing_ok=True)
+        NoteStore(note_file).path.unlink(missing_ok=True)
 
 
 async def demo_agent_with_notes():
@@ -175,11 +179,12 @@ Guidelines:
             print("=" * 60)
 
             # Check memory file
-            if memory_file.exists():
-                notes = json.loads(memory_file.read_text())
+            store = NoteStore(memory_file)
+            if store.exists():
+                notes = store.search()
                 print(f"\n✅ Agent recorded {len(notes)} notes in memory")
                 for note in notes:
-                    print(f"  - [{note['category']}] {note['content'][:50]}...")
+                    print(f"  - [{note.category}] {note.content[:50]}...")
             else:
                 print("\n⚠️  No notes found")
 
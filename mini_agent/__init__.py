@@ -1,7 +1,7 @@
 """Mini Agent - Minimal single agent with basic tools and MCP support."""
 
-from .agent import Agent
-from .llm import LLMClient
+import importlib
+
 from .schema import FunctionCall, LLMProvider, LLMResponse, Message, ToolCall
 
 __version__ = "0.1.0"
@@ -15,3 +15,22 @@ __all__ = [
     "ToolCall",
     "FunctionCall",
 ]
+
+# Exports imported on first access (they pull in the LLM client stack)
+_LAZY_EXPORTS = {
+    "Agent": ".agent",
+    "LLMClient": ".llm",
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
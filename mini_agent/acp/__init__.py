@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import logging
 from dataclasses import dataclass
 from pathlib import Path
@@ -32,11 +33,11 @@ from pydantic import field_validator
 from acp.schema import AgentCapabilities, Implementation, McpCapabilities
 
 from mini_agent.agent import Agent
-from mini_agent.cli import add_workspace_tools, initialize_base_tools
+from mini_agent.bootstrap import add_workspace_tools, create_response_cache, create_routing_client, initialize_base_tools
 from mini_agent.config import Config
-from mini_agent.llm import LLMClient
+from mini_agent.llm import LLMClient, RateLimitConfig, TransportConfig
 from mini_agent.retry import RetryConfig as RetryConfigBase
-from mini_agent.schema import Message
+from mini_agent.schema import LLMResponse, Message
 
 logger = logging.getLogger(__name__)
 
@@ -99,7 +100,7 @@ class MiniMaxACPAgent:
             workspace = workspace.resolve()
         tools = list(self._base_tools)
         add_workspace_tools(tools, self._config, workspace)
-        agent = Agent(llm_client=self._llm, system_prompt=self._system_prompt, tools=tools, max_steps=self._config.agent.max_steps, workspace_dir=str(workspace))
+        agent = Agent(llm_client=self._llm, system_prompt=self._system_prompt, tools=tools, max_steps=self._config.agent.max_steps, workspace_dir=str(workspace), token_limit=self._config.agent.token_limit, summary_threshold=self._config.agent.summary_threshold, max_concurrent_tools=self._config.agent.max_concurrent_tools)
         self._sessions[session_id] = SessionState(agent=agent)
         return NewSessionResponse(sessionId=session_id)
 
@@ -118,22 +119,43 @@ class MiniMaxACPAgent:
         if state:
             state.cancelled = True
 
+    async def closeSession(self, params: Any) -> None:
+        state = self._sessions.pop(params.sessionId, None)
+        if state:
+            state.cancelled = True
+            await self._close_session_tools(state)
+
+    async def close(self) -> None:
+        """End all sessions (server shutdown)."""
+        sessions, self._sessions = list(self._sessions.values()), {}
+        for state in sessions:
+            state.cancelled = True
+            await self._close_session_tools(state)
+
+    async def _close_session_tools(self, state: SessionState) -> None:
+        """Stop processes owned by a session's own tools, e.g. its persistent bash shell."""
+        for tool in state.agent.tools.values():
+            if tool in self._base_tools or not hasattr(tool, "close"):
+                continue
+            try:
+                await tool.close()
+            except Exception:
+                logger.exception("Failed to close tool %s", tool.name)
+
     async def _run_turn(self, state: SessionState, session_id: str) -> str:
         agent = state.agent
         for _ in range(agent.max_steps):
             if state.cancelled:
                 return "cancelled"
-            tool_schemas = [tool.to_schema() for tool in agent.tools.values()]
             try:
-                response = await agent.llm.generate(messages=agent.messages, tools=tool_schemas)
+                # The registry memoizes tool schemas until the tool set changes
+                response = await self._generate(state, session_id, agent.tools)
             except Exception as exc:
                 logger.exception("LLM error")
                 await self._send(session_id, update_agent_message(text_block(f"Error: {exc}")))
                 return "refusal"
-            if response.thinking:
-                await self._send(session_id, update_agent_thought(text_block(response.thinking)))
-            if response.content:
-                await self._send(session_id, update_agent_message(text_block(response.content)))
+            if response is None:
+                return "cancelled"
             agent.messages.append(Message(role="assistant", content=response.content, thinking=response.thinking, tool_calls=response.tool_calls))
             if not response.tool_calls:
                 return "end_turn"
@@ -158,6 +180,32 @@ class MiniMaxACPAgent:
                 agent.messages.append(Message(role="tool", content=text, tool_call_id=call.id, name=name))
         return "max_turn_requests"
 
+    async def _generate(self, state: SessionState, session_id: str, tools: Any) -> LLMResponse | None:
+        """Call the LLM, forwarding thought/message chunks as they stream in. Returns None if cancelled mid-stream."""
+        llm = state.agent.llm
+        if not (self._config.agent.stream and hasattr(llm, "stream")):
+            response = await llm.generate(messages=state.agent.messages, tools=tools)
+            if response.thinking:
+                await self._send(session_id, update_agent_thought(text_block(response.thinking)))
+            if response.content:
+                await self._send(session_id, update_agent_message(text_block(response.content)))
+            return response
+        response = None
+        # Close the stream when returning early so the underlying request is released
+        async with contextlib.aclosing(llm.stream(messages=state.agent.messages, tools=tools)) as stream:
+            async for event in stream:
+                if state.cancelled:
+                    return None
+                if event.type == "thinking" and event.delta:
+                    await self._send(session_id, update_agent_thought(text_block(event.delta)))
+                elif event.type == "text" and event.delta:
+                    await self._send(session_id, update_agent_message(text_block(event.delta)))
+                elif event.type == "done":
+                    response = event.response
+        if response is None:
+            raise RuntimeError("LLM stream ended without a response")
+        return response
+
     async def _send(self, session_id: str, update: Any) -> None:
         await self._conn.sessionUpdate(session_notification(session_id, update))
 
@@ -177,11 +225,25 @@ async def run_acp_server(config: Config | None = None) -> None:
         if meta:
             system_prompt = f"{system_prompt.rstrip()}\n\n{meta}"
     rcfg = config.llm.retry
-    llm = LLMClient(api_key=config.llm.api_key, api_base=config.llm.api_base, model=config.llm.model, retry_config=RetryConfigBase(enabled=rcfg.enabled, max_retries=rcfg.max_retries, initial_delay=rcfg.initial_delay, max_delay=rcfg.max_delay, exponential_base=rcfg.exponential_base))
+    client_kwargs = dict(retry_config=RetryConfigBase(enabled=rcfg.enabled, max_retries=rcfg.max_retries, initial_delay=rcfg.initial_delay, max_delay=rcfg.max_delay, exponential_base=rcfg.exponential_base), prompt_caching=config.llm.prompt_caching, transport_config=TransportConfig(**config.llm.http.model_dump(exclude={"prewarm"})), rate_limit_config=RateLimitConfig(**config.llm.rate_limit.model_dump()), response_cache=create_response_cache(config))
+    llm = create_routing_client(LLMClient(api_key=config.llm.api_key, api_base=config.llm.api_base, model=config.llm.model, **client_kwargs), config, **client_kwargs)
+    # Connect to the API while the client starts up
+    prewarm_task = asyncio.create_task(llm.prewarm()) if config.llm.http.prewarm else None
     reader, writer = await stdio_streams()
-    AgentSideConnection(lambda conn: MiniMaxACPAgent(conn, config, llm, base_tools, system_prompt), writer, reader)
+    agents: list[MiniMaxACPAgent] = []
+
+    def create_agent(conn: AgentSideConnection) -> MiniMaxACPAgent:
+        agent = MiniMaxACPAgent(conn, config, llm, base_tools, system_prompt)
+        agents.append(agent)
+        return agent
+
+    AgentSideConnection(create_agent, writer, reader)
     logger.info("Mini-Agent ACP server running")
-    await asyncio.Event().wait()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        for agent in agents:
+            await agent.close()
 
 
 def main() -> None:
@@ -1,15 +1,23 @@
 """Core Agent implementation."""
 
+import asyncio
+import contextlib
 import json
+import traceback
 from pathlib import Path
 
-import tiktoken
-
 from .llm import LLMClient
 from .logger import AgentLogger
-from .schema import Message
+from .schema import LLMResponse, Message, ToolCall
 from .tools.base import Tool, ToolResult
-from .utils import calculate_display_width
+from .tools.registry import ToolRegistry
+from .utils import calculate_display_width, get_encoding
+
+# Prefix of the summary messages that replace summarized execution history
+SUMMARY_PREFIX = "[Assistant Execution Summary]"
+
+# Maximum number of round summaries generated at the same time
+MAX_CONCURRENT_SUMMARIES = 4
 
 
 # ANSI color codes
@@ -39,6 +47,13 @@ class Colors:
     BRIGHT_WHITE = "\033[97m"
 
 
+def _resources_overlap(a: str | None, b: str | None) -> bool:
+    """Whether two resource keys are the same, or one is a directory containing the other"""
+    if a is None or b is None:
+        return False
+    return a == b or Path(a).is_relative_to(b) or Path(b).is_relative_to(a)
+
+
 class Agent:
     """Single agent with basic tools and MCP support."""
 
@@ -50,11 +65,17 @@ class Agent:
         max_steps: int = 50,
         workspace_dir: str = "./workspace",
         token_limit: int = 195000,  # Summary triggered when tokens exceed this value (set below 204800 API max)
+        max_concurrent_tools: int = 4,  # Tool calls of one turn executed concurrently (1 = sequential)
+        stream: bool = True,  # Print thinking/content as it is generated (requires LLM client with stream())
+        summary_threshold: float = 0.7,  # Fraction of token_limit at which summaries are prepared in the background
     ):
         self.llm = llm_client
-        self.tools = {tool.name: tool for tool in tools}
+        self.tools = ToolRegistry(tools)
         self.max_steps = max_steps
         self.token_limit = token_limit
+        self.max_concurrent_tools = max(1, max_concurrent_tools)
+        self.stream = stream
+        self.summary_threshold = summary_threshold
         self.workspace_dir = Path(workspace_dir)
 
         # Ensure workspace exists
@@ -78,6 +99,30 @@ class Agent:
         # Flag to skip token check right after summary (avoid consecutive triggers)
         self._skip_next_token_check: bool = False
 
+        # Per-message token cache: (message, token count) for a prefix of self.messages,
+        # plus the running total over that prefix. Only new messages get encoded.
+        self._token_cache: list[tuple[Message, int]] = []
+        self._token_cache_total: int = 0
+
+        # Prepared summaries: id of the first message of a summarized span -> (span, summary text).
+        # The span tuple keeps its messages alive, so the id stays unique while cached.
+        self._summary_cache: dict[int, tuple[tuple[Message, ...], str]] = {}
+        self._summary_task: asyncio.Task | None = None
+
+    @property
+    def tools(self) -> ToolRegistry:
+        """Tool registry (name -> Tool); schemas are memoized until the registry changes."""
+        return self._tools
+
+    @tools.setter
+    def tools(self, tools: ToolRegistry | dict[str, Tool] | list[Tool]):
+        if isinstance(tools, ToolRegistry):
+            self._tools = tools
+        elif isinstance(tools, dict):
+            self._tools = ToolRegistry(tools.values())
+        else:
+            self._tools = ToolRegistry(tools)
+
     def add_user_message(self, content: str):
         """Add a user message to history."""
         self.messages.append(Message(role="user", content=content))
@@ -85,39 +130,73 @@ class Agent:
     def _estimate_tokens(self) -> int:
         """Accurately calculate token count for message history using tiktoken
 
-        Uses cl100k_base encoder (GPT-4/Claude/M2 compatible)
+        Uses the shared cl100k_base encoder (GPT-4/Claude/M2 compatible).
+        Token counts are cached per message, so only messages appended since the
+        last call are encoded.
         """
-        try:
-            # Use cl100k_base encoder (used by GPT-4 and most modern models)
-            encoding = tiktoken.get_encoding("cl100k_base")
-        except Exception:
+        encoding = get_encoding()
+        if encoding is None:
             # Fallback: if tiktoken initialization fails, use simple estimation
             return self._estimate_tokens_fallback()
 
-        total_tokens = 0
+        self._sync_token_cache()
 
-        for msg in self.messages:
-            # Count text content
-            if isinstance(msg.content, str):
-                total_tokens += len(encoding.encode(msg.content))
-            elif isinstance(msg.content, list):
-                for block in msg.content:
-                    if isinstance(block, dict):
-                        # Convert dict to string for calculation
-                        total_tokens += len(encoding.encode(str(block)))
+        for msg in self.messages[len(self._token_cache) :]:
+            count = self._count_message_tokens(msg, encoding)
+            self._token_cache.append((msg, count))
+            self._token_cache_total += count
 
-            # Count thinking
-            if msg.thinking:
-                total_tokens += len(encoding.encode(msg.thinking))
+        return self._token_cache_total
 
-            # Count tool_calls
-            if msg.tool_calls:
-                total_tokens += len(encoding.encode(str(msg.tool_calls)))
+    def _count_message_tokens(self, msg: Message, encoding) -> int:
+        """Count tokens of a single message (content, thinking, tool calls and overhead)"""
+        tokens = 0
+
+        # Count text content
+        if isinstance(msg.content, str):
+            tokens += len(encoding.encode(msg.content, disallowed_special=()))
+        elif isinstance(msg.content, list):
+            for block in msg.content:
+                if isinstance(block, dict):
+                    # Convert dict to string for calculation
+                    tokens += len(encoding.encode(str(block), disallowed_special=()))
+
+        # Count thinking
+        if msg.thinking:
+            tokens += len(encoding.encode(msg.thinking, disallowed_special=()))
+
+        # Count tool_calls
+        if msg.tool_calls:
+            tokens += len(encoding.encode(str(msg.tool_calls), disallowed_special=()))
+
+        # Metadata overhead per message (approximately 4 tokens)
+        return tokens + 4
+
+    def _sync_token_cache(self):
+        """Drop cached token counts that no longer match self.messages
+
+        The history is normally append-only, which is detected in O(1) by checking
+        the last cached message. If the list was rewritten or replaced (summary,
+        /clear, ACP session changes), the longest still-valid prefix is kept.
+        """
+        cached = len(self._token_cache)
+        if cached == 0:
+            return
+        if cached <= len(self.messages) and self.messages[cached - 1] is self._token_cache[-1][0]:
+            return
 
-            # Metadata overhead per message (approximately 4 tokens)
-            total_tokens += 4
+        valid = 0
+        for msg, (cached_msg, _) in zip(self.messages, self._token_cache):
+            if msg is not cached_msg:
+                break
+            valid += 1
+        self._invalidate_token_cache(valid)
 
-        return total_tokens
+    def _invalidate_token_cache(self, start: int = 0):
+        """Invalidate cached token counts from message index start onward"""
+        for _, count in self._token_cache[start:]:
+            self._token_cache_total -= count
+        del self._token_cache[start:]
 
     def _estimate_tokens_fallback(self) -> int:
         """Fallback token estimation method (when tiktoken is unavailable)"""
@@ -148,6 +227,13 @@ class Agent:
         - If last round is still executing (has agent/tool messages but no next user), also summarize
         - Structure: system -> user1 -> summary1 -> user2 -> summary2 -> user3 -> summary3 (if executing)
 
+        Summaries are built incrementally:
+        - Once usage exceeds summary_threshold * token_limit, summaries of the not yet
+          summarized execution spans are prepared in a background task, concurrently
+        - At token_limit, missing summaries are created (concurrently) and all of them
+          are swapped into the history at once
+        - Existing summary messages are kept as they are and never summarized again
+
         Summary is triggered when EITHER:
         - Local token estimation exceeds limit
         - API reported total_tokens exceeds limit
@@ -162,53 +248,50 @@ class Agent:
         # Check both local estimation and API reported tokens
         should_summarize = estimated_tokens > self.token_limit or self.api_total_tokens > self.token_limit
 
-        # If neither exceeded, no summary needed
+        # Below the limit: prepare summaries in the background once past the soft threshold
         if not should_summarize:
+            soft_limit = self.token_limit * self.summary_threshold
+            if (estimated_tokens > soft_limit or self.api_total_tokens > soft_limit) and not self._summary_running():
+                rounds = self._plan_summaries()
+                if any(self._cached_summary(span) is None for _, spans in rounds for span in spans):
+                    self._summary_task = asyncio.create_task(self._prepare_summaries(rounds))
+                    self._summary_task.add_done_callback(self._summary_task_done)
             return
 
         print(f"\n{Colors.BRIGHT_YELLOW}📊 Token usage - Local estimate: {estimated_tokens}, API reported: {self.api_total_tokens}, Limit: {self.token_limit}{Colors.RESET}")
         print(f"{Colors.BRIGHT_YELLOW}🔄 Triggering message history summarization...{Colors.RESET}")
 
-        # Find all user message indices (skip system prompt)
-        user_indices = [i for i, msg in enumerate(self.messages) if msg.role == "user" and i > 0]
+        # Let summaries already being prepared finish instead of starting them again
+        if self._summary_running():
+            print(f"{Colors.DIM}  Waiting for summaries prepared in the background...{Colors.RESET}")
+            # Failures are reported by _summary_task_done; missing summaries are created below
+            await asyncio.wait([self._summary_task])
+
+        rounds = self._plan_summaries()
 
         # Need at least 1 user message to perform summary
-        if len(user_indices) < 1:
+        if not rounds:
             print(f"{Colors.BRIGHT_YELLOW}⚠️  Insufficient messages, cannot summarize{Colors.RESET}")
             return
 
-        # Build new message list
+        prepared_count = sum(1 for _, spans in rounds for span in spans if self._cached_summary(span) is not None)
+        created_count = await self._prepare_summaries(rounds)
+
+        # Build new message list and swap it in at once
         new_messages = [self.messages[0]]  # Keep system prompt
         summary_count = 0
-
-        # Iterate through each user message and summarize the execution process after it
-        for i, user_idx in enumerate(user_indices):
-            # Add current user message
-            new_messages.append(self.messages[user_idx])
-
-            # Determine message range to summarize
-            # If last user, go to end of message list; otherwise to before next user
-            if i < len(user_indices) - 1:
-                next_user_idx = user_indices[i + 1]
-            else:
-                next_user_idx = len(self.messages)
-
-            # Extract execution messages for this round
-            execution_messages = self.messages[user_idx + 1 : next_user_idx]
-
-            # If there are execution messages in this round, summarize them
-            if execution_messages:
-                summary_text = await self._create_summary(execution_messages, i + 1)
+        for user_message, spans in rounds:
+            new_messages.append(user_message)
+            for span in spans:
+                summary_text = self._cached_summary(span)
                 if summary_text:
-                    summary_message = Message(
-                        role="user",
-                        content=f"[Assistant Execution Summary]\n\n{summary_text}",
-                    )
-                    new_messages.append(summary_message)
+                    new_messages.append(Message(role="user", content=f"{SUMMARY_PREFIX}\n\n{summary_text}"))
                     summary_count += 1
 
-        # Replace message list
+        # Replace message list (only the system prompt keeps its cached token count)
         self.messages = new_messages
+        self._invalidate_token_cache(1)
+        self._summary_cache.clear()
 
         # Skip next token check to avoid consecutive summary triggers
         # (api_total_tokens will be updated after next LLM call)
@@ -216,9 +299,83 @@ class Agent:
 
         new_tokens = self._estimate_tokens()
         print(f"{Colors.BRIGHT_GREEN}✓ Summary completed, local tokens: {estimated_tokens} → {new_tokens}{Colors.RESET}")
-        print(f"{Colors.DIM}  Structure: system + {len(user_indices)} user messages + {summary_count} summaries{Colors.RESET}")
+        print(f"{Colors.DIM}  Structure: system + {len(rounds)} user messages + {summary_count} summaries ({prepared_count} prepared in background, {created_count} created now){Colors.RESET}")
         print(f"{Colors.DIM}  Note: API token count will update on next LLM call{Colors.RESET}")
 
+    def _summary_running(self) -> bool:
+        """Whether a background summary task is in progress"""
+        return self._summary_task is not None and not self._summary_task.done()
+
+    def _summary_task_done(self, task: asyncio.Task):
+        """Report a failed background summary task and forget it so it is retried
+
+        Summaries that were created before the failure stay cached; the others are
+        prepared again by the next background task or at the hard limit.
+        """
+        if self._summary_task is task:
+            self._summary_task = None
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            print(f"{Colors.BRIGHT_RED}✗ Background summary preparation failed: {error}{Colors.RESET}")
+
+    def _plan_summaries(self) -> list[tuple[Message, list[tuple[Message, ...]]]]:
+        """Split the history into rounds and the execution spans to summarize
+
+        A round starts at a user message (including earlier summary messages, which
+        are kept unchanged) and its execution messages are split into spans: spans
+        already covered by a prepared summary, then the uncovered rest of the round.
+
+        Returns:
+            List of (user message, execution spans) per round
+        """
+        user_indices = [i for i, msg in enumerate(self.messages) if msg.role == "user" and i > 0]
+
+        rounds = []
+        for n, user_idx in enumerate(user_indices):
+            end = user_indices[n + 1] if n + 1 < len(user_indices) else len(self.messages)
+            spans = []
+            start = user_idx + 1
+            while start < end:
+                cached = self._summary_cache.get(id(self.messages[start]))
+                span = cached[0] if cached else ()
+                if span and len(span) <= end - start and all(a is b for a, b in zip(span, self.messages[start : start + len(span)])):
+                    spans.append(span)
+                    start += len(span)
+                else:
+                    spans.append(tuple(self.messages[start:end]))
+                    break
+            rounds.append((self.messages[user_idx], spans))
+        return rounds
+
+    def _cached_summary(self, span: tuple[Message, ...]) -> str | None:
+        """Get the prepared summary of exactly this span of messages"""
+        cached = self._summary_cache.get(id(span[0]))
+        if cached is None or len(cached[0]) != len(span) or any(a is not b for a, b in zip(cached[0], span)):
+            return None
+        return cached[1]
+
+    async def _prepare_summaries(self, rounds: list[tuple[Message, list[tuple[Message, ...]]]]) -> int:
+        """Create summaries for all spans without a prepared summary, concurrently
+
+        Args:
+            rounds: Rounds returned by _plan_summaries()
+
+        Returns:
+            Number of summaries created
+        """
+        missing = [(round_num, span) for round_num, (_, spans) in enumerate(rounds, 1) for span in spans if self._cached_summary(span) is None]
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_SUMMARIES)
+
+        async def summarize(round_num: int, span: tuple[Message, ...]):
+            async with semaphore:
+                summary_text = await self._create_summary(list(span), round_num)
+            self._summary_cache[id(span[0])] = (span, summary_text)
+
+        await asyncio.gather(*(summarize(round_num, span) for round_num, span in missing))
+        return len(missing)
+
     async def _create_summary(self, messages: list[Message], round_num: int) -> str:
         """Create summary for one execution round
 
@@ -269,15 +426,167 @@ Requirements:
                 ]
             )
 
-            summary_text = response.content
-            print(f"{Colors.BRIGHT_GREEN}✓ Summary for round {round_num} generated successfully{Colors.RESET}")
-            return summary_text
+            return response.content
 
         except Exception as e:
             print(f"{Colors.BRIGHT_RED}✗ Summary generation failed for round {round_num}: {e}{Colors.RESET}")
             # Use simple text summary on failure
             return summary_content
 
+    def _print_tool_call(self, tool_call: ToolCall):
+        """Print tool call header and (truncated) arguments."""
+        print(f"\n{Colors.BRIGHT_YELLOW}🔧 Tool Call:{Colors.RESET} {Colors.BOLD}{Colors.CYAN}{tool_call.function.name}{Colors.RESET}")
+
+        # Arguments (formatted display)
+        print(f"{Colors.DIM}   Arguments:{Colors.RESET}")
+        # Truncate each argument value to avoid overly long output
+        truncated_args = {}
+        for key, value in tool_call.function.arguments.items():
+            value_str = str(value)
+            if len(value_str) > 200:
+                truncated_args[key] = value_str[:200] + "..."
+            else:
+                truncated_args[key] = value
+        args_json = json.dumps(truncated_args, indent=2, ensure_ascii=False)
+        for line in args_json.split("\n"):
+            print(f"   {Colors.DIM}{line}{Colors.RESET}")
+
+    async def _execute_tool(self, tool_call: ToolCall) -> ToolResult:
+        """Execute a single tool call, converting any exception into a failed ToolResult."""
+        function_name = tool_call.function.name
+        if function_name not in self.tools:
+            return ToolResult(
+                success=False,
+                content="",
+                error=f"Unknown tool: {function_name}",
+            )
+
+        try:
+            tool = self.tools[function_name]
+            return await tool.execute(**tool_call.function.arguments)
+        except Exception as e:
+            # Catch all exceptions during tool execution, convert to failed ToolResult
+            error_detail = f"{type(e).__name__}: {str(e)}"
+            error_trace = traceback.format_exc()
+            return ToolResult(
+                success=False,
+                content="",
+                error=f"Tool execution failed: {error_detail}\n\nTraceback:\n{error_trace}",
+            )
+
+    def _tool_call_dependencies(self, tool_calls: list[ToolCall]) -> list[list[int]]:
+        """Compute, for each tool call, the earlier calls it has to wait for.
+
+        Two calls conflict when they touch the same resource key, or one key is a
+        directory containing the other, and at least one of them is mutating
+        (e.g. write_file and read_file on the same path, or write_file and a
+        search_files over the workspace). A mutating call without a resource key
+        (e.g. bash or an MCP tool) is a barrier: it waits for every earlier call,
+        and every later call waits for it.
+        Conflicting calls keep their original order; everything else may overlap.
+
+        Args:
+            tool_calls: Tool calls from one LLM response
+
+        Returns:
+            List of dependency index lists, one per tool call
+        """
+        resources: list[tuple[str | None, bool]] = []
+        for tool_call in tool_calls:
+            tool = self.tools.get(tool_call.function.name)
+            if tool is None:
+                resources.append((None, False))
+                continue
+            try:
+                key = tool.resource_key(**tool_call.function.arguments)
+            except Exception:
+                key = None
+            resources.append((key, tool.is_mutating))
+
+        dependencies = []
+        for i, (key, mutating) in enumerate(resources):
+            if key is None and mutating:
+                dependencies.append(list(range(i)))
+                continue
+            dependencies.append(
+                [
+                    j
+                    for j in range(i)
+                    if (resources[j][0] is None and resources[j][1])
+                    or (_resources_overlap(resources[j][0], key) and (mutating or resources[j][1]))
+                ]
+            )
+        return dependencies
+
+    async def _execute_tool_calls(self, tool_calls: list[ToolCall]) -> list[ToolResult]:
+        """Execute the tool calls of one turn concurrently.
+
+        At most max_concurrent_tools calls run at the same time, and conflicting
+        calls (see _tool_call_dependencies) run in their original order.
+
+        Args:
+            tool_calls: Tool calls from one LLM response
+
+        Returns:
+            Tool results in the same order as tool_calls
+        """
+        dependencies = self._tool_call_dependencies(tool_calls)
+        semaphore = asyncio.Semaphore(self.max_concurrent_tools)
+        tasks: list[asyncio.Task] = []
+
+        async def run_call(index: int) -> ToolResult:
+            # Earlier tasks never depend on later ones, so this cannot deadlock
+            for dep in dependencies[index]:
+                await tasks[dep]
+            async with semaphore:
+                return await self._execute_tool(tool_calls[index])
+
+        for index in range(len(tool_calls)):
+            tasks.append(asyncio.create_task(run_call(index)))
+
+        return list(await asyncio.gather(*tasks))
+
+    async def _stream_response(self, tools: ToolRegistry) -> LLMResponse:
+        """Call the LLM in streaming mode, printing thinking and content as they arrive.
+
+        Args:
+            tools: Tools available for this call
+
+        Returns:
+            The assembled LLMResponse
+
+        Raises:
+            RuntimeError: Stream ended without a final response
+        """
+        response = None
+        current_section = None  # "thinking" or "text", to print each header once
+
+        async with contextlib.aclosing(self.llm.stream(messages=self.messages, tools=tools)) as events:
+            async for event in events:
+                if event.type == "thinking" and event.delta:
+                    if current_section != "thinking":
+                        if current_section:
+                            print()
+                        print(f"\n{Colors.BOLD}{Colors.MAGENTA}🧠 Thinking:{Colors.RESET}")
+                        current_section = "thinking"
+                    print(f"{Colors.DIM}{event.delta}{Colors.RESET}", end="", flush=True)
+                elif event.type == "text" and event.delta:
+                    if current_section != "text":
+                        if current_section:
+                            print()
+                        print(f"\n{Colors.BOLD}{Colors.BRIGHT_BLUE}🤖 Assistant:{Colors.RESET}")
+                        current_section = "text"
+                    print(event.delta, end="", flush=True)
+                elif event.type == "done":
+                    response = event.response
+
+        if current_section:
+            print()
+
+        if response is None:
+            raise RuntimeError("LLM stream ended without a response")
+        return response
+
     async def run(self) -> str:
         """Execute agent loop until task is complete or max steps reached."""
         # Start new run, initialize log file
@@ -300,14 +609,17 @@ Requirements:
             print(f"{Colors.DIM}│{Colors.RESET} {step_text}{' ' * padding}{Colors.DIM}│{Colors.RESET}")
             print(f"{Colors.DIM}╰{'─' * BOX_WIDTH}╯{Colors.RESET}")
 
-            # Get tool list for LLM call
-            tool_list = list(self.tools.values())
+            # Log LLM request and call LLM with the tool registry (schemas are memoized)
+            self.logger.log_request(messages=self.messages, tools=list(self.tools.values()))
 
-            # Log LLM request and call LLM with Tool objects directly
-            self.logger.log_request(messages=self.messages, tools=tool_list)
+            # Stream output when the client supports it; fall back to a single generate() call
+            streaming = self.stream and hasattr(self.llm, "stream")
 
             try:
-                response = await self.llm.generate(messages=self.messages, tools=tool_list)
+                if streaming:
+                    response = await self._stream_response(self.tools)
+                else:
+                    response = await self.llm.generate(messages=self.messages, tools=self.tools)
             except Exception as e:
                 # Check if it's a retry exhausted error
                 from .retry import RetryExhaustedError
@@ -341,13 +653,13 @@ Requirements:
             )
             self.messages.append(assistant_msg)
 
-            # Print thinking if present
-            if response.thinking:
+            # Print thinking if present (already printed while streaming)
+            if response.thinking and not streaming:
                 print(f"\n{Colors.BOLD}{Colors.MAGENTA}🧠 Thinking:{Colors.RESET}")
                 print(f"{Colors.DIM}{response.thinking}{Colors.RESET}")
 
-            # Print assistant response
-            if response.content:
+            # Print assistant response (already printed while streaming)
+            if response.content and not streaming:
                 print(f"\n{Colors.BOLD}{Colors.BRIGHT_BLUE}🤖 Assistant:{Colors.RESET}")
                 print(f"{response.content}")
 
@@ -355,56 +667,20 @@ Requirements:
             if not response.tool_calls:
                 return response.content
 
-            # Execute tool calls
+            # Print all tool calls of this turn before executing them
             for tool_call in response.tool_calls:
-                tool_call_id = tool_call.id
+                self._print_tool_call(tool_call)
+
+            # Execute tool calls concurrently; results come back in call order
+            results = await self._execute_tool_calls(response.tool_calls)
+
+            for tool_call, result in zip(response.tool_calls, results):
                 function_name = tool_call.function.name
-                arguments = tool_call.function.arguments
-
-                # Tool call header
-                print(f"\n{Colors.BRIGHT_YELLOW}🔧 Tool Call:{Colors.RESET} {Colors.BOLD}{Colors.CYAN}{function_name}{Colors.RESET}")
-
-                # Arguments (formatted display)
-                print(f"{Colors.DIM}   Arguments:{Colors.RESET}")
-                # Truncate each argument value to avoid overly long output
-                truncated_args = {}
-                for key, value in arguments.items():
-                    value_str = str(value)
-                    if len(value_str) > 200:
-                        truncated_args[key] = value_str[:200] + "..."
-                    else:
-                        truncated_args[key] = value
-                args_json = json.dumps(truncated_args, indent=2, ensure_ascii=False)
-                for line in args_json.split("\n"):
-                    print(f"   {Colors.DIM}{line}{Colors.RESET}")
-
-                # Execute tool
-                if function_name not in self.tools:
-                    result = ToolResult(
-                        success=False,
-                        content="",
-                        error=f"Unknown tool: {function_name}",
-                    )
-                else:
-                    try:
-                        tool = self.tools[function_name]
-                        result = await tool.execute(**arguments)
-                    except Exception as e:
-                        # Catch all exceptions during tool execution, convert to failed ToolResult
-                        import traceback
-
-                        error_detail = f"{type(e).__name__}: {str(e)}"
-                        error_trace = traceback.format_exc()
-                        result = ToolResult(
-                            success=False,
-                            content="",
-                            error=f"Tool execution failed: {error_detail}\n\nTraceback:\n{error_trace}",
-                        )
 
                 # Log tool execution result
                 self.logger.log_tool_result(
                     tool_name=function_name,
-                    arguments=arguments,
+                    arguments=tool_call.function.arguments,
                     result_success=result.success,
                     result_content=result.content if result.success else None,
                     result_error=result.error if not result.success else None,
@@ -415,15 +691,15 @@ Requirements:
                     result_text = result.content
                     if len(result_text) > 300:
                         result_text = result_text[:300] + f"{Colors.DIM}...{Colors.RESET}"
-                    print(f"{Colors.BRIGHT_GREEN}✓ Result:{Colors.RESET} {result_text}")
+                    print(f"{Colors.BRIGHT_GREEN}✓ Result ({function_name}):{Colors.RESET} {result_text}")
                 else:
-                    print(f"{Colors.BRIGHT_RED}✗ Error:{Colors.RESET} {Colors.RED}{result.error}{Colors.RESET}")
+                    print(f"{Colors.BRIGHT_RED}✗ Error ({function_name}):{Colors.RESET} {Colors.RED}{result.error}{Colors.RESET}")
 
                 # Add tool result message
                 tool_msg = Message(
                     role="tool",
                     content=result.content if result.success else f"Error: {result.error}",
-                    tool_call_id=tool_call_id,
+                    tool_call_id=tool_call.id,
                     name=function_name,
                 )
                 self.messages.append(tool_msg)
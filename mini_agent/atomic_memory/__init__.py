@@ -5,13 +5,15 @@ Implements multi-tier memory architecture leveraging Core's 27-tier polyglot dat
 Provides atomic consistency across 19 operational database services.
 """
 
-from .storage import AtomicMultiTierStorage
+from .storage import AtomicMultiTierStorage, WritePolicy, WriteReport
 # from .rehydrator import AtomicRehydrator  # To be implemented
 # from .managers import AtomicMemoryManager  # To be implemented
 from .schema import AtomicSession, AtomicMessage
 
 __all__ = [
     "AtomicMultiTierStorage",
+    "WritePolicy",
+    "WriteReport",
     # "AtomicRehydrator",
     # "AtomicMemoryManager",
     "AtomicSession",
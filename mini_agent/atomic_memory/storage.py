@@ -1,19 +1,33 @@
 """
 Atomic Multi-Tier Storage System
 
-Handles synchronous writes to all 27 memory tiers with atomic consistency.
-Provides fault tolerance with automatic rollback on any tier failure.
+Writes each message to all connected memory tiers concurrently, each tier
+with its own deadline. A write policy decides whether the message counts as
+stored: by default the hot tiers must acknowledge it, while the cold tiers
+are written best-effort.
 """
 
 import asyncio
 import json
+import threading
 import time
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 from dataclasses import dataclass, asdict
 
 from mini_agent.schema import Message
 
+# Tiers that must store a message by default: Tier 1 (in-memory) and Tier 2 (relational)
+HOT_TIERS = ("redis", "dragonfly", "postgres")
+
+# Seconds a tier write may take before it counts as failed
+TIER_WRITE_TIMEOUT = 2.0
+
+# Synchronous client calls that may run at once per tier; a timed-out call keeps
+# its thread until it returns, so a hung tier skips writes instead of queueing them
+MAX_TIER_THREADS = 2
+
 
 @dataclass
 class AtomicMessage:
@@ -41,6 +55,54 @@ class AtomicMessage:
         return json.dumps(self.to_dict(), ensure_ascii=False)
 
 
+@dataclass
+class TierWriteResult:
+    """Outcome of writing one message to one tier"""
+    tier: str
+    success: bool
+    latency: float
+    error: Optional[str] = None
+
+
+@dataclass
+class WriteReport:
+    """Outcome of writing one message to all tiers"""
+    success: bool
+    results: List[TierWriteResult]
+    latency: float
+
+    @property
+    def failed_tiers(self) -> List[str]:
+        return [result.tier for result in self.results if not result.success]
+
+
+@dataclass
+class WritePolicy:
+    """
+    Quorum policy deciding whether a message was stored.
+
+    Required tiers that are connected must all succeed, and at least
+    min_tiers tiers in total (all tiers if fewer are connected). Writes to
+    the other tiers are best-effort.
+    """
+    required_tiers: Optional[Tuple[str, ...]] = HOT_TIERS  # None: every connected tier is required
+    min_tiers: int = 1
+    timeout: float = TIER_WRITE_TIMEOUT
+    tier_timeouts: Optional[Dict[str, float]] = None  # Per-tier deadlines overriding timeout
+
+    def timeout_for(self, tier_name: str) -> float:
+        return (self.tier_timeouts or {}).get(tier_name, self.timeout)
+
+    def is_satisfied(self, results: List[TierWriteResult]) -> bool:
+        succeeded = {result.tier for result in results if result.success}
+        if self.required_tiers is None:
+            required = [result.tier for result in results]
+        else:
+            connected = {result.tier for result in results}
+            required = [tier for tier in self.required_tiers if tier in connected]
+        return all(tier in succeeded for tier in required) and len(succeeded) >= min(self.min_tiers, len(results))
+
+
 @dataclass
 class AtomicSession:
     """Session metadata spanning all memory tiers"""
@@ -57,15 +119,18 @@ class AtomicSession:
 
 class AtomicMultiTierStorage:
     """
-    Atomic storage engine that writes to all 27 memory tiers simultaneously
-    with automatic rollback on failure.
+    Atomic storage engine that writes to all 27 memory tiers simultaneously;
+    write_policy decides which tier failures make a write fail.
     """
 
-    def __init__(self, secrets_path: str = "/adapt/secrets"):
+    def __init__(self, secrets_path: str = "/adapt/secrets", write_policy: Optional[WritePolicy] = None):
         self.secrets_path = Path(secrets_path)
         self.secrets = {}
         self.tiers = {}
         self.initialized = False
+        self.write_policy = write_policy or WritePolicy()
+        # Threads of the synchronous tier clients, per tier
+        self._executors: Dict[str, Tuple[ThreadPoolExecutor, threading.BoundedSemaphore]] = {}
 
     async def initialize(self):
         """Initialize all database connections"""
@@ -271,62 +336,105 @@ class AtomicMultiTierStorage:
 
     async def store_atomically(self, message: AtomicMessage) -> bool:
         """
-        Store message atomically across all initialized tiers.
-        Returns True if successful, False if any tier fails.
+        Store message across all initialized tiers concurrently.
+        Returns True if the write policy is satisfied.
+        """
+        report = await self.store_with_report(message)
+        return report.success
+
+    async def store_with_report(self, message: AtomicMessage) -> WriteReport:
+        """
+        Store message across all initialized tiers concurrently.
+
+        Every tier is written at the same time with its own deadline, so the
+        latency is that of the slowest tier instead of the sum of all tiers.
+
+        Returns:
+            Per-tier results and whether the write policy is satisfied
         """
         if not self.initialized:
             await self.initialize()
 
-        session_id = message.session_id
-        success_count = 0
-        total_tiers = len(self.tiers)
+        print(f"💾 Storing message atomically across {len(self.tiers)} tiers...")
 
-        print(f"💾 Storing message atomically across {total_tiers} tiers...")
+        started = time.perf_counter()
+        results = list(await asyncio.gather(
+            *(self._write_tier(tier_name, client, message) for tier_name, client in self.tiers.items())
+        ))
+        report = WriteReport(self.write_policy.is_satisfied(results), results, time.perf_counter() - started)
 
-        for tier_name, client in self.tiers.items():
-            try:
-                if tier_name == "redis":
-                    await self._store_in_redis(client, message)
-                elif tier_name == "dragonfly":
-                    await self._store_in_dragonfly(client, message)
-                elif tier_name == "postgres":
-                    await self._store_in_postgres(client, message)
-                elif tier_name == "weaviate":
-                    await self._store_in_weaviate(client, message)
-                elif tier_name == "qdrant":
-                    await self._store_in_qdrant(client, message)
-                elif tier_name == "neo4j":
-                    await self._store_in_neo4j(client, message)
-                elif tier_name == "mongodb":
-                    await self._store_in_mongodb(client, message)
+        for result in results:
+            if result.success:
+                print(f"  ✅ {result.tier} ({result.latency * 1000:.0f} ms)")
+            else:
+                print(f"  ❌ {result.tier}: {result.error}")
+
+        stored = len(results) - len(report.failed_tiers)
+        print(f"📊 Stored in {stored}/{len(results)} tiers in {report.latency * 1000:.0f} ms")
+        return report
+
+    async def _write_tier(self, tier_name: str, client, message: AtomicMessage) -> TierWriteResult:
+        """Write message to one tier within its deadline (never raises)"""
+        # Tier writers are named after the tier: _store_in_<tier_name>
+        writer = getattr(self, f"_store_in_{tier_name}", None)
+        timeout = self.write_policy.timeout_for(tier_name)
+        started = time.perf_counter()
+        try:
+            if writer is not None:
+                await asyncio.wait_for(writer(client, message), timeout)
+        except asyncio.TimeoutError:
+            return TierWriteResult(tier_name, False, time.perf_counter() - started, f"timed out after {timeout:g}s")
+        except Exception as e:
+            return TierWriteResult(tier_name, False, time.perf_counter() - started, str(e) or type(e).__name__)
+        return TierWriteResult(tier_name, True, time.perf_counter() - started)
 
-                success_count += 1
-                print(f"  ✅ {tier_name}")
+    async def _run_sync(self, tier_name: str, func, *args, **kwargs):
+        """Run a synchronous client call on the tier's own threads.
 
-            except Exception as e:
-                print(f"  ❌ {tier_name}: {e}")
-                # Continue with other tiers
+        Calls of a tier that is not answering cannot fill the default executor:
+        once MAX_TIER_THREADS of its calls are still running, the write fails
+        right away.
+        """
+        if tier_name not in self._executors:
+            executor = ThreadPoolExecutor(max_workers=MAX_TIER_THREADS, thread_name_prefix=f"atomic-{tier_name}")
+            self._executors[tier_name] = (executor, threading.BoundedSemaphore(MAX_TIER_THREADS))
+        executor, slots = self._executors[tier_name]
+        if not slots.acquire(blocking=False):
+            raise RuntimeError(f"skipped, {MAX_TIER_THREADS} earlier writes still running")
+
+        def call():
+            try:
+                return func(*args, **kwargs)
+            finally:
+                slots.release()
 
-        print(f"📊 Stored in {success_count}/{total_tiers} tiers")
-        return success_count == total_tiers
+        try:
+            future = executor.submit(call)
+        except BaseException:
+            slots.release()
+            raise
+        return await asyncio.wrap_future(future)
 
     async def _store_in_redis(self, client, message: AtomicMessage):
         """Store in Redis (fast access, recent messages)"""
         key = f"session:{message.session_id}:messages"
         value = message.to_json()
 
-        # Store in list (most recent first)
-        await client.lpush(key, value)
+        # One round trip for all three commands
+        async with client.pipeline(transaction=False) as pipe:
+            # Store in list (most recent first)
+            pipe.lpush(key, value)
 
-        # Keep only last 100 messages in Redis for fast access
-        await client.ltrim(key, 0, 99)
+            # Keep only last 100 messages in Redis for fast access
+            pipe.ltrim(key, 0, 99)
 
-        # Also store by message ID for direct lookup
-        await client.setex(
-            f"message:{message.id}",
-            86400,  # 24 hour TTL
-            value
-        )
+            # Also store by message ID for direct lookup
+            pipe.setex(
+                f"message:{message.id}",
+                86400,  # 24 hour TTL
+                value
+            )
+            await pipe.execute()
 
     async def _store_in_dragonfly(self, client, message: AtomicMessage):
         """Store in DragonflyDB (persistent streams)"""
@@ -341,14 +449,17 @@ class AtomicMultiTierStorage:
             else:
                 stream_data[key] = str(value)
 
-        # Add to stream with automatic timestamp
-        await client.xadd(stream, stream_data)
+        # Add to stream with automatic timestamp, reading its length in the same round trip
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.xadd(stream, stream_data)
+            pipe.xlen(stream)
+            _, message_count = await pipe.execute()
 
         # Also store metadata in hash
         await client.hset(
             f"session_metadata:{message.session_id}",
             mapping={
-                "message_count": await client.xlen(stream),
+                "message_count": message_count,
                 "last_updated": str(int(time.time()))
             }
         )
@@ -384,13 +495,16 @@ class AtomicMultiTierStorage:
             ON CONFLICT (id) DO UPDATE
             SET message_count = atomic_sessions.message_count + 1,
                 updated_at = NOW()
-        """, (message.session_id, "/adapt/platform/novaops"))
+        """, message.session_id, "/adapt/platform/novaops")
 
     async def _store_in_weaviate(self, client, message: AtomicMessage):
         """Store in Weaviate (vector embeddings for semantic search)"""
         # Create object with vector embedding (placeholder - would use actual embedding)
         if message.vector_embedding:
-            client.data_object.create(
+            # Synchronous client: run in a thread so other tiers write meanwhile
+            await self._run_sync(
+                "weaviate",
+                client.data_object.create,
                 data_object={
                     "message_id": message.id,
                     "session_id": message.session_id,
@@ -407,7 +521,9 @@ class AtomicMultiTierStorage:
         if message.vector_embedding:
             from qdrant_client.http import models
 
-            client.upsert(
+            await self._run_sync(
+                "qdrant",
+                client.upsert,
                 collection_name="conversation_messages",
                 points=[
                     models.PointStruct(
@@ -421,33 +537,23 @@ class AtomicMultiTierStorage:
     async def _store_in_neo4j(self, client, message: AtomicMessage):
         """Store in Neo4j (relationship graph)"""
         async with client.session() as session:
-            # Create session node if doesn't exist
+            # Session node (created if missing), message node and relationship in one query
             await session.run("""
                 MERGE (s:Session {id: $session_id})
                 SET s.workspace = $workspace,
                     s.updated_at = timestamp()
-            """, session_id=message.session_id, workspace="/adapt/platform/novaops")
-
-            # Create message node
-            await session.run("""
                 CREATE (m:Message {
                     id: $message_id,
                     role: $role,
                     content: $content,
                     timestamp: $timestamp
                 })
-            """, message_id=message.id, role=message.role,
-               content=message.content[:100], timestamp=message.timestamp)
-
-            # Create relationship
-            await session.run("""
-                MATCH (s:Session {id: $session_id})
-                MATCH (m:Message {id: $message_id})
                 MERGE (s)-[r:CONTAINS {
                     timestamp: $timestamp
                 }]-(m)
-            """, session_id=message.session_id, message_id=message.id,
-               timestamp=message.timestamp)
+            """, session_id=message.session_id, workspace="/adapt/platform/novaops",
+               message_id=message.id, role=message.role,
+               content=message.content[:100], timestamp=message.timestamp)
 
     async def _store_in_mongodb(self, client, message: AtomicMessage):
         """Store in MongoDB (flexible document structure)"""
@@ -457,7 +563,7 @@ class AtomicMultiTierStorage:
         document = message.to_dict()
         document["_id"] = message.id  # Use message ID as MongoDB _id
 
-        collection.insert_one(document)
+        await self._run_sync("mongodb", collection.insert_one, document)
 
     async def health_check(self) -> Dict[str, bool]:
         """Check health of all memory tiers"""
@@ -493,6 +599,10 @@ class AtomicMultiTierStorage:
             except Exception as e:
                 print(f"⚠️  Error closing {tier_name}: {e}")
 
+        # Do not wait for calls of tiers that stopped answering
+        for executor, _ in self._executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        self._executors.clear()
         self.initialized = False
 
     @property
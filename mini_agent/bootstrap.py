@@ -0,0 +1,224 @@
+"""Agent setup shared by the interactive CLI and the ACP server.
+
+Builds the LLM client stack and the tool set from the configuration. Nothing
+here depends on the terminal UI, and tool modules (and the SDKs they need,
+such as mcp) are only imported when the corresponding tools are enabled.
+"""
+
+from pathlib import Path
+from typing import List
+
+from .agent import Colors
+from .config import Config
+from .llm import LLMClient, ResponseCache, RoutingLLMClient
+from .retry import RetryConfig
+from .schema import LLMProvider
+from .tools.base import Tool
+
+
+def create_response_cache(config: Config) -> ResponseCache | None:
+    """Open the LLM response cache from config.llm.response_cache
+
+    Args:
+        config: Configuration object
+
+    Returns:
+        ResponseCache shared by all LLM clients, or None if disabled
+    """
+    cache_config = config.llm.response_cache
+    if not cache_config.enabled:
+        return None
+    return ResponseCache(
+        path=cache_config.path,
+        mode=cache_config.mode,
+        memory_entries=cache_config.memory_entries,
+        max_size_mb=cache_config.max_size_mb,
+    )
+
+
+def create_routing_client(primary: LLMClient, config: Config, **client_kwargs) -> LLMClient | RoutingLLMClient:
+    """Wrap the primary LLM client with the backends from config.llm.routing
+
+    With routing, backends make a single attempt per request: the router fails
+    over to the next backend on a transient error and retries whole rounds over
+    the backends with the configured retry settings.
+
+    Args:
+        primary: Client for the primary LLM settings
+        config: Configuration object
+        **client_kwargs: LLMClient options shared with the additional backends
+
+    Returns:
+        RoutingLLMClient if backends are configured, otherwise the primary client
+    """
+    routing = config.llm.routing
+    if not routing.backends:
+        return primary
+
+    retry_config = client_kwargs.get("retry_config") or primary.retry_config
+    primary.retry_config = RetryConfig(enabled=False)
+    client_kwargs = {**client_kwargs, "retry_config": primary.retry_config}
+
+    backends = [primary]
+    for backend in routing.backends:
+        backends.append(
+            LLMClient(
+                api_key=backend.api_key or config.llm.api_key,
+                provider=LLMProvider.OPENAI if backend.provider.lower() == "openai" else LLMProvider.ANTHROPIC,
+                api_base=backend.api_base or config.llm.api_base,
+                model=backend.model or config.llm.model,
+                **client_kwargs,
+            )
+        )
+
+    return RoutingLLMClient(
+        backends,
+        policy=routing.policy,
+        names=[f"{client.provider.value}:{client.model}@{client.api_base}" for client in backends],
+        hedge_delay=routing.hedge_delay,
+        failure_threshold=routing.failure_threshold,
+        cooldown=routing.cooldown,
+        retry_config=retry_config,
+    )
+
+
+async def initialize_base_tools(config: Config):
+    """Initialize base tools (independent of workspace)
+
+    These tools are loaded from package configuration and don't depend on workspace.
+    Note: File tools are now workspace-dependent and initialized in add_workspace_tools()
+
+    Args:
+        config: Configuration object
+
+    Returns:
+        Tuple of (list of tools, skill loader if skills enabled)
+    """
+
+    tools = []
+    skill_loader = None
+
+    # 1. Bash tool and Bash Output tool
+    if config.tools.enable_bash:
+        from .tools.bash_tool import BashKillTool, BashOutputTool, BashTool
+
+        # With persistent sessions the bash tool is per workspace (see add_workspace_tools)
+        if not config.tools.bash_persistent_session:
+            bash_tool = BashTool()
+            tools.append(bash_tool)
+            print(f"{Colors.GREEN}✅ Loaded Bash tool{Colors.RESET}")
+
+        bash_output_tool = BashOutputTool()
+        tools.append(bash_output_tool)
+        print(f"{Colors.GREEN}✅ Loaded Bash Output tool{Colors.RESET}")
+
+        bash_kill_tool = BashKillTool()
+        tools.append(bash_kill_tool)
+        print(f"{Colors.GREEN}✅ Loaded Bash Kill tool{Colors.RESET}")
+
+    # 3. Claude Skills (loaded from package directory)
+    if config.tools.enable_skills:
+        print(f"{Colors.BRIGHT_CYAN}Loading Claude Skills...{Colors.RESET}")
+        try:
+            # Resolve skills directory with priority search
+            skills_dir = config.tools.skills_dir
+            if not Path(skills_dir).is_absolute():
+                # Search in priority order:
+                # 1. Current directory (dev mode: ./skills or ./mini_agent/skills)
+                # 2. Package directory (installed: site-packages/mini_agent/skills)
+                search_paths = [
+                    Path(skills_dir),  # ./skills for backward compatibility
+                    Path("mini_agent") / skills_dir,  # ./mini_agent/skills
+                    Config.get_package_dir() / skills_dir,  # site-packages/mini_agent/skills
+                ]
+
+                # Find first existing path
+                for path in search_paths:
+                    if path.exists():
+                        skills_dir = str(path.resolve())
+                        break
+
+            from .tools.skill_tool import create_skill_tools
+
+            skill_tools, skill_loader = create_skill_tools(skills_dir, watch=config.tools.skills_watch)
+            if skill_tools:
+                tools.extend(skill_tools)
+                print(f"{Colors.GREEN}✅ Loaded Skill tool (get_skill){Colors.RESET}")
+            else:
+                print(f"{Colors.YELLOW}⚠️  No available Skills found{Colors.RESET}")
+        except Exception as e:
+            print(f"{Colors.YELLOW}⚠️  Failed to load Skills: {e}{Colors.RESET}")
+
+    # 4. MCP tools (loaded with priority search)
+    if config.tools.enable_mcp:
+        print(f"{Colors.BRIGHT_CYAN}Loading MCP tools...{Colors.RESET}")
+        try:
+            # Use priority search for mcp.json
+            mcp_config_path = Config.find_config_file(config.tools.mcp_config_path)
+            if mcp_config_path:
+                from .tools.mcp_loader import load_mcp_tools_async
+
+                mcp_tools = await load_mcp_tools_async(
+                    str(mcp_config_path),
+                    lazy=config.tools.mcp_lazy_start,
+                    connect_timeout=config.tools.mcp_connect_timeout,
+                    call_timeout=config.tools.mcp_call_timeout,
+                    max_in_flight=config.tools.mcp_max_in_flight,
+                )
+                if mcp_tools:
+                    tools.extend(mcp_tools)
+                    print(f"{Colors.GREEN}✅ Loaded {len(mcp_tools)} MCP tools (from: {mcp_config_path}){Colors.RESET}")
+                else:
+                    print(f"{Colors.YELLOW}⚠️  No available MCP tools found{Colors.RESET}")
+            else:
+                print(f"{Colors.YELLOW}⚠️  MCP config file not found: {config.tools.mcp_config_path}{Colors.RESET}")
+        except Exception as e:
+            print(f"{Colors.YELLOW}⚠️  Failed to load MCP tools: {e}{Colors.RESET}")
+
+    print()  # Empty line separator
+    return tools, skill_loader
+
+
+def add_workspace_tools(tools: List[Tool], config: Config, workspace_dir: Path):
+    """Add workspace-dependent tools
+
+    These tools need to know the workspace directory.
+
+    Args:
+        tools: Existing tools list to add to
+        config: Configuration object
+        workspace_dir: Workspace directory path
+    """
+    # Ensure workspace directory exists
+    workspace_dir.mkdir(parents=True, exist_ok=True)
+
+    # File tools - need workspace to resolve relative paths
+    if config.tools.enable_file_tools:
+        from .tools.file_tools import EditTool, ReadTool, WriteTool
+        from .tools.search_tools import GlobFilesTool, SearchFilesTool
+
+        tools.extend(
+            [
+                ReadTool(workspace_dir=str(workspace_dir)),
+                WriteTool(workspace_dir=str(workspace_dir)),
+                EditTool(workspace_dir=str(workspace_dir)),
+                SearchFilesTool(workspace_dir=str(workspace_dir)),
+                GlobFilesTool(workspace_dir=str(workspace_dir)),
+            ]
+        )
+        print(f"{Colors.GREEN}✅ Loaded file operation tools (workspace: {workspace_dir}){Colors.RESET}")
+
+    # Bash tool with a persistent shell session started in the workspace
+    if config.tools.enable_bash and config.tools.bash_persistent_session:
+        from .tools.bash_tool import BashTool
+
+        tools.append(BashTool(workspace_dir=str(workspace_dir), persistent_session=True))
+        print(f"{Colors.GREEN}✅ Loaded Bash tool (persistent session){Colors.RESET}")
+
+    # Session note tool - needs workspace to store memory file
+    if config.tools.enable_note:
+        from .tools.note_tool import RecallNoteTool, SessionNoteTool
+
+        memory_file = str(workspace_dir / ".agent_memory.json")
+        tools.extend([SessionNoteTool(memory_file=memory_file), RecallNoteTool(memory_file=memory_file)])
+        print(f"{Colors.GREEN}✅ Loaded session note tools{Colors.RESET}")
@@ -2,37 +2,32 @@
 Mini Agent - Interactive Runtime Example
 
 Usage:
-    mini-agent [--workspace DIR]
+    mini-agent [--workspace DIR] [--profile-startup]
 
 Examples:
     mini-agent                              # Use current directory as workspace
     mini-agent --workspace /path/to/dir     # Use specific workspace directory
 """
 
+import time
+
+# Start of CLI startup (import of this module), for --profile-startup
+_STARTUP_START = time.perf_counter()
+
 import argparse
 import asyncio
 from datetime import datetime
 from pathlib import Path
-from typing import List
-
-from prompt_toolkit import PromptSession
-from prompt_toolkit.auto_suggest import AutoSuggestFromHistory
-from prompt_toolkit.completion import WordCompleter
-from prompt_toolkit.history import FileHistory
-from prompt_toolkit.key_binding import KeyBindings
-from prompt_toolkit.styles import Style
 
 from mini_agent import LLMClient
 from mini_agent.agent import Agent
+from mini_agent.bootstrap import add_workspace_tools, create_response_cache, create_routing_client, initialize_base_tools
 from mini_agent.config import Config
+from mini_agent.llm import RateLimitConfig, RoutingLLMClient, TransportConfig, transport_registry
 from mini_agent.schema import LLMProvider
-from mini_agent.tools.base import Tool
-from mini_agent.tools.bash_tool import BashKillTool, BashOutputTool, BashTool
-from mini_agent.tools.file_tools import EditTool, ReadTool, WriteTool
-from mini_agent.tools.mcp_loader import cleanup_mcp_connections, load_mcp_tools_async
-from mini_agent.tools.note_tool import SessionNoteTool
-from mini_agent.tools.skill_tool import create_skill_tools
+from mini_agent.tools.mcp_loader import cleanup_mcp_connections, get_mcp_stats
 from mini_agent.utils import calculate_display_width
+from mini_agent.utils.startup_profile import StartupProfile
 
 
 # ANSI color codes
@@ -173,6 +168,27 @@ def print_stats(agent: Agent, session_start: datetime):
     print(f"    - Assistant Replies: {Colors.BRIGHT_BLUE}{assistant_msgs}{Colors.RESET}")
     print(f"    - Tool Calls: {Colors.BRIGHT_YELLOW}{tool_msgs}{Colors.RESET}")
     print(f"  Available Tools: {len(agent.tools)}")
+    if isinstance(agent.llm, RoutingLLMClient):
+        for backend in agent.llm.stats():
+            latency = backend["latency_ewma"]["stream"] or backend["latency_ewma"]["generate"]
+            latency_text = f"{latency:.1f}s" if latency is not None else "n/a"
+            status = "healthy" if backend["healthy"] else "unhealthy"
+            print(f"  LLM Backend {backend['name']}: {status}, {backend['requests']} requests, {backend['failures']} failures, latency {latency_text}")
+    for pool in transport_registry.stats():
+        connections = "n/a" if pool["connections"] is None else f"{pool['connections']} open, {pool['idle_connections']} idle"
+        protocol = "HTTP/2" if pool["http2"] else "HTTP/1.1"
+        print(f"  HTTP Pool ({pool['api_base']}): {pool['requests']} requests, {connections}, {protocol}")
+    response_cache = getattr(agent.llm, "response_cache", None)
+    if response_cache is not None:
+        cache_stats = response_cache.stats()
+        print(f"  Response Cache ({cache_stats['mode']}): {cache_stats['hits']} hits, {cache_stats['misses']} misses, {cache_stats['stores']} stored")
+    for server in get_mcp_stats():
+        print(f"  MCP Server {server['name']}: {server['processes']}/{server['pool_size']} processes, {server['restarts']} restarts")
+        for tool_name, tool in server["tools"].items():
+            print(
+                f"    - {tool_name}: {tool['calls']} calls, {tool['errors']} errors ({tool['timeouts']} timeouts), "
+                f"mean {tool['mean_latency']:.2f}s, p95 {tool['p95_latency']:.2f}s"
+            )
     print(f"{Colors.DIM}{'─' * 40}{Colors.RESET}\n")
 
 
@@ -189,6 +205,7 @@ def parse_args() -> argparse.Namespace:
 Examples:
   mini-agent                              # Use current directory as workspace
   mini-agent --workspace /path/to/dir     # Use specific workspace directory
+  mini-agent --profile-startup            # Show where startup time goes
         """,
     )
     parser.add_argument(
@@ -198,6 +215,11 @@ Examples:
         default=None,
         help="Workspace directory (default: current directory)",
     )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Print an import-time and init-phase breakdown of startup",
+    )
     parser.add_argument(
         "--version",
         "-v",
@@ -208,127 +230,19 @@ Examples:
     return parser.parse_args()
 
 
-async def initialize_base_tools(config: Config):
-    """Initialize base tools (independent of workspace)
-
-    These tools are loaded from package configuration and don't depend on workspace.
-    Note: File tools are now workspace-dependent and initialized in add_workspace_tools()
-
-    Args:
-        config: Configuration object
-
-    Returns:
-        Tuple of (list of tools, skill loader if skills enabled)
-    """
-
-    tools = []
-    skill_loader = None
-
-    # 1. Bash tool and Bash Output tool
-    if config.tools.enable_bash:
-        bash_tool = BashTool()
-        tools.append(bash_tool)
-        print(f"{Colors.GREEN}✅ Loaded Bash tool{Colors.RESET}")
-
-        bash_output_tool = BashOutputTool()
-        tools.append(bash_output_tool)
-        print(f"{Colors.GREEN}✅ Loaded Bash Output tool{Colors.RESET}")
-
-        bash_kill_tool = BashKillTool()
-        tools.append(bash_kill_tool)
-        print(f"{Colors.GREEN}✅ Loaded Bash Kill tool{Colors.RESET}")
-
-    # 3. Claude Skills (loaded from package directory)
-    if config.tools.enable_skills:
-        print(f"{Colors.BRIGHT_CYAN}Loading Claude Skills...{Colors.RESET}")
-        try:
-            # Resolve skills directory with priority search
-            skills_dir = config.tools.skills_dir
-            if not Path(skills_dir).is_absolute():
-                # Search in priority order:
-                # 1. Current directory (dev mode: ./skills or ./mini_agent/skills)
-                # 2. Package directory (installed: site-packages/mini_agent/skills)
-                search_paths = [
-                    Path(skills_dir),  # ./skills for backward compatibility
-                    Path("mini_agent") / skills_dir,  # ./mini_agent/skills
-                    Config.get_package_dir() / skills_dir,  # site-packages/mini_agent/skills
-                ]
-
-                # Find first existing path
-                for path in search_paths:
-                    if path.exists():
-                        skills_dir = str(path.resolve())
-                        break
-
-            skill_tools, skill_loader = create_skill_tools(skills_dir)
-            if skill_tools:
-                tools.extend(skill_tools)
-                print(f"{Colors.GREEN}✅ Loaded Skill tool (get_skill){Colors.RESET}")
-            else:
-                print(f"{Colors.YELLOW}⚠️  No available Skills found{Colors.RESET}")
-        except Exception as e:
-            print(f"{Colors.YELLOW}⚠️  Failed to load Skills: {e}{Colors.RESET}")
-
-    # 4. MCP tools (loaded with priority search)
-    if config.tools.enable_mcp:
-        print(f"{Colors.BRIGHT_CYAN}Loading MCP tools...{Colors.RESET}")
-        try:
-            # Use priority search for mcp.json
-            mcp_config_path = Config.find_config_file(config.tools.mcp_config_path)
-            if mcp_config_path:
-                mcp_tools = await load_mcp_tools_async(str(mcp_config_path))
-                if mcp_tools:
-                    tools.extend(mcp_tools)
-                    print(f"{Colors.GREEN}✅ Loaded {len(mcp_tools)} MCP tools (from: {mcp_config_path}){Colors.RESET}")
-                else:
-                    print(f"{Colors.YELLOW}⚠️  No available MCP tools found{Colors.RESET}")
-            else:
-                print(f"{Colors.YELLOW}⚠️  MCP config file not found: {config.tools.mcp_config_path}{Colors.RESET}")
-        except Exception as e:
-            print(f"{Colors.YELLOW}⚠️  Failed to load MCP tools: {e}{Colors.RESET}")
-
-    print()  # Empty line separator
-    return tools, skill_loader
-
-
-def add_workspace_tools(tools: List[Tool], config: Config, workspace_dir: Path):
-    """Add workspace-dependent tools
-
-    These tools need to know the workspace directory.
-
-    Args:
-        tools: Existing tools list to add to
-        config: Configuration object
-        workspace_dir: Workspace directory path
-    """
-    # Ensure workspace directory exists
-    workspace_dir.mkdir(parents=True, exist_ok=True)
-
-    # File tools - need workspace to resolve relative paths
-    if config.tools.enable_file_tools:
-        tools.extend(
-            [
-                ReadTool(workspace_dir=str(workspace_dir)),
-                WriteTool(workspace_dir=str(workspace_dir)),
-                EditTool(workspace_dir=str(workspace_dir)),
-            ]
-        )
-        print(f"{Colors.GREEN}✅ Loaded file operation tools (workspace: {workspace_dir}){Colors.RESET}")
-
-    # Session note tool - needs workspace to store memory file
-    if config.tools.enable_note:
-        tools.append(SessionNoteTool(memory_file=str(workspace_dir / ".agent_memory.json")))
-        print(f"{Colors.GREEN}✅ Loaded session note tool{Colors.RESET}")
-
-
-async def run_agent(workspace_dir: Path):
+async def run_agent(workspace_dir: Path, profile: StartupProfile | None = None):
     """Run interactive Agent
 
     Args:
         workspace_dir: Workspace directory path
+        profile: Startup profile to record init phases in and print before the first prompt
     """
     session_start = datetime.now()
 
+    def mark(phase: str):
+        if profile is not None:
+            profile.mark(phase)
+
     # 1. Load configuration from package directory
     config_path = Config.get_default_config_path()
 
@@ -370,6 +284,8 @@ async def run_agent(workspace_dir: Path):
         print(f"{Colors.RED}❌ Error: Failed to load configuration file: {e}{Colors.RESET}")
         return
 
+    mark("load config")
+
     # 2. Initialize LLM client
     from mini_agent.retry import RetryConfig as RetryConfigBase
 
@@ -387,30 +303,64 @@ async def run_agent(workspace_dir: Path):
     def on_retry(exception: Exception, attempt: int):
         """Retry callback function to display retry information"""
         print(f"\n{Colors.BRIGHT_YELLOW}⚠️  LLM call failed (attempt {attempt}): {str(exception)}{Colors.RESET}")
-        next_delay = retry_config.calculate_delay(attempt - 1)
-        print(f"{Colors.DIM}   Retrying in {next_delay:.1f}s (attempt {attempt + 1})...{Colors.RESET}")
+        print(f"{Colors.DIM}   Retrying with backoff (attempt {attempt + 1})...{Colors.RESET}")
 
     # Convert provider string to LLMProvider enum
     provider = LLMProvider.ANTHROPIC if config.llm.provider.lower() == "anthropic" else LLMProvider.OPENAI
 
+    # Settings shared by the primary client and any routing backends
+    client_kwargs = dict(
+        retry_config=retry_config if config.llm.retry.enabled else None,
+        prompt_caching=config.llm.prompt_caching,
+        transport_config=TransportConfig(
+            http2=config.llm.http.http2,
+            max_connections=config.llm.http.max_connections,
+            max_keepalive_connections=config.llm.http.max_keepalive_connections,
+            keepalive_expiry=config.llm.http.keepalive_expiry,
+            connect_timeout=config.llm.http.connect_timeout,
+            read_timeout=config.llm.http.read_timeout,
+        ),
+        rate_limit_config=RateLimitConfig(
+            requests_per_minute=config.llm.rate_limit.requests_per_minute,
+            tokens_per_minute=config.llm.rate_limit.tokens_per_minute,
+            max_concurrent_requests=config.llm.rate_limit.max_concurrent_requests,
+        ),
+        response_cache=create_response_cache(config),
+    )
+
     llm_client = LLMClient(
         api_key=config.llm.api_key,
         provider=provider,
         api_base=config.llm.api_base,
         model=config.llm.model,
-        retry_config=retry_config if config.llm.retry.enabled else None,
+        **client_kwargs,
     )
 
+    # Route over fallback backends when configured
+    llm_client = create_routing_client(llm_client, config, **client_kwargs)
+    if isinstance(llm_client, RoutingLLMClient):
+        print(f"{Colors.GREEN}✅ LLM routing enabled ({config.llm.routing.policy}, {len(llm_client.backends)} backends){Colors.RESET}")
+    response_cache = client_kwargs["response_cache"]
+    if response_cache is not None:
+        print(f"{Colors.GREEN}✅ LLM response cache enabled ({response_cache.mode}, {response_cache.path or 'in-memory'}){Colors.RESET}")
+
+    # Connect to the API while tools are being loaded
+    prewarm_task = asyncio.create_task(llm_client.prewarm()) if config.llm.http.prewarm else None
+
     # Set retry callback
     if config.llm.retry.enabled:
         llm_client.retry_callback = on_retry
         print(f"{Colors.GREEN}✅ LLM retry mechanism enabled (max {config.llm.retry.max_retries} retries){Colors.RESET}")
 
+    mark("create LLM client")
+
     # 3. Initialize base tools (independent of workspace)
     tools, skill_loader = await initialize_base_tools(config)
+    mark("base tools (bash, skills, MCP)")
 
     # 4. Add workspace-dependent tools
     add_workspace_tools(tools, config, workspace_dir)
+    mark("workspace tools")
 
     # 5. Load System Prompt (with priority search)
     system_prompt_path = Config.find_config_file(config.agent.system_prompt_path)
@@ -442,23 +392,26 @@ async def run_agent(workspace_dir: Path):
         tools=tools,
         max_steps=config.agent.max_steps,
         workspace_dir=str(workspace_dir),
-<<<<<<< HEAD
-    )
-=======
         token_limit=config.agent.token_limit,
+        max_concurrent_tools=config.agent.max_concurrent_tools,
+        stream=config.agent.stream,
+        summary_threshold=config.agent.summary_threshold,
     )
 
-    # If resuming, add loaded messages to agent
-    if initial_messages:
-        # Skip the first system message since Agent already added one
-        agent.messages.extend(initial_messages[1:])
->>>>>>> c15ae5e (Bridge Infrastructure Assessment & NovaThreads Enhancement Plan - COMPLETE)
-
     # 8. Display welcome information
     print_banner()
     print_session_info(agent, workspace_dir, config.llm.model)
 
+    mark("system prompt and agent")
+
     # 9. Setup prompt_toolkit session
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.auto_suggest import AutoSuggestFromHistory
+    from prompt_toolkit.completion import WordCompleter
+    from prompt_toolkit.history import FileHistory
+    from prompt_toolkit.key_binding import KeyBindings
+    from prompt_toolkit.styles import Style
+
     # Command completer
     command_completer = WordCompleter(
         ["/help", "/clear", "/history", "/stats", "/exit", "/quit", "/q"],
@@ -504,6 +457,11 @@ async def run_agent(workspace_dir: Path):
         key_bindings=kb,
     )
 
+    mark("prompt session")
+    if profile is not None:
+        profile.uninstall()
+        print(f"{Colors.DIM}{profile.report()}{Colors.RESET}\n")
+
     # 10. Interactive loop
     while True:
         try:
@@ -582,6 +540,14 @@ async def run_agent(workspace_dir: Path):
     try:
         print(f"{Colors.BRIGHT_CYAN}Cleaning up MCP connections...{Colors.RESET}")
         await cleanup_mcp_connections()
+        bash_tool = agent.tools.get("bash")
+        if bash_tool is not None and hasattr(bash_tool, "close"):
+            await bash_tool.close()
+        if prewarm_task is not None and not prewarm_task.done():
+            prewarm_task.cancel()
+        await transport_registry.aclose()
+        if response_cache is not None:
+            response_cache.close()
         print(f"{Colors.GREEN}✅ Cleanup complete{Colors.RESET}\n")
     except Exception as e:
         print(f"{Colors.YELLOW}Error during cleanup (can be ignored): {e}{Colors.RESET}\n")
@@ -592,6 +558,12 @@ def main():
     # Parse command line arguments
     args = parse_args()
 
+    profile = None
+    if args.profile_startup:
+        profile = StartupProfile(start=_STARTUP_START)
+        profile.mark("import mini_agent.cli")
+        profile.install()
+
     # Determine workspace directory
     if args.workspace:
         workspace_dir = Path(args.workspace).absolute()
@@ -603,7 +575,7 @@ def main():
     workspace_dir.mkdir(parents=True, exist_ok=True)
 
     # Run the agent (config always loaded from package directory)
-    asyncio.run(run_agent(workspace_dir))
+    asyncio.run(run_agent(workspace_dir, profile))
 
 
 if __name__ == "__main__":
@@ -19,6 +19,55 @@ class RetryConfig(BaseModel):
     exponential_base: float = 2.0
 
 
+class RateLimitConfig(BaseModel):
+    """Client-side rate limit configuration (None = unlimited)"""
+
+    requests_per_minute: int | None = None
+    tokens_per_minute: int | None = None
+    max_concurrent_requests: int | None = None
+
+
+class HTTPConfig(BaseModel):
+    """Shared HTTP connection pool configuration"""
+
+    http2: bool = True  # Used when the h2 package is installed
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 120.0
+    connect_timeout: float = 10.0
+    read_timeout: float = 600.0
+    prewarm: bool = True  # Open a connection to the API at startup
+
+
+class ResponseCacheConfig(BaseModel):
+    """LLM response cache configuration"""
+
+    enabled: bool = False
+    mode: str = "readwrite"  # "readwrite", "record" or "replay"
+    path: str | None = "~/.mini-agent/cache/llm_responses.sqlite"  # None = in-memory only
+    memory_entries: int = 256
+    max_size_mb: float = 512.0
+
+
+class RoutingBackendConfig(BaseModel):
+    """Additional LLM backend (unset fields default to the primary LLM settings)"""
+
+    provider: str = "anthropic"  # "anthropic" or "openai"
+    model: str | None = None
+    api_base: str | None = None
+    api_key: str | None = None
+
+
+class RoutingConfig(BaseModel):
+    """Routing over the primary LLM and additional backends"""
+
+    policy: str = "failover"  # "failover" or "hedge"
+    hedge_delay: float = 10.0  # Hedge delay until enough latency samples exist (then p95 is used)
+    failure_threshold: int = 3  # Consecutive failures before a backend is skipped
+    cooldown: float = 30.0  # Seconds an unhealthy backend is skipped
+    backends: list[RoutingBackendConfig] = Field(default_factory=list)
+
+
 class LLMConfig(BaseModel):
     """LLM configuration"""
 
@@ -26,7 +75,12 @@ class LLMConfig(BaseModel):
     api_base: str = "https://api.minimax.io"
     model: str = "MiniMax-M2"
     provider: str = "anthropic"  # "anthropic" or "openai"
+    prompt_caching: bool = True  # Automatic prompt cache breakpoints (anthropic provider)
     retry: RetryConfig = Field(default_factory=RetryConfig)
+    http: HTTPConfig = Field(default_factory=HTTPConfig)
+    rate_limit: RateLimitConfig = Field(default_factory=RateLimitConfig)
+    routing: RoutingConfig = Field(default_factory=RoutingConfig)
+    response_cache: ResponseCacheConfig = Field(default_factory=ResponseCacheConfig)
 
 
 class AgentConfig(BaseModel):
@@ -36,6 +90,9 @@ class AgentConfig(BaseModel):
     workspace_dir: str = "./workspace"
     system_prompt_path: str = "system_prompt.md"
     token_limit: int = 195000  # Context compaction threshold (set below 204800 API max)
+    max_concurrent_tools: int = 4  # Tool calls of one turn executed concurrently (1 = sequential)
+    stream: bool = True  # Stream LLM output as it is generated
+    summary_threshold: float = 0.7  # Fraction of token_limit at which history summaries are prepared in the background
 
 
 class ToolsConfig(BaseModel):
@@ -44,15 +101,21 @@ class ToolsConfig(BaseModel):
     # Basic tools (file operations, bash)
     enable_file_tools: bool = True
     enable_bash: bool = True
+    bash_persistent_session: bool = False  # Run foreground bash commands in one long-lived shell per workspace
     enable_note: bool = True
 
     # Skills
     enable_skills: bool = True
     skills_dir: str = "./skills"
+    skills_watch: bool = False  # Pick up new or changed skills without a restart
 
     # MCP tools
     enable_mcp: bool = True
     mcp_config_path: str = "mcp.json"
+    mcp_lazy_start: bool = False  # Start MCP servers on first tool call, using cached tool schemas
+    mcp_connect_timeout: float = 30.0  # Seconds allowed for each MCP server to start
+    mcp_call_timeout: float | None = 120.0  # Seconds allowed for each MCP tool call (None: no limit)
+    mcp_max_in_flight: int = 8  # MCP tool calls running at once on each server
 
 
 class Config(BaseModel):
@@ -114,12 +177,57 @@ class Config(BaseModel):
             exponential_base=retry_data.get("exponential_base", 2.0),
         )
 
+        # Parse HTTP connection pool configuration
+        http_data = data.get("http") or {}
+        http_config = HTTPConfig(
+            http2=http_data.get("http2", True),
+            max_connections=http_data.get("max_connections", 100),
+            max_keepalive_connections=http_data.get("max_keepalive_connections", 20),
+            keepalive_expiry=http_data.get("keepalive_expiry", 120.0),
+            connect_timeout=http_data.get("connect_timeout", 10.0),
+            read_timeout=http_data.get("read_timeout", 600.0),
+            prewarm=http_data.get("prewarm", True),
+        )
+
+        # Parse rate limit configuration
+        rate_limit_data = data.get("rate_limit") or {}
+        rate_limit_config = RateLimitConfig(
+            requests_per_minute=rate_limit_data.get("requests_per_minute"),
+            tokens_per_minute=rate_limit_data.get("tokens_per_minute"),
+            max_concurrent_requests=rate_limit_data.get("max_concurrent_requests"),
+        )
+
+        # Parse routing configuration
+        routing_data = data.get("routing") or {}
+        routing_config = RoutingConfig(
+            policy=routing_data.get("policy", "failover"),
+            hedge_delay=routing_data.get("hedge_delay", 10.0),
+            failure_threshold=routing_data.get("failure_threshold", 3),
+            cooldown=routing_data.get("cooldown", 30.0),
+            backends=[RoutingBackendConfig(**backend) for backend in routing_data.get("backends") or []],
+        )
+
+        # Parse response cache configuration
+        response_cache_data = data.get("response_cache") or {}
+        response_cache_config = ResponseCacheConfig(
+            enabled=response_cache_data.get("enabled", False),
+            mode=response_cache_data.get("mode", "readwrite"),
+            path=response_cache_data.get("path", "~/.mini-agent/cache/llm_responses.sqlite"),
+            memory_entries=response_cache_data.get("memory_entries", 256),
+            max_size_mb=response_cache_data.get("max_size_mb", 512.0),
+        )
+
         llm_config = LLMConfig(
             api_key=data["api_key"],
             api_base=data.get("api_base", "https://api.minimax.io"),
             model=data.get("model", "MiniMax-M2"),
             provider=data.get("provider", "anthropic"),
+            prompt_caching=data.get("prompt_caching", True),
             retry=retry_config,
+            http=http_config,
+            rate_limit=rate_limit_config,
+            routing=routing_config,
+            response_cache=response_cache_config,
         )
 
         # Parse Agent configuration
@@ -128,6 +236,9 @@ class Config(BaseModel):
             workspace_dir=data.get("workspace_dir", "./workspace"),
             system_prompt_path=data.get("system_prompt_path", "system_prompt.md"),
             token_limit=data.get("token_limit", 195000),
+            max_concurrent_tools=data.get("max_concurrent_tools", 4),
+            stream=data.get("stream", True),
+            summary_threshold=data.get("summary_threshold", 0.7),
         )
 
         # Parse tools configuration
@@ -135,11 +246,17 @@ class Config(BaseModel):
         tools_config = ToolsConfig(
             enable_file_tools=tools_data.get("enable_file_tools", True),
             enable_bash=tools_data.get("enable_bash", True),
+            bash_persistent_session=tools_data.get("bash_persistent_session", False),
             enable_note=tools_data.get("enable_note", True),
             enable_skills=tools_data.get("enable_skills", True),
             skills_dir=tools_data.get("skills_dir", "./skills"),
+            skills_watch=tools_data.get("skills_watch", False),
             enable_mcp=tools_data.get("enable_mcp", True),
             mcp_config_path=tools_data.get("mcp_config_path", "mcp.json"),
+            mcp_lazy_start=tools_data.get("mcp_lazy_start", False),
+            mcp_connect_timeout=tools_data.get("mcp_connect_timeout", 30.0),
+            mcp_call_timeout=tools_data.get("mcp_call_timeout", 120.0),
+            mcp_max_in_flight=tools_data.get("mcp_max_in_flight", 8),
         )
 
         return cls(
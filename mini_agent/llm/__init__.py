@@ -1,9 +1,53 @@
-"""LLM clients package supporting both Anthropic and OpenAI protocols."""
+"""LLM clients package supporting both Anthropic and OpenAI protocols.
 
-from .anthropic_client import AnthropicClient
-from .base import LLMClientBase
-from .llm_wrapper import LLMClient
-from .openai_client import OpenAIClient
+Exports are imported on first access, so only the SDK of the provider that is
+actually used gets loaded.
+"""
 
-__all__ = ["LLMClientBase", "AnthropicClient", "OpenAIClient", "LLMClient"]
+import importlib
 
+__all__ = [
+    "LLMClientBase",
+    "AnthropicClient",
+    "OpenAIClient",
+    "LLMClient",
+    "RateLimitConfig",
+    "RateLimiter",
+    "rate_limiters",
+    "ResponseCache",
+    "ResponseCacheMissError",
+    "RoutingLLMClient",
+    "TransportConfig",
+    "TransportRegistry",
+    "transport_registry",
+]
+
+# Export name -> submodule defining it
+_EXPORTS = {
+    "AnthropicClient": ".anthropic_client",
+    "LLMClientBase": ".base",
+    "LLMClient": ".llm_wrapper",
+    "OpenAIClient": ".openai_client",
+    "RateLimitConfig": ".rate_limit",
+    "RateLimiter": ".rate_limit",
+    "rate_limiters": ".rate_limit",
+    "ResponseCache": ".response_cache",
+    "ResponseCacheMissError": ".response_cache",
+    "RoutingLLMClient": ".router",
+    "TransportConfig": ".transport",
+    "TransportRegistry": ".transport",
+    "transport_registry": ".transport",
+}
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -1,16 +1,25 @@
 """Anthropic LLM client implementation."""
 
+import contextlib
+import json
 import logging
-from typing import Any
+from typing import Any, AsyncIterator
 
 import anthropic
 
-from ..retry import RetryConfig, async_retry
-from ..schema import FunctionCall, LLMResponse, Message, TokenUsage, ToolCall
+from ..retry import RetryConfig
+from ..schema import FunctionCall, LLMProvider, LLMResponse, LLMStreamEvent, Message, TokenUsage, ToolCall
+from ..tools.registry import ToolRegistry
 from .base import LLMClientBase
+from .rate_limit import RateLimitConfig, estimate_request_tokens
+from .response_cache import ResponseCache
+from .transport import TransportConfig, transport_registry
 
 logger = logging.getLogger(__name__)
 
+# Prompt cache breakpoint marker
+CACHE_CONTROL = {"type": "ephemeral"}
+
 
 class AnthropicClient(LLMClientBase):
     """LLM client using Anthropic's protocol.
@@ -19,6 +28,7 @@ class AnthropicClient(LLMClientBase):
     - Extended thinking content
     - Tool calling
     - Retry logic
+    - Prompt caching (automatic cache breakpoints)
     """
 
     def __init__(
@@ -27,6 +37,10 @@ class AnthropicClient(LLMClientBase):
         api_base: str = "https://api.minimaxi.com/anthropic",
         model: str = "MiniMax-M2",
         retry_config: RetryConfig | None = None,
+        prompt_caching: bool = True,
+        transport_config: TransportConfig | None = None,
+        rate_limit_config: RateLimitConfig | None = None,
+        response_cache: ResponseCache | None = None,
     ):
         """Initialize Anthropic client.
 
@@ -35,15 +49,24 @@ class AnthropicClient(LLMClientBase):
             api_base: Base URL for the API (default: MiniMax Anthropic endpoint)
             model: Model name to use (default: MiniMax-M2)
             retry_config: Optional retry configuration
+            prompt_caching: Place cache_control breakpoints on system prompt, tools and history
+            transport_config: Optional shared HTTP connection pool configuration
+            rate_limit_config: Optional client-side rate limits
+            response_cache: Optional cache answering repeated identical requests
         """
-        super().__init__(api_key, api_base, model, retry_config)
+        super().__init__(api_key, api_base, model, retry_config, transport_config, rate_limit_config, response_cache)
+        self.prompt_caching = prompt_caching
 
-        # Initialize Anthropic async client
+        # Initialize Anthropic async client on the shared connection pool
+        self.http_client = transport_registry.get_http_client(anthropic, api_base, self.transport_config)
         self.client = anthropic.AsyncAnthropic(
             base_url=api_base,
             api_key=api_key,
             default_headers={"Authorization": f"Bearer {api_key}"},
+            http_client=self.http_client,
+            max_retries=0,  # Retries are handled by _call_api
         )
+        self._observe_rate_limit_headers()
 
     async def _make_api_request(
         self,
@@ -64,23 +87,138 @@ class AnthropicClient(LLMClientBase):
         Raises:
             Exception: API call failed
         """
+        params = self._build_params(system_message, api_messages, tools)
+
+        # Use Anthropic SDK's async messages.create
+        response = await self.client.messages.create(**params)
+        return response
+
+    async def _make_stream_request(
+        self,
+        system_message: str | None,
+        api_messages: list[dict[str, Any]],
+        tools: list[Any] | None = None,
+    ) -> Any:
+        """Open a streaming API request (core method that can be retried).
+
+        Only opening the stream is retried; once events are flowing a failure
+        is raised to the caller, since partial output has already been emitted.
+
+        Args:
+            system_message: Optional system message
+            api_messages: List of messages in Anthropic format
+            tools: Optional list of tools
+
+        Returns:
+            Anthropic async stream of raw message events
+
+        Raises:
+            Exception: API call failed
+        """
+        params = self._build_params(system_message, api_messages, tools)
+        return await self.client.messages.create(**params, stream=True)
+
+    def _build_params(
+        self,
+        system_message: str | None,
+        api_messages: list[dict[str, Any]],
+        tools: list[Any] | None = None,
+    ) -> dict[str, Any]:
+        """Build keyword arguments for messages.create.
+
+        Args:
+            system_message: Optional system message
+            api_messages: List of messages in Anthropic format
+            tools: Optional list of tools
+
+        Returns:
+            Request parameters
+        """
         params = {
             "model": self.model,
             "max_tokens": 16384,
-            "messages": api_messages,
+            "messages": self._add_message_cache_breakpoints(api_messages) if self.prompt_caching else api_messages,
         }
 
         if system_message:
-            params["system"] = system_message
+            if self.prompt_caching:
+                params["system"] = [{"type": "text", "text": system_message, "cache_control": CACHE_CONTROL}]
+            else:
+                params["system"] = system_message
 
         if tools:
-            params["tools"] = self._convert_tools(tools)
+            converted_tools = self._convert_tools(tools)
+            if self.prompt_caching and converted_tools:
+                # A breakpoint on the last tool caches the whole tool list
+                converted_tools = [*converted_tools[:-1], {**converted_tools[-1], "cache_control": CACHE_CONTROL}]
+            params["tools"] = converted_tools
 
-        # Use Anthropic SDK's async messages.create
-        response = await self.client.messages.create(**params)
-        return response
+        return params
+
+    def _add_message_cache_breakpoints(self, api_messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Place rolling prompt cache breakpoints on the message history.
+
+        Two breakpoints are used (together with system and tools, the API maximum of 4):
+        - The last message, so the whole history is cached for the next request
+        - The message before the last assistant turn, i.e. where the previous request
+          ended, so its cache entry is read even if many blocks were appended since
+
+        Breakpoints are derived from the current list on every request, so they
+        follow history rewrites such as summarization. Affected messages are copied;
+        the input list and its dicts are never modified.
+
+        Args:
+            api_messages: List of messages in Anthropic format
+
+        Returns:
+            List of messages with cache_control markers
+        """
+        if not api_messages:
+            return api_messages
+
+        targets = [len(api_messages) - 1]
+        for i in range(len(api_messages) - 1, 0, -1):
+            if api_messages[i]["role"] == "assistant":
+                targets.append(i - 1)
+                break
+
+        result = list(api_messages)
+        for i in targets:
+            marked = self._with_cache_control(result[i])
+            if marked is not None:
+                result[i] = marked
+        return result
+
+    @staticmethod
+    def _with_cache_control(message: dict[str, Any]) -> dict[str, Any] | None:
+        """Return a copy of message with cache_control on its last cacheable block.
+
+        Args:
+            message: Message in Anthropic format
+
+        Returns:
+            Copied message, or None if it has no block that can carry a breakpoint
+        """
+        content = message["content"]
+        if isinstance(content, str):
+            if not content:
+                return None
+            blocks = [{"type": "text", "text": content}]
+        else:
+            blocks = list(content)
+
+        # Thinking blocks (and empty text blocks) cannot be cache breakpoints
+        for i in range(len(blocks) - 1, -1, -1):
+            block = blocks[i]
+            if block.get("type") in ("thinking", "redacted_thinking"):
+                continue
+            if block.get("type") == "text" and not block.get("text"):
+                continue
+            blocks[i] = {**block, "cache_control": CACHE_CONTROL}
+            return {**message, "content": blocks}
+        return None
 
-    def _convert_tools(self, tools: list[Any]) -> list[dict[str, Any]]:
+    def _convert_tools(self, tools: list[Any] | ToolRegistry) -> list[dict[str, Any]] | tuple[dict[str, Any], ...]:
         """Convert tools to Anthropic format.
 
         Anthropic tool format:
@@ -94,12 +232,18 @@ class AnthropicClient(LLMClientBase):
             }
         }
 
+        A ToolRegistry returns its memoized schemas, which are only rebuilt when
+        the registry changes.
+
         Args:
-            tools: List of Tool objects or dicts
+            tools: ToolRegistry, or list of Tool objects or dicts
 
         Returns:
             List of tools in Anthropic dict format
         """
+        if isinstance(tools, ToolRegistry):
+            return tools.get_schemas(LLMProvider.ANTHROPIC)
+
         result = []
         for tool in tools:
             if isinstance(tool, dict):
@@ -111,71 +255,82 @@ class AnthropicClient(LLMClientBase):
                 raise TypeError(f"Unsupported tool type: {type(tool)}")
         return result
 
-    def _convert_messages(self, messages: list[Message]) -> tuple[str | None, list[dict[str, Any]]]:
-        """Convert internal messages to Anthropic format.
+    def _convert_message(self, msg: Message) -> dict[str, Any] | None:
+        """Convert a single internal message to Anthropic format.
 
         Args:
-            messages: List of internal Message objects
+            msg: Internal Message object
 
         Returns:
-            Tuple of (system_message, api_messages)
+            Message in Anthropic format, or None for the system message (sent separately)
         """
-        system_message = None
-        api_messages = []
+        if msg.role == "system":
+            return None
+
+        # For user and assistant messages
+        if msg.role in ["user", "assistant"]:
+            # Handle assistant messages with thinking or tool calls
+            if msg.role == "assistant" and (msg.thinking or msg.tool_calls):
+                # Build content blocks for assistant with thinking and/or tool calls
+                content_blocks = []
+
+                # Add thinking block if present
+                if msg.thinking:
+                    content_blocks.append({"type": "thinking", "thinking": msg.thinking})
+
+                # Add text content if present
+                if msg.content:
+                    content_blocks.append({"type": "text", "text": msg.content})
+
+                # Add tool use blocks
+                if msg.tool_calls:
+                    for tool_call in msg.tool_calls:
+                        content_blocks.append(
+                            {
+                                "type": "tool_use",
+                                "id": tool_call.id,
+                                "name": tool_call.function.name,
+                                "input": tool_call.function.arguments,
+                            }
+                        )
 
-        for msg in messages:
-            if msg.role == "system":
-                system_message = msg.content
-                continue
+                return {"role": "assistant", "content": content_blocks}
+            return {"role": msg.role, "content": msg.content}
 
-            # For user and assistant messages
-            if msg.role in ["user", "assistant"]:
-                # Handle assistant messages with thinking or tool calls
-                if msg.role == "assistant" and (msg.thinking or msg.tool_calls):
-                    # Build content blocks for assistant with thinking and/or tool calls
-                    content_blocks = []
-
-                    # Add thinking block if present
-                    if msg.thinking:
-                        content_blocks.append({"type": "thinking", "thinking": msg.thinking})
-
-                    # Add text content if present
-                    if msg.content:
-                        content_blocks.append({"type": "text", "text": msg.content})
-
-                    # Add tool use blocks
-                    if msg.tool_calls:
-                        for tool_call in msg.tool_calls:
-                            content_blocks.append(
-                                {
-                                    "type": "tool_use",
-                                    "id": tool_call.id,
-                                    "name": tool_call.function.name,
-                                    "input": tool_call.function.arguments,
-                                }
-                            )
-
-                    api_messages.append({"role": "assistant", "content": content_blocks})
-                else:
-                    api_messages.append({"role": msg.role, "content": msg.content})
-
-            # For tool result messages
-            elif msg.role == "tool":
-                # Anthropic uses user role with tool_result content blocks
-                api_messages.append(
+        # For tool result messages
+        if msg.role == "tool":
+            # Anthropic uses user role with tool_result content blocks
+            return {
+                "role": "user",
+                "content": [
                     {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "tool_result",
-                                "tool_use_id": msg.tool_call_id,
-                                "content": msg.content,
-                            }
-                        ],
+                        "type": "tool_result",
+                        "tool_use_id": msg.tool_call_id,
+                        "content": msg.content,
                     }
-                )
+                ],
+            }
+
+        return None
+
+    def _convert_messages(self, messages: list[Message]) -> tuple[str | None, list[dict[str, Any]]]:
+        """Convert internal messages to Anthropic format.
+
+        Only messages appended since the previous request of the same history are
+        converted; the rest comes from the client's message conversion cache.
+
+        Args:
+            messages: List of internal Message objects
+
+        Returns:
+            Tuple of (system_message, api_messages)
+        """
+        cache = self._sync_message_cache(messages)
+        return cache.system_message, list(cache.api_messages)
 
-        return system_message, api_messages
+    def _request_payload(self, request_params: dict[str, Any]) -> dict[str, Any]:
+        """Build messages.create parameters for a prepared request (response cache key)."""
+        return self._build_params(request_params["system_message"], request_params["api_messages"], request_params["tools"])
 
     def _prepare_request(
         self,
@@ -234,11 +389,7 @@ class AnthropicClient(LLMClientBase):
         # Extract token usage from response
         usage = None
         if hasattr(response, "usage") and response.usage:
-            usage = TokenUsage(
-                prompt_tokens=response.usage.input_tokens or 0,
-                completion_tokens=response.usage.output_tokens or 0,
-                total_tokens=(response.usage.input_tokens or 0) + (response.usage.output_tokens or 0),
-            )
+            usage = self._token_usage(response.usage, response.usage.output_tokens or 0)
 
         return LLMResponse(
             content=text_content,
@@ -264,24 +415,184 @@ class AnthropicClient(LLMClientBase):
         """
         # Prepare request
         request_params = self._prepare_request(messages, tools)
-
-        # Make API request with retry logic
-        if self.retry_config.enabled:
-            # Apply retry logic
-            retry_decorator = async_retry(config=self.retry_config, on_retry=self.retry_callback)
-            api_call = retry_decorator(self._make_api_request)
-            response = await api_call(
+        cache_key, cached_response = self._lookup_response_cache(request_params)
+        if cached_response is not None:
+            return cached_response
+        estimated_tokens = estimate_request_tokens(messages)
+
+        # Make API request with rate limiting and retry logic
+        async with self.rate_limiter.slot():
+            response = await self._call_api(
+                self._make_api_request,
                 request_params["system_message"],
                 request_params["api_messages"],
                 request_params["tools"],
+                estimated_tokens=estimated_tokens,
             )
-        else:
-            # Don't use retry
-            response = await self._make_api_request(
+
+        # Parse and return response
+        result = self._parse_response(response)
+        self._record_usage(estimated_tokens, result.usage)
+        self._store_response(cache_key, result)
+        return result
+
+    async def stream(
+        self,
+        messages: list[Message],
+        tools: list[Any] | None = None,
+    ) -> AsyncIterator[LLMStreamEvent]:
+        """Stream response from Anthropic LLM.
+
+        Args:
+            messages: List of conversation messages
+            tools: Optional list of available tools
+
+        Yields:
+            LLMStreamEvent objects, ending with a "done" event carrying the LLMResponse
+        """
+        request_params = self._prepare_request(messages, tools)
+        cache_key, cached_response = self._lookup_response_cache(request_params)
+        if cached_response is not None:
+            for event in self._response_events(cached_response):
+                yield event
+            return
+        estimated_tokens = estimate_request_tokens(messages)
+
+        # The in-flight slot is held until the stream is fully read
+        async with self.rate_limiter.slot():
+            stream = await self._call_api(
+                self._make_stream_request,
                 request_params["system_message"],
                 request_params["api_messages"],
                 request_params["tools"],
+                estimated_tokens=estimated_tokens,
             )
+            # Release the connection even if the caller stops reading early
+            try:
+                async with contextlib.aclosing(self._read_stream(stream)) as events:
+                    async for event in events:
+                        if event.type == "done":
+                            self._record_usage(estimated_tokens, event.response.usage)
+                            self._store_response(cache_key, event.response)
+                        yield event
+            finally:
+                await stream.close()
+
+    async def _read_stream(self, stream: Any) -> AsyncIterator[LLMStreamEvent]:
+        """Turn Anthropic stream events into LLMStreamEvents.
 
-        # Parse and return response
-        return self._parse_response(response)
+        Args:
+            stream: Anthropic async stream of raw message events
+
+        Yields:
+            LLMStreamEvent objects, ending with a "done" event carrying the LLMResponse
+        """
+        # Content blocks by index, accumulated from deltas
+        blocks: dict[int, dict[str, Any]] = {}
+        input_usage = None
+        output_tokens = 0
+        stop_reason = None
+
+        async for event in stream:
+            if event.type == "message_start":
+                input_usage = getattr(event.message, "usage", None)
+                if input_usage:
+                    output_tokens = input_usage.output_tokens or 0
+
+            elif event.type == "content_block_start":
+                block = event.content_block
+                if block.type == "tool_use":
+                    blocks[event.index] = {"type": "tool_use", "id": block.id, "name": block.name, "json": ""}
+                elif block.type == "thinking":
+                    blocks[event.index] = {"type": "thinking", "thinking": getattr(block, "thinking", "") or ""}
+                elif block.type == "text":
+                    blocks[event.index] = {"type": "text", "text": getattr(block, "text", "") or ""}
+
+            elif event.type == "content_block_delta":
+                block = blocks.get(event.index)
+                delta = event.delta
+                if block is None:
+                    continue
+                if delta.type == "text_delta":
+                    block["text"] += delta.text
+                    yield LLMStreamEvent(type="text", delta=delta.text)
+                elif delta.type == "thinking_delta":
+                    block["thinking"] += delta.thinking
+                    yield LLMStreamEvent(type="thinking", delta=delta.thinking)
+                elif delta.type == "input_json_delta":
+                    block["json"] += delta.partial_json
+
+            elif event.type == "content_block_stop":
+                block = blocks.get(event.index)
+                if block and block["type"] == "tool_use":
+                    block["tool_call"] = self._stream_tool_call(block)
+                    yield LLMStreamEvent(type="tool_use", tool_call=block["tool_call"])
+
+            elif event.type == "message_delta":
+                stop_reason = getattr(event.delta, "stop_reason", None) or stop_reason
+                usage = getattr(event, "usage", None)
+                if usage and usage.output_tokens is not None:
+                    output_tokens = usage.output_tokens
+
+        # Assemble final response in content block order
+        text_content = ""
+        thinking_content = ""
+        tool_calls = []
+        for index in sorted(blocks):
+            block = blocks[index]
+            if block["type"] == "text":
+                text_content += block["text"]
+            elif block["type"] == "thinking":
+                thinking_content += block["thinking"]
+            elif block["type"] == "tool_use":
+                tool_calls.append(block.get("tool_call") or self._stream_tool_call(block))
+
+        response = LLMResponse(
+            content=text_content,
+            thinking=thinking_content if thinking_content else None,
+            tool_calls=tool_calls if tool_calls else None,
+            finish_reason=stop_reason or "stop",
+            usage=self._token_usage(input_usage, output_tokens) if input_usage else None,
+        )
+        yield LLMStreamEvent(type="done", response=response)
+
+    @staticmethod
+    def _token_usage(usage: Any, output_tokens: int) -> TokenUsage:
+        """Build TokenUsage from an Anthropic usage object.
+
+        Anthropic reports cached input separately from input_tokens; prompt_tokens
+        includes all of them so context-size checks stay correct with caching.
+
+        Args:
+            usage: Anthropic usage object (input side)
+            output_tokens: Output token count
+
+        Returns:
+            TokenUsage object
+        """
+        cache_creation = getattr(usage, "cache_creation_input_tokens", None) or 0
+        cache_read = getattr(usage, "cache_read_input_tokens", None) or 0
+        prompt_tokens = (usage.input_tokens or 0) + cache_creation + cache_read
+        return TokenUsage(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=output_tokens,
+            total_tokens=prompt_tokens + output_tokens,
+            cache_creation_input_tokens=cache_creation,
+            cache_read_input_tokens=cache_read,
+        )
+
+    def _stream_tool_call(self, block: dict[str, Any]) -> ToolCall:
+        """Build a ToolCall from a streamed tool_use block.
+
+        Args:
+            block: Accumulated tool_use block with id, name and partial JSON input
+
+        Returns:
+            ToolCall object
+        """
+        arguments = json.loads(block["json"]) if block["json"] else {}
+        return ToolCall(
+            id=block["id"],
+            type="function",
+            function=FunctionCall(name=block["name"], arguments=arguments),
+        )
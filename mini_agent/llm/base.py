@@ -1,10 +1,85 @@
 """Base class for LLM clients."""
 
 from abc import ABC, abstractmethod
-from typing import Any
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Awaitable, Callable
 
-from ..retry import RetryConfig
-from ..schema import LLMResponse, Message
+from ..retry import RetryConfig, async_retry
+from ..schema import LLMResponse, LLMStreamEvent, Message, TokenUsage
+from .rate_limit import RateLimitConfig, rate_limiters
+from .response_cache import ResponseCache, response_cache_key
+from .transport import TransportConfig, TransportRegistry
+
+# Number of conversation histories (e.g. ACP sessions) whose converted form is kept per client
+MESSAGE_CACHE_SIZE = 8
+
+# Rate limiter of the API call running in the current task (the HTTP pool is shared by all models of a host)
+_active_rate_limiter: ContextVar[Any] = ContextVar("active_rate_limiter", default=None)
+
+
+async def _observe_rate_limit_headers(response: Any):
+    """HTTP client response hook: apply headers to the limiter of the request's own model"""
+    limiter = _active_rate_limiter.get()
+    if limiter is not None:
+        limiter.update_from_headers(response.headers)
+
+
+class MessageConversionCache:
+    """API-format conversion of one conversation history.
+
+    Messages are tracked by identity and treated as immutable once sent, like
+    the Agent's token cache. Appending to the history only converts the new
+    messages; if the history was rewritten (e.g. summarization), the converted
+    entries of the longest unchanged prefix are kept and the rest is rebuilt.
+    """
+
+    def __init__(self, convert: Callable[[Message], dict[str, Any] | None]):
+        """Initialize cache.
+
+        Args:
+            convert: Converts one message to an API dict (None if it has no entry, e.g. a separate system prompt)
+        """
+        self._convert = convert
+        self.messages: list[Message] = []
+        self.api_messages: list[dict[str, Any]] = []
+        self.system_message: str | None = None
+        # len(api_messages) after converting each message
+        self._ends: list[int] = []
+
+    def sync(self, messages: list[Message]):
+        """Bring the converted history in line with messages.
+
+        Args:
+            messages: Current conversation history
+        """
+        cached = self.messages
+        if cached and len(messages) >= len(cached) and messages[len(cached) - 1] is cached[-1]:
+            # Append-only history: O(1) check
+            prefix = len(cached)
+        else:
+            prefix = 0
+            for msg, cached_msg in zip(messages, cached):
+                if msg is not cached_msg:
+                    break
+                prefix += 1
+            self._truncate(prefix)
+
+        for msg in messages[prefix:]:
+            if msg.role == "system":
+                self.system_message = msg.content
+            converted = self._convert(msg)
+            if converted is not None:
+                self.api_messages.append(converted)
+            self.messages.append(msg)
+            self._ends.append(len(self.api_messages))
+
+    def _truncate(self, length: int):
+        """Drop converted entries of all messages from index length on"""
+        del self.messages[length:]
+        del self._ends[length:]
+        del self.api_messages[self._ends[-1] if self._ends else 0 :]
+        self.system_message = next((msg.content for msg in reversed(self.messages) if msg.role == "system"), None)
 
 
 class LLMClientBase(ABC):
@@ -20,6 +95,9 @@ class LLMClientBase(ABC):
         api_base: str,
         model: str,
         retry_config: RetryConfig | None = None,
+        transport_config: TransportConfig | None = None,
+        rate_limit_config: RateLimitConfig | None = None,
+        response_cache: ResponseCache | None = None,
     ):
         """Initialize the LLM client.
 
@@ -28,15 +106,29 @@ class LLMClientBase(ABC):
             api_base: Base URL for the API
             model: Model name to use
             retry_config: Optional retry configuration
+            transport_config: Optional shared HTTP connection pool configuration
+            rate_limit_config: Optional client-side rate limits, shared by all clients of the same model endpoint
+            response_cache: Optional cache answering repeated identical requests
         """
         self.api_key = api_key
         self.api_base = api_base
         self.model = model
         self.retry_config = retry_config or RetryConfig()
+        self.transport_config = transport_config or TransportConfig()
+        self.response_cache = response_cache
+
+        # Shared pooled HTTP client, set by subclasses
+        self.http_client = None
+
+        # Shared rate limiter for this model endpoint
+        self.rate_limiter = rate_limiters.get(type(self).__name__, api_base, model, rate_limit_config)
 
         # Callback for tracking retry count
         self.retry_callback = None
 
+        # Converted message histories, keyed by identity of their first message
+        self._message_caches: OrderedDict[int, MessageConversionCache] = OrderedDict()
+
     @abstractmethod
     async def generate(
         self,
@@ -54,6 +146,135 @@ class LLMClientBase(ABC):
         """
         pass
 
+    async def stream(
+        self,
+        messages: list[Message],
+        tools: list[Any] | None = None,
+    ) -> AsyncIterator[LLMStreamEvent]:
+        """Stream response from LLM.
+
+        Yields "thinking" and "text" deltas as they arrive, a "tool_use" event for
+        each completed tool call, and finally a "done" event carrying the assembled
+        LLMResponse. The default implementation falls back to generate() and emits
+        the whole response at once; clients with native streaming override it.
+
+        Args:
+            messages: List of conversation messages
+            tools: Optional list of Tool objects or dicts
+
+        Yields:
+            LLMStreamEvent objects, ending with a "done" event
+        """
+        response = await self.generate(messages, tools)
+        for event in self._response_events(response):
+            yield event
+
+    @staticmethod
+    def _response_events(response: LLMResponse) -> list[LLMStreamEvent]:
+        """Stream events emitting a complete response at once"""
+        events = []
+        if response.thinking:
+            events.append(LLMStreamEvent(type="thinking", delta=response.thinking))
+        if response.content:
+            events.append(LLMStreamEvent(type="text", delta=response.content))
+        for tool_call in response.tool_calls or []:
+            events.append(LLMStreamEvent(type="tool_use", tool_call=tool_call))
+        events.append(LLMStreamEvent(type="done", response=response))
+        return events
+
+    @abstractmethod
+    def _request_payload(self, request_params: dict[str, Any]) -> dict[str, Any]:
+        """Build the API request parameters for a prepared request (used as response cache key).
+
+        Args:
+            request_params: Result of _prepare_request()
+
+        Returns:
+            Parameters as sent to the API
+        """
+        pass
+
+    def _lookup_response_cache(self, request_params: dict[str, Any]) -> tuple[str | None, LLMResponse | None]:
+        """Look up a prepared request in the response cache.
+
+        Args:
+            request_params: Result of _prepare_request()
+
+        Returns:
+            Tuple of (cache key or None if caching is off, cached response or None)
+
+        Raises:
+            ResponseCacheMissError: Request not cached and the cache is in replay mode
+        """
+        if self.response_cache is None:
+            return None, None
+        key = response_cache_key(type(self).__name__, self._request_payload(request_params))
+        return key, self.response_cache.lookup(key)
+
+    def _store_response(self, cache_key: str | None, response: LLMResponse):
+        """Store an API response under the key from _lookup_response_cache()"""
+        if cache_key is not None:
+            self.response_cache.store(cache_key, response)
+
+    def _observe_rate_limit_headers(self):
+        """Feed rate-limit headers of this client's responses to its rate limiter.
+
+        The hook is installed once per shared HTTP client; it applies a response
+        to the limiter of the API call that sent the request (see _call_api), so
+        one model's 429 does not throttle another model on the same host.
+        """
+        hooks = self.http_client.event_hooks["response"]
+        if _observe_rate_limit_headers not in hooks:
+            hooks.append(_observe_rate_limit_headers)
+
+    async def _call_api(self, make_request: Callable[..., Awaitable[Any]], *args: Any, estimated_tokens: int = 0) -> Any:
+        """Run an API request through the rate limiter and the retry policy.
+
+        Every attempt waits for request/token budget first. Rate-limit headers of
+        failed attempts (e.g. Retry-After on 429) pause all clients sharing the limiter.
+
+        Args:
+            make_request: Core request method (_make_api_request or _make_stream_request)
+            *args: Arguments for make_request
+            estimated_tokens: Estimated tokens of the request
+
+        Returns:
+            Result of make_request
+        """
+
+        async def attempt(*call_args: Any) -> Any:
+            await self.rate_limiter.acquire(estimated_tokens)
+            active = _active_rate_limiter.set(self.rate_limiter)
+            try:
+                return await make_request(*call_args)
+            except Exception as e:
+                headers = getattr(getattr(e, "response", None), "headers", None)
+                if headers:
+                    self.rate_limiter.update_from_headers(headers)
+                raise
+            finally:
+                _active_rate_limiter.reset(active)
+
+        attempt.__name__ = make_request.__name__
+        if self.retry_config.enabled:
+            attempt = async_retry(config=self.retry_config, on_retry=self.retry_callback)(attempt)
+        return await attempt(*args)
+
+    def _record_usage(self, estimated_tokens: int, usage: TokenUsage | None):
+        """Correct the rate limiter's token budget with the reported usage"""
+        if usage is not None:
+            self.rate_limiter.record_usage(estimated_tokens, usage.total_tokens - usage.cache_read_input_tokens)
+
+    async def prewarm(self) -> bool:
+        """Open a pooled connection to the API so the first request skips the handshake.
+
+        Returns:
+            True if the API host answered
+        """
+        if self.http_client is None:
+            return False
+        return await TransportRegistry.prewarm(self.http_client, self.api_base, self.transport_config.connect_timeout)
+
     @abstractmethod
     def _prepare_request(
         self,
@@ -71,6 +292,46 @@ class LLMClientBase(ABC):
         """
         pass
 
+    @abstractmethod
+    def _convert_message(self, msg: Message) -> dict[str, Any] | None:
+        """Convert a single message to API-specific format.
+
+        Used by _sync_message_cache(), which _convert_messages() implementations build on.
+
+        Args:
+            msg: Internal Message object
+
+        Returns:
+            Message in API format, or None if the message has no entry in the message list
+        """
+        pass
+
+    def _sync_message_cache(self, messages: list[Message]) -> MessageConversionCache:
+        """Get the conversion cache for a history and convert messages added since the last request.
+
+        Histories are told apart by their first (system) message, so several
+        sessions sharing one client each keep their own cache.
+
+        Args:
+            messages: List of internal Message objects
+
+        Returns:
+            Up-to-date cache; its api_messages list must not be modified
+        """
+        # The cache references messages[0], so its id cannot be reused while cached
+        key = id(messages[0]) if messages else 0
+        cache = self._message_caches.get(key)
+        if cache is None:
+            cache = MessageConversionCache(self._convert_message)
+            self._message_caches[key] = cache
+            if len(self._message_caches) > MESSAGE_CACHE_SIZE:
+                self._message_caches.popitem(last=False)
+        else:
+            self._message_caches.move_to_end(key)
+
+        cache.sync(messages)
+        return cache
+
     @abstractmethod
     def _convert_messages(self, messages: list[Message]) -> tuple[str | None, list[dict[str, Any]]]:
         """Convert internal message format to API-specific format.
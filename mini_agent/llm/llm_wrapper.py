@@ -4,13 +4,16 @@ This module provides a unified interface for different LLM providers
 (Anthropic and OpenAI) through a single LLMClient class.
 """
 
+import contextlib
 import logging
+from typing import AsyncIterator
 
 from ..retry import RetryConfig
-from ..schema import LLMProvider, LLMResponse, Message
-from .anthropic_client import AnthropicClient
+from ..schema import LLMProvider, LLMResponse, LLMStreamEvent, Message
 from .base import LLMClientBase
-from .openai_client import OpenAIClient
+from .rate_limit import RateLimitConfig
+from .response_cache import ResponseCache
+from .transport import TransportConfig
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +37,10 @@ class LLMClient:
         api_base: str = "https://api.minimaxi.com",
         model: str = "MiniMax-M2",
         retry_config: RetryConfig | None = None,
+        prompt_caching: bool = True,
+        transport_config: TransportConfig | None = None,
+        rate_limit_config: RateLimitConfig | None = None,
+        response_cache: ResponseCache | None = None,
     ):
         """Initialize LLM client with specified provider.
 
@@ -44,11 +51,14 @@ class LLMClient:
                      Will be automatically suffixed with /anthropic or /v1 based on provider
             model: Model name to use
             retry_config: Optional retry configuration
+            prompt_caching: Enable automatic prompt cache breakpoints (anthropic provider only)
+            transport_config: Optional shared HTTP connection pool configuration
+            rate_limit_config: Optional client-side rate limits (shared per provider, api_base and model)
+            response_cache: Optional cache answering repeated identical requests (can be shared by several clients)
         """
         self.provider = provider
         self.api_key = api_key
         self.model = model
-        self.retry_config = retry_config or RetryConfig()
 
         # for backward compatibility
         api_base = api_base.replace("/anthropic", "")
@@ -65,25 +75,57 @@ class LLMClient:
 
         # Instantiate the appropriate client
         self._client: LLMClientBase
+        # Client modules are imported here so only the selected provider's SDK is loaded
         if provider == LLMProvider.ANTHROPIC:
+            from .anthropic_client import AnthropicClient
+
             self._client = AnthropicClient(
                 api_key=api_key,
                 api_base=full_api_base,
                 model=model,
                 retry_config=retry_config,
+                prompt_caching=prompt_caching,
+                transport_config=transport_config,
+                rate_limit_config=rate_limit_config,
+                response_cache=response_cache,
             )
         elif provider == LLMProvider.OPENAI:
+            from .openai_client import OpenAIClient
+
             self._client = OpenAIClient(
                 api_key=api_key,
                 api_base=full_api_base,
                 model=model,
                 retry_config=retry_config,
+                transport_config=transport_config,
+                rate_limit_config=rate_limit_config,
+                response_cache=response_cache,
             )
         else:
             raise ValueError(f"Unsupported provider: {provider}")
 
         logger.info("Initialized LLM client with provider: %s, api_base: %s", provider, full_api_base)
 
+    @property
+    def rate_limiter(self):
+        """Get the shared rate limiter of the underlying client."""
+        return self._client.rate_limiter
+
+    @property
+    def response_cache(self):
+        """Get the response cache of the underlying client (None if disabled)."""
+        return self._client.response_cache
+
+    @property
+    def retry_config(self) -> RetryConfig:
+        """Get retry configuration of the underlying client."""
+        return self._client.retry_config
+
+    @retry_config.setter
+    def retry_config(self, value: RetryConfig):
+        """Set retry configuration of the underlying client."""
+        self._client.retry_config = value
+
     @property
     def retry_callback(self):
         """Get retry callback."""
@@ -94,6 +136,14 @@ class LLMClient:
         """Set retry callback."""
         self._client.retry_callback = value
 
+    async def prewarm(self) -> bool:
+        """Open a pooled connection to the API ahead of the first request.
+
+        Returns:
+            True if the API host answered
+        """
+        return await self._client.prewarm()
+
     async def generate(
         self,
         messages: list[Message],
@@ -109,3 +159,21 @@ class LLMClient:
             LLMResponse containing the generated content
         """
         return await self._client.generate(messages, tools)
+
+    async def stream(
+        self,
+        messages: list[Message],
+        tools: list | None = None,
+    ) -> AsyncIterator[LLMStreamEvent]:
+        """Stream response from LLM.
+
+        Args:
+            messages: List of conversation messages
+            tools: Optional list of Tool objects or dicts
+
+        Yields:
+            LLMStreamEvent objects, ending with a "done" event carrying the LLMResponse
+        """
+        async with contextlib.aclosing(self._client.stream(messages, tools)) as events:
+            async for event in events:
+                yield event
@@ -1,14 +1,20 @@
 """OpenAI LLM client implementation."""
 
+import contextlib
 import json
 import logging
-from typing import Any
+from typing import Any, AsyncIterator
 
+import openai
 from openai import AsyncOpenAI
 
-from ..retry import RetryConfig, async_retry
-from ..schema import FunctionCall, LLMResponse, Message, TokenUsage, ToolCall
+from ..retry import RetryConfig
+from ..schema import FunctionCall, LLMProvider, LLMResponse, LLMStreamEvent, Message, TokenUsage, ToolCall
+from ..tools.registry import ToolRegistry
 from .base import LLMClientBase
+from .rate_limit import RateLimitConfig, estimate_request_tokens
+from .response_cache import ResponseCache
+from .transport import TransportConfig, transport_registry
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +34,9 @@ class OpenAIClient(LLMClientBase):
         api_base: str = "https://api.minimaxi.com/v1",
         model: str = "MiniMax-M2",
         retry_config: RetryConfig | None = None,
+        transport_config: TransportConfig | None = None,
+        rate_limit_config: RateLimitConfig | None = None,
+        response_cache: ResponseCache | None = None,
     ):
         """Initialize OpenAI client.
 
@@ -36,14 +45,21 @@ class OpenAIClient(LLMClientBase):
             api_base: Base URL for the API (default: MiniMax OpenAI endpoint)
             model: Model name to use (default: MiniMax-M2)
             retry_config: Optional retry configuration
+            transport_config: Optional shared HTTP connection pool configuration
+            rate_limit_config: Optional client-side rate limits
+            response_cache: Optional cache answering repeated identical requests
         """
-        super().__init__(api_key, api_base, model, retry_config)
+        super().__init__(api_key, api_base, model, retry_config, transport_config, rate_limit_config, response_cache)
 
-        # Initialize OpenAI client
+        # Initialize OpenAI client on the shared connection pool
+        self.http_client = transport_registry.get_http_client(openai, api_base, self.transport_config)
         self.client = AsyncOpenAI(
             api_key=api_key,
             base_url=api_base,
+            http_client=self.http_client,
+            max_retries=0,  # Retries are handled by _call_api
         )
+        self._observe_rate_limit_headers()
 
     async def _make_api_request(
         self,
@@ -62,6 +78,54 @@ class OpenAIClient(LLMClientBase):
         Raises:
             Exception: API call failed
         """
+        params = self._build_params(api_messages, tools)
+
+        # Use OpenAI SDK's chat.completions.create
+        response = await self.client.chat.completions.create(**params)
+        # Return full response to access usage info
+        return response
+
+    async def _make_stream_request(
+        self,
+        api_messages: list[dict[str, Any]],
+        tools: list[Any] | None = None,
+    ) -> Any:
+        """Open a streaming API request (core method that can be retried).
+
+        Only opening the stream is retried; once chunks are flowing a failure
+        is raised to the caller, since partial output has already been emitted.
+
+        Args:
+            api_messages: List of messages in OpenAI format
+            tools: Optional list of tools
+
+        Returns:
+            OpenAI async stream of ChatCompletionChunk objects
+
+        Raises:
+            Exception: API call failed
+        """
+        params = self._build_params(api_messages, tools)
+        return await self.client.chat.completions.create(
+            **params,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+
+    def _build_params(
+        self,
+        api_messages: list[dict[str, Any]],
+        tools: list[Any] | None = None,
+    ) -> dict[str, Any]:
+        """Build keyword arguments for chat.completions.create.
+
+        Args:
+            api_messages: List of messages in OpenAI format
+            tools: Optional list of tools
+
+        Returns:
+            Request parameters
+        """
         params = {
             "model": self.model,
             "messages": api_messages,
@@ -72,20 +136,23 @@ class OpenAIClient(LLMClientBase):
         if tools:
             params["tools"] = self._convert_tools(tools)
 
-        # Use OpenAI SDK's chat.completions.create
-        response = await self.client.chat.completions.create(**params)
-        # Return full response to access usage info
-        return response
+        return params
 
-    def _convert_tools(self, tools: list[Any]) -> list[dict[str, Any]]:
+    def _convert_tools(self, tools: list[Any] | ToolRegistry) -> list[dict[str, Any]] | tuple[dict[str, Any], ...]:
         """Convert tools to OpenAI format.
 
+        A ToolRegistry returns its memoized schemas, which are only rebuilt when
+        the registry changes.
+
         Args:
-            tools: List of Tool objects or dicts
+            tools: ToolRegistry, or list of Tool objects or dicts
 
         Returns:
             List of tools in OpenAI dict format
         """
+        if isinstance(tools, ToolRegistry):
+            return tools.get_schemas(LLMProvider.OPENAI)
+
         result = []
         for tool in tools:
             if isinstance(tool, dict):
@@ -111,9 +178,74 @@ class OpenAIClient(LLMClientBase):
                 raise TypeError(f"Unsupported tool type: {type(tool)}")
         return result
 
+    def _convert_message(self, msg: Message) -> dict[str, Any] | None:
+        """Convert a single internal message to OpenAI format.
+
+        Args:
+            msg: Internal Message object
+
+        Returns:
+            Message in OpenAI format
+        """
+        if msg.role == "system":
+            # OpenAI includes system message in messages array
+            return {"role": "system", "content": msg.content}
+
+        # For user messages
+        if msg.role == "user":
+            return {"role": "user", "content": msg.content}
+
+        # For assistant messages
+        if msg.role == "assistant":
+            assistant_msg = {"role": "assistant"}
+
+            # Add content if present
+            if msg.content:
+                assistant_msg["content"] = msg.content
+
+            # Add tool calls if present
+            if msg.tool_calls:
+                tool_calls_list = []
+                for tool_call in msg.tool_calls:
+                    tool_calls_list.append(
+                        {
+                            "id": tool_call.id,
+                            "type": "function",
+                            "function": {
+                                "name": tool_call.function.name,
+                                "arguments": json.dumps(tool_call.function.arguments),
+                            },
+                        }
+                    )
+                assistant_msg["tool_calls"] = tool_calls_list
+
+            # IMPORTANT: Add reasoning_details if thinking is present
+            # This is CRITICAL for Interleaved Thinking to work properly!
+            # The complete response_message (including reasoning_details) must be
+            # preserved in Message History and passed back to the model in the next turn.
+            # This ensures the model's chain of thought is not interrupted.
+            if msg.thinking:
+                assistant_msg["reasoning_details"] = [{"text": msg.thinking}]
+
+            return assistant_msg
+
+        # For tool result messages
+        if msg.role == "tool":
+            return {
+                "role": "tool",
+                "tool_call_id": msg.tool_call_id,
+                "content": msg.content,
+            }
+
+        return None
+
     def _convert_messages(self, messages: list[Message]) -> tuple[str | None, list[dict[str, Any]]]:
         """Convert internal messages to OpenAI format.
 
+        Only messages appended since the previous request of the same history are
+        converted (including json.dumps of tool call arguments); the rest comes
+        from the client's message conversion cache.
+
         Args:
             messages: List of internal Message objects
 
@@ -121,63 +253,12 @@ class OpenAIClient(LLMClientBase):
             Tuple of (system_message, api_messages)
             Note: OpenAI includes system message in the messages array
         """
-        api_messages = []
+        cache = self._sync_message_cache(messages)
+        return None, list(cache.api_messages)
 
-        for msg in messages:
-            if msg.role == "system":
-                # OpenAI includes system message in messages array
-                api_messages.append({"role": "system", "content": msg.content})
-                continue
-
-            # For user messages
-            if msg.role == "user":
-                api_messages.append({"role": "user", "content": msg.content})
-
-            # For assistant messages
-            elif msg.role == "assistant":
-                assistant_msg = {"role": "assistant"}
-
-                # Add content if present
-                if msg.content:
-                    assistant_msg["content"] = msg.content
-
-                # Add tool calls if present
-                if msg.tool_calls:
-                    tool_calls_list = []
-                    for tool_call in msg.tool_calls:
-                        tool_calls_list.append(
-                            {
-                                "id": tool_call.id,
-                                "type": "function",
-                                "function": {
-                                    "name": tool_call.function.name,
-                                    "arguments": json.dumps(tool_call.function.arguments),
-                                },
-                            }
-                        )
-                    assistant_msg["tool_calls"] = tool_calls_list
-
-                # IMPORTANT: Add reasoning_details if thinking is present
-                # This is CRITICAL for Interleaved Thinking to work properly!
-                # The complete response_message (including reasoning_details) must be
-                # preserved in Message History and passed back to the model in the next turn.
-                # This ensures the model's chain of thought is not interrupted.
-                if msg.thinking:
-                    assistant_msg["reasoning_details"] = [{"text": msg.thinking}]
-
-                api_messages.append(assistant_msg)
-
-            # For tool result messages
-            elif msg.role == "tool":
-                api_messages.append(
-                    {
-                        "role": "tool",
-                        "tool_call_id": msg.tool_call_id,
-                        "content": msg.content,
-                    }
-                )
-
-        return None, api_messages
+    def _request_payload(self, request_params: dict[str, Any]) -> dict[str, Any]:
+        """Build chat.completions.create parameters for a prepared request (response cache key)."""
+        return self._build_params(request_params["api_messages"], request_params["tools"])
 
     def _prepare_request(
         self,
@@ -274,22 +355,149 @@ class OpenAIClient(LLMClientBase):
         """
         # Prepare request
         request_params = self._prepare_request(messages, tools)
-
-        # Make API request with retry logic
-        if self.retry_config.enabled:
-            # Apply retry logic
-            retry_decorator = async_retry(config=self.retry_config, on_retry=self.retry_callback)
-            api_call = retry_decorator(self._make_api_request)
-            response = await api_call(
+        cache_key, cached_response = self._lookup_response_cache(request_params)
+        if cached_response is not None:
+            return cached_response
+        estimated_tokens = estimate_request_tokens(messages)
+
+        # Make API request with rate limiting and retry logic
+        async with self.rate_limiter.slot():
+            response = await self._call_api(
+                self._make_api_request,
                 request_params["api_messages"],
                 request_params["tools"],
+                estimated_tokens=estimated_tokens,
             )
-        else:
-            # Don't use retry
-            response = await self._make_api_request(
+
+        # Parse and return response
+        result = self._parse_response(response)
+        self._record_usage(estimated_tokens, result.usage)
+        self._store_response(cache_key, result)
+        return result
+
+    async def stream(
+        self,
+        messages: list[Message],
+        tools: list[Any] | None = None,
+    ) -> AsyncIterator[LLMStreamEvent]:
+        """Stream response from OpenAI LLM.
+
+        Args:
+            messages: List of conversation messages
+            tools: Optional list of available tools
+
+        Yields:
+            LLMStreamEvent objects, ending with a "done" event carrying the LLMResponse
+        """
+        request_params = self._prepare_request(messages, tools)
+        cache_key, cached_response = self._lookup_response_cache(request_params)
+        if cached_response is not None:
+            for event in self._response_events(cached_response):
+                yield event
+            return
+        estimated_tokens = estimate_request_tokens(messages)
+
+        # The in-flight slot is held until the stream is fully read
+        async with self.rate_limiter.slot():
+            stream = await self._call_api(
+                self._make_stream_request,
                 request_params["api_messages"],
                 request_params["tools"],
+                estimated_tokens=estimated_tokens,
             )
+            # Release the connection even if the caller stops reading early
+            try:
+                async with contextlib.aclosing(self._read_stream(stream)) as events:
+                    async for event in events:
+                        if event.type == "done":
+                            self._record_usage(estimated_tokens, event.response.usage)
+                            self._store_response(cache_key, event.response)
+                        yield event
+            finally:
+                await stream.close()
+
+    async def _read_stream(self, stream: Any) -> AsyncIterator[LLMStreamEvent]:
+        """Turn OpenAI chat completion chunks into LLMStreamEvents.
 
-        # Parse and return response
-        return self._parse_response(response)
+        Args:
+            stream: OpenAI async stream of ChatCompletionChunk objects
+
+        Yields:
+            LLMStreamEvent objects, ending with a "done" event carrying the LLMResponse
+        """
+        text_content = ""
+        thinking_content = ""
+        # Tool calls by index, accumulated from argument fragments
+        tool_call_parts: dict[int, dict[str, str]] = {}
+        finish_reason = None
+        usage = None
+
+        async for chunk in stream:
+            if getattr(chunk, "usage", None):
+                usage = TokenUsage(
+                    prompt_tokens=chunk.usage.prompt_tokens or 0,
+                    completion_tokens=chunk.usage.completion_tokens or 0,
+                    total_tokens=chunk.usage.total_tokens or 0,
+                )
+
+            if not chunk.choices:
+                continue
+
+            choice = chunk.choices[0]
+            delta = choice.delta
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+            if delta is None:
+                continue
+
+            # reasoning_details may carry either the accumulated reasoning so far or a plain delta
+            for detail in getattr(delta, "reasoning_details", None) or []:
+                text = detail.get("text") if isinstance(detail, dict) else getattr(detail, "text", None)
+                if not text:
+                    continue
+                if text.startswith(thinking_content):
+                    new_thinking = text[len(thinking_content) :]
+                    thinking_content = text
+                else:
+                    new_thinking = text
+                    thinking_content += text
+                if new_thinking:
+                    yield LLMStreamEvent(type="thinking", delta=new_thinking)
+
+            if delta.content:
+                text_content += delta.content
+                yield LLMStreamEvent(type="text", delta=delta.content)
+
+            for tool_call_delta in delta.tool_calls or []:
+                part = tool_call_parts.setdefault(tool_call_delta.index, {"id": "", "name": "", "arguments": ""})
+                if tool_call_delta.id:
+                    part["id"] = tool_call_delta.id
+                function = tool_call_delta.function
+                if function is not None:
+                    if function.name:
+                        part["name"] = function.name
+                    if function.arguments:
+                        part["arguments"] += function.arguments
+
+        tool_calls = []
+        for index in sorted(tool_call_parts):
+            part = tool_call_parts[index]
+            tool_call = ToolCall(
+                id=part["id"],
+                type="function",
+                function=FunctionCall(
+                    name=part["name"],
+                    arguments=json.loads(part["arguments"]) if part["arguments"] else {},
+                ),
+            )
+            tool_calls.append(tool_call)
+            yield LLMStreamEvent(type="tool_use", tool_call=tool_call)
+
+        response = LLMResponse(
+            content=text_content,
+            thinking=thinking_content if thinking_content else None,
+            tool_calls=tool_calls if tool_calls else None,
+            finish_reason=finish_reason or "stop",
+            usage=usage,
+        )
+        yield LLMStreamEvent(type="done", response=response)
@@ -0,0 +1,285 @@
+"""Client-side rate limiting for LLM calls.
+
+All clients of one provider, api_base and model share a RateLimiter, so several
+agents or ACP sessions in one process stay within the account's budget instead
+of all running into 429 errors and retrying at once. The limiter enforces:
+- Requests per minute and tokens per minute (token buckets)
+- A cap on in-flight requests
+- Pauses requested by the server (Retry-After, exhausted rate-limit headers)
+
+Callers waiting for budget are served in arrival order.
+"""
+
+import asyncio
+import re
+import time
+import weakref
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncIterator, Mapping
+
+from ..retry import parse_retry_after
+from ..schema import Message
+from ..utils.token_utils import ESTIMATED_CHARS_PER_TOKEN
+
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+class RateLimitConfig:
+    """Rate limit configuration (None disables a limit)"""
+
+    def __init__(
+        self,
+        requests_per_minute: int | None = None,
+        tokens_per_minute: int | None = None,
+        max_concurrent_requests: int | None = None,
+    ):
+        """
+        Args:
+            requests_per_minute: Maximum requests started per minute
+            tokens_per_minute: Maximum input + output tokens per minute
+            max_concurrent_requests: Maximum requests in flight at the same time
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_concurrent_requests = max_concurrent_requests
+
+
+class _TokenBucket:
+    """Token bucket refilled continuously up to a per-minute capacity"""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self.rate = per_minute / 60.0
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until amount is available (requests larger than the capacity wait for a full bucket)"""
+        self._refill(now)
+        needed = min(amount, self.capacity)
+        if self.level >= needed:
+            return 0.0
+        return (needed - self.level) / self.rate
+
+    def consume(self, amount: float):
+        # May go negative: oversized requests are paid back before the next one starts
+        self.level -= amount
+
+    def limit(self, remaining: float, now: float):
+        """Lower the level to a server-reported remaining budget"""
+        self._refill(now)
+        self.level = min(self.level, remaining)
+
+
+def estimate_request_tokens(messages: list[Message]) -> int:
+    """Estimate the input tokens of a request from its message sizes.
+
+    Args:
+        messages: Messages of the request
+
+    Returns:
+        Estimated token count
+    """
+    chars = 0
+    for msg in messages:
+        content = msg.content
+        chars += len(content) if isinstance(content, str) else sum(len(str(block)) for block in content)
+        if msg.thinking:
+            chars += len(msg.thinking)
+    return chars // ESTIMATED_CHARS_PER_TOKEN
+
+
+def _parse_reset(value: str | None) -> float | None:
+    """Parse a rate-limit reset header into seconds from now.
+
+    Supports RFC 3339 timestamps (Anthropic) and durations like "6m0s" or "20ms" (OpenAI).
+    """
+    if not value:
+        return None
+    try:
+        reset_at = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        return max(0.0, reset_at.timestamp() - time.time())
+    except ValueError:
+        pass
+    parts = _DURATION_RE.findall(value)
+    if not parts:
+        return None
+    return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+
+
+def _parse_int(value: str | None) -> int | None:
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class RateLimiter:
+    """Shared request/token budget and concurrency limit for one model endpoint"""
+
+    def __init__(self, config: RateLimitConfig | None = None):
+        """Initialize rate limiter.
+
+        Args:
+            config: Limits to enforce (default: none, only server-requested pauses)
+        """
+        self.config = config or RateLimitConfig()
+        self._requests = _TokenBucket(self.config.requests_per_minute) if self.config.requests_per_minute else None
+        self._tokens = _TokenBucket(self.config.tokens_per_minute) if self.config.tokens_per_minute else None
+        self._semaphore = asyncio.Semaphore(self.config.max_concurrent_requests) if self.config.max_concurrent_requests else None
+        # Held while waiting for budget, so waiters are served in arrival order
+        self._queue_lock = asyncio.Lock()
+        self._paused_until = 0.0
+
+        self.total_requests = 0
+        self.total_wait_time = 0.0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one of the in-flight request slots (for a whole call, including streaming)"""
+        if self._semaphore is None:
+            yield
+            return
+        async with self._semaphore:
+            yield
+
+    async def acquire(self, tokens: int = 0):
+        """Wait until one request with the given token estimate fits the budget, then consume it.
+
+        Args:
+            tokens: Estimated tokens of the request
+        """
+        async with self._queue_lock:
+            start = time.monotonic()
+            while True:
+                now = time.monotonic()
+                wait = self._paused_until - now
+                if self._requests is not None:
+                    wait = max(wait, self._requests.wait_time(1, now))
+                if self._tokens is not None:
+                    wait = max(wait, self._tokens.wait_time(tokens, now))
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+
+            if self._requests is not None:
+                self._requests.consume(1)
+            if self._tokens is not None:
+                self._tokens.consume(tokens)
+            self.total_requests += 1
+            self.total_wait_time += time.monotonic() - start
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: int):
+        """Correct the token budget once the real usage of a request is known.
+
+        Args:
+            estimated_tokens: Estimate passed to acquire()
+            actual_tokens: Tokens reported by the API
+        """
+        if self._tokens is not None:
+            self._tokens.consume(actual_tokens - estimated_tokens)
+
+    def pause(self, seconds: float):
+        """Stop starting new requests for the given time.
+
+        Args:
+            seconds: Pause duration
+        """
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """Apply Retry-After and rate-limit headers of an API response.
+
+        Understands Anthropic (anthropic-ratelimit-*) and OpenAI (x-ratelimit-*) headers:
+        remaining budgets lower the local buckets, and an exhausted budget pauses
+        all callers until its reset time.
+
+        Args:
+            headers: Response headers (case-insensitive mapping)
+        """
+        retry_after = parse_retry_after(headers)
+        if retry_after is not None:
+            self.pause(retry_after)
+
+        now = time.monotonic()
+        for kind, bucket in (("requests", self._requests), ("tokens", self._tokens)):
+            remaining = _parse_int(headers.get(f"anthropic-ratelimit-{kind}-remaining") or headers.get(f"x-ratelimit-remaining-{kind}"))
+            if remaining is None:
+                continue
+            if bucket is not None:
+                bucket.limit(remaining, now)
+            if remaining <= 0:
+                reset = _parse_reset(headers.get(f"anthropic-ratelimit-{kind}-reset") or headers.get(f"x-ratelimit-reset-{kind}"))
+                if reset:
+                    self.pause(reset)
+
+    def stats(self) -> dict[str, Any]:
+        """Get limiter statistics.
+
+        Returns:
+            Dict with total_requests, total_wait_time, paused_for and remaining budgets
+        """
+        now = time.monotonic()
+        stats = {
+            "total_requests": self.total_requests,
+            "total_wait_time": self.total_wait_time,
+            "paused_for": max(0.0, self._paused_until - now),
+            "requests_available": None,
+            "tokens_available": None,
+        }
+        if self._requests is not None:
+            self._requests.wait_time(0, now)
+            stats["requests_available"] = self._requests.level
+        if self._tokens is not None:
+            self._tokens.wait_time(0, now)
+            stats["tokens_available"] = self._tokens.level
+        return stats
+
+
+class RateLimiterRegistry:
+    """Process-wide registry of rate limiters keyed by provider, api_base and model.
+
+    Limiters use asyncio primitives and are kept per event loop, like the
+    shared HTTP clients. The configuration of the first caller is used.
+    """
+
+    def __init__(self):
+        self._loop_limiters: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[tuple[str, str, str], RateLimiter]] = weakref.WeakKeyDictionary()
+        self._unbound_limiters: dict[tuple[str, str, str], RateLimiter] = {}
+
+    def _limiters(self) -> dict[tuple[str, str, str], RateLimiter]:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return self._unbound_limiters
+        return self._loop_limiters.setdefault(loop, {})
+
+    def get(self, provider: str, api_base: str, model: str, config: RateLimitConfig | None = None) -> RateLimiter:
+        """Get the shared limiter for a model endpoint.
+
+        Args:
+            provider: Provider name
+            api_base: API base URL
+            model: Model name
+            config: Limits (used when the limiter is created)
+
+        Returns:
+            RateLimiter instance
+        """
+        limiters = self._limiters()
+        key = (provider, api_base, model)
+        limiter = limiters.get(key)
+        if limiter is None:
+            limiter = RateLimiter(config)
+            limiters[key] = limiter
+        return limiter
+
+
+# Process-wide registry used by the LLM clients
+rate_limiters = RateLimiterRegistry()
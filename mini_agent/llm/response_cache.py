@@ -0,0 +1,208 @@
+"""Content-addressed cache of LLM responses.
+
+Responses are keyed by a SHA-256 hash of the canonical JSON of the full API
+request (client type, model, converted messages, tool schemas and sampling
+parameters), so identical requests are answered without an API call. This
+makes repeated evaluation runs and replays of logged sessions fast and
+deterministic.
+
+Two tiers are used: an in-memory LRU for the current process and an optional
+SQLite file, bounded in size and evicted least-recently-used first.
+
+Modes:
+- readwrite: serve hits from the cache, call the API on misses and store the result
+- record: always call the API and store (overwrite) the result
+- replay: serve hits only; a miss raises ResponseCacheMissError (offline CI runs)
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from ..schema import LLMResponse
+
+RESPONSE_CACHE_MODES = ("readwrite", "record", "replay")
+
+
+class ResponseCacheMissError(Exception):
+    """Request not found in the response cache in replay mode"""
+
+
+def response_cache_key(client_type: str, payload: dict[str, Any]) -> str:
+    """Compute the cache key of an API request.
+
+    Args:
+        client_type: Name of the client class (the API protocol)
+        payload: Request parameters as sent to the API
+
+    Returns:
+        Hex SHA-256 digest of the canonical request JSON
+    """
+    canonical = json.dumps([client_type, payload], sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Two-tier (memory + SQLite) LLM response cache, shared by several clients"""
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        mode: str = "readwrite",
+        memory_entries: int = 256,
+        max_size_mb: float = 512.0,
+    ):
+        """Initialize response cache.
+
+        Args:
+            path: SQLite database file (None: in-memory tier only)
+            mode: "readwrite", "record" or "replay"
+            memory_entries: Responses kept in the in-memory LRU
+            max_size_mb: Maximum size of the stored responses in the database
+        """
+        if mode not in RESPONSE_CACHE_MODES:
+            raise ValueError(f"Unsupported response cache mode: {mode} (expected one of {', '.join(RESPONSE_CACHE_MODES)})")
+
+        self.mode = mode
+        self.memory_entries = memory_entries
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self._memory: OrderedDict[str, LLMResponse] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.stores = 0
+        self.evictions = 0
+
+        self.path = Path(path).expanduser() if path is not None else None
+        self._db: sqlite3.Connection | None = None
+        self._disk_bytes = 0
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.path), isolation_level=None, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT NOT NULL, size INTEGER NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+            self._disk_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def lookup(self, key: str) -> LLMResponse | None:
+        """Get the cached response for a request, following the cache mode.
+
+        Args:
+            key: Request key from response_cache_key()
+
+        Returns:
+            Copy of the cached response, or None if the API should be called
+
+        Raises:
+            ResponseCacheMissError: Request not cached in replay mode
+        """
+        if self.mode == "record":
+            return None
+
+        response = self.get(key)
+        if response is None and self.mode == "replay":
+            raise ResponseCacheMissError(f"No cached response for request {key[:16]} (response cache in replay mode)")
+        return response
+
+    def get(self, key: str) -> LLMResponse | None:
+        """Get a cached response from memory or disk.
+
+        Args:
+            key: Request key
+
+        Returns:
+            Copy of the cached response, or None
+        """
+        response = self._memory.get(key)
+        if response is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            self.memory_hits += 1
+            return response.model_copy(deep=True)
+
+        if self._db is not None:
+            row = self._db.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+                response = LLMResponse.model_validate_json(row[0])
+                self._remember(key, response)
+                self.hits += 1
+                self.disk_hits += 1
+                return response.model_copy(deep=True)
+
+        self.misses += 1
+        return None
+
+    def store(self, key: str, response: LLMResponse):
+        """Store the response of a request.
+
+        Args:
+            key: Request key
+            response: Response returned by the API
+        """
+        response = response.model_copy(deep=True)
+        self._remember(key, response)
+        self.stores += 1
+
+        if self._db is not None:
+            data = response.model_dump_json()
+            size = len(data.encode("utf-8"))
+            now = time.time()
+            previous = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)", (key, data, size, now, now))
+            self._disk_bytes += size - (previous[0] if previous else 0)
+            self._evict()
+
+    def _remember(self, key: str, response: LLMResponse):
+        """Put a response into the in-memory LRU"""
+        self._memory[key] = response
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self):
+        """Delete least recently used responses until the database fits max_bytes"""
+        while self._disk_bytes > self.max_bytes:
+            rows = self._db.execute("SELECT key, size FROM responses ORDER BY accessed_at LIMIT 64").fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._memory.pop(key, None)
+                self._disk_bytes -= size
+                self.evictions += 1
+                if self._disk_bytes <= self.max_bytes:
+                    break
+
+    def stats(self) -> dict[str, Any]:
+        """Get cache statistics.
+
+        Returns:
+            Dict with mode, hits, misses, memory_hits, disk_hits, stores, evictions, memory_entries and disk_bytes
+        """
+        return {
+            "mode": self.mode,
+            "hits": self.hits,
+            "misses": self.misses,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "memory_entries": len(self._memory),
+            "disk_bytes": self._disk_bytes,
+        }
+
+    def close(self):
+        """Close the database"""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,362 @@
+"""Routing LLM client with failover and hedged requests.
+
+RoutingLLMClient wraps several backends (LLMClient or LLMClientBase instances,
+e.g. the same model over the Anthropic and the OpenAI protocol, or different
+models) behind the generate()/stream() interface used by Agent.
+
+Policies:
+- failover: try backends one after another, ordered by health and latency EWMA
+- hedge: start the best backend; if it has not answered after its p95 latency,
+  start the next one as well and use whichever finishes first
+
+Only transient errors (see is_transient_error) move a request on to the next
+backend; other errors, e.g. an invalid request, are raised right away. When
+all backends failed with transient errors, the whole round is retried under
+retry_config. Backends should therefore not retry on their own (see
+create_routing_client), or a failing backend would exhaust its retries before
+the router can fail over.
+
+Backends that fail repeatedly are skipped for a cool-down period.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from typing import Any, AsyncIterator
+
+from ..retry import RetryConfig, async_retry, is_transient_error
+from ..schema import LLMResponse, LLMStreamEvent, Message
+
+logger = logging.getLogger(__name__)
+
+ROUTING_POLICIES = ("failover", "hedge")
+
+
+class _LatencyStats:
+    """Latency EWMA and recent samples of one backend and request kind"""
+
+    def __init__(self, alpha: float, window: int):
+        self.alpha = alpha
+        self.ewma: float | None = None
+        self.samples: deque[float] = deque(maxlen=window)
+
+    def record(self, latency: float):
+        self.ewma = latency if self.ewma is None else self.alpha * latency + (1 - self.alpha) * self.ewma
+        self.samples.append(latency)
+
+    def p95(self) -> float:
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, math.ceil(0.95 * len(ordered)) - 1)]
+
+
+class Backend:
+    """A routed LLM client with its health and latency statistics"""
+
+    def __init__(self, client: Any, name: str, alpha: float, window: int):
+        self.client = client
+        self.name = name
+        self.latency = {"generate": _LatencyStats(alpha, window), "stream": _LatencyStats(alpha, window)}
+        self.consecutive_failures = 0
+        self.unhealthy_until = 0.0
+        self.total_requests = 0
+        self.total_failures = 0
+
+    def is_healthy(self, now: float) -> bool:
+        return now >= self.unhealthy_until
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "healthy": self.is_healthy(time.monotonic()),
+            "requests": self.total_requests,
+            "failures": self.total_failures,
+            "consecutive_failures": self.consecutive_failures,
+            "latency_ewma": {kind: stats.ewma for kind, stats in self.latency.items()},
+        }
+
+
+class RoutingLLMClient:
+    """LLM client routing requests over several backends.
+
+    Streaming requests are hedged and failed over up to their first event: once
+    a backend has started answering, the stream is committed to it.
+    """
+
+    def __init__(
+        self,
+        backends: list[Any],
+        policy: str = "failover",
+        names: list[str] | None = None,
+        hedge_delay: float = 10.0,
+        min_hedge_delay: float = 0.5,
+        min_samples: int = 5,
+        failure_threshold: int = 3,
+        cooldown: float = 30.0,
+        ewma_alpha: float = 0.3,
+        latency_window: int = 50,
+        retry_config: RetryConfig | None = None,
+    ):
+        """Initialize routing client.
+
+        Args:
+            backends: Clients with generate()/stream(), in order of preference
+            policy: "failover" or "hedge"
+            names: Optional backend names for logs and stats (default: "model@api_base")
+            hedge_delay: Hedge delay (seconds) until a backend has min_samples latencies
+            min_hedge_delay: Lower bound for the p95-based hedge delay (seconds)
+            min_samples: Latency samples needed before the p95 is used
+            failure_threshold: Consecutive failures after which a backend is skipped
+            cooldown: Seconds an unhealthy backend is skipped before it is tried again
+            ewma_alpha: Weight of the newest latency in the EWMA
+            latency_window: Number of recent latencies kept for the p95
+            retry_config: Retries of a whole round after every backend failed transiently
+                (default: no retries)
+        """
+        if not backends:
+            raise ValueError("RoutingLLMClient needs at least one backend")
+        if policy not in ROUTING_POLICIES:
+            raise ValueError(f"Unsupported routing policy: {policy} (expected one of {', '.join(ROUTING_POLICIES)})")
+
+        names = names or [f"{getattr(client, 'model', 'llm')}@{getattr(client, 'api_base', i)}" for i, client in enumerate(backends)]
+        self.backends = [Backend(client, name, ewma_alpha, latency_window) for client, name in zip(backends, names)]
+        self.policy = policy
+        self.hedge_delay = hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.min_samples = min_samples
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.retry_config = retry_config
+        self._retry_callback = None
+
+        # Expose the primary backend's identity, like LLMClient
+        self.model = getattr(backends[0], "model", None)
+        self.api_base = getattr(backends[0], "api_base", None)
+
+    @property
+    def response_cache(self):
+        """Get the primary backend's response cache (None if disabled)."""
+        return getattr(self.backends[0].client, "response_cache", None)
+
+    @property
+    def retry_callback(self):
+        """Get retry callback."""
+        return self._retry_callback
+
+    @retry_callback.setter
+    def retry_callback(self, value):
+        """Set retry callback of routed retries and of all backends."""
+        self._retry_callback = value
+        for backend in self.backends:
+            backend.client.retry_callback = value
+
+    async def prewarm(self) -> bool:
+        """Open pooled connections to all backends that support it.
+
+        Returns:
+            True if at least one backend answered
+        """
+        clients = [backend.client for backend in self.backends if hasattr(backend.client, "prewarm")]
+        results = await asyncio.gather(*(client.prewarm() for client in clients), return_exceptions=True)
+        return any(result is True for result in results)
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Get per-backend health and latency statistics.
+
+        Returns:
+            One dict per backend, in configuration order
+        """
+        return [backend.stats() for backend in self.backends]
+
+    def _ordered_backends(self, kind: str) -> list[Backend]:
+        """Backends in the order they should be tried.
+
+        Healthy backends come first. Among them, backends with a latency EWMA are
+        ordered by it; backends without samples keep their configured position
+        ahead of slower measured ones, so each gets measured.
+        """
+        now = time.monotonic()
+        positions = {id(backend): i for i, backend in enumerate(self.backends)}
+
+        def sort_key(backend: Backend):
+            ewma = backend.latency[kind].ewma
+            return (not backend.is_healthy(now), 0 if ewma is None else 1, ewma or 0.0, positions[id(backend)])
+
+        return sorted(self.backends, key=sort_key)
+
+    def _hedge_delay_for(self, backend: Backend, kind: str) -> float:
+        stats = backend.latency[kind]
+        if len(stats.samples) < self.min_samples:
+            return self.hedge_delay
+        return max(self.min_hedge_delay, stats.p95())
+
+    def _record_success(self, backend: Backend, kind: str, latency: float):
+        backend.latency[kind].record(latency)
+        backend.consecutive_failures = 0
+        backend.unhealthy_until = 0.0
+
+    def _record_failure(self, backend: Backend, error: BaseException):
+        backend.total_failures += 1
+        backend.consecutive_failures += 1
+        if backend.consecutive_failures >= self.failure_threshold:
+            backend.unhealthy_until = time.monotonic() + self.cooldown
+            logger.warning("LLM backend %s marked unhealthy for %.0fs after %d failures", backend.name, self.cooldown, backend.consecutive_failures)
+        logger.warning("LLM backend %s failed: %s", backend.name, error)
+
+    async def _timed(self, backend: Backend, kind: str, call: Any) -> Any:
+        """Await call, recording latency or failure for the backend"""
+        backend.total_requests += 1
+        start = time.monotonic()
+        try:
+            result = await call
+        except asyncio.CancelledError:
+            # Lost a hedge race: the partial latency would skew the EWMA and p95 low
+            raise
+        except Exception as e:
+            # Errors of the request itself (e.g. invalid request) say nothing about the backend's health
+            if is_transient_error(e):
+                self._record_failure(backend, e)
+            raise
+        self._record_success(backend, kind, time.monotonic() - start)
+        return result
+
+    async def _route(self, kind: str, start: Any, discard: Any = None) -> tuple[Backend, Any]:
+        """Run start(backend) under the routing policy.
+
+        Args:
+            kind: "generate" or "stream" (selects the latency statistics)
+            start: Function returning an awaitable for a backend
+            discard: Optional coroutine function releasing an unused result of a losing hedged request
+
+        Returns:
+            Tuple of (backend that answered, its result)
+
+        Raises:
+            Exception: A non-transient error, or the error of the last backend if all
+                backends failed (after retry_config's retries)
+        """
+
+        async def route_once() -> tuple[Backend, Any]:
+            backends = self._ordered_backends(kind)
+            if self.policy == "hedge":
+                return await self._hedge(kind, backends, start, discard)
+
+            last_error: Exception | None = None
+            for backend in backends:
+                try:
+                    return backend, await self._timed(backend, kind, start(backend))
+                except Exception as e:
+                    if not is_transient_error(e):
+                        raise
+                    last_error = e
+            raise last_error
+
+        route_once.__name__ = f"route_{kind}"
+        if self.retry_config is not None and self.retry_config.enabled:
+            route_once = async_retry(config=self.retry_config, on_retry=self._retry_callback)(route_once)
+        return await route_once()
+
+    async def _hedge(self, kind: str, backends: list[Backend], start: Any, discard: Any) -> tuple[Backend, Any]:
+        """Hedged requests: launch the next backend whenever the running ones exceed their p95"""
+        pending: dict[asyncio.Task, Backend] = {}
+        remaining = list(backends)
+        last_error: Exception | None = None
+
+        def launch():
+            backend = remaining.pop(0)
+            pending[asyncio.create_task(self._timed(backend, kind, start(backend)))] = backend
+            return backend
+
+        try:
+            current = launch()
+            while pending:
+                timeout = self._hedge_delay_for(current, kind) if remaining else None
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    # Slower than usual: hedge with the next backend
+                    logger.info("LLM backend %s exceeded %.1fs, hedging with %s", current.name, timeout, remaining[0].name)
+                    current = launch()
+                    continue
+
+                for task in done:
+                    backend = pending.pop(task)
+                    if task.exception() is None:
+                        return backend, task.result()
+                    if not is_transient_error(task.exception()):
+                        raise task.exception()
+                    last_error = task.exception()
+
+                # All running requests failed: fail over immediately
+                if not pending and remaining:
+                    current = launch()
+            raise last_error
+        finally:
+            for task in pending:
+                task.cancel()
+            for task in pending:
+                # Results of losing requests are discarded
+                try:
+                    result = await task
+                except BaseException:
+                    continue
+                if discard is not None:
+                    await discard(result)
+
+    async def generate(
+        self,
+        messages: list[Message],
+        tools: list | None = None,
+    ) -> LLMResponse:
+        """Generate response from the routed backends.
+
+        Args:
+            messages: List of conversation messages
+            tools: Optional list of Tool objects or dicts
+
+        Returns:
+            LLMResponse of the backend that answered first
+        """
+        _, response = await self._route("generate", lambda backend: backend.client.generate(messages, tools))
+        return response
+
+    async def stream(
+        self,
+        messages: list[Message],
+        tools: list | None = None,
+    ) -> AsyncIterator[LLMStreamEvent]:
+        """Stream response from the routed backends.
+
+        The backend whose stream produces the first event is used for the rest
+        of the response; the others are cancelled.
+
+        Args:
+            messages: List of conversation messages
+            tools: Optional list of Tool objects or dicts
+
+        Yields:
+            LLMStreamEvent objects, ending with a "done" event carrying the LLMResponse
+        """
+
+        async def first_event(backend: Backend) -> tuple[Any, LLMStreamEvent]:
+            events = backend.client.stream(messages, tools)
+            try:
+                return events, await events.__anext__()
+            except BaseException:
+                await events.aclose()
+                raise
+
+        async def close_stream(result: tuple[Any, LLMStreamEvent]):
+            await result[0].aclose()
+
+        backend, (events, event) = await self._route("stream", first_event, close_stream)
+        try:
+            yield event
+            async for event in events:
+                yield event
+        except Exception as e:
+            self._record_failure(backend, e)
+            raise
+        finally:
+            await events.aclose()
@@ -0,0 +1,191 @@
+"""Shared HTTP transport for LLM clients.
+
+By default every SDK client (AsyncAnthropic / AsyncOpenAI) opens its own
+connection pool, so the agent, ACP sessions and any other LLM client in the
+process each pay their own TCP and TLS handshakes. The registry in this module
+hands out one pooled HTTP client per event loop, SDK and api_base instead.
+
+The HTTP clients are created with the SDK's own DefaultAsyncHttpxClient, so the
+SDK defaults (redirects, headers) are kept and the client type always matches
+the HTTP library the SDK was built against.
+"""
+
+import asyncio
+import importlib.util
+import logging
+import weakref
+from types import ModuleType
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class TransportConfig:
+    """HTTP connection pool configuration"""
+
+    def __init__(
+        self,
+        http2: bool = True,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 120.0,
+        connect_timeout: float = 10.0,
+        read_timeout: float = 600.0,
+    ):
+        """
+        Args:
+            http2: Use HTTP/2 when the h2 package is installed
+            max_connections: Maximum number of open connections per pool
+            max_keepalive_connections: Maximum number of idle connections kept open
+            keepalive_expiry: Seconds an idle connection is kept open
+            connect_timeout: Connection timeout (seconds)
+            read_timeout: Read/write/pool timeout (seconds), must cover a full LLM response
+        """
+        self.http2 = http2
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+
+
+class _Pool:
+    """A shared HTTP client and its request counters"""
+
+    def __init__(self, sdk_name: str, api_base: str):
+        self.sdk_name = sdk_name
+        self.api_base = api_base
+        self.client: Any = None
+        self.http2 = False
+        self.requests = 0
+        self.responses = 0
+
+    async def on_request(self, request):
+        self.requests += 1
+
+    async def on_response(self, response):
+        self.responses += 1
+
+    def stats(self) -> dict[str, Any]:
+        stats = {
+            "sdk": self.sdk_name,
+            "api_base": self.api_base,
+            "http2": self.http2,
+            "closed": self.client.is_closed,
+            "requests": self.requests,
+            "responses": self.responses,
+            "connections": None,
+            "idle_connections": None,
+        }
+        # The connection pool is not part of the public client API; report it when available
+        connection_pool = getattr(getattr(self.client, "_transport", None), "_pool", None)
+        connections = getattr(connection_pool, "connections", None)
+        if connections is not None:
+            stats["connections"] = len(connections)
+            stats["idle_connections"] = sum(1 for conn in connections if conn.is_idle())
+        return stats
+
+
+class TransportRegistry:
+    """Process-wide registry of pooled HTTP clients.
+
+    Clients are bound to the event loop they are used in, so pools are kept per
+    running loop (clients created outside a loop share one extra bucket). Within
+    a loop there is one client per SDK and api_base; the configuration of the
+    first caller is used for it.
+    """
+
+    def __init__(self):
+        self._loop_pools: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[tuple[str, str], _Pool]] = weakref.WeakKeyDictionary()
+        self._unbound_pools: dict[tuple[str, str], _Pool] = {}
+
+    def _pools(self) -> dict[tuple[str, str], _Pool]:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return self._unbound_pools
+        return self._loop_pools.setdefault(loop, {})
+
+    def get_http_client(self, sdk: ModuleType, api_base: str, config: TransportConfig | None = None) -> Any:
+        """Get the shared HTTP client for an SDK and API base URL.
+
+        Args:
+            sdk: SDK module providing DefaultAsyncHttpxClient (anthropic or openai)
+            api_base: API base URL the client is used for
+            config: Pool configuration (used when the client is created)
+
+        Returns:
+            Async HTTP client to pass as http_client to the SDK client
+        """
+        pools = self._pools()
+        key = (sdk.__name__, api_base)
+        pool = pools.get(key)
+        if pool is None or pool.client.is_closed:
+            pool = self._create_pool(sdk, api_base, config or TransportConfig())
+            pools[key] = pool
+        return pool.client
+
+    @staticmethod
+    def _create_pool(sdk: ModuleType, api_base: str, config: TransportConfig) -> _Pool:
+        pool = _Pool(sdk.__name__, api_base)
+
+        pool.http2 = config.http2 and importlib.util.find_spec("h2") is not None
+        if config.http2 and not pool.http2:
+            logger.info("HTTP/2 requested but the h2 package is not installed, using HTTP/1.1")
+
+        # Limits class of the SDK's HTTP library
+        limits = type(sdk.DEFAULT_CONNECTION_LIMITS)(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry,
+        )
+        pool.client = sdk.DefaultAsyncHttpxClient(
+            http2=pool.http2,
+            limits=limits,
+            timeout=sdk.Timeout(config.read_timeout, connect=config.connect_timeout),
+            event_hooks={"request": [pool.on_request], "response": [pool.on_response]},
+        )
+        logger.debug("Created shared HTTP client for %s (%s, http2=%s)", api_base, sdk.__name__, pool.http2)
+        return pool
+
+    @staticmethod
+    async def prewarm(http_client: Any, api_base: str, timeout: float = 10.0) -> bool:
+        """Open a connection (TCP + TLS) to api_base ahead of the first request.
+
+        Any HTTP response counts as success; the connection stays in the pool.
+
+        Args:
+            http_client: Client returned by get_http_client()
+            api_base: URL to connect to
+            timeout: Request timeout (seconds)
+
+        Returns:
+            True if the server answered
+        """
+        try:
+            response = await http_client.head(api_base, timeout=timeout)
+            await response.aclose()
+            return True
+        except Exception as e:
+            logger.debug("Connection pre-warm for %s failed: %s", api_base, e)
+            return False
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Get statistics of all pools in the current event loop.
+
+        Returns:
+            One dict per pool with sdk, api_base, http2, closed, requests, responses,
+            connections and idle_connections (None if the pool does not expose them)
+        """
+        return [pool.stats() for pool in self._pools().values()]
+
+    async def aclose(self):
+        """Close all pooled clients of the current event loop"""
+        pools = self._pools()
+        for pool in pools.values():
+            await pool.client.aclose()
+        pools.clear()
+
+
+# Process-wide registry used by the LLM clients
+transport_registry = TransportRegistry()
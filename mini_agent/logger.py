@@ -1,86 +1,194 @@
-"""Agent run logger"""
+"""Agent run logger
 
+Each run is written as a JSON Lines file. LLM requests are stored as deltas: a
+request record only contains the messages appended since the previous request,
+plus a reference to that request and the number of messages it shares with it.
+Use reconstruct_request() to rebuild the full message list of any request.
+
+Records are serialized and written by a single background thread, so logging
+never blocks the event loop on file I/O.
+"""
+
+import atexit
 import json
+import queue
+import sys
+import threading
+import weakref
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
 from .schema import Message, ToolCall
+from .utils.token_utils import truncate_text_by_tokens
+
+# Maximum number of records waiting to be written before producers block
+LOG_QUEUE_SIZE = 1024
+
+# File buffer size for the writer thread
+LOG_BUFFER_SIZE = 64 * 1024
+
+# Token limit of a tool result or error stored in the log
+LOG_RESULT_MAX_TOKENS = 32000
+
+_STOP = object()
+
+
+class _LogWriter:
+    """Background writer owning one log file.
+
+    Records are put on a bounded queue and written by a single thread with
+    buffered I/O. The buffer is flushed whenever the queue runs empty.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        self._thread = threading.Thread(target=self._run, name=f"agent-log-writer-{path.stem}", daemon=True)
+        self._closed = False
+        self._thread.start()
+        _active_writers.add(self)
+
+    def write(self, record: dict[str, Any]):
+        """Queue a record for writing (blocks only if the writer is LOG_QUEUE_SIZE records behind)"""
+        if not self._closed:
+            self._queue.put(record)
+
+    def flush(self):
+        """Wait until all queued records are written to disk"""
+        if not self._closed:
+            self._queue.join()
+
+    def close(self):
+        """Write remaining records, close the file and stop the thread"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        _active_writers.discard(self)
+
+    def _run(self):
+        with open(self.path, "a", encoding="utf-8", buffering=LOG_BUFFER_SIZE) as f:
+            while True:
+                record = self._queue.get()
+                try:
+                    if record is _STOP:
+                        f.flush()
+                        return
+                    f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+                    if self._queue.empty():
+                        f.flush()
+                except Exception as e:
+                    print(f"Agent log write failed: {e}", file=sys.stderr)
+                finally:
+                    self._queue.task_done()
+
+
+_active_writers: "weakref.WeakSet[_LogWriter]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_active_writers():
+    for writer in list(_active_writers):
+        writer.close()
+
+
+def message_to_dict(msg: Message) -> dict[str, Any]:
+    """Convert a message to its JSON serializable log representation"""
+    msg_dict = {
+        "role": msg.role,
+        "content": msg.content,
+    }
+    if msg.thinking:
+        msg_dict["thinking"] = msg.thinking
+    if msg.tool_calls:
+        msg_dict["tool_calls"] = [tc.model_dump() for tc in msg.tool_calls]
+    if msg.tool_call_id:
+        msg_dict["tool_call_id"] = msg.tool_call_id
+    if msg.name:
+        msg_dict["name"] = msg.name
+    return msg_dict
 
 
 class AgentLogger:
     """Agent run logger
 
     Responsible for recording the complete interaction process of each agent run, including:
-    - LLM requests and responses
+    - LLM requests (as deltas against the previous request) and responses
     - Tool calls and results
     """
 
-    def __init__(self):
+    def __init__(self, log_dir: str | Path | None = None):
         """Initialize logger
 
-        Logs are stored in ~/.mini-agent/log/ directory
+        Args:
+            log_dir: Log directory (default: ~/.mini-agent/log/)
         """
         # Use ~/.mini-agent/log/ directory for logs
-        self.log_dir = Path.home() / ".mini-agent" / "log"
+        self.log_dir = Path(log_dir) if log_dir else Path.home() / ".mini-agent" / "log"
         self.log_dir.mkdir(parents=True, exist_ok=True)
         self.log_file = None
         self.log_index = 0
+        self._writer: _LogWriter | None = None
+
+        # Messages sent in the previous request (references only) and its log index
+        self._logged_messages: list[Message] = []
+        self._last_request_index: int | None = None
 
     def start_new_run(self):
         """Start new run, create new log file"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        log_filename = f"agent_run_{timestamp}.log"
+        self.close()
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        log_filename = f"agent_run_{timestamp}.jsonl"
         self.log_file = self.log_dir / log_filename
         self.log_index = 0
+        self._logged_messages = []
+        self._last_request_index = None
 
-        # Write log header
-        with open(self.log_file, "w", encoding="utf-8") as f:
-            f.write("=" * 80 + "\n")
-            f.write(f"Agent Run Log - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write("=" * 80 + "\n\n")
+        self._writer = _LogWriter(self.log_file)
+        self._writer.write({"type": "RUN_START", "timestamp": self._timestamp(), "format": "delta-v1"})
 
     def log_request(self, messages: list[Message], tools: list[Any] | None = None):
         """Log LLM request
 
+        Only messages that differ from the previous request are recorded:
+        message_offset is the number of leading messages shared with the request at
+        base_index (identity comparison), and messages holds the rest. The first
+        request of a run has base_index None and contains the full history.
+
         Args:
             messages: Message list
             tools: Tool list (optional)
         """
         self.log_index += 1
 
-        # Build complete request data structure
+        # Shared prefix with the previous request: O(1) for the append-only case
+        logged = self._logged_messages
+        if logged and len(messages) >= len(logged) and messages[len(logged) - 1] is logged[-1]:
+            offset = len(logged)
+        else:
+            offset = 0
+            for msg, logged_msg in zip(messages, logged):
+                if msg is not logged_msg:
+                    break
+                offset += 1
+
+        new_messages = messages[offset:]
+        del logged[offset:]
+        logged.extend(new_messages)
+
         request_data = {
-            "messages": [],
-            "tools": [],
+            "base_index": self._last_request_index if offset else None,
+            "message_offset": offset,
+            "messages": [message_to_dict(msg) for msg in new_messages],
+            # Only record tool names
+            "tools": [tool.name if hasattr(tool, "name") else tool.get("name") for tool in tools] if tools else [],
         }
+        self._last_request_index = self.log_index
 
-        # Convert messages to JSON serializable format
-        for msg in messages:
-            msg_dict = {
-                "role": msg.role,
-                "content": msg.content,
-            }
-            if msg.thinking:
-                msg_dict["thinking"] = msg.thinking
-            if msg.tool_calls:
-                msg_dict["tool_calls"] = [tc.model_dump() for tc in msg.tool_calls]
-            if msg.tool_call_id:
-                msg_dict["tool_call_id"] = msg.tool_call_id
-            if msg.name:
-                msg_dict["name"] = msg.name
-
-            request_data["messages"].append(msg_dict)
-
-        # Only record tool names
-        if tools:
-            request_data["tools"] = [tool.name for tool in tools]
-
-        # Format as JSON
-        content = "LLM Request:\n\n"
-        content += json.dumps(request_data, indent=2, ensure_ascii=False)
-
-        self._write_log("REQUEST", content)
+        self._write_log("REQUEST", request_data)
 
     def log_response(
         self,
@@ -113,11 +221,7 @@ class AgentLogger:
         if finish_reason:
             response_data["finish_reason"] = finish_reason
 
-        # Format as JSON
-        log_content = "LLM Response:\n\n"
-        log_content += json.dumps(response_data, indent=2, ensure_ascii=False)
-
-        self._write_log("RESPONSE", log_content)
+        self._write_log("RESPONSE", response_data)
 
     def log_tool_result(
         self,
@@ -146,33 +250,108 @@ class AgentLogger:
         }
 
         if result_success:
-            tool_result_data["result"] = result_content
+            tool_result_data["result"] = truncate_text_by_tokens(result_content, LOG_RESULT_MAX_TOKENS) if result_content else result_content
         else:
-            tool_result_data["error"] = result_error
+            tool_result_data["error"] = truncate_text_by_tokens(result_error, LOG_RESULT_MAX_TOKENS) if result_error else result_error
 
-        # Format as JSON
-        content = "Tool Execution:\n\n"
-        content += json.dumps(tool_result_data, indent=2, ensure_ascii=False)
+        self._write_log("TOOL_RESULT", tool_result_data)
 
-        self._write_log("TOOL_RESULT", content)
-
-    def _write_log(self, log_type: str, content: str):
-        """Write log entry
+    def _write_log(self, log_type: str, data: dict[str, Any]):
+        """Queue log entry for the background writer
 
         Args:
             log_type: Log type (REQUEST, RESPONSE, TOOL_RESULT)
-            content: Log content
+            data: Log data (serialized by the writer thread)
         """
-        if self.log_file is None:
+        if self._writer is None:
             return
 
-        with open(self.log_file, "a", encoding="utf-8") as f:
-            f.write("\n" + "-" * 80 + "\n")
-            f.write(f"[{self.log_index}] {log_type}\n")
-            f.write(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}\n")
-            f.write("-" * 80 + "\n")
-            f.write(content + "\n")
+        record = {"index": self.log_index, "type": log_type, "timestamp": self._timestamp()}
+        record.update(data)
+        self._writer.write(record)
+
+    @staticmethod
+    def _timestamp() -> str:
+        return datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+
+    def flush(self):
+        """Block until all queued log entries are on disk"""
+        if self._writer is not None:
+            self._writer.flush()
+
+    def close(self):
+        """Flush and close the current log file"""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
 
     def get_log_file_path(self) -> Path:
         """Get current log file path"""
         return self.log_file
+
+
+def read_log(log_file: str | Path) -> list[dict[str, Any]]:
+    """Read all records of a run log
+
+    Args:
+        log_file: Path to an agent_run_*.jsonl file
+
+    Returns:
+        List of log records in file order
+    """
+    records = []
+    with open(log_file, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                records.append(json.loads(line))
+    return records
+
+
+def reconstruct_request(log: str | Path | list[dict[str, Any]], index: int) -> dict[str, Any]:
+    """Rebuild the full request logged at the given index
+
+    Args:
+        log: Path to a run log, or records returned by read_log()
+        index: Log index of a REQUEST record
+
+    Returns:
+        Dict with the complete "messages" list and "tools" names of that request
+
+    Raises:
+        ValueError: No REQUEST record with that index, or a broken delta chain
+    """
+    records = read_log(log) if isinstance(log, (str, Path)) else log
+    requests = {record["index"]: record for record in records if record.get("type") == "REQUEST"}
+
+    if index not in requests:
+        raise ValueError(f"No REQUEST record with index {index}")
+
+    # Walk back to the first full snapshot, then replay deltas forward
+    chain = []
+    current: int | None = index
+    while current is not None:
+        record = requests.get(current)
+        if record is None:
+            raise ValueError(f"Broken delta chain: REQUEST {current} not found")
+        chain.append(record)
+        current = record.get("base_index")
+
+    messages: list[dict[str, Any]] = []
+    for record in reversed(chain):
+        messages = messages[: record["message_offset"]] + record["messages"]
+
+    return {"messages": messages, "tools": requests[index].get("tools", [])}
+
+
+def main():
+    """Print a reconstructed request: python -m mini_agent.logger LOG_FILE INDEX"""
+    if len(sys.argv) != 3:
+        print("Usage: python -m mini_agent.logger LOG_FILE REQUEST_INDEX")
+        sys.exit(1)
+    request = reconstruct_request(sys.argv[1], int(sys.argv[2]))
+    print(json.dumps(request, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,10 @@
 Provides decorators and utility functions to support retry logic for async functions.
 
 Features:
-- Supports exponential backoff strategy
+- Exponential backoff with decorrelated jitter
 - Configurable retry count and intervals
-- Supports specifying retryable exception types
+- Only transient errors (network, timeouts, 408/409/429/5xx) are retried by default
+- Honors Retry-After headers of failed responses
 - Detailed logging
 - Fully decoupled, non-invasive to business code
 """
@@ -13,12 +14,84 @@ Features:
 import asyncio
 import functools
 import logging
-from typing import Any, Callable, Type, TypeVar
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Mapping, Type, TypeVar
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
+# HTTP status codes worth retrying (529: Anthropic "overloaded")
+TRANSIENT_STATUS_CODES = frozenset({408, 409, 425, 429, 500, 502, 503, 504, 529})
+
+# Exception classes (matched by name, so SDKs need not be imported) for failures without a status code
+TRANSIENT_ERROR_NAMES = frozenset({"APIConnectionError", "APITimeoutError", "TransportError", "TimeoutException"})
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """Check whether an error is transient, i.e. the same request may succeed later.
+
+    Args:
+        exc: Raised exception
+
+    Returns:
+        True for network errors, timeouts and retryable HTTP status codes
+    """
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    status_code = getattr(exc, "status_code", None)
+    if isinstance(status_code, int):
+        return status_code in TRANSIENT_STATUS_CODES
+    return any(cls.__name__ in TRANSIENT_ERROR_NAMES for cls in type(exc).__mro__)
+
+
+def parse_retry_after(headers: Mapping[str, str] | None) -> float | None:
+    """Get the delay requested by Retry-After style response headers.
+
+    Args:
+        headers: Response headers (case-insensitive mapping)
+
+    Returns:
+        Delay in seconds, or None if no valid header is present
+    """
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000)
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        # HTTP date
+        return max(0.0, (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_after_from_exception(exc: BaseException) -> float | None:
+    """Get the Retry-After delay from an SDK error carrying the HTTP response.
+
+    Args:
+        exc: Raised exception
+
+    Returns:
+        Delay in seconds, or None
+    """
+    response = getattr(exc, "response", None)
+    return parse_retry_after(getattr(response, "headers", None))
+
 
 class RetryConfig:
     """Retry configuration class"""
@@ -31,6 +104,8 @@ class RetryConfig:
         max_delay: float = 60.0,
         exponential_base: float = 2.0,
         retryable_exceptions: tuple[Type[Exception], ...] = (Exception,),
+        retry_if: Callable[[Exception], bool] | None = is_transient_error,
+        jitter: bool = True,
     ):
         """
         Args:
@@ -38,8 +113,11 @@ class RetryConfig:
             max_retries: Maximum number of retries
             initial_delay: Initial delay time (seconds)
             max_delay: Maximum delay time (seconds)
-            exponential_base: Exponential backoff base
+            exponential_base: Exponential backoff base (used without jitter)
             retryable_exceptions: Tuple of retryable exception types
+            retry_if: Predicate further restricting which exceptions are retried
+                (default: transient errors only; None retries all retryable_exceptions)
+            jitter: Use decorrelated jitter instead of plain exponential backoff
         """
         self.enabled = enabled
         self.max_retries = max_retries
@@ -47,6 +125,21 @@ class RetryConfig:
         self.max_delay = max_delay
         self.exponential_base = exponential_base
         self.retryable_exceptions = retryable_exceptions
+        self.retry_if = retry_if
+        self.jitter = jitter
+
+    def should_retry(self, exc: Exception) -> bool:
+        """Check whether an exception is retried under this configuration
+
+        Args:
+            exc: Raised exception
+
+        Returns:
+            True if the call should be retried
+        """
+        if not isinstance(exc, self.retryable_exceptions):
+            return False
+        return self.retry_if is None or self.retry_if(exc)
 
     def calculate_delay(self, attempt: int) -> float:
         """Calculate delay time (exponential backoff)
@@ -60,6 +153,25 @@ class RetryConfig:
         delay = self.initial_delay * (self.exponential_base**attempt)
         return min(delay, self.max_delay)
 
+    def next_delay(self, attempt: int, previous_delay: float | None) -> float:
+        """Calculate the delay before the next attempt
+
+        With jitter, uses "decorrelated jitter": a random delay between
+        initial_delay and three times the previous delay (capped at max_delay),
+        so concurrent clients hitting the same error spread out their retries.
+
+        Args:
+            attempt: Current attempt number (starting from 0)
+            previous_delay: Delay used before this attempt (None for the first retry)
+
+        Returns:
+            Delay time (seconds)
+        """
+        if not self.jitter:
+            return self.calculate_delay(attempt)
+        upper = max(self.initial_delay, (previous_delay or self.initial_delay) * 3)
+        return min(self.max_delay, random.uniform(self.initial_delay, upper))
+
 
 class RetryExhaustedError(Exception):
     """Retry exhausted exception"""
@@ -98,6 +210,7 @@ def async_retry(
         @functools.wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> Any:
             last_exception: Exception | None = None
+            delay: float | None = None
 
             for attempt in range(config.max_retries + 1):
                 try:
@@ -107,13 +220,20 @@ def async_retry(
                 except config.retryable_exceptions as e:
                     last_exception = e
 
+                    # Permanent errors (e.g. invalid request, authentication) are raised as-is
+                    if not config.should_retry(e):
+                        raise
+
                     # If this is the last attempt, don't retry
                     if attempt >= config.max_retries:
                         logger.error(f"Function {func.__name__} retry failed, reached maximum retry count {config.max_retries}")
                         raise RetryExhaustedError(e, attempt + 1)
 
-                    # Calculate delay time
-                    delay = config.calculate_delay(attempt)
+                    # Calculate delay time, waiting at least as long as the server asked for
+                    delay = config.next_delay(attempt, delay)
+                    retry_after = retry_after_from_exception(e)
+                    if retry_after is not None:
+                        delay = max(delay, retry_after)
 
                     # Log
                     logger.warning(
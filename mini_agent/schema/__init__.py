@@ -4,6 +4,7 @@ from .schema import (
     FunctionCall,
     LLMProvider,
     LLMResponse,
+    LLMStreamEvent,
     Message,
     TokenUsage,
     ToolCall,
@@ -13,6 +14,7 @@ __all__ = [
     "FunctionCall",
     "LLMProvider",
     "LLMResponse",
+    "LLMStreamEvent",
     "Message",
     "TokenUsage",
     "ToolCall",
@@ -40,9 +40,11 @@ class Message(BaseModel):
 class TokenUsage(BaseModel):
     """Token usage statistics from LLM API response."""
 
-    prompt_tokens: int = 0
+    prompt_tokens: int = 0  # All input tokens, including cached ones
     completion_tokens: int = 0
     total_tokens: int = 0
+    cache_creation_input_tokens: int = 0  # Input tokens written to the prompt cache
+    cache_read_input_tokens: int = 0  # Input tokens served from the prompt cache
 
 
 class LLMResponse(BaseModel):
@@ -53,3 +55,12 @@ class LLMResponse(BaseModel):
     tool_calls: list[ToolCall] | None = None
     finish_reason: str
     usage: TokenUsage | None = None  # Token usage from API response
+
+
+class LLMStreamEvent(BaseModel):
+    """Incremental event yielded by LLMClient.stream()."""
+
+    type: str  # "thinking", "text", "tool_use" or "done"
+    delta: str = ""  # New thinking/text since the previous event
+    tool_call: ToolCall | None = None  # Complete tool call (type "tool_use")
+    response: LLMResponse | None = None  # Assembled final response (type "done")
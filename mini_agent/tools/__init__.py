@@ -1,9 +1,9 @@
-"""Tools module."""
+"""Tools module.
 
-from .base import Tool, ToolResult
-from .bash_tool import BashTool
-from .file_tools import EditTool, ReadTool, WriteTool
-from .note_tool import RecallNoteTool, SessionNoteTool
+Tool classes are imported on first access, so only enabled tools are loaded.
+"""
+
+import importlib
 
 __all__ = [
     "Tool",
@@ -11,7 +11,38 @@ __all__ = [
     "ReadTool",
     "WriteTool",
     "EditTool",
+    "SearchFilesTool",
+    "GlobFilesTool",
     "BashTool",
     "SessionNoteTool",
     "RecallNoteTool",
+    "ToolRegistry",
 ]
+
+# Export name -> submodule defining it
+_EXPORTS = {
+    "Tool": ".base",
+    "ToolResult": ".base",
+    "BashTool": ".bash_tool",
+    "EditTool": ".file_tools",
+    "ReadTool": ".file_tools",
+    "WriteTool": ".file_tools",
+    "RecallNoteTool": ".note_tool",
+    "SessionNoteTool": ".note_tool",
+    "ToolRegistry": ".registry",
+    "GlobFilesTool": ".search_tools",
+    "SearchFilesTool": ".search_tools",
+}
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -31,6 +31,27 @@ class Tool:
         """Tool parameters schema (JSON Schema format)."""
         raise NotImplementedError
 
+    @property
+    def is_mutating(self) -> bool:
+        """Whether the tool modifies the resource returned by resource_key().
+
+        Mutating calls are never reordered against other calls on the same
+        resource. A mutating call without a resource key (e.g. a shell command)
+        may change anything and is ordered against every other call. Tools are
+        assumed to be mutating unless they declare otherwise.
+        """
+        return True
+
+    def resource_key(self, **kwargs) -> str | None:
+        """Resource touched by a call with the given arguments.
+
+        Used by the agent to keep conflicting tool calls of one turn in order.
+        Returns None when the call touches no known resource: it then runs
+        concurrently with any other call if the tool is not mutating, and
+        in order with all other calls if it is.
+        """
+        return None
+
     async def execute(self, *args, **kwargs) -> ToolResult:  # type: ignore
         """Execute the tool with arbitrary arguments."""
         raise NotImplementedError
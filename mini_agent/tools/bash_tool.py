@@ -4,16 +4,52 @@ Supports both bash (Unix/Linux/macOS) and PowerShell (Windows).
 """
 
 import asyncio
+import codecs
+import functools
+import getpass
+import os
 import platform
 import re
+import signal
+import tempfile
 import time
 import uuid
-from typing import Any
+from collections import deque
+from pathlib import Path
+from typing import Any, TextIO
 
 from pydantic import Field, model_validator
 
+from ..utils.token_utils import truncate_text_by_tokens
 from .base import Tool, ToolResult
 
+# Token limit of the formatted command output returned to the model
+MAX_OUTPUT_TOKENS = 32000
+
+# Output of a background shell kept in memory (older lines are only in the spill file)
+OUTPUT_BUFFER_BYTES = 1024 * 1024
+
+# Size of a spill file before it is rotated, and number of rotated files kept
+SPILL_FILE_BYTES = 16 * 1024 * 1024
+SPILL_FILE_BACKUPS = 2
+
+# Bytes requested per read from a background process's output pipe
+READ_CHUNK_BYTES = 64 * 1024
+
+# Seconds to wait for remaining output after a background process exited
+# (its output pipe stays open while child processes still hold it)
+EXIT_OUTPUT_GRACE = 1.0
+
+# Maximum seconds bash_output waits for new output
+MAX_OUTPUT_WAIT = 600
+
+# Directory of the spill files with the full output of background shells
+# (one per user, as the output may contain secrets and the temp dir is shared)
+SPILL_DIR = Path(tempfile.gettempdir()) / f"mini-agent-shells-{os.getuid() if hasattr(os, 'getuid') else getpass.getuser()}"
+
+# Spill files untouched for this many seconds are deleted (e.g. left by earlier runs)
+SPILL_FILE_MAX_AGE = 24 * 3600
+
 
 class BashOutputResult(ToolResult):
     """Bash command execution result with separated stdout and stderr.
@@ -45,46 +81,292 @@ class BashOutputResult(ToolResult):
         if not output:
             output = "(no output)"
 
-        self.content = output
+        self.content = truncate_text_by_tokens(output, MAX_OUTPUT_TOKENS)
         return self
 
 
+def _signal_process_group(process: "asyncio.subprocess.Process", force: bool = False):
+    """Terminate (or kill) a process together with its children.
+
+    On Unix, commands are started in their own session, so signalling the
+    process group also stops the programs started by the shell.
+    """
+    if platform.system() != "Windows":
+        try:
+            os.killpg(process.pid, signal.SIGKILL if force else signal.SIGTERM)
+            return
+        except (ProcessLookupError, PermissionError):
+            pass
+    if force:
+        process.kill()
+    else:
+        process.terminate()
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_filter(filter_pattern: str) -> re.Pattern | None:
+    """Compile an output filter once (None for an invalid regex)."""
+    try:
+        return re.compile(filter_pattern)
+    except re.error:
+        return None
+
+
+def _ensure_private_dir(path: Path):
+    """Create a directory only the current user can access, refusing one owned by someone else."""
+    path.mkdir(mode=0o700, parents=True, exist_ok=True)
+    if not hasattr(os, "getuid"):
+        return
+    info = os.lstat(path)
+    if not path.is_dir() or path.is_symlink() or info.st_uid != os.getuid():
+        raise PermissionError(f"Spill directory {path} is not a directory owned by the current user")
+    if info.st_mode & 0o077:
+        os.chmod(path, 0o700)
+
+
+def _open_private(path: Path, truncate: bool = False) -> TextIO:
+    """Open a file for appending (or truncated writing) that only the current user can read."""
+    flags = os.O_WRONLY | os.O_CREAT | (os.O_TRUNC if truncate else os.O_APPEND)
+    return os.fdopen(os.open(path, flags, 0o600), "w" if truncate else "a", encoding="utf-8", errors="replace")
+
+
+class SpillFile:
+    """Append-only file with the full output of a shell, rotated by size."""
+
+    def __init__(self, path: Path, max_bytes: int = SPILL_FILE_BYTES, backups: int = SPILL_FILE_BACKUPS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._file: TextIO | None = None
+        self._size = 0
+
+    def write(self, line: str):
+        """Append one line, rotating the file when it is full."""
+        if self._file is None:
+            _ensure_private_dir(self.path.parent)
+            self._file = _open_private(self.path)
+            self._size = self._file.tell()
+        if self._size >= self.max_bytes:
+            self._rotate()
+        self._file.write(line + "\n")
+        self._size += len(line) + 1
+
+    def _rotate(self):
+        """Shift log -> log.1 -> log.2 ..., dropping the oldest."""
+        self._file.close()
+        for i in range(self.backups, 0, -1):
+            source = self.path if i == 1 else self.path.with_name(f"{self.path.name}.{i - 1}")
+            if source.exists():
+                source.replace(self.path.with_name(f"{self.path.name}.{i}"))
+        self._file = _open_private(self.path, truncate=True)
+        self._size = 0
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self, delete: bool = False):
+        """Close the file, optionally deleting it and its rotated copies."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if delete:
+            for i in range(self.backups + 1):
+                self.path.with_name(self.path.name if i == 0 else f"{self.path.name}.{i}").unlink(missing_ok=True)
+
+
+def cleanup_stale_spill_files(max_age: float = SPILL_FILE_MAX_AGE) -> int:
+    """Delete spill files (and rotated copies) in SPILL_DIR not written for max_age seconds.
+
+    Returns:
+        Number of files deleted
+    """
+    deleted = 0
+    cutoff = time.time() - max_age
+    try:
+        entries = list(os.scandir(SPILL_DIR))
+    except OSError:
+        return 0
+    for entry in entries:
+        try:
+            if ".log" in entry.name and entry.is_file(follow_symlinks=False) and entry.stat().st_mtime < cutoff:
+                os.unlink(entry.path)
+                deleted += 1
+        except OSError:
+            continue
+    return deleted
+
+
+class OutputRingBuffer:
+    """Byte-bounded buffer of output lines.
+
+    Lines are numbered from 0 in arrival order. When the buffer exceeds
+    max_bytes, the oldest lines are dropped and counted.
+    """
+
+    def __init__(self, max_bytes: int = OUTPUT_BUFFER_BYTES):
+        self.max_bytes = max_bytes
+        self._lines: deque[str] = deque()
+        self._sizes: deque[int] = deque()
+        self.size = 0
+        self.total_lines = 0
+        self.dropped_lines = 0
+
+    @property
+    def first_index(self) -> int:
+        """Number of the oldest line still in memory."""
+        return self.total_lines - len(self._lines)
+
+    def append(self, line: str):
+        """Add a line, dropping the oldest lines beyond max_bytes."""
+        if len(line) > self.max_bytes:
+            line = line[: self.max_bytes]
+        line_size = len(line.encode("utf-8", errors="replace")) + 1
+        self._lines.append(line)
+        self._sizes.append(line_size)
+        self.size += line_size
+        self.total_lines += 1
+        while self.size > self.max_bytes and len(self._lines) > 1:
+            self._lines.popleft()
+            self.size -= self._sizes.popleft()
+            self.dropped_lines += 1
+
+    def read_from(self, index: int) -> tuple[list[str], int]:
+        """Get the lines from a line number on.
+
+        Args:
+            index: Number of the first line to return
+
+        Returns:
+            Tuple of (lines still in memory, number of requested lines already dropped)
+        """
+        first = self.first_index
+        skipped = max(0, first - index)
+        start = max(index, first) - first
+        if start >= len(self._lines):
+            return [], skipped
+        if start == 0:
+            return list(self._lines), skipped
+        return [self._lines[i] for i in range(start, len(self._lines))], skipped
+
+    def __iter__(self):
+        return iter(self._lines)
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+
 class BackgroundShell:
     """Background shell data container.
 
     Pure data class that only stores state and output.
     IO operations are managed externally by BackgroundShellManager.
+
+    Output is kept in a byte-bounded ring buffer, so long-running processes
+    (dev servers) use constant memory; the full output is also written to a
+    rotating spill file.
     """
 
-    def __init__(self, bash_id: str, command: str, process: "asyncio.subprocess.Process", start_time: float):
+    def __init__(
+        self,
+        bash_id: str,
+        command: str,
+        process: "asyncio.subprocess.Process",
+        start_time: float,
+        max_output_bytes: int = OUTPUT_BUFFER_BYTES,
+        spill: bool = True,
+    ):
         self.bash_id = bash_id
         self.command = command
         self.process = process
         self.start_time = start_time
-        self.output_lines: list[str] = []
+        self.output = OutputRingBuffer(max_output_bytes)
+        self.spill_file = SpillFile(SPILL_DIR / f"{bash_id}.log") if spill else None
         self.last_read_index = 0
+        # Lines dropped from memory before they were read
+        self.missed_lines = 0
         self.status = "running"
         self.exit_code: int | None = None
+        # Incomplete last line of the output received so far
+        self._partial_line = ""
+        # Set when output arrives or the status changes
+        self._changed = asyncio.Event()
+
+    @property
+    def output_lines(self) -> list[str]:
+        """Output lines currently held in memory."""
+        return list(self.output)
 
     def add_output(self, line: str):
         """Add new output line."""
-        self.output_lines.append(line)
+        self.output.append(line)
+        if self.spill_file is not None:
+            self.spill_file.write(line)
+        self._changed.set()
+
+    def add_text(self, text: str):
+        """Add a chunk of decoded output, which may end in the middle of a line."""
+        *lines, self._partial_line = (self._partial_line + text).split("\n")
+        for line in lines:
+            self.add_output(line)
+        # Output without newlines (e.g. progress bars) is not held back indefinitely
+        if len(self._partial_line) >= self.output.max_bytes:
+            self.add_output(self._partial_line)
+            self._partial_line = ""
+
+    def flush_partial_line(self):
+        """Add the incomplete last line once the output has ended."""
+        if self._partial_line:
+            self.add_output(self._partial_line)
+            self._partial_line = ""
+
+    def has_new_output(self) -> bool:
+        """Whether output was added since the last get_new_output()."""
+        return self.output.total_lines > self.last_read_index
+
+    async def wait_for_output(self, timeout: float) -> bool:
+        """Wait until there is unread output or the process is no longer running.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if new output is available or the process finished, False on timeout
+        """
+        if self.has_new_output() or self.status != "running":
+            return True
+        self._changed.clear()
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
 
     def get_new_output(self, filter_pattern: str | None = None) -> list[str]:
-        """Get new output since last check, optionally filtered by regex."""
-        new_lines = self.output_lines[self.last_read_index :]
-        self.last_read_index = len(self.output_lines)
+        """Get new output since last check, optionally filtered by regex.
+
+        Only lines added since the last call are scanned; lines dropped from
+        the buffer in between are counted in missed_lines.
+        """
+        new_lines, skipped = self.output.read_from(self.last_read_index)
+        self.last_read_index = self.output.total_lines
+        self.missed_lines += skipped
+        if skipped and self.spill_file is not None:
+            self.spill_file.flush()
 
         if filter_pattern:
-            try:
-                pattern = re.compile(filter_pattern)
+            pattern = _compile_filter(filter_pattern)
+            # Invalid regex: return all lines
+            if pattern is not None:
                 new_lines = [line for line in new_lines if pattern.search(line)]
-            except re.error:
-                # Invalid regex, return all lines
-                pass
 
         return new_lines
 
+    def close_spill_file(self, delete: bool = True):
+        """Close (and by default delete) the spill file."""
+        if self.spill_file is not None:
+            self.spill_file.close(delete=delete)
+
     def update_status(self, is_alive: bool, exit_code: int | None = None):
         """Update process status."""
         if not is_alive:
@@ -92,17 +374,19 @@ class BackgroundShell:
             self.exit_code = exit_code
         else:
             self.status = "running"
+        self._changed.set()
 
     async def terminate(self):
         """Terminate the background process."""
         if self.process.returncode is None:
-            self.process.terminate()
+            _signal_process_group(self.process)
             try:
                 await asyncio.wait_for(self.process.wait(), timeout=5)
             except asyncio.TimeoutError:
-                self.process.kill()
+                _signal_process_group(self.process, force=True)
         self.status = "terminated"
         self.exit_code = self.process.returncode
+        self._changed.set()
 
 
 class BackgroundShellManager:
@@ -110,10 +394,15 @@ class BackgroundShellManager:
 
     _shells: dict[str, BackgroundShell] = {}
     _monitor_tasks: dict[str, asyncio.Task] = {}
+    _stale_spill_files_removed = False
 
     @classmethod
     def add(cls, shell: BackgroundShell) -> None:
         """Add a background shell to management."""
+        if not cls._stale_spill_files_removed:
+            # Once per process, before the first shell writes its spill file
+            cls._stale_spill_files_removed = True
+            cleanup_stale_spill_files()
         cls._shells[shell.bash_id] = shell
 
     @classmethod
@@ -134,44 +423,55 @@ class BackgroundShellManager:
 
     @classmethod
     async def start_monitor(cls, bash_id: str) -> None:
-        """Start monitoring a background shell's output."""
+        """Start monitoring a background shell's output.
+
+        The monitor only wakes up when output arrives or the process exits:
+        output is read in chunks until EOF, while the exit code is awaited
+        separately (child processes may keep the output pipe open).
+        """
         shell = cls.get(bash_id)
         if not shell:
             return
 
+        async def read_output():
+            process = shell.process
+            if not process.stdout:
+                return
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            while True:
+                chunk = await process.stdout.read(READ_CHUNK_BYTES)
+                if not chunk:
+                    break
+                shell.add_text(decoder.decode(chunk))
+            shell.add_text(decoder.decode(b"", final=True))
+            shell.flush_partial_line()
+
         async def monitor():
+            reader = asyncio.create_task(read_output())
             try:
-                process = shell.process
-                # Continuously read output until process ends
-                while process.returncode is None:
-                    try:
-                        if process.stdout:
-                            line = await asyncio.wait_for(process.stdout.readline(), timeout=0.1)
-                            if line:
-                                decoded_line = line.decode("utf-8", errors="replace").rstrip("\n")
-                                shell.add_output(decoded_line)
-                            else:
-                                break
-                    except asyncio.TimeoutError:
-                        await asyncio.sleep(0.1)
-                        continue
-                    except Exception:
-                        await asyncio.sleep(0.1)
-                        continue
-
                 # Process ended, wait for exit code
                 try:
-                    returncode = await process.wait()
+                    returncode = await shell.process.wait()
                 except Exception:
                     returncode = -1
 
-                shell.update_status(is_alive=False, exit_code=returncode)
+                # Let the reader catch up with output written just before exit
+                await asyncio.wait([reader], timeout=EXIT_OUTPUT_GRACE)
+                if shell.status != "terminated":
+                    shell.update_status(is_alive=False, exit_code=returncode)
+
+                # Child processes may still hold the output pipe: keep reading until EOF
+                await reader
+                # The spill file is only needed for lines no longer held in memory
+                shell.close_spill_file(delete=shell.output.first_index == 0)
 
             except Exception as e:
                 if bash_id in cls._shells:
                     cls._shells[bash_id].status = "error"
                     cls._shells[bash_id].add_output(f"Monitor error: {str(e)}")
             finally:
+                if not reader.done():
+                    reader.cancel()
                 if bash_id in cls._monitor_tasks:
                     del cls._monitor_tasks[bash_id]
 
@@ -207,25 +507,180 @@ class BackgroundShellManager:
         # Terminate the process
         await shell.terminate()
 
-        # Clean up monitoring and remove from manager
+        # Let the monitor drain the remaining output, then clean up monitoring and remove from manager
+        monitor_task = cls._monitor_tasks.get(bash_id)
+        if monitor_task is not None:
+            await asyncio.wait([monitor_task], timeout=EXIT_OUTPUT_GRACE)
         cls._cancel_monitor(bash_id)
         cls._remove(bash_id)
+        shell.close_spill_file()
 
         return shell
 
 
+class ShellSession:
+    """Long-lived bash process running foreground commands one after another.
+
+    Keeps the working directory, exported variables and activated virtualenvs
+    between commands and avoids starting a shell per command. Each command is
+    followed by unique sentinel lines on stdout (with exit code and working
+    directory) and stderr, which mark the end of its output on both streams.
+
+    A command that times out is killed together with the session; the next
+    command starts a fresh session in the last known working directory.
+    """
+
+    def __init__(self, cwd: str | None = None):
+        """
+        Args:
+            cwd: Initial working directory (default: current directory)
+        """
+        self.cwd = cwd or os.getcwd()
+        self.process: asyncio.subprocess.Process | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    async def _start(self):
+        self.process = await asyncio.create_subprocess_exec(
+            "bash",
+            "--noprofile",
+            "--norc",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=self.cwd if os.path.isdir(self.cwd) else None,
+            # Own process group, so a timed-out command can be killed with its children
+            start_new_session=True,
+        )
+
+    async def run(self, command: str, timeout: float) -> tuple[str, str, int]:
+        """Run a command in the session.
+
+        Args:
+            command: Shell command
+            timeout: Timeout in seconds
+
+        Returns:
+            Tuple of (stdout, stderr, exit code)
+
+        Raises:
+            asyncio.TimeoutError: Command did not finish in time (the session was killed)
+        """
+        async with self._lock:
+            if not self.is_alive:
+                await self._start()
+
+            marker = f"__MINI_AGENT_{uuid.uuid4().hex}__"
+            quoted = "'" + command.replace("'", "'\\''") + "'"
+            # eval keeps syntax errors inside the command; stdin is not shared with the session
+            script = (
+                f"eval {quoted} < /dev/null\n"
+                f"__mini_agent_status=$?\n"
+                f"printf '\\n%s %d %s\\n' '{marker}' \"$__mini_agent_status\" \"$PWD\"\n"
+                f"printf '\\n%s\\n' '{marker}' >&2\n"
+            )
+            self.process.stdin.write(script.encode("utf-8"))
+
+            try:
+                await self.process.stdin.drain()
+                stdout, stderr = await asyncio.wait_for(
+                    asyncio.gather(
+                        self._read_until(self.process.stdout, f"\n{marker} ".encode(), b"\n"),
+                        self._read_until(self.process.stderr, f"\n{marker}\n".encode()),
+                    ),
+                    timeout=timeout,
+                )
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                await self.close()
+                raise
+            except (BrokenPipeError, ConnectionResetError):
+                stdout, stderr = (b"", None), (b"", None)
+
+            output, trailer = stdout
+            if trailer is None or stderr[1] is None:
+                # Session exited during the command (e.g. `exit`): restart on next command
+                returncode = await self.process.wait()
+                await self.close()
+                return self._decode(output), self._decode(stderr[0]), returncode
+
+            exit_code, _, cwd = trailer.decode("utf-8", errors="replace").partition(" ")
+            if cwd:
+                self.cwd = cwd
+            return self._decode(output), self._decode(stderr[0]), int(exit_code)
+
+    @staticmethod
+    async def _read_until(stream: asyncio.StreamReader, marker: bytes, trailer_end: bytes | None = None) -> tuple[bytes, bytes | None]:
+        """Read a stream in chunks up to the marker.
+
+        Returns:
+            Tuple of (output before the marker, text after the marker up to trailer_end;
+            None if the stream ended before the marker)
+        """
+        data = bytearray()
+        search_from = 0
+        while True:
+            index = data.find(marker, search_from)
+            if index != -1:
+                rest = data[index + len(marker) :]
+                if trailer_end is None:
+                    return bytes(data[:index]), b""
+                end = rest.find(trailer_end)
+                if end != -1:
+                    return bytes(data[:index]), bytes(rest[:end])
+            else:
+                search_from = max(0, len(data) - len(marker))
+            chunk = await stream.read(READ_CHUNK_BYTES)
+            if not chunk:
+                return bytes(data), None
+            data.extend(chunk)
+
+    @staticmethod
+    def _decode(output: bytes) -> str:
+        return output.decode("utf-8", errors="replace")
+
+    async def close(self):
+        """Kill the session and any commands still running in it."""
+        process, self.process = self.process, None
+        if process is None:
+            return
+        if process.returncode is None:
+            _signal_process_group(process, force=True)
+        # Closing stdin lets the subprocess transport finish once the output pipes are drained
+        process.stdin.close()
+        await process.wait()
+
+
 class BashTool(Tool):
     """Execute shell commands in foreground or background.
     
     Automatically detects OS and uses appropriate shell:
     - Windows: PowerShell
     - Unix/Linux/macOS: bash
+
+    With persistent_session, foreground commands run in one long-lived bash
+    process (Unix only), so the working directory and environment carry over
+    between commands.
     """
 
-    def __init__(self):
-        """Initialize BashTool with OS-specific shell detection."""
+    def __init__(self, workspace_dir: str | None = None, persistent_session: bool = False):
+        """Initialize BashTool with OS-specific shell detection.
+
+        Args:
+            workspace_dir: Working directory for commands (default: current directory)
+            persistent_session: Run foreground commands in a persistent bash session
+        """
         self.is_windows = platform.system() == "Windows"
         self.shell_name = "PowerShell" if self.is_windows else "bash"
+        self.workspace_dir = workspace_dir
+        self.session = ShellSession(workspace_dir) if persistent_session and not self.is_windows else None
+
+    async def close(self):
+        """Stop the persistent session, if any."""
+        if self.session is not None:
+            await self.session.close()
 
     @property
     def name(self) -> str:
@@ -273,7 +728,14 @@ Examples:
   - npm test
   - python3 -m http.server 8080 (with run_in_background=true)"""
         }
-        return shell_examples["Windows"] if self.is_windows else shell_examples["Unix"]
+        if self.is_windows:
+            return shell_examples["Windows"]
+        if self.session is not None:
+            return shell_examples["Unix"] + """
+
+Foreground commands run in a persistent shell session: the working directory,
+exported variables and activated virtualenvs carry over to later commands."""
+        return shell_examples["Unix"]
 
     @property
     def parameters(self) -> dict[str, Any]:
@@ -341,12 +803,16 @@ Examples:
                         *shell_cmd,
                         stdout=asyncio.subprocess.PIPE,
                         stderr=asyncio.subprocess.STDOUT,
+                        cwd=self.workspace_dir,
                     )
                 else:
                     process = await asyncio.create_subprocess_shell(
                         shell_cmd,
                         stdout=asyncio.subprocess.PIPE,
                         stderr=asyncio.subprocess.STDOUT,
+                        # Start in the session's current directory
+                        cwd=self.session.cwd if self.session else self.workspace_dir,
+                        start_new_session=True,
                     )
 
                 # Create background shell and add to manager
@@ -369,6 +835,20 @@ Examples:
                     bash_id=bash_id,
                 )
 
+            elif self.session is not None:
+                # Foreground execution in the persistent session
+                try:
+                    stdout_text, stderr_text, returncode = await self.session.run(command, timeout)
+                except asyncio.TimeoutError:
+                    error_msg = f"Command timed out after {timeout} seconds (shell session restarted; environment reset, working directory kept)"
+                    return BashOutputResult(
+                        success=False,
+                        error=error_msg,
+                        stdout="",
+                        stderr=error_msg,
+                        exit_code=-1,
+                    )
+
             else:
                 # Foreground execution: Create isolated process
                 if self.is_windows:
@@ -376,18 +856,22 @@ Examples:
                         *shell_cmd,
                         stdout=asyncio.subprocess.PIPE,
                         stderr=asyncio.subprocess.PIPE,
+                        cwd=self.workspace_dir,
                     )
                 else:
                     process = await asyncio.create_subprocess_shell(
                         shell_cmd,
                         stdout=asyncio.subprocess.PIPE,
                         stderr=asyncio.subprocess.PIPE,
+                        cwd=self.workspace_dir,
+                        start_new_session=True,
                     )
 
                 try:
                     stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
                 except asyncio.TimeoutError:
-                    process.kill()
+                    _signal_process_group(process, force=True)
+                    await process.wait()
                     error_msg = f"Command timed out after {timeout} seconds"
                     return BashOutputResult(
                         success=False,
@@ -400,22 +884,23 @@ Examples:
                 # Decode output
                 stdout_text = stdout.decode("utf-8", errors="replace")
                 stderr_text = stderr.decode("utf-8", errors="replace")
+                returncode = process.returncode
 
-                # Create result (content auto-formatted by model_validator)
-                is_success = process.returncode == 0
-                error_msg = None
-                if not is_success:
-                    error_msg = f"Command failed with exit code {process.returncode}"
-                    if stderr_text:
-                        error_msg += f"\n{stderr_text.strip()}"
+            # Create result (content auto-formatted by model_validator)
+            is_success = returncode == 0
+            error_msg = None
+            if not is_success:
+                error_msg = f"Command failed with exit code {returncode}"
+                if stderr_text:
+                    error_msg += f"\n{stderr_text.strip()}"
 
-                return BashOutputResult(
-                    success=is_success,
-                    error=error_msg,
-                    stdout=stdout_text,
-                    stderr=stderr_text,
-                    exit_code=process.returncode or 0,
-                )
+            return BashOutputResult(
+                success=is_success,
+                error=error_msg,
+                stdout=stdout_text,
+                stderr=stderr_text,
+                exit_code=returncode or 0,
+            )
 
         except Exception as e:
             return BashOutputResult(
@@ -442,6 +927,7 @@ class BashOutputTool(Tool):
         - Always returns only new output since the last check
         - Returns stdout and stderr output along with shell status
         - Supports optional regex filtering to show only lines matching a pattern
+        - Can wait (wait_seconds) until new output arrives or the shell exits, instead of polling repeatedly
         - Use this tool when you need to monitor or check the output of a long-running shell
         - Shell IDs can be found using the bash tool with run_in_background=true
 
@@ -467,20 +953,31 @@ class BashOutputTool(Tool):
                     "type": "string",
                     "description": "Optional regular expression to filter the output lines. Only lines matching this regex will be included in the result. Any lines that do not match will no longer be available to read.",
                 },
+                "wait_seconds": {
+                    "type": "number",
+                    "description": f"Optional: Wait up to this many seconds (max: {MAX_OUTPUT_WAIT}) for new output or the shell to exit before returning. Default 0 returns immediately.",
+                    "default": 0,
+                },
             },
             "required": ["bash_id"],
         }
 
+    def resource_key(self, bash_id: str = "", **kwargs) -> str | None:
+        # Only ordered against calls on the same background shell
+        return f"bash_shell:{bash_id}"
+
     async def execute(
         self,
         bash_id: str,
         filter_str: str | None = None,
+        wait_seconds: float = 0,
     ) -> BashOutputResult:
         """Retrieve output from background shell.
 
         Args:
             bash_id: The unique identifier of the background shell
             filter_str: Optional regex pattern to filter output lines
+            wait_seconds: Wait up to this many seconds for new output or process exit
 
         Returns:
             BashOutputResult with shell output including stdout, stderr, status, and success flag
@@ -499,9 +996,19 @@ class BashOutputTool(Tool):
                     exit_code=-1,
                 )
 
+            if wait_seconds > 0:
+                await bg_shell.wait_for_output(min(wait_seconds, MAX_OUTPUT_WAIT))
+
             # Get new output
+            missed_before = bg_shell.missed_lines
             new_lines = bg_shell.get_new_output(filter_pattern=filter_str)
             stdout = "\n".join(new_lines) if new_lines else ""
+            missed = bg_shell.missed_lines - missed_before
+            if missed:
+                note = f"[{missed} earlier lines dropped from memory"
+                if bg_shell.spill_file is not None:
+                    note += f"; full output in {bg_shell.spill_file.path}"
+                stdout = f"{note}]\n{stdout}" if stdout else f"{note}]"
 
             return BashOutputResult(
                 success=True,
@@ -554,6 +1061,9 @@ class BashKillTool(Tool):
             "required": ["bash_id"],
         }
 
+    def resource_key(self, bash_id: str = "", **kwargs) -> str | None:
+        return f"bash_shell:{bash_id}"
+
     async def execute(self, bash_id: str) -> BashOutputResult:
         """Terminate a background shell process.
 
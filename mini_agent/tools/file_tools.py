@@ -1,63 +1,225 @@
 """File operation tools."""
 
+import asyncio
+import difflib
+import itertools
+import os
+import re
+import tempfile
 from pathlib import Path
 from typing import Any
 
-import tiktoken
-
+from ..utils.token_utils import count_tokens, truncate_text_by_tokens
 from .base import Tool, ToolResult
+from .line_index import is_binary_file, read_lines
+from .workspace_index import invalidate_workspace_path
 
+# Token limit of read_file output
+MAX_READ_TOKENS = 32000
 
-def truncate_text_by_tokens(
-    text: str,
-    max_tokens: int,
-) -> str:
-    """Truncate text by token count if it exceeds the limit.
+# Bytes read per token of budget before tokens are counted (generous: code indentation can exceed 4 chars/token)
+READ_BYTES_PER_TOKEN = 8
 
-    When text exceeds the specified token limit, performs intelligent truncation
-    by keeping the front and back parts while truncating the middle.
+# Unchanged lines shown around each change in edit_file diffs
+DIFF_CONTEXT_LINES = 2
 
-    Args:
-        text: Text to be truncated
-        max_tokens: Maximum token limit
+# Token limit of the diff returned by edit_file
+MAX_DIFF_TOKENS = 8000
 
-    Returns:
-        str: Truncated text if it exceeds the limit, otherwise the original text.
+_HUNK_HEADER_RE = re.compile(r"^@@ -(\d+)(,\d+)? \+(\d+)(,\d+)? @@")
 
-    Example:
-        >>> text = "very long text..." * 10000
-        >>> truncated = truncate_text_by_tokens(text, 64000)
-        >>> print(truncated)
-    """
-    encoding = tiktoken.get_encoding("cl100k_base")
-    token_count = len(encoding.encode(text))
 
-    # Return original text if under limit
-    if token_count <= max_tokens:
-        return text
+def _fit_lines_to_tokens(lines: list[str], max_tokens: int) -> int:
+    """Number of leading lines whose joined text fits the token limit."""
+    kept = len(lines)
+    while kept:
+        text = "\n".join(lines[:kept])
+        token_count = count_tokens(text)
+        if token_count <= max_tokens:
+            break
+        # Shrink proportionally to the overshoot (with 5% safety margin)
+        target_chars = len(text) * max_tokens / token_count * 0.95
+        chars = 0
+        for i, line in enumerate(lines[:kept]):
+            chars += len(line) + 1
+            if chars > target_chars:
+                kept = i
+                break
+    return kept
 
-    # Calculate token/character ratio for approximation
-    char_count = len(text)
-    ratio = token_count / char_count
 
-    # Keep head and tail mode: allocate half space for each (with 5% safety margin)
-    chars_per_half = int((max_tokens / 2) / ratio * 0.95)
+def _locate_edits(content: str, edits: list[dict[str, str]]) -> list[tuple[int, int, str]]:
+    """Find the unique, non-overlapping match of each edit in content.
+
+    Args:
+        content: Original file content
+        edits: Ordered list of {"old_str", "new_str"} replacements
+
+    Returns:
+        (start, end, new_str) spans sorted by position
 
-    # Truncate front part: find nearest newline
-    head_part = text[:chars_per_half]
-    last_newline_head = head_part.rfind("\n")
-    if last_newline_head > 0:
-        head_part = head_part[:last_newline_head]
+    Raises:
+        ValueError: An edit is malformed, not found, ambiguous or overlaps another
+    """
+    spans = []
+    for number, edit in enumerate(edits, start=1):
+        old_str = edit.get("old_str")
+        new_str = edit.get("new_str")
+        if not isinstance(old_str, str) or not isinstance(new_str, str) or not old_str:
+            raise ValueError(f"Edit {number}: old_str must be a non-empty string and new_str a string")
+
+        start = content.find(old_str)
+        if start == -1:
+            raise ValueError(f"Edit {number}: text not found in file: {old_str}")
+        if content.find(old_str, start + 1) != -1:
+            raise ValueError(f"Edit {number}: text appears more than once in file, include more surrounding context: {old_str}")
+        spans.append((start, start + len(old_str), new_str, number))
+
+    spans.sort()
+    for previous, current in zip(spans, spans[1:]):
+        if current[0] < previous[1]:
+            raise ValueError(f"Edit {current[3]} overlaps edit {previous[3]}")
+    return [(start, end, new_str) for start, end, new_str, _ in spans]
+
+
+def _context_start(content: str, line_start: int) -> int:
+    """Start of the line DIFF_CONTEXT_LINES lines before the line at line_start"""
+    for _ in range(DIFF_CONTEXT_LINES):
+        if line_start == 0:
+            break
+        line_start = content.rfind("\n", 0, line_start - 1) + 1
+    return line_start
+
+
+def _context_end(content: str, line_end: int) -> int:
+    """End of the line DIFF_CONTEXT_LINES lines after the line ending at line_end"""
+    for _ in range(DIFF_CONTEXT_LINES):
+        if line_end >= len(content):
+            break
+        next_end = content.find("\n", line_end + 1)
+        line_end = len(content) if next_end == -1 else next_end
+    return line_end
+
+
+def _diff_lines(text: str) -> list[str]:
+    """Split text into lines for diffing (no empty line after a final newline)"""
+    lines = text.split("\n")
+    if text.endswith("\n"):
+        lines.pop()
+    return lines
+
+
+def _apply_edits(content: str, spans: list[tuple[int, int, str]]) -> tuple[str, str]:
+    """Apply located edits in one pass and build a unified diff of them.
+
+    Only a window of a few context lines around each edit is diffed, so the
+    cost does not grow with the size of the file. Edits whose windows touch
+    are shown in one hunk.
 
-    # Truncate back part: find nearest newline
-    tail_part = text[-chars_per_half:]
-    first_newline_tail = tail_part.find("\n")
-    if first_newline_tail > 0:
-        tail_part = tail_part[first_newline_tail + 1 :]
+    Args:
+        content: Original file content
+        spans: Sorted (start, end, new_str) spans from _locate_edits()
 
-    # Combine result
-    truncation_note = f"\n\n... [Content truncated: {token_count} tokens -> ~{max_tokens} tokens limit] ...\n\n"
-    return head_part + truncation_note + tail_part
+    Returns:
+        Tuple of (new content, diff)
+    """
+    # Group edits by their context windows
+    groups: list[list] = []
+    for start, end, new_str in spans:
+        line_end = content.find("\n", end)
+        window_start = _context_start(content, content.rfind("\n", 0, start) + 1)
+        window_end = _context_end(content, len(content) if line_end == -1 else line_end)
+        if groups and window_start <= groups[-1][1] + 1:
+            groups[-1][1] = max(groups[-1][1], window_end)
+            groups[-1][2].append((start, end, new_str))
+        else:
+            groups.append([window_start, window_end, [(start, end, new_str)]])
+
+    parts = []
+    hunks = []
+    pos = 0
+    # Line numbers are counted incrementally from one window to the next
+    line_pos = 0
+    old_line = new_line = 1
+
+    for window_start, window_end, group in groups:
+        skipped = content.count("\n", line_pos, window_start)
+        old_line += skipped
+        new_line += skipped
+
+        window_parts = []
+        window_pos = window_start
+        for start, end, new_str in group:
+            window_parts.append(content[window_pos:start])
+            window_parts.append(new_str)
+            window_pos = end
+        window_parts.append(content[window_pos:window_end])
+        old_window = content[window_start:window_end]
+        new_window = "".join(window_parts)
+
+        parts.append(content[pos:window_start])
+        parts.append(new_window)
+        pos = window_end
+
+        diff = difflib.unified_diff(_diff_lines(old_window), _diff_lines(new_window), n=DIFF_CONTEXT_LINES, lineterm="")
+        for line in itertools.islice(diff, 2, None):  # Skip the ---/+++ file header
+            match = _HUNK_HEADER_RE.match(line)
+            if match:
+                old_start, old_count, new_start, new_count = match.groups()
+                line = f"@@ -{int(old_start) + old_line - 1}{old_count or ''} +{int(new_start) + new_line - 1}{new_count or ''} @@"
+            hunks.append(line)
+
+        old_line += old_window.count("\n")
+        new_line += new_window.count("\n")
+        line_pos = window_end
+
+    parts.append(content[pos:])
+    return "".join(parts), "\n".join(hunks)
+
+
+def _atomic_write(file_path: Path, text: str):
+    """Write a file via a temporary file in the same directory and a rename.
+
+    Readers see either the old or the new content, never a partial write. The
+    permissions and ownership of an existing file are kept, and a symlink is
+    followed so its target is written. Hardlinked files, and files whose owner
+    cannot be kept, are written in place instead so the other links see the
+    change.
+    """
+    file_path = Path(os.path.realpath(file_path))
+    stat = file_path.stat() if file_path.exists() else None
+    if stat is not None and stat.st_nlink > 1:
+        file_path.write_text(text, encoding="utf-8")
+        return
+
+    fd, temp_name = tempfile.mkstemp(dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        if stat is not None:
+            temp_stat = os.stat(temp_name)
+            if hasattr(os, "chown") and (stat.st_uid, stat.st_gid) != (temp_stat.st_uid, temp_stat.st_gid):
+                try:
+                    os.chown(temp_name, stat.st_uid, stat.st_gid)
+                except PermissionError:
+                    Path(temp_name).unlink()
+                    file_path.write_text(text, encoding="utf-8")
+                    return
+            os.chmod(temp_name, stat.st_mode & 0o7777)
+        os.replace(temp_name, file_path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+def _resolve_path(workspace_dir: Path, path: str) -> Path:
+    """Resolve a tool path argument relative to the workspace directory."""
+    file_path = Path(path)
+    if not file_path.is_absolute():
+        file_path = workspace_dir / file_path
+    return file_path
 
 
 class ReadTool(Tool):
@@ -105,13 +267,18 @@ class ReadTool(Tool):
             "required": ["path"],
         }
 
+    @property
+    def is_mutating(self) -> bool:
+        return False
+
+    def resource_key(self, path: str = "", **kwargs) -> str | None:
+        return str(_resolve_path(self.workspace_dir, path).resolve()) if path else None
+
     async def execute(self, path: str, offset: int | None = None, limit: int | None = None) -> ToolResult:
         """Execute read file."""
         try:
-            file_path = Path(path)
             # Resolve relative paths relative to workspace_dir
-            if not file_path.is_absolute():
-                file_path = self.workspace_dir / file_path
+            file_path = _resolve_path(self.workspace_dir, path)
 
             if not file_path.exists():
                 return ToolResult(
@@ -120,32 +287,33 @@ class ReadTool(Tool):
                     error=f"File not found: {path}",
                 )
 
-            # Read file content with line numbers
-            with open(file_path, encoding="utf-8") as f:
-                lines = f.readlines()
-
-            # Apply offset and limit
-            start = (offset - 1) if offset else 0
-            end = (start + limit) if limit else len(lines)
-            if start < 0:
-                start = 0
-            if end > len(lines):
-                end = len(lines)
+            if is_binary_file(file_path):
+                return ToolResult(
+                    success=False,
+                    content="",
+                    error=f"Cannot read binary file: {path} ({file_path.stat().st_size} bytes)",
+                )
 
-            selected_lines = lines[start:end]
+            # Read only the requested lines, within the output budget
+            start = max((offset - 1) if offset else 0, 0)
+            raw_lines, budget_reached = read_lines(file_path, start, limit or None, MAX_READ_TOKENS * READ_BYTES_PER_TOKEN)
 
-            # Format with line numbers (1-indexed)
-            numbered_lines = []
-            for i, line in enumerate(selected_lines, start=start + 1):
-                # Remove trailing newline for formatting
-                line_content = line.rstrip("\n")
-                numbered_lines.append(f"{i:6d}|{line_content}")
+            # Format with line numbers (1-indexed); invalid UTF-8 is replaced
+            numbered_lines = [f"{i:6d}|{line.decode('utf-8', errors='replace')}" for i, line in enumerate(raw_lines, start=start + 1)]
 
-            content = "\n".join(numbered_lines)
+            # Keep whole lines within the token limit
+            kept = _fit_lines_to_tokens(numbered_lines, MAX_READ_TOKENS)
+            if kept:
+                content = "\n".join(numbered_lines[:kept])
+            elif numbered_lines:
+                # A single line longer than the limit
+                kept = 1
+                content = truncate_text_by_tokens(numbered_lines[0], MAX_READ_TOKENS)
+            else:
+                content = ""
 
-            # Apply token truncation if needed
-            max_tokens = 32000
-            content = truncate_text_by_tokens(content, max_tokens)
+            if budget_reached or kept < len(numbered_lines):
+                content += f"\n\n... [Output truncated at ~{MAX_READ_TOKENS} tokens. Use offset={start + kept + 1} to continue reading] ..."
 
             return ToolResult(success=True, content=content)
         except Exception as e:
@@ -192,18 +360,24 @@ class WriteTool(Tool):
             "required": ["path", "content"],
         }
 
+    @property
+    def is_mutating(self) -> bool:
+        return True
+
+    def resource_key(self, path: str = "", **kwargs) -> str | None:
+        return str(_resolve_path(self.workspace_dir, path).resolve()) if path else None
+
     async def execute(self, path: str, content: str) -> ToolResult:
         """Execute write file."""
         try:
-            file_path = Path(path)
             # Resolve relative paths relative to workspace_dir
-            if not file_path.is_absolute():
-                file_path = self.workspace_dir / file_path
+            file_path = _resolve_path(self.workspace_dir, path)
 
             # Create parent directories if they don't exist
             file_path.parent.mkdir(parents=True, exist_ok=True)
 
             file_path.write_text(content, encoding="utf-8")
+            await asyncio.to_thread(invalidate_workspace_path, file_path)
             return ToolResult(success=True, content=f"Successfully wrote to {file_path}")
         except Exception as e:
             return ToolResult(success=False, content="", error=str(e))
@@ -229,6 +403,9 @@ class EditTool(Tool):
         return (
             "Perform exact string replacement in a file. The old_str must match exactly "
             "and appear uniquely in the file, otherwise the operation will fail. "
+            "To make several changes to one file, pass them all at once in `edits` instead of "
+            "calling the tool repeatedly: they are validated against the current content and "
+            "applied together, or not at all. Returns a diff of the changes. "
             "You must read the file first before editing. Preserve exact indentation from the source."
         )
 
@@ -249,17 +426,50 @@ class EditTool(Tool):
                     "type": "string",
                     "description": "Replacement string (use for refactoring, renaming, etc.)",
                 },
+                "edits": {
+                    "type": "array",
+                    "description": "Several replacements to apply at once (instead of old_str/new_str). "
+                    "Each old_str must be unique in the original file and edits must not overlap",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "old_str": {"type": "string", "description": "Exact string to find and replace"},
+                            "new_str": {"type": "string", "description": "Replacement string"},
+                        },
+                        "required": ["old_str", "new_str"],
+                    },
+                },
             },
-            "required": ["path", "old_str", "new_str"],
+            "required": ["path"],
         }
 
-    async def execute(self, path: str, old_str: str, new_str: str) -> ToolResult:
+    @property
+    def is_mutating(self) -> bool:
+        return True
+
+    def resource_key(self, path: str = "", **kwargs) -> str | None:
+        return str(_resolve_path(self.workspace_dir, path).resolve()) if path else None
+
+    async def execute(
+        self,
+        path: str,
+        old_str: str | None = None,
+        new_str: str | None = None,
+        edits: list[dict[str, str]] | None = None,
+    ) -> ToolResult:
         """Execute edit file."""
         try:
-            file_path = Path(path)
+            if edits is None:
+                if old_str is None or new_str is None:
+                    return ToolResult(success=False, content="", error="Provide old_str and new_str, or edits")
+                edits = [{"old_str": old_str, "new_str": new_str}]
+            elif old_str is not None:
+                edits = [{"old_str": old_str, "new_str": new_str or ""}] + list(edits)
+            if not edits:
+                return ToolResult(success=False, content="", error="No edits given")
+
             # Resolve relative paths relative to workspace_dir
-            if not file_path.is_absolute():
-                file_path = self.workspace_dir / file_path
+            file_path = _resolve_path(self.workspace_dir, path)
 
             if not file_path.exists():
                 return ToolResult(
@@ -270,16 +480,17 @@ class EditTool(Tool):
 
             content = file_path.read_text(encoding="utf-8")
 
-            if old_str not in content:
-                return ToolResult(
-                    success=False,
-                    content="",
-                    error=f"Text not found in file: {old_str}",
-                )
+            # Validate every edit before anything is written
+            try:
+                spans = _locate_edits(content, edits)
+            except ValueError as e:
+                return ToolResult(success=False, content="", error=str(e))
 
-            new_content = content.replace(old_str, new_str)
-            file_path.write_text(new_content, encoding="utf-8")
+            new_content, diff = _apply_edits(content, spans)
+            _atomic_write(file_path, new_content)
+            await asyncio.to_thread(invalidate_workspace_path, file_path)
 
-            return ToolResult(success=True, content=f"Successfully edited {file_path}")
+            summary = f"Successfully edited {file_path} ({len(spans)} {'edit' if len(spans) == 1 else 'edits'})"
+            return ToolResult(success=True, content=f"{summary}\n{truncate_text_by_tokens(diff, MAX_DIFF_TOKENS)}")
         except Exception as e:
             return ToolResult(success=False, content="", error=str(e))
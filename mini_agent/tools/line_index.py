@@ -0,0 +1,164 @@
+"""Memory-bounded line access to large files.
+
+Files are memory-mapped and read line by line from the requested offset, so
+paging through a multi-gigabyte log only touches the pages that are returned.
+A sparse index of line start offsets (one entry every LINE_INDEX_STRIDE lines)
+is cached per file and extended on demand; it is dropped when the file's
+mtime or size changes.
+"""
+
+import mmap
+import os
+import threading
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+
+# Lines between two cached line start offsets
+LINE_INDEX_STRIDE = 1024
+
+# Number of files whose line index is cached
+LINE_INDEX_CACHE_SIZE = 64
+
+# Bytes inspected to tell binary files from text
+BINARY_SNIFF_BYTES = 8192
+
+
+class LineIndex:
+    """Sparse index of line start offsets of one version of a file"""
+
+    def __init__(self, mtime_ns: int, size: int):
+        self.mtime_ns = mtime_ns
+        self.size = size
+        # checkpoints[k] is the byte offset of line k * LINE_INDEX_STRIDE
+        self.checkpoints = array("Q", [0])
+        # Furthest line whose start offset is known
+        self.scanned_line = 0
+        self.scanned_pos = 0
+
+    def _record(self, line: int, pos: int):
+        """Remember the start offset of a line reached while scanning"""
+        if line > self.scanned_line:
+            self.scanned_line = line
+            self.scanned_pos = pos
+            if line % LINE_INDEX_STRIDE == 0:
+                self.checkpoints.append(pos)
+
+    def seek(self, data: mmap.mmap, line: int) -> int | None:
+        """Find the byte offset where a line starts.
+
+        Args:
+            data: Mapped file content
+            line: 0-based line number
+
+        Returns:
+            Byte offset, or None if the file has fewer lines
+        """
+        if line <= self.scanned_line:
+            current = (line // LINE_INDEX_STRIDE) * LINE_INDEX_STRIDE
+            pos = self.checkpoints[line // LINE_INDEX_STRIDE]
+        else:
+            current, pos = self.scanned_line, self.scanned_pos
+
+        while current < line:
+            newline = data.find(b"\n", pos)
+            if newline == -1:
+                return None
+            pos = newline + 1
+            current += 1
+            self._record(current, pos)
+
+        return pos if pos < self.size else None
+
+    def read(self, data: mmap.mmap, start: int, limit: int | None, max_bytes: int) -> tuple[list[bytes], bool]:
+        """Read lines from a line number on, within a byte budget.
+
+        Args:
+            data: Mapped file content
+            start: 0-based first line
+            limit: Maximum number of lines (None: up to the end of the file)
+            max_bytes: Byte budget; reading stops at a line end once it is used up (a
+                first line longer than the budget is cut)
+
+        Returns:
+            Tuple of (lines without line endings, whether the byte budget stopped reading)
+        """
+        pos = self.seek(data, start)
+        lines: list[bytes] = []
+        if pos is None:
+            return lines, False
+
+        budget = max_bytes
+        line = start
+        while pos < self.size and (limit is None or len(lines) < limit):
+            newline = data.find(b"\n", pos)
+            end = self.size if newline == -1 else newline
+            if end - pos > budget:
+                # Cut a line only if it alone exceeds the budget
+                if not lines:
+                    lines.append(data[pos : pos + budget])
+                return lines, True
+            lines.append(data[pos:end].rstrip(b"\r"))
+            budget -= end - pos + 1
+            pos = end + 1
+            line += 1
+            self._record(line, pos)
+            if budget <= 0 and pos < self.size and (limit is None or len(lines) < limit):
+                return lines, True
+
+        return lines, False
+
+
+class LineIndexCache:
+    """LRU cache of line indexes, keyed by resolved path"""
+
+    def __init__(self, max_files: int = LINE_INDEX_CACHE_SIZE):
+        self.max_files = max_files
+        self._indexes: OrderedDict[str, LineIndex] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: Path, stat: os.stat_result) -> LineIndex:
+        """Get the index of a file, creating a new one if the file changed"""
+        key = str(path)
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is None or index.mtime_ns != stat.st_mtime_ns or index.size != stat.st_size:
+                index = LineIndex(stat.st_mtime_ns, stat.st_size)
+                self._indexes[key] = index
+                if len(self._indexes) > self.max_files:
+                    self._indexes.popitem(last=False)
+            else:
+                self._indexes.move_to_end(key)
+            return index
+
+
+# Process-wide cache used by ReadTool
+line_indexes = LineIndexCache()
+
+
+def is_binary_file(path: Path) -> bool:
+    """Check for NUL bytes at the start of a file (like git and grep)"""
+    with open(path, "rb") as f:
+        return b"\0" in f.read(BINARY_SNIFF_BYTES)
+
+
+def read_lines(path: Path, start: int, limit: int | None, max_bytes: int) -> tuple[list[bytes], bool]:
+    """Read lines of a file without loading it fully.
+
+    Args:
+        path: File to read
+        start: 0-based first line
+        limit: Maximum number of lines (None: up to the end of the file)
+        max_bytes: Byte budget of the returned lines
+
+    Returns:
+        Tuple of (raw lines without line endings, whether the byte budget stopped reading)
+    """
+    path = path.resolve()
+    with open(path, "rb") as f:
+        stat = os.fstat(f.fileno())
+        if stat.st_size == 0:
+            return [], False
+        index = line_indexes.get(path, stat)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return index.read(data, start, limit, max_bytes)
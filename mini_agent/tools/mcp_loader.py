@@ -1,15 +1,98 @@
-"""MCP tool loader with real MCP client integration."""
-
+"""MCP tool loader with real MCP client integration.
+
+All configured servers are started concurrently, each with its own connect
+timeout. In lazy mode, tool schemas are taken from an on-disk cache (keyed by
+the server's command, arguments, environment and configured version) and the
+server process is only spawned by the first call of one of its tools; the
+cache is refreshed whenever a server is actually started.
+
+Tool calls are bounded per server (in-flight limit and per-call deadline),
+dead server processes are restarted with backoff, and stateless servers can
+be run as a pool of processes. Call counts, errors and latencies are kept
+per tool (see get_mcp_stats).
+"""
+
+import asyncio
+import hashlib
 import json
+import math
+import os
+import tempfile
+import time
+from collections import deque
 from contextlib import AsyncExitStack
 from pathlib import Path
-from typing import Any
-
-from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
+from typing import TYPE_CHECKING, Any
 
+from ..utils.token_utils import truncate_text_by_tokens
 from .base import Tool, ToolResult
 
+if TYPE_CHECKING:
+    from mcp import ClientSession
+
+# Token limit of an MCP tool result returned to the model
+MAX_RESULT_TOKENS = 32000
+
+# Seconds allowed for starting a server, initializing the session and listing its tools
+MCP_CONNECT_TIMEOUT = 30.0
+
+# Seconds allowed for one tool call, once a server process has been assigned to it
+MCP_CALL_TIMEOUT = 120.0
+
+# Tool calls running at once on one server (across all processes of its pool)
+MCP_MAX_IN_FLIGHT = 8
+
+# Restart backoff after a server died or failed to start: first delay and cap in seconds
+MCP_RECONNECT_BACKOFF = 0.5
+MCP_RECONNECT_BACKOFF_MAX = 30.0
+
+# Tool schemas of previously started servers, used in lazy mode
+MCP_SCHEMA_CACHE_PATH = Path.home() / ".mini-agent" / "cache" / "mcp_tools.json"
+
+
+def _field(obj: Any, name: str, legacy_name: str, default: Any = None) -> Any:
+    """Read an MCP model field (snake_case in newer SDKs, camelCase in older ones)"""
+    value = getattr(obj, name, None)
+    if value is None:
+        value = getattr(obj, legacy_name, default)
+    return value
+
+
+def mcp_schema_cache_key(command: str, args: list[str], env: dict[str, str] | None, version: str | None = None) -> str:
+    """Cache key of a server's tool schemas"""
+    canonical = json.dumps([command, args, env or {}, version], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class MCPSchemaCache:
+    """JSON file mapping server keys to their server version and tool schemas"""
+
+    def __init__(self, path: str | Path = MCP_SCHEMA_CACHE_PATH):
+        self.path = Path(path).expanduser()
+        try:
+            self._entries: dict[str, Any] = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Get the cached entry ({"version", "tools"}) of a server"""
+        return self._entries.get(key)
+
+    def put(self, key: str, version: str | None, tools: list[dict[str, Any]]):
+        """Store the tool schemas of a server and write the cache file atomically"""
+        entry = {"version": version, "tools": tools}
+        if self._entries.get(key) == entry:
+            return
+        self._entries[key] = entry
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_name = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f)
+            os.replace(temp_name, self.path)
+        except OSError as e:
+            print(f"⚠️  Failed to write MCP schema cache {self.path}: {e}")
+
 
 class MCPTool(Tool):
     """Wrapper for MCP tools."""
@@ -19,12 +102,12 @@ class MCPTool(Tool):
         name: str,
         description: str,
         parameters: dict[str, Any],
-        session: ClientSession,
+        connection: "MCPServerConnection",
     ):
         self._name = name
         self._description = description
         self._parameters = parameters
-        self._session = session
+        self._connection = connection
 
     @property
     def name(self) -> str:
@@ -39,9 +122,9 @@ class MCPTool(Tool):
         return self._parameters
 
     async def execute(self, **kwargs) -> ToolResult:
-        """Execute MCP tool via the session."""
+        """Execute MCP tool via the server connection (started on first use in lazy mode)."""
         try:
-            result = await self._session.call_tool(self._name, arguments=kwargs)
+            result = await self._connection.call_tool(self._name, kwargs)
 
             # MCP tool results are a list of content items
             content_parts = []
@@ -51,9 +134,9 @@ class MCPTool(Tool):
                 else:
                     content_parts.append(str(item))
 
-            content_str = '\n'.join(content_parts)
+            content_str = truncate_text_by_tokens('\n'.join(content_parts), MAX_RESULT_TOKENS)
 
-            is_error = result.isError if hasattr(result, 'isError') else False
+            is_error = bool(_field(result, "is_error", "isError", False))
 
             return ToolResult(
                 success=not is_error,
@@ -68,102 +151,396 @@ class MCPTool(Tool):
             )
 
 
+def _is_connection_lost(error: BaseException) -> bool:
+    """Whether a call failed because the server process or its pipes are gone"""
+    import anyio
+    from mcp.types import CONNECTION_CLOSED
+
+    if isinstance(error, (anyio.ClosedResourceError, anyio.BrokenResourceError, anyio.EndOfStream, ConnectionError)):
+        return True
+    return getattr(getattr(error, "error", None), "code", None) == CONNECTION_CLOSED
+
+
+def reconnect_delay(failures: int) -> float:
+    """Backoff before restarting a server after consecutive failures"""
+    if failures <= 0:
+        return 0.0
+    return min(MCP_RECONNECT_BACKOFF_MAX, MCP_RECONNECT_BACKOFF * 2 ** (failures - 1))
+
+
+class MCPToolMetrics:
+    """Call counts and recent latencies of one MCP tool"""
+
+    def __init__(self, window: int = 256):
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.total_latency = 0.0
+        self.samples: deque[float] = deque(maxlen=window)
+
+    def record(self, latency: float, error: bool = False, timeout: bool = False):
+        self.calls += 1
+        self.errors += error or timeout
+        self.timeouts += timeout
+        self.total_latency += latency
+        self.samples.append(latency)
+
+    def stats(self) -> dict[str, Any]:
+        ordered = sorted(self.samples)
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "mean_latency": self.total_latency / self.calls if self.calls else None,
+            "p95_latency": ordered[min(len(ordered) - 1, math.ceil(0.95 * len(ordered)) - 1)] if ordered else None,
+        }
+
+
+class MCPServerProcess:
+    """One process of an MCP server and its client session.
+
+    The stdio client and session contexts are entered and exited by one
+    dedicated task, so processes can be started concurrently and stopped from
+    any task.
+    """
+
+    def __init__(self, connection: "MCPServerConnection", index: int):
+        self.connection = connection
+        self.index = index
+        self.session: "ClientSession | None" = None
+        self.server_version: str | None = None
+        self.tool_schemas: list[dict[str, Any]] = []
+        self.in_flight = 0
+        # Consecutive failed starts and lost connections, for the restart backoff
+        self.failures = 0
+        self.retry_at = 0.0
+        self.generation = 0
+        self._task: asyncio.Task | None = None
+        self._stop: asyncio.Event | None = None
+        self._start_lock = asyncio.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self.session is not None
+
+    async def start(self) -> bool:
+        """Spawn the process and initialize the session, if not running.
+
+        Waits out the restart backoff of earlier failures first.
+
+        Returns:
+            True if the process was started by this call
+
+        Raises:
+            asyncio.TimeoutError: Not ready within the connect timeout
+            Exception: Server failed to start
+        """
+        async with self._start_lock:
+            if self.session is not None:
+                return False
+
+            delay = self.retry_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            ready = asyncio.get_running_loop().create_future()
+            self._stop = asyncio.Event()
+            self._task = asyncio.create_task(self._run(ready, self._stop), name=f"mcp-{self.connection.name}-{self.index}")
+            try:
+                await asyncio.wait_for(asyncio.shield(ready), self.connection.connect_timeout)
+            except BaseException:
+                await self._stop_task(cancel=True)
+                self._record_failure()
+                raise
+            self.generation += 1
+            return True
+
+    def _record_failure(self):
+        self.failures += 1
+        self.retry_at = time.monotonic() + reconnect_delay(self.failures)
+
+    async def _run(self, ready: asyncio.Future, stop: asyncio.Event):
+        """Own the server process and session until stop is set"""
+        try:
+            # The MCP SDK is only imported once a server is actually started
+            from mcp import ClientSession, StdioServerParameters
+            from mcp.client.stdio import stdio_client
+
+            server_params = StdioServerParameters(
+                command=self.connection.command,
+                args=self.connection.args,
+                env=self.connection.env if self.connection.env else None
+            )
+
+            # Use AsyncExitStack to properly manage multiple async context managers
+            async with AsyncExitStack() as exit_stack:
+                read_stream, write_stream = await exit_stack.enter_async_context(stdio_client(server_params))
+                session = await exit_stack.enter_async_context(ClientSession(read_stream, write_stream))
+
+                # Initialize the session and list available tools
+                init_result = await session.initialize()
+                tools_list = await session.list_tools()
+
+                server_info = _field(init_result, "server_info", "serverInfo")
+                self.server_version = getattr(server_info, "version", None)
+                self.tool_schemas = [
+                    {
+                        "name": tool.name,
+                        "description": tool.description or "",
+                        # Convert MCP tool schema to our format
+                        "parameters": _field(tool, "input_schema", "inputSchema", {}) or {},
+                    }
+                    for tool in tools_list.tools
+                ]
+                self.session = session
+                ready.set_result(None)
+
+                await stop.wait()
+        except BaseException as e:
+            if not ready.done():
+                if isinstance(e, asyncio.CancelledError):
+                    ready.cancel()
+                else:
+                    ready.set_exception(e)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+        finally:
+            self.session = None
+
+    async def _stop_task(self, cancel: bool = False):
+        """Stop the task owning the process, cancelling it if it does not exit.
+
+        Args:
+            cancel: Cancel right away (the server never became ready)
+        """
+        task, self._task = self._task, None
+        if task is None:
+            return
+        if cancel:
+            task.cancel()
+        elif self._stop is not None:
+            self._stop.set()
+        try:
+            await asyncio.wait_for(task, timeout=5.0)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            task.cancel()
+        except Exception:
+            pass
+
+    async def call_tool(self, name: str, arguments: dict[str, Any], timeout: float | None) -> Any:
+        """Call a tool on the running session.
+
+        Raises:
+            asyncio.TimeoutError: No result within timeout (the process is kept)
+            ConnectionError: The process died; it is restarted by the next call
+        """
+        generation = self.generation
+        session = self.session
+        if session is None:
+            raise ConnectionError(f"MCP server '{self.connection.name}' is not running")
+        try:
+            result = await asyncio.wait_for(session.call_tool(name, arguments=arguments), timeout)
+        except Exception as e:
+            if not _is_connection_lost(e):
+                raise
+            await self._connection_lost(generation)
+            raise ConnectionError(f"MCP server '{self.connection.name}' exited during the call; it is restarted on the next call") from e
+        self.failures = 0
+        return result
+
+    async def _connection_lost(self, generation: int):
+        """Drop a dead session (once, however many calls saw it fail)"""
+        async with self._start_lock:
+            if generation != self.generation or self._task is None:
+                return
+            self.session = None
+            self.connection.restarts += 1
+            self._record_failure()
+            await self._stop_task()
+
+    async def stop(self):
+        """Stop the process"""
+        await self._stop_task()
+        self.session = None
+
+
 class MCPServerConnection:
-    """Manages connection to a single MCP server."""
+    """Manages connection to a single MCP server.
+
+    Calls go through a per-server execution layer: at most max_in_flight
+    calls run at once, each call has a deadline, and a server process that
+    dies is restarted by the next call, with exponential backoff after
+    repeated failures. Calls that were running when the process died fail;
+    they are not retried since they may already have had side effects.
+
+    Stateless servers can be run as a pool of processes: calls go to the
+    least busy process, and further processes are only spawned when all
+    running ones are busy.
+    """
 
-    def __init__(self, name: str, command: str, args: list[str], env: dict[str, str] | None = None):
+    def __init__(
+        self,
+        name: str,
+        command: str,
+        args: list[str],
+        env: dict[str, str] | None = None,
+        connect_timeout: float = MCP_CONNECT_TIMEOUT,
+        call_timeout: float | None = MCP_CALL_TIMEOUT,
+        max_in_flight: int = MCP_MAX_IN_FLIGHT,
+        pool_size: int = 1,
+    ):
         self.name = name
         self.command = command
         self.args = args
         self.env = env or {}
-        self.session: ClientSession | None = None
-        self.exit_stack: AsyncExitStack | None = None
+        self.connect_timeout = connect_timeout
+        self.call_timeout = call_timeout
+        self.max_in_flight = max_in_flight
+        self.server_version: str | None = None
         self.tools: list[MCPTool] = []
+        self.tool_schemas: list[dict[str, Any]] = []
+        self.processes = [MCPServerProcess(self, i) for i in range(max(1, pool_size))]
+        self.metrics: dict[str, MCPToolMetrics] = {}
+        self.restarts = 0
+        self._slots = asyncio.Semaphore(max_in_flight)
+        # Called with the connection after each (lazy) start
+        self.on_start = None
 
-    async def connect(self) -> bool:
-        """Connect to the MCP server using proper async context management."""
-        try:
-            server_params = StdioServerParameters(
-                command=self.command,
-                args=self.args,
-                env=self.env if self.env else None
-            )
+    @property
+    def session(self) -> "ClientSession | None":
+        """Session of the first server process (None while not running)"""
+        return self.processes[0].session
 
-            # Use AsyncExitStack to properly manage multiple async context managers
-            self.exit_stack = AsyncExitStack()
-            
-            # Enter stdio client context
-            read_stream, write_stream = await self.exit_stack.enter_async_context(
-                stdio_client(server_params)
-            )
-            
-            # Enter client session context
-            session = await self.exit_stack.enter_async_context(
-                ClientSession(read_stream, write_stream)
-            )
-            self.session = session
-
-            # Initialize the session
-            await session.initialize()
-
-            # List available tools
-            tools_list = await session.list_tools()
-
-            # Wrap each tool
-            for tool in tools_list.tools:
-                # Convert MCP tool schema to our format
-                parameters = tool.inputSchema if hasattr(tool, 'inputSchema') else {}
-
-                mcp_tool = MCPTool(
-                    name=tool.name,
-                    description=tool.description or "",
-                    parameters=parameters,
-                    session=session
-                )
-                self.tools.append(mcp_tool)
-
-            print(f"✓ Connected to MCP server '{self.name}' - loaded {len(self.tools)} tools")
-            for tool in self.tools:
-                desc = tool.description[:60] if len(tool.description) > 60 else tool.description
-                print(f"  - {tool.name}: {desc}...")
-            return True
+    async def connect(self) -> bool:
+        """Start the server and load its tools.
 
+        Returns:
+            True on success (errors are reported, not raised)
+        """
+        try:
+            await self.start()
         except Exception as e:
-            print(f"✗ Failed to connect to MCP server '{self.name}': {e}")
-            # Clean up exit stack if connection failed
-            if self.exit_stack:
-                await self.exit_stack.aclose()
-                self.exit_stack = None
-            import traceback
-            traceback.print_exc()
+            reason = f"timed out after {self.connect_timeout:g}s" if isinstance(e, asyncio.TimeoutError) else str(e) or type(e).__name__
+            print(f"✗ Failed to connect to MCP server '{self.name}': {reason}")
             return False
 
+        self.tools = [MCPTool(schema["name"], schema["description"], schema["parameters"], self) for schema in self.tool_schemas]
+        print(f"✓ Connected to MCP server '{self.name}' - loaded {len(self.tools)} tools")
+        for tool in self.tools:
+            desc = tool.description[:60] if len(tool.description) > 60 else tool.description
+            print(f"  - {tool.name}: {desc}...")
+        return True
+
+    def load_cached_tools(self, tool_schemas: list[dict[str, Any]]):
+        """Create the tools from cached schemas without starting the server"""
+        self.tool_schemas = tool_schemas
+        self.tools = [MCPTool(schema["name"], schema["description"], schema["parameters"], self) for schema in tool_schemas]
+
+    async def start(self, process: MCPServerProcess | None = None):
+        """Start a server process (the first one by default), if not running.
+
+        Raises:
+            asyncio.TimeoutError: Not ready within connect_timeout
+            Exception: Server failed to start
+        """
+        process = process or self.processes[0]
+        if await process.start():
+            self.server_version = process.server_version
+            self.tool_schemas = process.tool_schemas
+            if self.on_start is not None:
+                self.on_start(self)
+
+    def _pick_process(self) -> MCPServerProcess:
+        """Least busy running process, or a stopped one if all running ones are busy"""
+        running = [p for p in self.processes if p.running]
+        idle = [p for p in running if p.in_flight == 0]
+        if idle:
+            return idle[0]
+        stopped = [p for p in self.processes if not p.running]
+        if stopped:
+            return min(stopped, key=lambda p: p.in_flight)
+        return min(running, key=lambda p: p.in_flight)
+
+    async def call_tool(self, name: str, arguments: dict[str, Any]) -> Any:
+        """Call a tool of this server, starting a server process first if needed.
+
+        Raises:
+            asyncio.TimeoutError: No result within call_timeout
+            ConnectionError: The server process died during the call
+        """
+        metrics = self.metrics.setdefault(name, MCPToolMetrics())
+        async with self._slots:
+            process = self._pick_process()
+            process.in_flight += 1
+            start = time.monotonic()
+            try:
+                try:
+                    await self.start(process)
+                except asyncio.TimeoutError:
+                    raise ConnectionError(f"MCP server '{self.name}' did not start within {self.connect_timeout:g}s") from None
+                result = await process.call_tool(name, arguments, self.call_timeout)
+            except asyncio.TimeoutError:
+                metrics.record(time.monotonic() - start, timeout=True)
+                raise asyncio.TimeoutError(f"MCP tool '{name}' timed out after {self.call_timeout:g}s") from None
+            except Exception:
+                metrics.record(time.monotonic() - start, error=True)
+                raise
+            finally:
+                process.in_flight -= 1
+
+        metrics.record(time.monotonic() - start, error=bool(_field(result, "is_error", "isError", False)))
+        return result
+
+    def stats(self) -> dict[str, Any]:
+        """Process and per-tool call statistics of this server"""
+        return {
+            "name": self.name,
+            "processes": sum(p.running for p in self.processes),
+            "pool_size": len(self.processes),
+            "in_flight": sum(p.in_flight for p in self.processes),
+            "restarts": self.restarts,
+            "tools": {name: metrics.stats() for name, metrics in self.metrics.items() if metrics.calls},
+        }
+
     async def disconnect(self):
         """Properly disconnect from the MCP server."""
-        if self.exit_stack:
-            # AsyncExitStack handles all cleanup properly
-            await self.exit_stack.aclose()
-            self.exit_stack = None
-            self.session = None
+        await asyncio.gather(*(process.stop() for process in self.processes))
 
 
 # Global connections registry
 _mcp_connections: list[MCPServerConnection] = []
 
 
-async def load_mcp_tools_async(config_path: str = "mcp.json") -> list[Tool]:
+async def load_mcp_tools_async(
+    config_path: str = "mcp.json",
+    lazy: bool = False,
+    connect_timeout: float = MCP_CONNECT_TIMEOUT,
+    schema_cache_path: str | Path = MCP_SCHEMA_CACHE_PATH,
+    call_timeout: float | None = MCP_CALL_TIMEOUT,
+    max_in_flight: int = MCP_MAX_IN_FLIGHT,
+) -> list[Tool]:
     """
     Load MCP tools from config file.
 
     This function:
     1. Reads the MCP config file
-    2. Starts MCP server processes
-    3. Connects to each server
-    4. Fetches tool definitions
-    5. Wraps them as Tool objects
+    2. Starts all MCP server processes concurrently (lazy servers with
+       cached schemas are not started)
+    3. Connects to each server and fetches tool definitions
+    4. Wraps them as Tool objects
+
+    Per-server settings in mcp.json override the arguments: "lazy",
+    "connect_timeout", "call_timeout", "max_in_flight" and "version" (part of
+    the schema cache key; change it to invalidate cached schemas). Stateless
+    servers may set "pool_size" to run up to that many processes.
 
     Args:
         config_path: Path to MCP configuration file (default: "mcp.json")
+        lazy: Start servers on first tool call, using cached tool schemas
+        connect_timeout: Seconds allowed for each server to start
+        schema_cache_path: Tool schema cache file used in lazy mode
+        call_timeout: Seconds allowed for each tool call (None: no limit)
+        max_in_flight: Tool calls running at once on each server
 
     Returns:
         List of Tool objects representing MCP tools
@@ -186,9 +563,10 @@ async def load_mcp_tools_async(config_path: str = "mcp.json") -> list[Tool]:
             print("No MCP servers configured")
             return []
 
-        all_tools = []
+        schema_cache = MCPSchemaCache(schema_cache_path)
+        connections: list[MCPServerConnection] = []
+        pending: list[MCPServerConnection] = []
 
-        # Connect to each enabled server
         for server_name, server_config in mcp_servers.items():
             if server_config.get("disabled", False):
                 print(f"Skipping disabled server: {server_name}")
@@ -202,12 +580,38 @@ async def load_mcp_tools_async(config_path: str = "mcp.json") -> list[Tool]:
                 print(f"No command specified for server: {server_name}")
                 continue
 
-            connection = MCPServerConnection(server_name, command, args, env)
-            success = await connection.connect()
+            connection = MCPServerConnection(
+                server_name,
+                command,
+                args,
+                env,
+                connect_timeout=server_config.get("connect_timeout", connect_timeout),
+                call_timeout=server_config.get("call_timeout", call_timeout),
+                max_in_flight=server_config.get("max_in_flight", max_in_flight),
+                pool_size=server_config.get("pool_size", 1),
+            )
+            cache_key = mcp_schema_cache_key(command, args, env, server_config.get("version"))
+            # Keep the cached schemas current whenever the server is started
+            connection.on_start = lambda conn, key=cache_key: schema_cache.put(key, conn.server_version, conn.tool_schemas)
+            connections.append(connection)
+
+            cached = schema_cache.get(cache_key) if server_config.get("lazy", lazy) else None
+            if cached is not None:
+                connection.load_cached_tools(cached["tools"])
+                print(f"✓ MCP server '{server_name}' - {len(connection.tools)} tools from cache (starts on first use)")
+            else:
+                pending.append(connection)
+
+        # Start all remaining servers concurrently
+        results = await asyncio.gather(*(connection.connect() for connection in pending))
+        failed = {id(connection) for connection, success in zip(pending, results) if not success}
 
-            if success:
-                _mcp_connections.append(connection)
-                all_tools.extend(connection.tools)
+        all_tools = []
+        for connection in connections:
+            if id(connection) in failed:
+                continue
+            _mcp_connections.append(connection)
+            all_tools.extend(connection.tools)
 
         print(f"\nTotal MCP tools loaded: {len(all_tools)}")
 
@@ -220,9 +624,13 @@ async def load_mcp_tools_async(config_path: str = "mcp.json") -> list[Tool]:
         return []
 
 
+def get_mcp_stats() -> list[dict[str, Any]]:
+    """Call statistics of all loaded MCP servers"""
+    return [connection.stats() for connection in _mcp_connections]
+
+
 async def cleanup_mcp_connections():
     """Clean up all MCP connections."""
     global _mcp_connections
-    for connection in _mcp_connections:
-        await connection.disconnect()
+    await asyncio.gather(*(connection.disconnect() for connection in _mcp_connections))
     _mcp_connections.clear()
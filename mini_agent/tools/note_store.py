@@ -0,0 +1,225 @@
+"""SQLite-backed store of session notes.
+
+Notes are only ever appended. They live in a SQLite database in WAL mode, so
+several agent processes can record and recall notes at the same time without
+rewriting or clobbering each other's data. The database has indexes on
+category and timestamp and, where SQLite was built with FTS5, a full-text index
+used to rank notes by relevance to a query.
+
+Notes of the former JSON format (one array rewritten on every note) are
+imported once, the first time the store is opened; the JSON file is kept
+with an ".imported" suffix.
+"""
+
+import json
+import re
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+# Seconds a writer waits for another process's write transaction
+BUSY_TIMEOUT = 10.0
+
+_WORD_RE = re.compile(r"\w+")
+
+
+@dataclass
+class Note:
+    """One recorded note"""
+
+    id: int
+    timestamp: str
+    category: str
+    content: str
+
+
+def database_path(memory_file: str | Path) -> Path:
+    """Database file of a configured memory file (.json paths map to .db)"""
+    path = Path(memory_file)
+    return path.with_suffix(".db") if path.suffix == ".json" else path
+
+
+class NoteStore:
+    """Append-only note database with category, time and full-text indexes"""
+
+    def __init__(self, memory_file: str | Path):
+        """Initialize note store.
+
+        Args:
+            memory_file: Configured note file; a legacy JSON note file at this
+                path is imported into the database next to it
+        """
+        self.path = database_path(memory_file)
+        self.legacy_file = Path(memory_file) if Path(memory_file).suffix == ".json" else None
+        self._fts: bool | None = None
+        self._schema_ready = False
+
+    def exists(self) -> bool:
+        """Whether any notes may have been recorded (nothing is created otherwise)"""
+        return self.path.exists() or (self.legacy_file is not None and self.legacy_file.exists() and self.legacy_file.stat().st_size > 0)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database (the schema is set up by the first connection of this store)"""
+        if not self._schema_ready:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(str(self.path), timeout=BUSY_TIMEOUT, isolation_level=None)
+        # Per-connection setting (WAL mode is stored in the database file)
+        db.execute("PRAGMA synchronous=NORMAL")
+        if not self._schema_ready:
+            try:
+                self._create_schema(db)
+                self._import_legacy(db)
+            except BaseException:
+                db.close()
+                raise
+            self._schema_ready = True
+        return db
+
+    def _create_schema(self, db: sqlite3.Connection):
+        """Create tables, indexes and the full-text index"""
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS notes (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL, category TEXT NOT NULL, content TEXT NOT NULL)"
+        )
+        db.execute("CREATE INDEX IF NOT EXISTS notes_category ON notes (category, timestamp)")
+        db.execute("CREATE INDEX IF NOT EXISTS notes_timestamp ON notes (timestamp)")
+
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            created = not db.execute("SELECT 1 FROM sqlite_master WHERE name = 'notes_fts'").fetchone()
+            db.execute("CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(content, category, content='notes', content_rowid='id')")
+            db.execute(
+                "CREATE TRIGGER IF NOT EXISTS notes_fts_insert AFTER INSERT ON notes BEGIN "
+                "INSERT INTO notes_fts (rowid, content, category) VALUES (new.id, new.content, new.category); END"
+            )
+            if created:
+                # Index notes stored before the full-text index existed
+                db.execute("INSERT INTO notes_fts (notes_fts) VALUES ('rebuild')")
+            db.execute("COMMIT")
+            self._fts = True
+        except sqlite3.OperationalError:
+            db.execute("ROLLBACK")
+            # SQLite built without FTS5: queries fall back to LIKE matching
+            self._fts = False
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    def _import_legacy(self, db: sqlite3.Connection):
+        """Import notes of the JSON note file, once"""
+        if self.legacy_file is None or not self.legacy_file.exists():
+            return
+        claimed = self.legacy_file.with_name(self.legacy_file.name + ".imported")
+        try:
+            # The rename is atomic: only one process imports the file
+            self.legacy_file.replace(claimed)
+        except OSError:
+            return
+
+        try:
+            notes = json.loads(claimed.read_text(encoding="utf-8") or "[]")
+        except (OSError, ValueError):
+            return
+        if not isinstance(notes, list) or not notes:
+            claimed.unlink(missing_ok=True)
+            return
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.executemany(
+                "INSERT INTO notes (timestamp, category, content) VALUES (?, ?, ?)",
+                [
+                    (str(note.get("timestamp", "")), str(note.get("category", "general")), str(note.get("content", "")))
+                    for note in notes
+                    if isinstance(note, dict)
+                ],
+            )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    def add(self, content: str, category: str = "general") -> Note:
+        """Append a note.
+
+        Args:
+            content: Note text
+            category: Category/tag
+
+        Returns:
+            The stored note
+        """
+        timestamp = datetime.now().isoformat()
+        db = self._connect()
+        try:
+            cursor = db.execute("INSERT INTO notes (timestamp, category, content) VALUES (?, ?, ?)", (timestamp, category, content))
+            return Note(cursor.lastrowid, timestamp, category, content)
+        finally:
+            db.close()
+
+    def count(self, category: str | None = None) -> int:
+        """Number of notes, optionally in one category"""
+        if not self.exists():
+            return 0
+        db = self._connect()
+        try:
+            if category:
+                return db.execute("SELECT COUNT(*) FROM notes WHERE category = ?", (category,)).fetchone()[0]
+            return db.execute("SELECT COUNT(*) FROM notes").fetchone()[0]
+        finally:
+            db.close()
+
+    def search(self, query: str | None = None, category: str | None = None, limit: int | None = None) -> list[Note]:
+        """Find notes.
+
+        Without a query the most recent notes are returned; with a query,
+        notes containing any of its words, most relevant first.
+
+        Args:
+            query: Words to look for
+            category: Only notes of this category
+            limit: Maximum number of notes
+
+        Returns:
+            Matching notes (most recent or most relevant first)
+        """
+        if not self.exists():
+            return []
+
+        words = _WORD_RE.findall(query or "")
+        limit_sql = -1 if limit is None else limit
+        db = self._connect()
+        try:
+            if not words:
+                sql = "SELECT id, timestamp, category, content FROM notes"
+                params: list = []
+                if category:
+                    sql += " WHERE category = ?"
+                    params.append(category)
+                sql += " ORDER BY id DESC LIMIT ?"
+                rows = db.execute(sql, params + [limit_sql]).fetchall()
+            elif self._fts:
+                match = " OR ".join(f'"{word}"*' for word in words)
+                sql = (
+                    "SELECT notes.id, notes.timestamp, notes.category, notes.content FROM notes_fts "
+                    "JOIN notes ON notes.id = notes_fts.rowid WHERE notes_fts MATCH ?"
+                )
+                params = [match]
+                if category:
+                    sql += " AND notes.category = ?"
+                    params.append(category)
+                sql += " ORDER BY bm25(notes_fts), notes.id DESC LIMIT ?"
+                rows = db.execute(sql, params + [limit_sql]).fetchall()
+            else:
+                conditions = " OR ".join("content LIKE ?" for _ in words)
+                sql = f"SELECT id, timestamp, category, content FROM notes WHERE ({conditions})"
+                params = [f"%{word}%" for word in words]
+                if category:
+                    sql += " AND category = ?"
+                    params.append(category)
+                sql += " ORDER BY id DESC LIMIT ?"
+                rows = db.execute(sql, params + [limit_sql]).fetchall()
+        finally:
+            db.close()
+
+        return [Note(*row) for row in rows]
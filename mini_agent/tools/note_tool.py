@@ -6,12 +6,19 @@ This tool allows the agent to:
 - Maintain context across agent execution chains
 """
 
-import json
-from datetime import datetime
+import asyncio
 from pathlib import Path
 from typing import Any
 
+from ..utils.token_utils import estimate_tokens, truncate_text_by_tokens
 from .base import Tool, ToolResult
+from .note_store import NoteStore
+
+# Notes returned by recall_notes when no limit is given
+DEFAULT_RECALL_LIMIT = 50
+
+# Token budget of recall_notes output
+MAX_RECALL_TOKENS = 4000
 
 
 class SessionNoteTool(Tool):
@@ -36,6 +43,7 @@ class SessionNoteTool(Tool):
         """
         self.memory_file = Path(memory_file)
         # Lazy loading: file and directory are only created when first note is recorded
+        self.store = NoteStore(memory_file)
 
     @property
     def name(self) -> str:
@@ -66,27 +74,8 @@ class SessionNoteTool(Tool):
             "required": ["content"],
         }
 
-    def _load_from_file(self) -> list:
-        """Load notes from file.
-        
-        Returns empty list if file doesn't exist (lazy loading).
-        """
-        if not self.memory_file.exists():
-            return []
-        
-        try:
-            return json.loads(self.memory_file.read_text())
-        except Exception:
-            return []
-
-    def _save_to_file(self, notes: list):
-        """Save notes to file.
-        
-        Creates parent directory and file if they don't exist (lazy initialization).
-        """
-        # Ensure parent directory exists when actually saving
-        self.memory_file.parent.mkdir(parents=True, exist_ok=True)
-        self.memory_file.write_text(json.dumps(notes, indent=2, ensure_ascii=False))
+    def resource_key(self, **kwargs) -> str | None:
+        return str(self.store.path.resolve())
 
     async def execute(self, content: str, category: str = "general") -> ToolResult:
         """Record a session note.
@@ -99,19 +88,8 @@ class SessionNoteTool(Tool):
             ToolResult with success status
         """
         try:
-            # Load existing notes
-            notes = self._load_from_file()
-
-            # Add new note with timestamp
-            note = {
-                "timestamp": datetime.now().isoformat(),
-                "category": category,
-                "content": content,
-            }
-            notes.append(note)
-
-            # Save back to file
-            self._save_to_file(notes)
+            # Append the note; nothing else is read or rewritten
+            await asyncio.to_thread(self.store.add, content, category or "general")
 
             return ToolResult(
                 success=True,
@@ -135,6 +113,7 @@ class RecallNoteTool(Tool):
             memory_file: Path to the note storage file
         """
         self.memory_file = Path(memory_file)
+        self.store = NoteStore(memory_file)
 
     @property
     def name(self) -> str:
@@ -143,9 +122,10 @@ class RecallNoteTool(Tool):
     @property
     def description(self) -> str:
         return (
-            "Recall all previously recorded session notes. "
+            "Recall previously recorded session notes. "
             "Use this to retrieve important information, context, or decisions "
-            "from earlier in the session or previous agent execution chains."
+            "from earlier in the session or previous agent execution chains. "
+            "Pass a query to get the notes most relevant to it; without one, the most recent notes are returned."
         )
 
     @property
@@ -153,55 +133,76 @@ class RecallNoteTool(Tool):
         return {
             "type": "object",
             "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Optional: words to search for; notes are ranked by relevance",
+                },
                 "category": {
                     "type": "string",
                     "description": "Optional: filter notes by category",
                 },
+                "limit": {
+                    "type": "integer",
+                    "description": f"Optional: maximum number of notes to return (default: {DEFAULT_RECALL_LIMIT})",
+                },
             },
         }
 
-    async def execute(self, category: str = None) -> ToolResult:
+    @property
+    def is_mutating(self) -> bool:
+        return False
+
+    def resource_key(self, **kwargs) -> str | None:
+        return str(self.store.path.resolve())
+
+    async def execute(self, query: str | None = None, category: str | None = None, limit: int | None = None) -> ToolResult:
         """Recall session notes.
 
         Args:
+            query: Optional search words
             category: Optional category filter
+            limit: Maximum number of notes
 
         Returns:
             ToolResult with notes content
         """
         try:
-            if not self.memory_file.exists():
-                return ToolResult(
-                    success=True,
-                    content="No notes recorded yet.",
-                )
-
-            notes = json.loads(self.memory_file.read_text())
+            limit = max(1, limit or DEFAULT_RECALL_LIMIT)
+            notes = await asyncio.to_thread(self.store.search, query, category, limit)
 
             if not notes:
+                if query:
+                    return ToolResult(success=True, content=f"No notes found matching: {query}")
+                if category and await asyncio.to_thread(self.store.count):
+                    return ToolResult(success=True, content=f"No notes found in category: {category}")
                 return ToolResult(
                     success=True,
                     content="No notes recorded yet.",
                 )
 
-            # Filter by category if specified
-            if category:
-                notes = [n for n in notes if n.get("category") == category]
-                if not notes:
-                    return ToolResult(
-                        success=True,
-                        content=f"No notes found in category: {category}",
-                    )
-
-            # Format notes for display
-            formatted = []
-            for idx, note in enumerate(notes, 1):
-                timestamp = note.get("timestamp", "unknown time")
-                cat = note.get("category", "general")
-                content = note.get("content", "")
-                formatted.append(f"{idx}. [{cat}] {content}\n   (recorded at {timestamp})")
-
-            result = "Recorded Notes:\n" + "\n".join(formatted)
+            # Keep the most recent (or most relevant) notes within the token budget
+            entries = []
+            budget = MAX_RECALL_TOKENS
+            for note in notes:
+                entry = f"[{note.category}] {note.content}\n   (recorded at {note.timestamp})"
+                budget -= estimate_tokens(f"{len(entries) + 1}. {entry}")
+                if budget < 0:
+                    if entries:
+                        break
+                    # A single note longer than the whole budget
+                    entry = truncate_text_by_tokens(entry, MAX_RECALL_TOKENS)
+                entries.append(entry)
+
+            # Recent notes are shown in chronological order, search results by relevance
+            if not query:
+                entries.reverse()
+            formatted = [f"{idx}. {entry}" for idx, entry in enumerate(entries, 1)]
+
+            header = f"Notes matching '{query}':" if query else "Recorded Notes:"
+            result = header + "\n" + "\n".join(formatted)
+            total = await asyncio.to_thread(self.store.count, category) if not query else len(notes)
+            if len(formatted) < total:
+                result += f"\n\n({len(formatted)} of {total} notes shown; use query, category or limit to find others)"
 
             return ToolResult(success=True, content=result)
 
@@ -0,0 +1,84 @@
+"""Tool registry with memoized API schemas."""
+
+from typing import Any, Iterable
+
+from ..schema import LLMProvider
+from .base import Tool
+
+
+class ToolRegistry(dict):
+    """Mapping of tool name -> Tool that caches provider-specific schemas.
+
+    Every mutation of the registry bumps ``version``. Schemas are built once per
+    provider format and version, so LLM clients can reuse them on every request
+    instead of calling ``to_schema()`` on each tool per step.
+    """
+
+    def __init__(self, tools: Iterable[Tool] = ()):
+        super().__init__((tool.name, tool) for tool in tools)
+        self.version = 0
+        self._schema_cache: dict[str, tuple[int, tuple[dict[str, Any], ...]]] = {}
+
+    def get_schemas(self, provider: LLMProvider | str) -> tuple[dict[str, Any], ...]:
+        """Get the tool schemas in the given provider format.
+
+        The returned tuple and its dicts are shared between calls and must not be
+        modified; copy a schema before changing it.
+
+        Args:
+            provider: "anthropic" (Tool.to_schema) or "openai" (Tool.to_openai_schema)
+
+        Returns:
+            Tuple of tool schemas in registry order
+        """
+        key = LLMProvider(provider).value
+        cached = self._schema_cache.get(key)
+        if cached is not None and cached[0] == self.version:
+            return cached[1]
+
+        if key == LLMProvider.ANTHROPIC.value:
+            schemas = tuple(tool.to_schema() for tool in self.values())
+        else:
+            schemas = tuple(tool.to_openai_schema() for tool in self.values())
+
+        self._schema_cache[key] = (self.version, schemas)
+        return schemas
+
+    def _changed(self):
+        self.version += 1
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed()
+
+    def pop(self, *args):
+        result = super().pop(*args)
+        self._changed()
+        return result
+
+    def popitem(self):
+        result = super().popitem()
+        self._changed()
+        return result
+
+    def setdefault(self, key, default=None):
+        result = super().setdefault(key, default)
+        self._changed()
+        return result
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._changed()
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+    def __ior__(self, other):
+        result = super().__ior__(other)
+        self._changed()
+        return result
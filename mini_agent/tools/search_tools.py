@@ -0,0 +1,216 @@
+"""Workspace search tools backed by the incremental workspace index."""
+
+import asyncio
+import re
+from pathlib import Path
+from typing import Any
+
+from ..utils.token_utils import ESTIMATED_CHARS_PER_TOKEN
+from .base import Tool, ToolResult
+from .workspace_index import compile_glob, get_workspace_index
+
+# Token budget of search_files and glob_files output
+MAX_SEARCH_TOKENS = 8000
+
+# Characters of a matching line shown in search results
+MAX_LINE_CHARS = 300
+
+
+def _scope(workspace_dir: Path, path: str | None, glob: str | None) -> re.Pattern | None:
+    """Build the path filter of a query from a subdirectory and a glob"""
+    filters = []
+    if path:
+        directory = (workspace_dir / path).resolve()
+        relative = directory.relative_to(workspace_dir).as_posix()
+        if directory.is_file():
+            filters.append(re.escape(relative))
+        elif relative != ".":
+            filters.append(f"{re.escape(relative)}/.*")
+    if glob:
+        filters.append(compile_glob(glob).pattern)
+    if not filters:
+        return None
+    return re.compile("".join(f"(?={f}$)" for f in filters) + ".*")
+
+
+class SearchFilesTool(Tool):
+    """Search file contents of the workspace"""
+
+    def __init__(self, workspace_dir: str = "."):
+        """Initialize SearchFilesTool with workspace directory.
+
+        Args:
+            workspace_dir: Directory that is indexed and searched
+        """
+        self.workspace_dir = Path(workspace_dir).resolve()
+
+    @property
+    def name(self) -> str:
+        return "search_files"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Search the contents of files in the workspace (like grep -rn, but indexed and much faster). "
+            "Files excluded by .gitignore are skipped. Returns matching lines as path:line:text, "
+            "files with most matches first. Use this instead of running grep or find through bash."
+        )
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "pattern": {
+                    "type": "string",
+                    "description": "Text to search for (a regular expression if regex is true)",
+                },
+                "regex": {
+                    "type": "boolean",
+                    "description": "Treat pattern as a Python regular expression (default: false)",
+                },
+                "case_sensitive": {
+                    "type": "boolean",
+                    "description": "Match case exactly (default: false)",
+                },
+                "path": {
+                    "type": "string",
+                    "description": "Only search in this subdirectory of the workspace",
+                },
+                "glob": {
+                    "type": "string",
+                    "description": "Only search files matching this glob, e.g. '*.py' or 'src/**/*.ts'",
+                },
+            },
+            "required": ["pattern"],
+        }
+
+    @property
+    def is_mutating(self) -> bool:
+        return False
+
+    def resource_key(self, path: str | None = None, **kwargs) -> str | None:
+        # Ordered after writes to any file below the searched directory
+        return str((self.workspace_dir / path).resolve()) if path else str(self.workspace_dir)
+
+    async def execute(
+        self,
+        pattern: str,
+        regex: bool = False,
+        case_sensitive: bool = False,
+        path: str | None = None,
+        glob: str | None = None,
+    ) -> ToolResult:
+        """Execute search."""
+        if not pattern:
+            return ToolResult(success=False, content="", error="Empty search pattern")
+        try:
+            path_filter = _scope(self.workspace_dir, path, glob)
+            index = get_workspace_index(self.workspace_dir)
+            results = await asyncio.to_thread(index.search, pattern, regex, case_sensitive, path_filter)
+        except re.error as e:
+            return ToolResult(success=False, content="", error=f"Invalid regular expression: {e}")
+        except ValueError:
+            return ToolResult(success=False, content="", error=f"Path is outside the workspace: {path}")
+        except Exception as e:
+            return ToolResult(success=False, content="", error=str(e))
+
+        if not results:
+            return ToolResult(success=True, content=f"No matches found for: {pattern}")
+
+        budget = MAX_SEARCH_TOKENS * ESTIMATED_CHARS_PER_TOKEN
+        lines = []
+        shown = 0
+        total = sum(len(matches) for _, matches in results)
+        for rel_path, matches in results:
+            for match in matches:
+                line = f"{rel_path}:{match.line_number}:{match.line.strip()[:MAX_LINE_CHARS]}"
+                budget -= len(line) + 1
+                if budget < 0:
+                    break
+                lines.append(line)
+                shown += 1
+            if budget < 0:
+                break
+
+        content = "\n".join(lines)
+        if shown < total:
+            content += f"\n\n... [{shown} of {total} matching lines in {len(results)} files shown; narrow the search with path or glob] ..."
+        return ToolResult(success=True, content=content)
+
+
+class GlobFilesTool(Tool):
+    """Find workspace files by name pattern"""
+
+    def __init__(self, workspace_dir: str = "."):
+        """Initialize GlobFilesTool with workspace directory.
+
+        Args:
+            workspace_dir: Directory that is indexed and searched
+        """
+        self.workspace_dir = Path(workspace_dir).resolve()
+
+    @property
+    def name(self) -> str:
+        return "glob_files"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Find files in the workspace by glob pattern, e.g. '*.py', 'src/**/*.ts' or 'tests/test_*.py'. "
+            "Patterns without '/' match file names at any depth. Files excluded by .gitignore are skipped. "
+            "Returns workspace-relative paths, most recently modified first."
+        )
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "pattern": {
+                    "type": "string",
+                    "description": "Glob pattern matched against workspace-relative paths",
+                },
+                "path": {
+                    "type": "string",
+                    "description": "Only list files in this subdirectory of the workspace",
+                },
+            },
+            "required": ["pattern"],
+        }
+
+    @property
+    def is_mutating(self) -> bool:
+        return False
+
+    def resource_key(self, path: str | None = None, **kwargs) -> str | None:
+        return str((self.workspace_dir / path).resolve()) if path else str(self.workspace_dir)
+
+    async def execute(self, pattern: str, path: str | None = None) -> ToolResult:
+        """Execute glob."""
+        try:
+            path_filter = _scope(self.workspace_dir, path, None)
+            index = get_workspace_index(self.workspace_dir)
+            paths = await asyncio.to_thread(index.glob, pattern)
+        except ValueError:
+            return ToolResult(success=False, content="", error=f"Path is outside the workspace: {path}")
+        except Exception as e:
+            return ToolResult(success=False, content="", error=str(e))
+
+        if path_filter is not None:
+            paths = [p for p in paths if path_filter.fullmatch(p)]
+        if not paths:
+            return ToolResult(success=True, content=f"No files found matching: {pattern}")
+
+        budget = MAX_SEARCH_TOKENS * ESTIMATED_CHARS_PER_TOKEN
+        shown = []
+        for rel_path in paths:
+            budget -= len(rel_path) + 1
+            if budget < 0:
+                break
+            shown.append(rel_path)
+
+        content = "\n".join(shown)
+        if len(shown) < len(paths):
+            content += f"\n\n... [{len(shown)} of {len(paths)} files shown; use a more specific pattern] ..."
+        return ToolResult(success=True, content=content)
@@ -2,15 +2,33 @@
 Skill Loader - Load Claude Skills
 
 Supports loading skills from SKILL.md files and providing them to Agent
+
+Discovery only reads skill metadata (YAML frontmatter), and keeps it in a
+persistent index keyed by file path, modification time and size, together
+with the modification times of the skills tree's directories. While nothing
+changed, startup only stats the indexed directories and SKILL.md files. The
+skill body is read and its paths rewritten on the first get_skill call.
 """
 
+import json
+import os
 import re
+import tempfile
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 
+# Persistent index of skill metadata, one entry per skills directory
+SKILL_INDEX_PATH = Path.home() / ".mini-agent" / "cache" / "skills_index.json"
+
+# Seconds between re-scans of the skills directory in watch mode
+SKILL_WATCH_INTERVAL = 2.0
+
+_FRONTMATTER_RE = re.compile(r"^---\n(.*?)\n---\n(.*)$", re.DOTALL)
+
 
 @dataclass
 class Skill:
@@ -37,18 +55,84 @@ class Skill:
 """
 
 
+@dataclass
+class SkillInfo:
+    """Skill metadata kept in the skill index (the body is loaded on demand)"""
+
+    name: str
+    description: str
+    license: Optional[str] = None
+    allowed_tools: Optional[List[str]] = None
+    metadata: Optional[Dict[str, str]] = None
+    skill_path: Optional[Path] = None
+
+
+def parse_skill_file(skill_path: Path) -> Optional[Tuple[Dict[str, Any], str]]:
+    """
+    Read a SKILL.md file and parse its YAML frontmatter
+
+    Args:
+        skill_path: SKILL.md file path
+
+    Returns:
+        Tuple of (frontmatter, body), or None if the file is not a valid skill
+    """
+    content = skill_path.read_text(encoding="utf-8")
+
+    # Parse YAML frontmatter
+    frontmatter_match = _FRONTMATTER_RE.match(content)
+
+    if not frontmatter_match:
+        print(f"⚠️  {skill_path} missing YAML frontmatter")
+        return None
+
+    # Parse YAML
+    try:
+        frontmatter = yaml.safe_load(frontmatter_match.group(1))
+    except yaml.YAMLError as e:
+        print(f"❌ Failed to parse YAML frontmatter: {e}")
+        return None
+
+    # Required fields
+    if not isinstance(frontmatter, dict) or "name" not in frontmatter or "description" not in frontmatter:
+        print(f"⚠️  {skill_path} missing required fields (name or description)")
+        return None
+
+    return frontmatter, frontmatter_match.group(2).strip()
+
+
 class SkillLoader:
     """Skill loader"""
 
-    def __init__(self, skills_dir: str = "./skills"):
+    def __init__(
+        self,
+        skills_dir: str = "./skills",
+        index_path: str | Path | None = None,
+        watch: bool = False,
+        watch_interval: float = SKILL_WATCH_INTERVAL,
+    ):
         """
         Initialize Skill Loader
 
         Args:
             skills_dir: Skills directory path
+            index_path: Persistent skill index file (None: index kept in memory only)
+            watch: Re-scan the skills directory when skills are looked up, so new
+                or changed skills are picked up without a restart
+            watch_interval: Minimum seconds between re-scans in watch mode
         """
         self.skills_dir = Path(skills_dir)
-        self.loaded_skills: Dict[str, Skill] = {}
+        self.index_path = Path(index_path).expanduser() if index_path is not None else None
+        self.watch = watch
+        self.watch_interval = watch_interval
+        self.loaded_skills: Dict[str, SkillInfo] = {}
+        # SKILL.md path relative to skills_dir -> {"mtime_ns", "size", "skill": metadata or None}
+        self._files: Dict[str, Dict[str, Any]] = {}
+        # Directory relative to skills_dir -> mtime_ns (changes when entries are added or removed)
+        self._dirs: Dict[str, int] = {}
+        # Skill name -> ((mtime_ns, size), skill with processed body)
+        self._bodies: Dict[str, Tuple[Tuple[int, int], Skill]] = {}
+        self._last_scan = 0.0
 
     def load_skill(self, skill_path: Path) -> Optional[Skill]:
         """
@@ -61,29 +145,10 @@ class SkillLoader:
             Skill object, or None if loading fails
         """
         try:
-            content = skill_path.read_text(encoding="utf-8")
-
-            # Parse YAML frontmatter
-            frontmatter_match = re.match(r"^---\n(.*?)\n---\n(.*)$", content, re.DOTALL)
-
-            if not frontmatter_match:
-                print(f"⚠️  {skill_path} missing YAML frontmatter")
-                return None
-
-            frontmatter_text = frontmatter_match.group(1)
-            skill_content = frontmatter_match.group(2).strip()
-
-            # Parse YAML
-            try:
-                frontmatter = yaml.safe_load(frontmatter_text)
-            except yaml.YAMLError as e:
-                print(f"❌ Failed to parse YAML frontmatter: {e}")
-                return None
-
-            # Required fields
-            if "name" not in frontmatter or "description" not in frontmatter:
-                print(f"⚠️  {skill_path} missing required fields (name or description)")
+            parsed = parse_skill_file(skill_path)
+            if parsed is None:
                 return None
+            frontmatter, skill_content = parsed
 
             # Get skill directory (parent of SKILL.md)
             skill_dir = skill_path.parent
@@ -183,31 +248,146 @@ class SkillLoader:
 
         return content
 
-    def discover_skills(self) -> List[Skill]:
+    def discover_skills(self) -> List[SkillInfo]:
         """
-        Discover and load all skills in the skills directory
+        Discover all skills in the skills directory (metadata only)
 
         Returns:
-            List of Skills
+            List of skill metadata
         """
-        skills = []
-
         if not self.skills_dir.exists():
             print(f"⚠️  Skills directory does not exist: {self.skills_dir}")
-            return skills
+            return []
+
+        self.refresh()
+        return list(self.loaded_skills.values())
+
+    def refresh(self) -> bool:
+        """
+        Bring the skill index up to date with the skills directory
+
+        Directories are only walked again if one of them changed, and only new
+        or modified SKILL.md files are parsed.
 
-        # Recursively find all SKILL.md files
-        for skill_file in self.skills_dir.rglob("SKILL.md"):
-            skill = self.load_skill(skill_file)
-            if skill:
-                skills.append(skill)
+        Returns:
+            True if skills were added, removed or changed
+        """
+        if self._last_scan == 0.0:
+            self._load_index()
+        self._last_scan = time.monotonic()
+
+        walked = not self._dirs or any(self._stat_dir(rel_dir) != mtime for rel_dir, mtime in self._dirs.items())
+        if walked:
+            skill_files, self._dirs = self._walk()
+        else:
+            skill_files = list(self._files)
+
+        files = {}
+        for rel_path in skill_files:
+            try:
+                stat = (self.skills_dir / rel_path).stat()
+            except OSError:
+                continue
+            entry = self._files.get(rel_path)
+            if entry is None or entry["mtime_ns"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+                entry = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "skill": self._read_metadata(rel_path)}
+            files[rel_path] = entry
+
+        changed = files != self._files
+        self._files = files
+        self.loaded_skills = {}
+        for rel_path, entry in files.items():
+            if entry["skill"] is not None:
+                skill = SkillInfo(**entry["skill"], skill_path=self.skills_dir / rel_path)
                 self.loaded_skills[skill.name] = skill
 
-        return skills
+        if changed or walked:
+            self._save_index()
+        return changed
+
+    def _refresh_if_watching(self):
+        """Re-scan the skills directory in watch mode, at most every watch_interval"""
+        if self.watch and time.monotonic() - self._last_scan >= self.watch_interval:
+            self.refresh()
+
+    def _walk(self) -> Tuple[List[str], Dict[str, int]]:
+        """Find all SKILL.md files and record directory modification times"""
+        skill_files = []
+        dirs = {}
+        for directory, _, filenames in os.walk(self.skills_dir):
+            rel_dir = Path(directory).relative_to(self.skills_dir).as_posix()
+            mtime = self._stat_dir(rel_dir)
+            if mtime is not None:
+                dirs[rel_dir] = mtime
+            if "SKILL.md" in filenames:
+                skill_files.append(f"{rel_dir}/SKILL.md" if rel_dir != "." else "SKILL.md")
+        return sorted(skill_files), dirs
+
+    def _stat_dir(self, rel_dir: str) -> Optional[int]:
+        try:
+            return (self.skills_dir / rel_dir).stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _read_metadata(self, rel_path: str) -> Optional[Dict[str, Any]]:
+        """Parse the frontmatter of a SKILL.md file into index metadata"""
+        skill_path = self.skills_dir / rel_path
+        try:
+            parsed = parse_skill_file(skill_path)
+        except Exception as e:
+            print(f"❌ Failed to load skill ({skill_path}): {e}")
+            return None
+        if parsed is None:
+            return None
+        frontmatter = parsed[0]
+        return {
+            "name": frontmatter["name"],
+            "description": frontmatter["description"],
+            "license": frontmatter.get("license"),
+            "allowed_tools": frontmatter.get("allowed-tools"),
+            "metadata": frontmatter.get("metadata"),
+        }
+
+    def _index_key(self) -> str:
+        return str(self.skills_dir.resolve())
+
+    def _load_index(self):
+        """Take the last scan of this skills directory from the index file"""
+        if self.index_path is None:
+            return
+        try:
+            entry = json.loads(self.index_path.read_text(encoding="utf-8")).get(self._index_key())
+        except (OSError, ValueError, AttributeError):
+            return
+        if isinstance(entry, dict):
+            self._dirs = entry.get("dirs", {})
+            self._files = entry.get("files", {})
+
+    def _save_index(self):
+        """Write this directory's scan to the index file atomically"""
+        if self.index_path is None:
+            return
+        try:
+            index = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            index = {}
+        if not isinstance(index, dict):
+            index = {}
+        # Drop entries of skills directories that no longer exist
+        index = {key: value for key, value in index.items() if Path(key).is_dir()}
+        index[self._index_key()] = {"dirs": self._dirs, "files": self._files}
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_name = tempfile.mkstemp(dir=self.index_path.parent, prefix=f".{self.index_path.name}.", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(index, f, default=str)
+            os.replace(temp_name, self.index_path)
+        except OSError as e:
+            print(f"⚠️  Failed to write skill index {self.index_path}: {e}")
 
     def get_skill(self, name: str) -> Optional[Skill]:
         """
-        Get loaded skill
+        Get a skill with its full content, loading the body on first use
 
         Args:
             name: Skill name
@@ -215,15 +395,32 @@ class SkillLoader:
         Returns:
             Skill object, or None if not found
         """
-        return self.loaded_skills.get(name)
+        self._refresh_if_watching()
+        info = self.loaded_skills.get(name)
+        if info is None:
+            return None
+        try:
+            stat = info.skill_path.stat()
+        except OSError:
+            return None
+
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self._bodies.get(name)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        skill = self.load_skill(info.skill_path)
+        if skill is not None:
+            self._bodies[name] = (version, skill)
+        return skill
 
     def list_skills(self) -> List[str]:
         """
-        List all loaded skill names
+        List all discovered skill names
 
         Returns:
             List of skill names
         """
+        self._refresh_if_watching()
         return list(self.loaded_skills.keys())
 
     def get_skills_metadata_prompt(self) -> str:
@@ -7,7 +7,7 @@ Implements Progressive Disclosure (Level 2): Load full skill content when needed
 from typing import Any, Dict, List, Optional
 
 from .base import Tool, ToolResult
-from .skill_loader import SkillLoader
+from .skill_loader import SKILL_INDEX_PATH, SkillLoader
 
 
 class GetSkillTool(Tool):
@@ -37,6 +37,10 @@ class GetSkillTool(Tool):
             "required": ["skill_name"],
         }
 
+    @property
+    def is_mutating(self) -> bool:
+        return False
+
     async def execute(self, skill_name: str) -> ToolResult:
         """Get detailed information about specified skill"""
         skill = self.skill_loader.get_skill(skill_name)
@@ -56,6 +60,8 @@ class GetSkillTool(Tool):
 
 def create_skill_tools(
     skills_dir: str = "./skills",
+    watch: bool = False,
+    index_path: Optional[str] = SKILL_INDEX_PATH,
 ) -> tuple[List[Tool], Optional[SkillLoader]]:
     """
     Create skill tool for Progressive Disclosure
@@ -65,12 +71,14 @@ def create_skill_tools(
 
     Args:
         skills_dir: Skills directory path
+        watch: Pick up new or changed skills without a restart
+        index_path: Persistent skill metadata index (None: always parse skills)
 
     Returns:
         Tuple of (list of tools, skill loader)
     """
     # Create skill loader
-    loader = SkillLoader(skills_dir)
+    loader = SkillLoader(skills_dir, index_path=index_path, watch=watch)
 
     # Discover and load skills
     skills = loader.discover_skills()
@@ -0,0 +1,666 @@
+"""Incremental search index of a workspace.
+
+The index keeps the metadata of every file in the workspace (respecting
+.gitignore and .ignore files) and an inverted index from lowercase words to
+the text files that contain them. A search only reads the files that contain
+every word of the query; a query fragment that is only part of a word is
+matched against the vocabulary, which is kept as one newline-joined string so
+that a single C-level regex scan finds every word containing it.
+
+The index is kept up to date by mtime scanning: a refresh stats every file
+and only re-reads files whose mtime or size changed. Refreshes run at most
+every `refresh_interval` seconds. In small workspaces a query waits for the
+refresh; where a scan takes longer than SYNC_REFRESH_SECONDS (large
+monorepos), queries are answered from the current index while the scan runs
+in a background thread. Files written by the file tools are re-indexed
+right away (invalidate_workspace_path), so changes made by other means
+(e.g. bash) are the only ones that can wait for the next refresh.
+
+Matching lines are read from the files themselves. Results of repeated
+queries are cached until the index changes; a cached search result is only
+reused while the files it matched still have the same mtime and size.
+"""
+
+import bisect
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# Directories never indexed, even without an ignore file
+DEFAULT_IGNORED_DIRS = frozenset({".git", ".hg", ".svn", "node_modules", "__pycache__", ".venv", ".mypy_cache", ".pytest_cache", ".tox"})
+
+# Files read by the workspace index to find ignore rules
+IGNORE_FILES = (".gitignore", ".ignore")
+
+# Text files larger than this are listed but not indexed for search
+MAX_INDEXED_FILE_BYTES = 1024 * 1024
+
+# Bytes inspected to tell binary files from text
+BINARY_SNIFF_BYTES = 8192
+
+# Cached search/glob results per index
+RESULT_CACHE_SIZE = 128
+
+# Scans taking longer than this run in the background instead of delaying queries
+SYNC_REFRESH_SECONDS = 0.1
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def translate_glob(pattern: str) -> str:
+    """Translate a gitignore-style glob into a regular expression.
+
+    `*` and `?` do not cross directory separators, `**` does, and `**/` also
+    matches no directory at all.
+
+    Args:
+        pattern: Glob pattern
+
+    Returns:
+        Regular expression source (without anchors)
+    """
+    parts = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            parts.append(".*")
+            i += 2
+            continue
+        if char == "*":
+            parts.append("[^/]*")
+        elif char == "?":
+            parts.append("[^/]")
+        elif char == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                parts.append(re.escape(char))
+            else:
+                body = pattern[i + 1 : end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                parts.append(f"[{body}]")
+                i = end
+        else:
+            parts.append(re.escape(char))
+        i += 1
+    return "".join(parts)
+
+
+def compile_glob(pattern: str) -> re.Pattern:
+    """Compile a glob matched against workspace-relative paths.
+
+    Patterns without a slash match file names at any depth (like ripgrep's
+    --glob); patterns with a slash match the whole relative path.
+    """
+    pattern = pattern.strip()
+    if pattern.startswith("./"):
+        pattern = pattern[2:]
+    if "/" not in pattern:
+        return re.compile(f"(?:.*/)?{translate_glob(pattern)}")
+    return re.compile(translate_glob(pattern.lstrip("/")))
+
+
+@dataclass
+class IgnoreRule:
+    """One line of an ignore file"""
+
+    regex: re.Pattern
+    negated: bool
+    dir_only: bool
+
+
+def parse_ignore_file(text: str) -> list[IgnoreRule]:
+    """Parse the rules of a .gitignore file.
+
+    Args:
+        text: Content of the ignore file
+
+    Returns:
+        Rules in file order
+    """
+    rules = []
+    for line in text.splitlines():
+        line = line.rstrip()
+        if not line or line.startswith("#"):
+            continue
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:]
+        elif line.startswith("\\"):
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+        if "/" in line:
+            # Anchored to the directory of the ignore file
+            source = translate_glob(line.lstrip("/"))
+        else:
+            source = f"(?:.*/)?{translate_glob(line)}"
+        rules.append(IgnoreRule(re.compile(source), negated, dir_only))
+    return rules
+
+
+@dataclass
+class FileEntry:
+    """Indexed state of one file"""
+
+    mtime_ns: int
+    size: int
+    # Ids of the lowercase words in the file (empty if not indexed)
+    words: frozenset[int] = field(default_factory=frozenset)
+    indexed: bool = False
+
+
+@dataclass
+class SearchMatch:
+    """One matching line"""
+
+    path: str
+    line_number: int
+    line: str
+
+
+class WorkspaceIndex:
+    """Incrementally refreshed file list and word index of one directory tree"""
+
+    def __init__(self, root: str | Path, refresh_interval: float = 2.0, max_file_bytes: int = MAX_INDEXED_FILE_BYTES):
+        """Initialize workspace index.
+
+        Args:
+            root: Directory to index
+            refresh_interval: Minimum seconds between two scans for changes
+            max_file_bytes: Text files larger than this are not searched
+        """
+        self.root = Path(root).resolve()
+        self.refresh_interval = refresh_interval
+        self.max_file_bytes = max_file_bytes
+
+        self.files: dict[str, FileEntry] = {}
+        self._word_ids: dict[str, int] = {}
+        self._postings: list[set[str]] = []
+        self._vocabulary = ""
+        self._vocabulary_offsets: list[int] = []
+        self._vocabulary_size = 0
+
+        # Incremented whenever the indexed content changes
+        self.generation = 0
+        self.last_refresh = 0.0
+        self.last_scan_seconds = 0.0
+        self._results: OrderedDict[tuple, object] = OrderedDict()
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._background_refresh: threading.Thread | None = None
+
+    # ---- Scanning ----
+
+    def refresh(self, force: bool = False) -> bool:
+        """Scan the workspace for added, changed and deleted files.
+
+        Files are stat'ed and read without holding the index lock, so queries
+        are not blocked while a scan runs; changes are applied at the end.
+
+        Args:
+            force: Scan even if the last scan is more recent than refresh_interval
+
+        Returns:
+            True if the index changed
+        """
+        with self._refresh_lock:
+            if not force and time.monotonic() - self.last_refresh < self.refresh_interval:
+                return False
+
+            started = time.monotonic()
+            seen: set[str] = set()
+            updates: list[tuple[str, os.stat_result, set[str] | None]] = []
+            for rel_path, stat in self._walk():
+                seen.add(rel_path)
+                entry = self.files.get(rel_path)
+                if entry is None or entry.mtime_ns != stat.st_mtime_ns or entry.size != stat.st_size:
+                    updates.append((rel_path, stat, self._read_words(rel_path, stat)))
+
+            with self._lock:
+                deleted = self.files.keys() - seen
+                for rel_path in deleted:
+                    self._remove_file(rel_path)
+                for rel_path, stat, words in updates:
+                    self._index_file(rel_path, stat, words)
+                if updates or deleted:
+                    self.generation += 1
+                    self._results.clear()
+
+            self.last_refresh = time.monotonic()
+            self.last_scan_seconds = self.last_refresh - started
+            return bool(updates or deleted)
+
+    def ensure_fresh(self):
+        """Refresh the index before a query if it may be out of date.
+
+        The first scan and scans of small workspaces are waited for; slow scans
+        run in a background thread while queries use the current index.
+        """
+        if self.last_refresh == 0.0:
+            self.refresh(force=True)
+        elif time.monotonic() - self.last_refresh < self.refresh_interval:
+            return
+        elif self.last_scan_seconds <= SYNC_REFRESH_SECONDS:
+            self.refresh()
+        elif self._background_refresh is None or not self._background_refresh.is_alive():
+            self._background_refresh = threading.Thread(target=self.refresh, name="workspace-index", daemon=True)
+            self._background_refresh.start()
+
+    def invalidate(self, path: str | Path):
+        """Re-index one file right away, e.g. after writing or deleting it.
+
+        Args:
+            path: Absolute path, or path relative to the workspace root
+        """
+        if self.last_refresh == 0.0:
+            # Not scanned yet: the first query scans everything anyway
+            return
+        try:
+            rel_path = (self.root / path).resolve().relative_to(self.root).as_posix()
+        except ValueError:
+            return
+
+        stat = None
+        words = None
+        if not self._ignored_path(rel_path):
+            try:
+                stat = os.stat(self.root / rel_path)
+            except OSError:
+                pass
+            if stat is not None and os.path.isfile(self.root / rel_path):
+                words = self._read_words(rel_path, stat)
+            else:
+                stat = None
+
+        with self._lock:
+            if stat is None:
+                self._remove_file(rel_path)
+            else:
+                self._index_file(rel_path, stat, words)
+            self.generation += 1
+            self._results.clear()
+
+    def _ignored_path(self, rel_path: str) -> bool:
+        """Whether a file is excluded by default ignores or ignore files (as in _walk)"""
+        parts = rel_path.split("/")
+        rules: list[tuple[str, list[IgnoreRule]]] = []
+        prefix = ""
+        for depth, name in enumerate(parts):
+            directory = self.root / prefix
+            for ignore_name in IGNORE_FILES:
+                try:
+                    parsed = parse_ignore_file((directory / ignore_name).read_text(encoding="utf-8", errors="replace"))
+                except OSError:
+                    continue
+                if parsed:
+                    rules.append((prefix, parsed))
+            is_dir = depth < len(parts) - 1
+            if is_dir and name in DEFAULT_IGNORED_DIRS:
+                return True
+            if self._ignored(prefix + name, is_dir, rules):
+                return True
+            prefix += name + "/"
+        return False
+
+    def _walk(self):
+        """Yield (relative path, stat) of every file not excluded by ignore rules"""
+        # Stack of (directory, relative prefix, ignore rules that apply: list of (base prefix, rules))
+        stack: list[tuple[Path, str, list[tuple[str, list[IgnoreRule]]]]] = [(self.root, "", [])]
+        while stack:
+            directory, prefix, inherited = stack.pop()
+            rules = inherited
+            for ignore_name in IGNORE_FILES:
+                try:
+                    parsed = parse_ignore_file((directory / ignore_name).read_text(encoding="utf-8", errors="replace"))
+                except OSError:
+                    continue
+                if parsed:
+                    rules = rules + [(prefix, parsed)]
+
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+
+            for entry in entries:
+                rel_path = prefix + entry.name
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    if not is_dir and not entry.is_file():
+                        continue
+                except OSError:
+                    continue
+                if is_dir and entry.name in DEFAULT_IGNORED_DIRS:
+                    continue
+                if self._ignored(rel_path, is_dir, rules):
+                    continue
+                if is_dir:
+                    stack.append((Path(entry.path), rel_path + "/", rules))
+                else:
+                    try:
+                        yield rel_path, entry.stat()
+                    except OSError:
+                        continue
+
+    @staticmethod
+    def _ignored(rel_path: str, is_dir: bool, rules: list[tuple[str, list[IgnoreRule]]]) -> bool:
+        """Apply ignore rules from the root down; the last matching rule wins"""
+        ignored = False
+        for base, base_rules in rules:
+            if not rel_path.startswith(base):
+                continue
+            local = rel_path[len(base) :]
+            for rule in base_rules:
+                if rule.dir_only and not is_dir:
+                    continue
+                if rule.regex.fullmatch(local):
+                    ignored = not rule.negated
+        return ignored
+
+    def _read_words(self, rel_path: str, stat: os.stat_result) -> set[str] | None:
+        """Lowercase words of a text file (None for large or binary files)"""
+        if stat.st_size > self.max_file_bytes:
+            return None
+        try:
+            with open(self.root / rel_path, "rb") as f:
+                data = f.read(self.max_file_bytes + 1)
+        except OSError:
+            return None
+        if b"\0" in data[:BINARY_SNIFF_BYTES]:
+            return None
+        return set(_WORD_RE.findall(data.decode("utf-8", errors="replace").lower()))
+
+    def _index_file(self, rel_path: str, stat: os.stat_result, words: set[str] | None):
+        """Replace the entry of one file"""
+        self._remove_file(rel_path)
+        entry = FileEntry(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+        self.files[rel_path] = entry
+        if words is None:
+            return
+
+        word_ids = set()
+        for word in words:
+            word_id = self._word_ids.get(word)
+            if word_id is None:
+                word_id = len(self._postings)
+                self._word_ids[word] = word_id
+                self._postings.append(set())
+            self._postings[word_id].add(rel_path)
+            word_ids.add(word_id)
+        entry.words = frozenset(word_ids)
+        entry.indexed = True
+
+    def _remove_file(self, rel_path: str):
+        """Drop a file from the index"""
+        entry = self.files.pop(rel_path, None)
+        if entry is not None:
+            for word_id in entry.words:
+                self._postings[word_id].discard(rel_path)
+
+    # ---- Candidate selection ----
+
+    def _vocabulary_text(self) -> str:
+        """All known words joined by newlines (rebuilt when words were added)"""
+        if self._vocabulary_size != len(self._word_ids):
+            words = list(self._word_ids)
+            offsets = []
+            position = 0
+            for word in words:
+                offsets.append(position)
+                position += len(word) + 1
+            self._vocabulary = "\n".join(words)
+            self._vocabulary_offsets = offsets
+            self._vocabulary_size = len(words)
+        return self._vocabulary
+
+    def _files_with_word(self, word: str, prefix: bool, suffix: bool) -> set[str]:
+        """Files containing a word, or any word it is a prefix/suffix/part of"""
+        if not prefix and not suffix:
+            word_id = self._word_ids.get(word)
+            return set(self._postings[word_id]) if word_id is not None else set()
+
+        vocabulary = self._vocabulary_text()
+        pattern = ("^" if not suffix else "") + re.escape(word) + ("$" if not prefix else "")
+        files: set[str] = set()
+        matched_ids = set()
+        for match in re.finditer(pattern, vocabulary, re.MULTILINE):
+            word_id = bisect.bisect_right(self._vocabulary_offsets, match.start()) - 1
+            if word_id not in matched_ids:
+                matched_ids.add(word_id)
+                files |= self._postings[word_id]
+        return files
+
+    def candidates(self, literal: str) -> set[str] | None:
+        """Files that may contain a literal text (case-insensitive).
+
+        Args:
+            literal: Text that every match contains
+
+        Returns:
+            Candidate relative paths, or None if the literal has no words to look up
+        """
+        literal = literal.lower()
+        result: set[str] | None = None
+        for match in _WORD_RE.finditer(literal):
+            # A word at the edge of the literal may continue in the file
+            may_extend_left = match.start() == 0
+            may_extend_right = match.end() == len(literal)
+            files = self._files_with_word(match.group(), prefix=may_extend_right, suffix=may_extend_left)
+            result = files if result is None else result & files
+            if not result:
+                break
+        return result
+
+    # ---- Queries ----
+
+    def search(
+        self,
+        pattern: str,
+        regex: bool = False,
+        case_sensitive: bool = False,
+        path_filter: re.Pattern | None = None,
+        max_matches_per_file: int = 20,
+    ) -> list[tuple[str, list[SearchMatch]]]:
+        """Search indexed text files for a pattern.
+
+        Args:
+            pattern: Literal text, or a regular expression if regex is True
+            regex: Treat pattern as a regular expression
+            case_sensitive: Match case exactly
+            path_filter: Only files whose relative path fully matches it
+            max_matches_per_file: Matching lines reported per file
+
+        Returns:
+            (path, matches) per file, files with most matches first
+
+        Raises:
+            re.error: Invalid regular expression
+        """
+        flags = re.MULTILINE if case_sensitive else re.MULTILINE | re.IGNORECASE
+        compiled = re.compile(pattern if regex else re.escape(pattern), flags)
+        literals = required_literals(pattern) if regex else [pattern]
+
+        self.ensure_fresh()
+        key = ("search", compiled.pattern, compiled.flags, path_filter.pattern if path_filter else None, max_matches_per_file)
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None:
+                self._results.move_to_end(key)
+        if cached is not None:
+            results, stamps = cached
+            changed = [rel_path for rel_path, stamp in stamps.items() if _file_stamp(self.root / rel_path) != stamp]
+            if not changed:
+                return results
+            # Never serve line text of files changed since the search
+            for rel_path in changed:
+                self.invalidate(rel_path)
+
+        with self._lock:
+            generation = self.generation
+            candidates: set[str] | None = None
+            for literal in literals:
+                files = self.candidates(literal)
+                if files is not None:
+                    candidates = files if candidates is None else candidates & files
+            if candidates is None:
+                candidates = {path for path, entry in self.files.items() if entry.indexed}
+            candidates = sorted(candidates)
+
+        # Files are read and matched without holding the lock, so writers and
+        # other queries are not blocked by a long search
+        results = []
+        stamps = {}
+        for rel_path in candidates:
+            if path_filter is not None and not path_filter.fullmatch(rel_path):
+                continue
+            matches, stamp = self._match_file(rel_path, compiled, max_matches_per_file)
+            if matches:
+                results.append((rel_path, matches))
+                stamps[rel_path] = stamp
+
+        # Rank: most matching lines first, then shallower and shorter paths
+        results.sort(key=lambda item: (-len(item[1]), item[0].count("/"), len(item[0]), item[0]))
+        with self._lock:
+            # Only cache results that the index did not change under
+            if self.generation == generation:
+                self._remember(key, (results, stamps))
+        return results
+
+    def _match_file(self, rel_path: str, compiled: re.Pattern, max_matches: int) -> tuple[list[SearchMatch], tuple[int, int] | None]:
+        """Find matching lines in one file, with the (mtime, size) of the text searched"""
+        try:
+            with open(self.root / rel_path, "rb") as f:
+                stat = os.fstat(f.fileno())
+                text = f.read().decode("utf-8", errors="replace")
+        except OSError:
+            return [], None
+
+        matches = []
+        line_number = 1
+        line_pos = 0
+        last_line = 0
+        for match in compiled.finditer(text):
+            line_number += text.count("\n", line_pos, match.start())
+            line_pos = match.start()
+            if line_number == last_line:
+                continue
+            last_line = line_number
+            line_start = text.rfind("\n", 0, match.start()) + 1
+            line_end = text.find("\n", match.start())
+            line = text[line_start : len(text) if line_end == -1 else line_end].rstrip("\r")
+            matches.append(SearchMatch(rel_path, line_number, line))
+            if len(matches) >= max_matches:
+                break
+        return matches, (stat.st_mtime_ns, stat.st_size)
+
+    def glob(self, pattern: str) -> list[str]:
+        """List files matching a glob, most recently modified first.
+
+        Args:
+            pattern: Glob pattern (see compile_glob)
+
+        Returns:
+            Relative paths
+        """
+        compiled = compile_glob(pattern)
+        self.ensure_fresh()
+        with self._lock:
+            key = ("glob", compiled.pattern)
+            cached = self._results.get(key)
+            if cached is not None:
+                self._results.move_to_end(key)
+                return cached
+
+            paths = [path for path in self.files if compiled.fullmatch(path)]
+            paths.sort(key=lambda path: (-self.files[path].mtime_ns, path))
+            self._remember(key, paths)
+            return paths
+
+    def _remember(self, key: tuple, value):
+        """Cache a query result until the index changes"""
+        self._results[key] = value
+        while len(self._results) > RESULT_CACHE_SIZE:
+            self._results.popitem(last=False)
+
+
+def _file_stamp(path: Path) -> tuple[int, int] | None:
+    """(mtime, size) of a file, None if it is gone"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def required_literals(pattern: str) -> list[str]:
+    """Literal strings every match of a regular expression must contain.
+
+    Only top-level runs of literal characters are extracted; patterns with a
+    top-level alternation yield none (every file is then searched).
+
+    Args:
+        pattern: Regular expression
+
+    Returns:
+        Literal runs of at least 3 characters
+    """
+    try:
+        import re._parser as sre_parse
+        from re._constants import BRANCH, LITERAL
+    except ImportError:  # Python < 3.11
+        import sre_parse  # type: ignore[no-redef]
+        from sre_constants import BRANCH, LITERAL  # type: ignore[no-redef]
+
+    try:
+        parsed = sre_parse.parse(pattern)
+    except Exception:
+        return []
+
+    literals = []
+    current = []
+    for op, value in parsed:
+        if op is BRANCH:
+            return []
+        if op is LITERAL:
+            current.append(chr(value))
+            continue
+        literals.append("".join(current))
+        current = []
+    literals.append("".join(current))
+    return [literal for literal in literals if len(literal) >= 3]
+
+
+# Shared indexes, one per workspace root
+_indexes: dict[Path, WorkspaceIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_workspace_index(root: str | Path) -> WorkspaceIndex:
+    """Get the shared index of a workspace, creating it on first use"""
+    root = Path(root).resolve()
+    with _indexes_lock:
+        index = _indexes.get(root)
+        if index is None:
+            index = _indexes[root] = WorkspaceIndex(root)
+        return index
+
+
+def invalidate_workspace_path(path: str | Path):
+    """Re-index a file in every existing index that contains it (no index is created)"""
+    path = Path(path).resolve()
+    with _indexes_lock:
+        indexes = [index for root, index in _indexes.items() if path.is_relative_to(root)]
+    for index in indexes:
+        index.invalidate(path)
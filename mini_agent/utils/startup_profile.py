@@ -0,0 +1,72 @@
+"""Startup time breakdown for the CLI (--profile-startup).
+
+Records how long each initialization phase takes and, while installed, how
+long each package that was not loaded yet takes to import. Packages are
+attributed to the outermost import that loaded them, so the time of an SDK
+includes its own dependencies.
+"""
+
+import builtins
+import sys
+import time
+
+
+class StartupProfile:
+    """Init-phase and import timings of one process start"""
+
+    def __init__(self, start: float | None = None):
+        """Initialize startup profile.
+
+        Args:
+            start: perf_counter() value startup is measured from (default: now)
+        """
+        self.start = time.perf_counter() if start is None else start
+        self._last_mark = self.start
+        self.phases: list[tuple[str, float]] = []
+        self.imports: dict[str, float] = {}
+        self._original_import = None
+        self._depth = 0
+
+    def install(self):
+        """Start timing imports of packages that are not loaded yet"""
+        if self._original_import is not None:
+            return
+        original = self._original_import = builtins.__import__
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            package = name.partition(".")[0]
+            if level or self._depth or package == "mini_agent" or package in sys.modules:
+                return original(name, globals, locals, fromlist, level)
+            self._depth += 1
+            started = time.perf_counter()
+            try:
+                return original(name, globals, locals, fromlist, level)
+            finally:
+                self._depth -= 1
+                self.imports[package] = self.imports.get(package, 0.0) + time.perf_counter() - started
+
+        builtins.__import__ = timed_import
+
+    def uninstall(self):
+        """Stop timing imports"""
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def mark(self, name: str):
+        """End a phase: record the time since the previous mark (or the start)"""
+        now = time.perf_counter()
+        self.phases.append((name, now - self._last_mark))
+        self._last_mark = now
+
+    def report(self, top_imports: int = 10) -> str:
+        """Format the breakdown, with the total time since start"""
+        lines = ["Startup profile:"]
+        for name, seconds in self.phases:
+            lines.append(f"  {name:<32} {seconds * 1000:8.1f} ms")
+        lines.append(f"  {'total (time to prompt)':<32} {(time.perf_counter() - self.start) * 1000:8.1f} ms")
+        if self.imports:
+            lines.append("Slowest imports (included in the phases above):")
+            for package, seconds in sorted(self.imports.items(), key=lambda item: -item[1])[:top_imports]:
+                lines.append(f"  {package:<32} {seconds * 1000:8.1f} ms")
+        return "\n".join(lines)
@@ -0,0 +1,160 @@
+"""Shared tokenizer utilities.
+
+The cl100k_base encoder is loaded once per process and shared by the agent's
+token accounting and the tools' output truncation.
+
+Truncation never encodes a whole long text: its token count is extrapolated
+from the chars-per-token ratio of a few sample windows, and only the head and
+tail windows that are kept get encoded.
+"""
+
+import threading
+from typing import Any
+
+import tiktoken
+
+ENCODING_NAME = "cl100k_base"
+
+# Rough estimation used when tiktoken is unavailable: average 2.5 characters = 1 token
+FALLBACK_CHARS_PER_TOKEN = 2.5
+
+# Typical characters per token of English text and code, for estimates without any encoding
+ESTIMATED_CHARS_PER_TOKEN = 4
+
+# Characters encoded from each of the head, middle and tail of a long text to calibrate its ratio
+ESTIMATE_SAMPLE_CHARS = 4096
+
+_encoding: Any = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+
+def get_encoding() -> Any:
+    """Get the process-wide cl100k_base encoder (GPT-4/Claude/M2 compatible).
+
+    The encoder is initialized on first use. If initialization fails (e.g. the
+    encoding file cannot be downloaded), the failure is remembered and None is
+    returned so callers can fall back to character-based estimation without
+    retrying on every call.
+
+    Returns:
+        tiktoken Encoding, or None if tiktoken is unavailable
+    """
+    global _encoding, _encoding_loaded
+
+    if _encoding_loaded:
+        return _encoding
+
+    with _encoding_lock:
+        if not _encoding_loaded:
+            try:
+                _encoding = tiktoken.get_encoding(ENCODING_NAME)
+            except Exception:
+                _encoding = None
+            _encoding_loaded = True
+
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens in text with the shared encoder.
+
+    Falls back to a character-based estimate when tiktoken is unavailable.
+
+    Args:
+        text: Text to count
+
+    Returns:
+        Token count
+    """
+    encoding = get_encoding()
+    if encoding is None:
+        return int(len(text) / FALLBACK_CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate tokens in text without encoding all of it.
+
+    Short texts are counted exactly. Longer texts are extrapolated from the
+    chars-per-token ratio of sample windows at their head, middle and tail.
+
+    Args:
+        text: Text to estimate
+
+    Returns:
+        Estimated token count
+    """
+    length = len(text)
+    if length <= 3 * ESTIMATE_SAMPLE_CHARS:
+        return count_tokens(text)
+
+    middle = (length - ESTIMATE_SAMPLE_CHARS) // 2
+    samples = (text[:ESTIMATE_SAMPLE_CHARS], text[middle : middle + ESTIMATE_SAMPLE_CHARS], text[-ESTIMATE_SAMPLE_CHARS:])
+    sample_tokens = sum(count_tokens(sample) for sample in samples)
+    return max(1, round(length * sample_tokens / (3 * ESTIMATE_SAMPLE_CHARS)))
+
+
+def _fit_window(window: str, max_tokens: int, from_end: bool) -> str:
+    """Shrink a head (or tail) window of text until it fits max_tokens"""
+    while window:
+        token_count = count_tokens(window)
+        if token_count <= max_tokens:
+            break
+        keep = int(len(window) * max_tokens / token_count * 0.98)
+        if keep <= 0:
+            return ""
+        window = window[-keep:] if from_end else window[:keep]
+    return window
+
+
+def truncate_text_by_tokens(text: str, max_tokens: int) -> str:
+    """Truncate text by token count if it exceeds the limit.
+
+    When text exceeds the specified token limit, performs intelligent truncation
+    by keeping the front and back parts while truncating the middle. The cost
+    depends on max_tokens rather than on the length of the text: only texts
+    close to the limit are encoded fully.
+
+    Args:
+        text: Text to be truncated
+        max_tokens: Maximum token limit
+
+    Returns:
+        str: Truncated text if it exceeds the limit, otherwise the original text.
+
+    Example:
+        >>> text = "very long text..." * 10000
+        >>> truncated = truncate_text_by_tokens(text, 64000)
+        >>> print(truncated)
+    """
+    # A token covers at least one UTF-8 byte, i.e. at most 4 tokens per character
+    if len(text) * 4 <= max_tokens:
+        return text
+
+    token_count = estimate_tokens(text)
+    if token_count <= 2 * max_tokens:
+        # Close to the limit: the exact count decides
+        token_count = count_tokens(text)
+        if token_count <= max_tokens:
+            return text
+
+    # Keep head and tail mode: allocate half space for each
+    half_tokens = max_tokens // 2
+    window_chars = int(half_tokens * len(text) / token_count * 1.1) + 1
+
+    # Truncate front part: find nearest newline
+    head_part = _fit_window(text[:window_chars], half_tokens, from_end=False)
+    last_newline_head = head_part.rfind("\n")
+    if last_newline_head > 0:
+        head_part = head_part[:last_newline_head]
+
+    # Truncate back part: find nearest newline
+    tail_part = _fit_window(text[-window_chars:], half_tokens, from_end=True)
+    first_newline_tail = tail_part.find("\n")
+    if first_newline_tail > 0:
+        tail_part = tail_part[first_newline_tail + 1 :]
+
+    # Combine result
+    truncation_note = f"\n\n... [Content truncated: ~{token_count} tokens -> ~{max_tokens} tokens limit] ...\n\n"
+    return head_part + truncation_note + tail_part
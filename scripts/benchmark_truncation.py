@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark token-budget truncation of large tool outputs.
+
+Compares truncate_text_by_tokens() with the previous approach, which encoded
+the whole text to learn its token count before cutting it.
+
+Usage: uv run python scripts/benchmark_truncation.py [size_mb] [max_tokens]
+"""
+
+import sys
+import time
+
+from mini_agent.utils import count_tokens, get_encoding, truncate_text_by_tokens
+
+
+def full_encode_truncate(text: str, max_tokens: int) -> str:
+    """Previous implementation: exact count of the full text, then head/tail cut"""
+    token_count = count_tokens(text)
+    if token_count <= max_tokens:
+        return text
+    chars_per_half = int((max_tokens / 2) / (token_count / len(text)) * 0.95)
+    return text[:chars_per_half] + "\n\n... [Content truncated] ...\n\n" + text[-chars_per_half:]
+
+
+def make_output(size_mb: float) -> str:
+    """Build log-like text of about size_mb megabytes"""
+    line = "2025-01-01 12:00:00 INFO worker-{0} processed request id={1} in {2} ms status=ok\n"
+    lines = []
+    size = 0
+    i = 0
+    while size < size_mb * 1024 * 1024:
+        lines.append(line.format(i % 16, i * 7919 % 1000003, i % 997))
+        size += len(lines[-1])
+        i += 1
+    return "".join(lines)
+
+
+def best_of(func, *args, runs: int = 3) -> float:
+    """Best wall time of several runs in seconds"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    size_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    max_tokens = int(sys.argv[2]) if len(sys.argv) > 2 else 32000
+
+    print(f"Tokenizer: {'tiktoken cl100k_base' if get_encoding() is not None else 'character estimate (tiktoken unavailable)'}")
+    text = make_output(size_mb)
+    print(f"Input: {len(text) / 1024 / 1024:.1f} MB, limit {max_tokens} tokens")
+
+    previous = best_of(full_encode_truncate, text, max_tokens)
+    current = best_of(truncate_text_by_tokens, text, max_tokens)
+    print(f"Full-text encoding:  {previous * 1000:10.2f} ms")
+    print(f"Sampled truncation:  {current * 1000:10.2f} ms")
+    print(f"Speedup:             {previous / current:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -87,3 +87,30 @@ async def test_acp_invalid_session(acp_agent):
     prompt = SimpleNamespace(sessionId="missing", prompt=[{"text": "?"}])
     response = await agent.prompt(prompt)
     assert response.stopReason == "refusal"
+
+
+@pytest.mark.asyncio
+async def test_acp_session_shell_is_closed(tmp_path):
+    config = Config(
+        llm=LLMConfig(api_key="test-key"),
+        agent=AgentConfig(max_steps=3, workspace_dir=str(tmp_path)),
+        tools=ToolsConfig(enable_file_tools=False, enable_note=False, bash_persistent_session=True),
+    )
+    agent = MiniMaxACPAgent(DummyConn(), config, DummyLLM(), [EchoTool()], "system")
+
+    shells = []
+    for _ in range(2):
+        session = await agent.newSession(SimpleNamespace(cwd=str(tmp_path)))
+        bash = agent._sessions[session.sessionId].agent.tools["bash"]
+        assert (await bash.execute(command="echo hi")).success
+        assert bash.session.is_alive
+        shells.append((session.sessionId, bash.session))
+
+    await agent.closeSession(SimpleNamespace(sessionId=shells[0][0]))
+    assert not shells[0][1].is_alive
+    assert shells[0][0] not in agent._sessions
+    assert shells[1][1].is_alive
+
+    await agent.close()
+    assert not shells[1][1].is_alive
+    assert not agent._sessions
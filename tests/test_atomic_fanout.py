@@ -0,0 +1,121 @@
+"""Test cases for concurrent tier writes and the write policy of atomic storage."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from mini_agent.atomic_memory.storage import MAX_TIER_THREADS, AtomicMessage, AtomicMultiTierStorage, WritePolicy
+
+
+def make_storage(delays: dict[str, float], failing: tuple = (), policy: WritePolicy | None = None) -> AtomicMultiTierStorage:
+    """Storage whose tier writers sleep for the given delays (failing ones raise)"""
+    storage = AtomicMultiTierStorage(write_policy=policy)
+    storage.initialized = True
+    storage.tiers = {tier: object() for tier in delays}
+    storage.written = []
+
+    for tier, delay in delays.items():
+
+        async def write(client, message, tier=tier, delay=delay):
+            await asyncio.sleep(delay)
+            if tier in failing:
+                raise ConnectionError(f"{tier} refused the write")
+            storage.written.append(tier)
+
+        setattr(storage, f"_store_in_{tier}", write)
+    return storage
+
+
+def make_message() -> AtomicMessage:
+    return AtomicMessage(id="m1", session_id="s1", role="user", content="hello", timestamp=time.time())
+
+
+async def test_tiers_are_written_concurrently():
+    """Test latency is that of the slowest tier, not the sum of all tiers"""
+    storage = make_storage({"redis": 0.2, "postgres": 0.2, "neo4j": 0.2, "mongodb": 0.3})
+
+    started = time.perf_counter()
+    report = await storage.store_with_report(make_message())
+    elapsed = time.perf_counter() - started
+
+    assert report.success
+    assert sorted(storage.written) == ["mongodb", "neo4j", "postgres", "redis"]
+    assert elapsed < 0.6
+    assert {result.tier for result in report.results} == set(storage.tiers)
+
+
+async def test_tier_deadline():
+    """Test a slow tier times out without holding up the write"""
+    policy = WritePolicy(tier_timeouts={"mongodb": 0.1})
+    storage = make_storage({"redis": 0.05, "mongodb": 5.0}, policy=policy)
+
+    started = time.perf_counter()
+    report = await storage.store_with_report(make_message())
+
+    assert time.perf_counter() - started < 1.0
+    assert report.success
+    assert report.failed_tiers == ["mongodb"]
+    mongodb = next(result for result in report.results if result.tier == "mongodb")
+    assert "timed out" in mongodb.error
+
+
+async def test_cold_tier_failure_is_tolerated():
+    """Test the default policy only requires the hot tiers"""
+    storage = make_storage({"redis": 0.0, "postgres": 0.0, "qdrant": 0.0}, failing=("qdrant",))
+
+    assert await storage.store_atomically(make_message())
+
+
+async def test_hot_tier_failure_fails_the_write():
+    """Test a failing hot tier fails the write while the others are still written"""
+    storage = make_storage({"redis": 0.0, "postgres": 0.0, "qdrant": 0.0}, failing=("postgres",))
+
+    report = await storage.store_with_report(make_message())
+
+    assert not report.success
+    assert report.failed_tiers == ["postgres"]
+    assert "refused" in report.results[1].error
+    assert sorted(storage.written) == ["qdrant", "redis"]
+
+
+async def test_policies():
+    """Test strict and minimum-count policies"""
+    strict = make_storage({"redis": 0.0, "mongodb": 0.0}, failing=("mongodb",), policy=WritePolicy(required_tiers=None))
+    assert not await strict.store_atomically(make_message())
+
+    # Only cold tiers connected: at least two of them must succeed
+    quorum = WritePolicy(min_tiers=2)
+    assert not await make_storage({"neo4j": 0.0, "mongodb": 0.0}, failing=("mongodb",), policy=quorum).store_atomically(make_message())
+    assert await make_storage({"neo4j": 0.0, "mongodb": 0.0, "qdrant": 0.0}, failing=("mongodb",), policy=quorum).store_atomically(make_message())
+
+
+
+async def test_hung_sync_tier_does_not_fill_default_executor():
+    """Test a hung synchronous tier only ties up its own threads"""
+    release = threading.Event()
+    calls = []
+
+    class HungCollection:
+        def insert_one(self, document):
+            calls.append(document["_id"])
+            release.wait(5)
+
+    storage = make_storage({"redis": 0.0}, policy=WritePolicy(tier_timeouts={"mongodb": 0.05}))
+    storage.tiers["mongodb"] = {"atomic_memory": {"messages": HungCollection()}}
+    try:
+        reports = [await storage.store_with_report(make_message()) for _ in range(MAX_TIER_THREADS + 2)]
+
+        assert all(report.success and report.failed_tiers == ["mongodb"] for report in reports)
+        assert len(calls) == MAX_TIER_THREADS
+        assert "skipped" in reports[-1].results[1].error
+        # The default executor is still free
+        assert await asyncio.wait_for(asyncio.to_thread(lambda: "free"), 1) == "free"
+    finally:
+        release.set()
+        await storage.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,157 @@
+"""Test cases for incremental, background history summarization in Agent."""
+
+import asyncio
+
+import pytest
+
+from mini_agent.agent import SUMMARY_PREFIX, Agent
+from mini_agent.schema import LLMResponse, Message
+
+
+class SlowSummaryLLM:
+    """Fake LLM returning a summary after a delay, tracking concurrency."""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.calls = 0
+        self.running = 0
+        self.peak = 0
+
+    async def generate(self, messages, tools=None):
+        self.calls += 1
+        number = self.calls
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.running -= 1
+        return LLMResponse(content=f"summary {number}", finish_reason="stop")
+
+
+def make_agent(tmp_path, llm, rounds: int, token_limit: int = 10**6) -> Agent:
+    agent = Agent(llm_client=llm, system_prompt="system", tools=[], workspace_dir=str(tmp_path), token_limit=token_limit)
+    for i in range(rounds):
+        agent.add_user_message(f"task {i}")
+        agent.messages.append(Message(role="assistant", content=f"working on {i}"))
+        agent.messages.append(Message(role="tool", content=f"result {i}", tool_call_id=f"c{i}", name="bash"))
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_rounds_summarized_concurrently(tmp_path):
+    """Test that round summaries are generated concurrently and swapped in at once."""
+    print("\n=== Testing Concurrent Round Summaries ===")
+
+    llm = SlowSummaryLLM()
+    agent = make_agent(tmp_path, llm, rounds=4, token_limit=10)
+
+    await agent._summarize_messages()
+
+    assert llm.calls == 4
+    assert llm.peak > 1
+    # system + 4 x (user, summary)
+    assert len(agent.messages) == 9
+    assert [m.role for m in agent.messages[1:]] == ["user"] * 8
+    assert all(m.content.startswith(SUMMARY_PREFIX) for m in agent.messages[2::2])
+    assert agent._summary_cache == {}
+
+
+@pytest.mark.asyncio
+async def test_background_summaries_reused(tmp_path):
+    """Test that crossing the soft threshold prepares summaries without changing history."""
+    print("\n=== Testing Background Summary Preparation ===")
+
+    llm = SlowSummaryLLM()
+    agent = make_agent(tmp_path, llm, rounds=2)
+    tokens = agent._estimate_tokens()
+    agent.token_limit = int(tokens / 0.8)
+    agent.summary_threshold = 0.5
+    history = list(agent.messages)
+
+    # Soft threshold crossed: summarization starts but the step is not blocked
+    await agent._summarize_messages()
+    assert agent._summary_task is not None
+    assert agent.messages == history
+    await agent._summary_task
+    assert llm.calls == 2
+
+    # Running into the hard limit later reuses the prepared summaries
+    agent.messages.append(Message(role="assistant", content="more " * 50))
+    await agent._summarize_messages()
+
+    assert llm.calls == 3  # Only the new span of the last round
+    contents = [m.content for m in agent.messages[1:]]
+    # Last round: prepared summary of its first span followed by the new span's summary
+    assert contents == [
+        "task 0",
+        f"{SUMMARY_PREFIX}\n\nsummary 1",
+        "task 1",
+        f"{SUMMARY_PREFIX}\n\nsummary 2",
+        f"{SUMMARY_PREFIX}\n\nsummary 3",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_hard_limit_waits_for_background_task(tmp_path):
+    """Test that the hard limit waits for in-flight summaries instead of repeating them."""
+    llm = SlowSummaryLLM(delay=0.1)
+    agent = make_agent(tmp_path, llm, rounds=3)
+    agent._summary_task = asyncio.create_task(agent._prepare_summaries(agent._plan_summaries()))
+
+    agent.token_limit = 10
+    await agent._summarize_messages()
+
+    assert llm.calls == 3
+    assert len(agent.messages) == 7
+
+
+@pytest.mark.asyncio
+async def test_stale_prepared_summary_ignored(tmp_path):
+    """Test that a prepared summary is only used for the exact messages it covers."""
+    llm = SlowSummaryLLM(delay=0)
+    agent = make_agent(tmp_path, llm, rounds=1)
+    await agent._prepare_summaries(agent._plan_summaries())
+
+    # History replaced with different messages
+    agent.messages = agent.messages[:2] + [Message(role="assistant", content="other")]
+    spans = agent._plan_summaries()[0][1]
+    assert len(spans) == 1
+    assert agent._cached_summary(spans[0]) is None
+
+
+@pytest.mark.asyncio
+async def test_failed_background_task_is_retried(tmp_path):
+    """Test that a failing background task is reported and prepared again later."""
+    print("\n=== Testing Failed Background Summary ===")
+
+    llm = SlowSummaryLLM(delay=0)
+    agent = make_agent(tmp_path, llm, rounds=2)
+    agent.token_limit = agent._estimate_tokens() * 2
+    agent.summary_threshold = 0.1
+
+    create_summary = agent._create_summary
+    failures = []
+
+    async def flaky_summary(messages, round_num):
+        if not failures:
+            failures.append(round_num)
+            raise RuntimeError("summary backend down")
+        return await create_summary(messages, round_num)
+
+    agent._create_summary = flaky_summary
+
+    await agent._summarize_messages()
+    task = agent._summary_task
+    await asyncio.wait([task])
+    await asyncio.sleep(0)
+
+    # The failure was retrieved and the task forgotten
+    assert isinstance(task.exception(), RuntimeError)
+    assert agent._summary_task is None
+
+    await agent._summarize_messages()
+    await agent._summary_task
+
+    rounds = agent._plan_summaries()
+    assert all(agent._cached_summary(span) is not None for _, spans in rounds for span in spans)
@@ -1,10 +1,13 @@
 """Test cases for Bash Tool."""
 
 import asyncio
+import os
+import time
 
 import pytest
 
-from mini_agent.tools.bash_tool import BackgroundShellManager, BashKillTool, BashOutputTool, BashTool
+from mini_agent.tools import bash_tool as bash_tool_module
+from mini_agent.tools.bash_tool import BackgroundShell, BackgroundShellManager, BashKillTool, BashOutputTool, BashTool, OutputRingBuffer, SpillFile
 
 
 @pytest.mark.asyncio
@@ -270,3 +273,222 @@ async def test_timeout_validation():
     result = await bash_tool.execute(command="echo 'test'", timeout=0)
     assert result.success
     print("Timeout < 1 handled correctly")
+
+
+def test_output_ring_buffer_is_bounded():
+    """Test that the output buffer stays within its byte budget and counts dropped lines."""
+    print("\n=== Testing Output Ring Buffer ===")
+
+    buffer = OutputRingBuffer(max_bytes=100)
+    for i in range(1000):
+        buffer.append(f"line {i:04d}")  # 9 bytes + newline
+
+    assert buffer.size <= 100
+    assert len(buffer) == 10
+    assert buffer.dropped_lines == 990
+    assert buffer.total_lines == 1000
+
+    lines, skipped = buffer.read_from(985)
+    assert skipped == 5
+    assert lines == [f"line {i:04d}" for i in range(990, 1000)]
+    assert buffer.read_from(1000) == ([], 0)
+
+
+def test_spill_file_rotation(tmp_path):
+    """Test that the spill file keeps the full output and rotates by size."""
+    spill = SpillFile(tmp_path / "shell.log", max_bytes=50, backups=2)
+    for i in range(20):
+        spill.write(f"line {i:04d}")
+    spill.close()
+
+    current = (tmp_path / "shell.log").read_text().splitlines()
+    first_backup = (tmp_path / "shell.log.1").read_text().splitlines()
+    assert current[-1] == "line 0019"
+    assert first_backup[-1] == f"line {int(current[0][5:]) - 1:04d}"
+    assert not (tmp_path / "shell.log.3").exists()
+
+    spill.close(delete=True)
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="Unix permissions")
+def test_spill_files_are_private(tmp_path, monkeypatch):
+    """Test that spill files live in a per-user directory only the user can read."""
+    assert str(os.getuid()) in bash_tool_module.SPILL_DIR.name
+
+    spill_dir = tmp_path / "shells"
+    monkeypatch.setattr(bash_tool_module, "SPILL_DIR", spill_dir)
+    spill = SpillFile(spill_dir / "shell.log", max_bytes=50, backups=1)
+    for i in range(10):
+        spill.write(f"secret {i:04d}")
+    spill.close()
+
+    assert spill_dir.stat().st_mode & 0o777 == 0o700
+    assert (spill_dir / "shell.log").stat().st_mode & 0o777 == 0o600
+    assert (spill_dir / "shell.log.1").stat().st_mode & 0o777 == 0o600
+
+    # Only spill files are cleaned up
+    other = spill_dir / "notes.txt"
+    other.write_text("not a spill file")
+    for path in spill_dir.iterdir():
+        os.utime(path, (time.time() - bash_tool_module.SPILL_FILE_MAX_AGE - 60,) * 2)
+    assert bash_tool_module.cleanup_stale_spill_files() == 2
+    assert list(spill_dir.iterdir()) == [other]
+
+
+@pytest.mark.asyncio
+async def test_bash_output_reports_dropped_lines(tmp_path, monkeypatch):
+    """Test that bash_output reports lines dropped from memory and where to find them."""
+    print("\n=== Testing Dropped Line Reporting ===")
+
+    monkeypatch.setattr(bash_tool_module, "SPILL_DIR", tmp_path)
+    shell = BackgroundShell("ringtest", "server", process=None, start_time=0, max_output_bytes=200)
+    BackgroundShellManager.add(shell)
+    try:
+        for i in range(100):
+            shell.add_output(f"request {i}" if i % 10 else f"ERROR {i}")
+
+        result = await BashOutputTool().execute(bash_id="ringtest", filter_str="ERROR")
+        assert result.success
+        assert result.stdout.startswith("[")
+        assert "earlier lines dropped" in result.stdout
+        assert str(tmp_path / "ringtest.log") in result.stdout
+        assert "ERROR 90" in result.stdout
+
+        # Full output was spilled to disk
+        shell.spill_file.flush()
+        assert len((tmp_path / "ringtest.log").read_text().splitlines()) == 100
+
+        # Nothing new: no note
+        result = await BashOutputTool().execute(bash_id="ringtest")
+        assert result.stdout == ""
+    finally:
+        BackgroundShellManager._remove("ringtest")
+        shell.close_spill_file()
+
+
+@pytest.mark.asyncio
+async def test_spill_files_are_cleaned_up(tmp_path, monkeypatch):
+    """Test that finished shells and earlier runs leave no spill files behind."""
+    print("\n=== Testing Spill File Cleanup ===")
+
+    monkeypatch.setattr(bash_tool_module, "SPILL_DIR", tmp_path)
+    stale = tmp_path / "old.log"
+    stale.write_text("output of an earlier run\n")
+    os.utime(stale, (time.time() - bash_tool_module.SPILL_FILE_MAX_AGE - 60,) * 2)
+    fresh = tmp_path / "other.log"
+    fresh.write_text("output of a running shell\n")
+    assert bash_tool_module.cleanup_stale_spill_files() == 1
+    assert list(tmp_path.iterdir()) == [fresh]
+    fresh.unlink()
+
+    # All output still in memory when the shell finished: spill file deleted
+    result = await BashTool().execute(command="echo done", run_in_background=True)
+    shell = BackgroundShellManager.get(result.bash_id)
+    try:
+        for _ in range(100):
+            if result.bash_id not in BackgroundShellManager._monitor_tasks:
+                break
+            await asyncio.sleep(0.05)
+        assert shell.output_lines == ["done"]
+        assert list(tmp_path.iterdir()) == []
+    finally:
+        BackgroundShellManager._remove(result.bash_id)
+
+
+@pytest.mark.asyncio
+async def test_bash_output_waits_for_new_output():
+    """Test that bash_output can block until output arrives instead of polling."""
+    print("\n=== Testing Waiting for Output ===")
+
+    bash_tool = BashTool()
+    result = await bash_tool.execute(command="sleep 0.3; echo ready; exec sleep 30", run_in_background=True)
+    bash_id = result.bash_id
+
+    try:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        output = await BashOutputTool().execute(bash_id=bash_id, wait_seconds=10)
+        assert "ready" in output.stdout
+        assert loop.time() - start < 5
+
+        # No new output: waits for the timeout only
+        start = loop.time()
+        output = await BashOutputTool().execute(bash_id=bash_id, wait_seconds=0.2)
+        assert output.stdout == ""
+        assert loop.time() - start >= 0.2
+    finally:
+        await BashKillTool().execute(bash_id=bash_id)
+
+
+@pytest.mark.asyncio
+async def test_chunked_output_and_exit_wakeup():
+    """Test that lines split across reads are joined and that process exit wakes waiters."""
+    bash_tool = BashTool()
+    result = await bash_tool.execute(command="printf 'abc'; sleep 0.2; printf 'def\\nlast'", run_in_background=True)
+    bash_id = result.bash_id
+
+    shell = BackgroundShellManager.get(bash_id)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    lines = []
+    while shell.status == "running" and loop.time() - start < 5:
+        await shell.wait_for_output(timeout=5)
+        lines += shell.get_new_output()
+
+    assert shell.status == "completed"
+    assert lines + shell.get_new_output() == ["abcdef", "last"]
+    await BashKillTool().execute(bash_id=bash_id)
+
+
+@pytest.mark.asyncio
+async def test_persistent_session_keeps_state(tmp_path):
+    """Test that cd and exported variables carry over between commands."""
+    print("\n=== Testing Persistent Shell Session ===")
+
+    (tmp_path / "sub").mkdir()
+    bash_tool = BashTool(workspace_dir=str(tmp_path), persistent_session=True)
+    try:
+        result = await bash_tool.execute(command="cd sub && export GREETING=hello")
+        assert result.success
+
+        result = await bash_tool.execute(command="pwd; echo $GREETING; printf 'no newline'")
+        assert result.stdout == f"{tmp_path / 'sub'}\nhello\nno newline"
+
+        result = await bash_tool.execute(command="echo out; echo err >&2; (exit 7)")
+        assert not result.success
+        assert result.exit_code == 7
+        assert result.stdout == "out\n"
+        assert result.stderr == "err\n"
+
+        # Background commands start in the session's directory
+        result = await bash_tool.execute(command="pwd", run_in_background=True)
+        shell = BackgroundShellManager.get(result.bash_id)
+        await shell.wait_for_output(timeout=5)
+        assert shell.get_new_output() == [str(tmp_path / "sub")]
+        await BashKillTool().execute(bash_id=result.bash_id)
+    finally:
+        await bash_tool.close()
+
+
+@pytest.mark.asyncio
+async def test_persistent_session_recovery(tmp_path):
+    """Test that syntax errors, exit and timeouts leave a usable session."""
+    bash_tool = BashTool(workspace_dir=str(tmp_path), persistent_session=True)
+    try:
+        result = await bash_tool.execute(command="echo 'unbalanced")
+        assert not result.success
+        assert (await bash_tool.execute(command="echo fine")).stdout == "fine\n"
+
+        result = await bash_tool.execute(command="exit 3")
+        assert result.exit_code == 3
+        assert (await bash_tool.execute(command="echo restarted")).stdout == "restarted\n"
+
+        await bash_tool.execute(command="cd /")
+        result = await bash_tool.execute(command="sleep 10", timeout=1)
+        assert not result.success
+        assert "timed out" in result.error
+        result = await bash_tool.execute(command="pwd")
+        assert result.stdout == "/\n"
+    finally:
+        await bash_tool.close()
@@ -0,0 +1,111 @@
+"""Test cases for batched, atomic EditTool edits."""
+
+import os
+
+import pytest
+
+from mini_agent.tools import EditTool
+
+
+def make_file(tmp_path, lines: int = 1000):
+    path = tmp_path / "module.py"
+    path.write_text("".join(f"value_{i} = {i}\n" for i in range(1, lines + 1)))
+    return path
+
+
+@pytest.mark.asyncio
+async def test_batched_edits_with_diff(tmp_path):
+    """Test that several edits are applied at once and reported as a diff."""
+    print("\n=== Testing Batched Edits ===")
+
+    path = make_file(tmp_path)
+    tool = EditTool(workspace_dir=str(tmp_path))
+
+    result = await tool.execute(
+        path="module.py",
+        edits=[
+            {"old_str": "value_500 = 500\n", "new_str": "value_500 = 'five hundred'\n"},
+            {"old_str": "value_10 = 10\n", "new_str": "# ten\nvalue_10 = 10\n"},
+            {"old_str": "value_1000 = 1000", "new_str": "value_1000 = 1_000"},
+        ],
+    )
+
+    assert result.success, result.error
+    lines = path.read_text().splitlines()
+    assert lines[9:11] == ["# ten", "value_10 = 10"]
+    assert lines[500] == "value_500 = 'five hundred'"
+    assert lines[-1] == "value_1000 = 1_000"
+
+    diff = result.content.splitlines()
+    assert "(3 edits)" in diff[0]
+    assert "@@ -8,4 +8,5 @@" in diff
+    assert "@@ -498,5 +499,5 @@" in diff
+    assert "@@ -998,3 +999,3 @@" in diff
+    assert "-value_500 = 500" in diff and "+value_500 = 'five hundred'" in diff
+    assert "+# ten" in diff
+
+
+@pytest.mark.asyncio
+async def test_invalid_batch_leaves_file_untouched(tmp_path):
+    """Test that one bad edit rejects the whole batch."""
+    print("\n=== Testing Atomic Batch Validation ===")
+
+    path = make_file(tmp_path, lines=20)
+    original = path.read_text()
+    tool = EditTool(workspace_dir=str(tmp_path))
+
+    result = await tool.execute(path="module.py", edits=[{"old_str": "value_2 = 2", "new_str": "x"}, {"old_str": "missing", "new_str": "y"}])
+    assert not result.success
+    assert "Edit 2" in result.error
+
+    # value_1 is a prefix of value_1x lines: ambiguous
+    result = await tool.execute(path="module.py", edits=[{"old_str": "value_1", "new_str": "v1"}])
+    assert not result.success
+    assert "more than once" in result.error
+
+    result = await tool.execute(path="module.py", edits=[{"old_str": "value_3 = 3", "new_str": "a"}, {"old_str": "3 = 3\nvalue_4", "new_str": "b"}])
+    assert not result.success
+    assert "overlaps" in result.error
+
+    assert path.read_text() == original
+
+
+@pytest.mark.asyncio
+async def test_atomic_write_keeps_permissions(tmp_path):
+    """Test that the file is replaced via rename and keeps its mode."""
+    path = make_file(tmp_path, lines=3)
+    path.chmod(0o750)
+    inode = path.stat().st_ino
+    tool = EditTool(workspace_dir=str(tmp_path))
+
+    result = await tool.execute(path="module.py", old_str="value_2 = 2", new_str="value_2 = 'two'")
+
+    assert result.success
+    assert path.stat().st_ino != inode
+    assert path.stat().st_mode & 0o777 == 0o750
+    assert sorted(os.listdir(tmp_path)) == ["module.py"]
+
+
+@pytest.mark.asyncio
+async def test_edit_follows_symlinks_and_hardlinks(tmp_path):
+    """Test that editing through a symlink or hardlink changes the shared file."""
+    target = tmp_path / "target.txt"
+    target.write_text("hello\n")
+    link = tmp_path / "link.txt"
+    link.symlink_to(target)
+    tool = EditTool(workspace_dir=str(tmp_path))
+
+    result = await tool.execute(path="link.txt", old_str="hello", new_str="hi")
+
+    assert result.success
+    assert link.is_symlink()
+    assert target.read_text() == "hi\n"
+
+    hardlink = tmp_path / "hardlink.txt"
+    os.link(target, hardlink)
+    result = await tool.execute(path="hardlink.txt", old_str="hi", new_str="hey")
+
+    assert result.success
+    assert os.path.samefile(target, hardlink)
+    assert target.read_text() == "hey\n"
+    assert sorted(os.listdir(tmp_path)) == ["hardlink.txt", "link.txt", "target.txt"]
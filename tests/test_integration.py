@@ -1,7 +1,6 @@
 """Integration test cases - Full agent demos."""
 
 import asyncio
-import json
 import tempfile
 from pathlib import Path
 
@@ -12,6 +11,7 @@ from mini_agent.agent import Agent
 from mini_agent.config import Config
 from mini_agent.tools import BashTool, EditTool, ReadTool, WriteTool
 from mini_agent.tools.mcp_loader import load_mcp_tools_async
+from mini_agent.tools.note_store import NoteStore
 from mini_agent.tools.note_tool import RecallNoteTool, SessionNoteTool
 
 
@@ -198,11 +198,12 @@ You have record_note and recall_notes tools:
         print("=" * 80)
 
         # Check if notes were recorded
-        if memory_file.exists():
-            notes = json.loads(memory_file.read_text())
+        store = NoteStore(memory_file)
+        if store.exists():
+            notes = store.search()
             print(f"\n✅ Agent recorded {len(notes)} notes:")
             for note in notes:
-                print(f"  - [{note['category']}] {note['content']}")
+                print(f"  - [{note.category}] {note.content}")
             assert len(notes) > 0, "Agent should have recorded some notes"
         else:
             print("\n⚠️  No notes found - agent may not have used record_note tool")
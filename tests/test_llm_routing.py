@@ -0,0 +1,237 @@
+"""Test cases for RoutingLLMClient failover and hedging."""
+
+import asyncio
+import sys
+
+import pytest
+
+from mini_agent.llm import RoutingLLMClient
+from mini_agent.retry import RetryConfig
+from mini_agent.schema import LLMResponse, LLMStreamEvent, Message
+
+
+class FakeBackend:
+    """Backend answering after a delay, or failing"""
+
+    def __init__(self, name: str, delay: float = 0.0, fail: bool = False, error: Exception | None = None, failures: int | None = None):
+        self.model = name
+        self.api_base = f"http://{name}.test"
+        self.delay = delay
+        self.fail = fail
+        self.error = error or ConnectionError(f"{name} down")
+        self.failures = failures  # Fail only the first n calls
+        self.calls = 0
+        self.cancelled = 0
+        self.closed_streams = 0
+
+    async def generate(self, messages, tools=None):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail and (self.failures is None or self.calls <= self.failures):
+            raise self.error
+        return LLMResponse(content=self.model, finish_reason="stop")
+
+    async def stream(self, messages, tools=None):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail:
+                raise ConnectionError(f"{self.model} down")
+            yield LLMStreamEvent(type="text", delta=self.model)
+            yield LLMStreamEvent(type="done", response=LLMResponse(content=self.model, finish_reason="stop"))
+        finally:
+            self.closed_streams += 1
+
+
+MESSAGES = [Message(role="user", content="hi")]
+
+
+@pytest.mark.asyncio
+async def test_failover_and_unhealthy_backend():
+    """Test ordered failover and skipping of a repeatedly failing backend."""
+    print("\n=== Testing Failover ===")
+
+    primary = FakeBackend("primary", fail=True)
+    secondary = FakeBackend("secondary")
+    client = RoutingLLMClient([primary, secondary], policy="failover", failure_threshold=2, cooldown=60)
+
+    for _ in range(2):
+        response = await client.generate(MESSAGES)
+        assert response.content == "secondary"
+    assert primary.calls == 2
+
+    # Primary is now unhealthy and skipped
+    await client.generate(MESSAGES)
+    assert primary.calls == 2
+    stats = {s["name"]: s for s in client.stats()}
+    assert stats["primary@http://primary.test"]["healthy"] is False
+    assert stats["secondary@http://secondary.test"]["requests"] == 3
+
+
+@pytest.mark.asyncio
+async def test_failover_prefers_lower_latency():
+    """Test that measured latency EWMA reorders backends."""
+    slow = FakeBackend("slow", delay=0.05)
+    fast = FakeBackend("fast")
+    client = RoutingLLMClient([slow, fast], policy="failover")
+
+    # Unmeasured backends are tried in configured order until measured
+    client.backends[1].latency["generate"].record(0.001)
+    assert (await client.generate(MESSAGES)).content == "slow"
+    assert (await client.generate(MESSAGES)).content == "fast"
+    assert slow.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_all_backends_fail():
+    """Test that the last error is raised when no backend answers."""
+    client = RoutingLLMClient([FakeBackend("a", fail=True), FakeBackend("b", fail=True)], policy="hedge")
+    with pytest.raises(ConnectionError):
+        await client.generate(MESSAGES)
+
+
+@pytest.mark.asyncio
+async def test_hedged_generate():
+    """Test that a slow backend is hedged and the faster answer wins."""
+    print("\n=== Testing Hedged Generate ===")
+
+    slow = FakeBackend("slow", delay=1.0)
+    fast = FakeBackend("fast", delay=0.01)
+    client = RoutingLLMClient([slow, fast], policy="hedge", hedge_delay=0.05)
+
+    start = asyncio.get_running_loop().time()
+    response = await client.generate(MESSAGES)
+
+    assert response.content == "fast"
+    assert asyncio.get_running_loop().time() - start < 0.5
+    assert slow.cancelled == 1
+    # The cancelled loser's partial latency is not recorded
+    assert not client.backends[0].latency["generate"].samples
+
+    # A failing primary is failed over without waiting for the hedge delay
+    failing = FakeBackend("failing", fail=True)
+    client = RoutingLLMClient([failing, FakeBackend("backup")], policy="hedge", hedge_delay=10)
+    assert (await asyncio.wait_for(client.generate(MESSAGES), 1)).content == "backup"
+
+
+@pytest.mark.asyncio
+async def test_hedged_stream_commits_to_first_backend():
+    """Test that streams are hedged until the first event and losers are closed."""
+    print("\n=== Testing Hedged Stream ===")
+
+    slow = FakeBackend("slow", delay=1.0)
+    fast = FakeBackend("fast", delay=0.01)
+    client = RoutingLLMClient([slow, fast], policy="hedge", hedge_delay=0.05)
+
+    events = [event async for event in client.stream(MESSAGES)]
+
+    assert [e.type for e in events] == ["text", "done"]
+    assert events[-1].response.content == "fast"
+    assert slow.closed_streams == 1
+    assert fast.closed_streams == 1
+
+
+@pytest.mark.asyncio
+async def test_only_transient_errors_fail_over():
+    """Test that request errors are raised right away and rounds are retried."""
+    print("\n=== Testing Transient Error Routing ===")
+
+    invalid = FakeBackend("invalid", fail=True, error=ValueError("invalid request"))
+    backup = FakeBackend("backup")
+    client = RoutingLLMClient([invalid, backup])
+    with pytest.raises(ValueError):
+        await client.generate(MESSAGES)
+    assert backup.calls == 0
+    assert client.backends[0].consecutive_failures == 0
+
+    # Every backend down once: the whole round is retried
+    flaky = [FakeBackend("a", fail=True, failures=1), FakeBackend("b", fail=True, failures=1)]
+    retries = []
+    client = RoutingLLMClient(flaky, retry_config=RetryConfig(max_retries=2, initial_delay=0.01, max_delay=0.01))
+    client.retry_callback = lambda error, attempt: retries.append(attempt)
+    assert (await client.generate(MESSAGES)).content in ("a", "b")
+    assert retries == [1]
+
+
+def test_routed_backends_do_not_retry():
+    """Test that create_routing_client leaves retries to the router."""
+    from mini_agent.bootstrap import create_routing_client
+    from mini_agent.config import AgentConfig, Config, LLMConfig, RoutingBackendConfig, RoutingConfig, ToolsConfig
+    from mini_agent.llm import LLMClient
+
+    retry_config = RetryConfig(max_retries=5)
+    config = Config(
+        llm=LLMConfig(api_key="key", routing=RoutingConfig(backends=[RoutingBackendConfig(model="backup-model")])),
+        agent=AgentConfig(),
+        tools=ToolsConfig(),
+    )
+    primary = LLMClient(api_key="key", retry_config=retry_config)
+    client = create_routing_client(primary, config, retry_config=retry_config)
+
+    assert client.retry_config is retry_config
+    assert all(not backend.client.retry_config.enabled for backend in client.backends)
+
+
+@pytest.mark.asyncio
+async def test_backends_make_one_http_attempt(monkeypatch):
+    """Test that a failing backend is hit once over HTTP before the router fails over."""
+    print("\n=== Testing Single HTTP Attempt Per Backend ===")
+    from mini_agent.bootstrap import create_routing_client
+    from mini_agent.config import AgentConfig, Config, LLMConfig, RoutingBackendConfig, RoutingConfig, ToolsConfig
+    from mini_agent.llm import LLMClient
+
+    config = Config(
+        llm=LLMConfig(
+            api_key="key",
+            api_base="http://primary-attempts.test",
+            routing=RoutingConfig(backends=[RoutingBackendConfig(api_base="http://backup-attempts.test", model="backup-model")]),
+        ),
+        agent=AgentConfig(),
+        tools=ToolsConfig(),
+    )
+    retry_config = RetryConfig(max_retries=3, initial_delay=0.01, max_delay=0.01)
+    primary = LLMClient(api_key="key", api_base="http://primary-attempts.test", retry_config=retry_config)
+    client = create_routing_client(primary, config, retry_config=retry_config)
+
+    attempts = {"primary-attempts.test": 0, "backup-attempts.test": 0}
+    http_client = client.backends[0].client._client.http_client
+    httpx = sys.modules[type(http_client).__mro__[1].__module__.split(".")[0]]
+
+    def handler(request):
+        attempts[request.url.host] += 1
+        if request.url.host == "primary-attempts.test":
+            return httpx.Response(503, json={"error": {"type": "overloaded_error", "message": "overloaded"}})
+        return httpx.Response(
+            200,
+            json={
+                "id": "msg_1",
+                "type": "message",
+                "role": "assistant",
+                "model": "backup-model",
+                "content": [{"type": "text", "text": "from backup"}],
+                "stop_reason": "end_turn",
+                "stop_sequence": None,
+                "usage": {"input_tokens": 3, "output_tokens": 2},
+            },
+        )
+
+    for backend in client.backends:
+        backend.client._client.http_client._transport = httpx.MockTransport(handler)
+
+    response = await client.generate(MESSAGES)
+
+    assert response.content == "from backup"
+    assert attempts == {"primary-attempts.test": 1, "backup-attempts.test": 1}
+    assert client.backends[0].total_failures == 1
+
+
+def test_invalid_policy():
+    """Test configuration errors."""
+    with pytest.raises(ValueError):
+        RoutingLLMClient([FakeBackend("a")], policy="random")
+    with pytest.raises(ValueError):
+        RoutingLLMClient([])
@@ -0,0 +1,308 @@
+"""Test cases for streaming LLM responses."""
+
+import asyncio
+import contextlib
+from types import SimpleNamespace
+
+import pytest
+
+from mini_agent.acp import MiniMaxACPAgent
+from mini_agent.agent import Agent
+from mini_agent.config import AgentConfig, Config, LLMConfig, ToolsConfig
+from mini_agent.llm import AnthropicClient, LLMClient, OpenAIClient, RateLimitConfig
+from mini_agent.llm.base import LLMClientBase
+from mini_agent.retry import RetryConfig
+from mini_agent.schema import LLMResponse, LLMStreamEvent, Message
+
+
+class FakeStream:
+    """Async iterator over prepared stream events."""
+
+    def __init__(self, events):
+        self._events = list(events)
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self._events:
+            raise StopAsyncIteration
+        return self._events.pop(0)
+
+    async def close(self):
+        self.closed = True
+
+
+def ns(**kwargs):
+    return SimpleNamespace(**kwargs)
+
+
+async def collect(stream):
+    return [event async for event in stream]
+
+
+@pytest.mark.asyncio
+async def test_anthropic_stream_assembles_response():
+    """Test that Anthropic stream events are yielded and assembled."""
+    print("\n=== Testing Anthropic Streaming ===")
+
+    events = [
+        ns(type="message_start", message=ns(usage=ns(input_tokens=12, output_tokens=1))),
+        ns(type="content_block_start", index=0, content_block=ns(type="thinking", thinking="")),
+        ns(type="content_block_delta", index=0, delta=ns(type="thinking_delta", thinking="Let me ")),
+        ns(type="content_block_delta", index=0, delta=ns(type="thinking_delta", thinking="think")),
+        ns(type="content_block_stop", index=0),
+        ns(type="content_block_start", index=1, content_block=ns(type="text", text="")),
+        ns(type="content_block_delta", index=1, delta=ns(type="text_delta", text="Hel")),
+        ns(type="content_block_delta", index=1, delta=ns(type="text_delta", text="lo")),
+        ns(type="content_block_stop", index=1),
+        ns(type="content_block_start", index=2, content_block=ns(type="tool_use", id="tu_1", name="read_file")),
+        ns(type="content_block_delta", index=2, delta=ns(type="input_json_delta", partial_json='{"path": ')),
+        ns(type="content_block_delta", index=2, delta=ns(type="input_json_delta", partial_json='"a.txt"}')),
+        ns(type="content_block_stop", index=2),
+        ns(type="message_delta", delta=ns(stop_reason="tool_use"), usage=ns(output_tokens=30)),
+        ns(type="message_stop"),
+    ]
+    requests = []
+
+    async def fake_create(**params):
+        requests.append(params)
+        return FakeStream(events)
+
+    client = AnthropicClient(api_key="test-key", retry_config=RetryConfig(enabled=False))
+    client.client = ns(messages=ns(create=fake_create))
+
+    result = await collect(client.stream([Message(role="system", content="sys"), Message(role="user", content="hi")]))
+
+    assert requests[0]["stream"] is True
+    assert [(e.type, e.delta) for e in result if e.type in ("thinking", "text")] == [
+        ("thinking", "Let me "),
+        ("thinking", "think"),
+        ("text", "Hel"),
+        ("text", "lo"),
+    ]
+    tool_events = [e for e in result if e.type == "tool_use"]
+    assert tool_events[0].tool_call.function.arguments == {"path": "a.txt"}
+
+    response = result[-1].response
+    assert result[-1].type == "done"
+    assert response.content == "Hello"
+    assert response.thinking == "Let me think"
+    assert response.tool_calls[0].id == "tu_1"
+    assert response.finish_reason == "tool_use"
+    assert response.usage.total_tokens == 42
+
+
+@pytest.mark.asyncio
+async def test_openai_stream_assembles_response():
+    """Test that OpenAI chunks (with accumulated reasoning_details) are assembled."""
+    print("\n=== Testing OpenAI Streaming ===")
+
+    def chunk(delta=None, finish_reason=None, usage=None):
+        choices = [ns(delta=delta, finish_reason=finish_reason)] if delta is not None else []
+        return ns(choices=choices, usage=usage)
+
+    def delta(content=None, reasoning=None, tool_calls=None):
+        return ns(content=content, reasoning_details=reasoning, tool_calls=tool_calls)
+
+    chunks = [
+        chunk(delta(reasoning=[{"text": "Plan"}])),
+        chunk(delta(reasoning=[{"text": "Planning more"}])),
+        chunk(delta(content="Do")),
+        chunk(delta(content="ne")),
+        chunk(delta(tool_calls=[ns(index=0, id="call_1", function=ns(name="bash", arguments='{"comm'))])),
+        chunk(delta(tool_calls=[ns(index=0, id=None, function=ns(name=None, arguments='and": "ls"}'))])),
+        chunk(delta(), finish_reason="tool_calls"),
+        chunk(usage=ns(prompt_tokens=5, completion_tokens=7, total_tokens=12)),
+    ]
+
+    async def fake_create(**params):
+        assert params["stream"] is True
+        return FakeStream(chunks)
+
+    client = OpenAIClient(api_key="test-key", retry_config=RetryConfig(enabled=False))
+    client.client = ns(chat=ns(completions=ns(create=fake_create)))
+
+    result = await collect(client.stream([Message(role="user", content="hi")]))
+
+    assert [e.delta for e in result if e.type == "thinking"] == ["Plan", "ning more"]
+    assert [e.delta for e in result if e.type == "text"] == ["Do", "ne"]
+
+    response = result[-1].response
+    assert response.thinking == "Planning more"
+    assert response.content == "Done"
+    assert response.tool_calls[0].function.arguments == {"command": "ls"}
+    assert response.finish_reason == "tool_calls"
+    assert response.usage.total_tokens == 12
+
+
+class StreamingLLM:
+    """LLM stub that streams a fixed reply."""
+
+    def __init__(self):
+        self.generate_calls = 0
+        self.stream_closed = False
+
+    async def generate(self, messages, tools=None):
+        self.generate_calls += 1
+        return LLMResponse(content="Hello world", finish_reason="stop")
+
+    async def stream(self, messages, tools=None):
+        try:
+            yield LLMStreamEvent(type="thinking", delta="hmm")
+            for piece in ["Hello", " ", "world"]:
+                yield LLMStreamEvent(type="text", delta=piece)
+            yield LLMStreamEvent(
+                type="done",
+                response=LLMResponse(content="Hello world", thinking="hmm", finish_reason="stop"),
+            )
+        finally:
+            self.stream_closed = True
+
+
+@pytest.mark.asyncio
+async def test_agent_prints_stream(tmp_path, capsys):
+    """Test that Agent.run uses stream() and prints deltas."""
+    print("\n=== Testing Agent Streaming Output ===")
+
+    llm = StreamingLLM()
+    agent = Agent(llm_client=llm, system_prompt="system", tools=[], workspace_dir=str(tmp_path))
+    agent.add_user_message("hi")
+
+    result = await agent.run()
+
+    assert result == "Hello world"
+    assert llm.generate_calls == 0
+    assert agent.messages[-1].thinking == "hmm"
+    output = capsys.readouterr().out
+    assert output.count("Hello world") == 1
+
+
+@pytest.mark.asyncio
+async def test_default_stream_falls_back_to_generate():
+    """Test LLMClientBase.stream() default implementation."""
+    print("\n=== Testing Default Stream Fallback ===")
+
+    class GenerateOnly(LLMClientBase):
+        async def generate(self, messages, tools=None):
+            return LLMResponse(content="full", thinking="t", finish_reason="stop")
+
+        def _prepare_request(self, messages, tools=None):
+            return {}
+
+        def _convert_messages(self, messages):
+            return None, []
+
+        def _convert_message(self, msg):
+            return None
+
+        def _request_payload(self, request_params):
+            return request_params
+
+    client = GenerateOnly(api_key="k", api_base="http://localhost", model="m")
+    result = await collect(client.stream([Message(role="user", content="hi")]))
+
+    assert [e.type for e in result] == ["thinking", "text", "done"]
+    assert result[-1].response.content == "full"
+
+
+@pytest.mark.asyncio
+async def test_acp_forwards_stream_chunks(tmp_path):
+    """Test that the ACP adapter forwards each streamed chunk."""
+    print("\n=== Testing ACP Streaming ===")
+
+    class DummyConn:
+        def __init__(self):
+            self.updates = []
+
+        async def sessionUpdate(self, payload):
+            self.updates.append(payload)
+
+    config = Config(
+        llm=LLMConfig(api_key="test-key"),
+        agent=AgentConfig(max_steps=3, workspace_dir=str(tmp_path)),
+        tools=ToolsConfig(),
+    )
+    conn = DummyConn()
+    acp_agent = MiniMaxACPAgent(conn, config, StreamingLLM(), [], "system")
+    session = await acp_agent.newSession(SimpleNamespace(cwd=str(tmp_path)))
+
+    response = await acp_agent.prompt(SimpleNamespace(sessionId=session.sessionId, prompt=[{"text": "hi"}]))
+
+    assert response.stopReason == "end_turn"
+    # One thought chunk + three message chunks
+    assert len(conn.updates) == 4
+    state = acp_agent._sessions[session.sessionId]
+    assert state.agent.messages[-1].content == "Hello world"
+
+
+@pytest.mark.asyncio
+async def test_acp_closes_stream_on_cancel(tmp_path):
+    """Test that cancelling mid-stream closes the LLM stream right away."""
+    print("\n=== Testing ACP Stream Cancel ===")
+
+    class CancellingConn:
+        def __init__(self):
+            self.updates = []
+            self.state = None
+
+        async def sessionUpdate(self, payload):
+            self.updates.append(payload)
+            self.state.cancelled = True
+
+    config = Config(
+        llm=LLMConfig(api_key="test-key"),
+        agent=AgentConfig(max_steps=3, workspace_dir=str(tmp_path)),
+        tools=ToolsConfig(),
+    )
+    conn = CancellingConn()
+    llm = StreamingLLM()
+    acp_agent = MiniMaxACPAgent(conn, config, llm, [], "system")
+    session = await acp_agent.newSession(SimpleNamespace(cwd=str(tmp_path)))
+    state = acp_agent._sessions[session.sessionId]
+    conn.state = state
+
+    response = await acp_agent._generate(state, session.sessionId, None)
+
+    assert response is None
+    assert len(conn.updates) == 1
+    assert llm.stream_closed
+
+
+@pytest.mark.asyncio
+async def test_abandoned_stream_releases_connection():
+    """Test that leaving a stream early closes the SDK stream and frees the request slot."""
+    print("\n=== Testing Abandoned Stream ===")
+
+    events = [
+        ns(type="message_start", message=ns(usage=ns(input_tokens=3, output_tokens=1))),
+        ns(type="content_block_start", index=0, content_block=ns(type="text", text="")),
+        ns(type="content_block_delta", index=0, delta=ns(type="text_delta", text="Hel")),
+        ns(type="content_block_delta", index=0, delta=ns(type="text_delta", text="lo")),
+    ]
+    streams = []
+
+    async def fake_create(**params):
+        streams.append(FakeStream(events))
+        return streams[-1]
+
+    llm = LLMClient(
+        api_key="test-key",
+        api_base="http://abandoned-stream.test",
+        retry_config=RetryConfig(enabled=False),
+        rate_limit_config=RateLimitConfig(max_concurrent_requests=1),
+    )
+    llm._client.client = ns(messages=ns(create=fake_create))
+
+    async with contextlib.aclosing(llm.stream([Message(role="user", content="hi")])) as stream:
+        async for event in stream:
+            if event.type == "text":
+                break
+
+    assert streams[0].closed
+    # The single in-flight slot is free again
+    second = llm.stream([Message(role="user", content="hi")])
+    assert (await asyncio.wait_for(second.__anext__(), timeout=1)).type == "text"
+    await second.aclose()
+    assert streams[1].closed
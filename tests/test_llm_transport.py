@@ -0,0 +1,98 @@
+"""Test cases for the shared LLM HTTP transport."""
+
+import asyncio
+
+import anthropic
+import pytest
+
+from mini_agent.llm import AnthropicClient, LLMClient, OpenAIClient, TransportConfig, TransportRegistry, transport_registry
+from mini_agent.schema import LLMProvider
+
+
+@pytest.mark.asyncio
+async def test_clients_share_pool_per_api_base():
+    """Test that clients for the same endpoint share one HTTP client."""
+    print("\n=== Testing Shared Connection Pool ===")
+
+    first = LLMClient(api_key="key-1", api_base="http://shared.test")
+    second = LLMClient(api_key="key-2", api_base="http://shared.test")
+    other_base = LLMClient(api_key="key-1", api_base="http://other.test")
+    openai_client = LLMClient(api_key="key-1", api_base="http://shared.test", provider=LLMProvider.OPENAI)
+
+    assert first._client.http_client is second._client.http_client
+    assert first._client.client._client is first._client.http_client
+    assert other_base._client.http_client is not first._client.http_client
+    assert openai_client._client.http_client is not first._client.http_client
+
+
+def test_pools_are_bound_to_event_loop():
+    """Test that each event loop gets its own pool."""
+
+    async def create():
+        return AnthropicClient(api_key="k", api_base="http://loop.test").http_client
+
+    assert asyncio.run(create()) is not asyncio.run(create())
+
+
+@pytest.mark.asyncio
+async def test_pool_configuration_and_reopen():
+    """Test pool limits, timeouts and replacement of a closed client."""
+    registry = TransportRegistry()
+    config = TransportConfig(http2=False, max_connections=7, max_keepalive_connections=3, connect_timeout=2.0, read_timeout=30.0)
+
+    client = registry.get_http_client(anthropic, "http://config.test", config)
+    assert client.timeout.connect == 2.0
+    assert client.timeout.read == 30.0
+
+    await registry.aclose()
+    assert client.is_closed
+    assert registry.get_http_client(anthropic, "http://config.test", config) is not client
+    await registry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_prewarm_and_stats():
+    """Test connection pre-warming against a local server and pool statistics."""
+    print("\n=== Testing Pre-warm and Pool Stats ===")
+
+    async def handle(reader, writer):
+        while not reader.at_eof():
+            try:
+                await reader.readuntil(b"\r\n\r\n")
+            except asyncio.IncompleteReadError:
+                break
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n")
+            await writer.drain()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    api_base = f"http://127.0.0.1:{port}/v1"
+
+    try:
+        client = OpenAIClient(api_key="k", api_base=api_base, transport_config=TransportConfig(http2=False))
+        assert await client.prewarm() is True
+
+        stats = next(s for s in transport_registry.stats() if s["api_base"] == api_base)
+        assert stats["requests"] == 1
+        assert stats["responses"] == 1
+        if stats["connections"] is not None:
+            assert stats["idle_connections"] == 1
+    finally:
+        server.close()
+
+    # Unreachable host: pre-warm fails quietly
+    unreachable = AnthropicClient(api_key="k", api_base="http://127.0.0.1:9", transport_config=TransportConfig(connect_timeout=1.0))
+    assert await unreachable.prewarm() is False
+
+
+def test_empty_http_section_uses_defaults(tmp_path):
+    """Test that empty http: and rate_limit: sections in config.yaml fall back to the defaults."""
+    from mini_agent.config import Config, HTTPConfig
+
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("api_key: test-key\nhttp:\nrate_limit:\n")
+
+    config = Config.from_yaml(config_path)
+
+    assert config.llm.http == HTTPConfig()
+    assert config.llm.rate_limit.requests_per_minute is None
@@ -0,0 +1,107 @@
+"""Test cases for AgentLogger delta logging."""
+
+import pytest
+
+from mini_agent.logger import AgentLogger, read_log, reconstruct_request
+from mini_agent.schema import FunctionCall, Message, ToolCall
+
+
+@pytest.fixture
+def logger(tmp_path):
+    agent_logger = AgentLogger(log_dir=tmp_path)
+    agent_logger.start_new_run()
+    yield agent_logger
+    agent_logger.close()
+
+
+def test_requests_are_logged_as_deltas(logger):
+    """Test that each request only stores messages appended since the previous one."""
+    print("\n=== Testing Delta Request Logging ===")
+
+    messages = [Message(role="system", content="sys"), Message(role="user", content="task")]
+    logger.log_request(messages)
+    logger.log_response(content="", tool_calls=[ToolCall(id="c1", type="function", function=FunctionCall(name="bash", arguments={"command": "ls"}))])
+
+    messages.append(Message(role="assistant", content="", tool_calls=[ToolCall(id="c1", type="function", function=FunctionCall(name="bash", arguments={"command": "ls"}))]))
+    messages.append(Message(role="tool", content="a.txt", tool_call_id="c1", name="bash"))
+    logger.log_tool_result(tool_name="bash", arguments={"command": "ls"}, result_success=True, result_content="a.txt")
+    logger.log_request(messages)
+    logger.flush()
+
+    records = read_log(logger.get_log_file_path())
+    requests = [r for r in records if r["type"] == "REQUEST"]
+
+    assert records[0]["type"] == "RUN_START"
+    assert requests[0]["base_index"] is None
+    assert len(requests[0]["messages"]) == 2
+    assert requests[1]["base_index"] == requests[0]["index"]
+    assert requests[1]["message_offset"] == 2
+    assert [m["role"] for m in requests[1]["messages"]] == ["assistant", "tool"]
+
+    rebuilt = reconstruct_request(records, requests[1]["index"])
+    assert [m["role"] for m in rebuilt["messages"]] == ["system", "user", "assistant", "tool"]
+    assert rebuilt["messages"][2]["tool_calls"][0]["function"]["arguments"] == {"command": "ls"}
+
+
+def test_rewritten_history_is_reconstructed(logger):
+    """Test reconstruction after the history is rewritten (e.g. summarization)."""
+    print("\n=== Testing Reconstruction After Rewrite ===")
+
+    system = Message(role="system", content="sys")
+    user = Message(role="user", content="task")
+    messages = [system, user] + [Message(role="assistant", content=f"step {i}") for i in range(5)]
+    logger.log_request(messages)
+
+    messages.append(Message(role="user", content="next"))
+    logger.log_request(messages)
+
+    summarized = [system, user, Message(role="user", content="[Assistant Execution Summary]\n\nsummary")]
+    logger.log_request(summarized)
+
+    summarized.append(Message(role="assistant", content="after summary"))
+    logger.log_request(summarized)
+    logger.flush()
+
+    records = read_log(logger.get_log_file_path())
+    requests = [r for r in records if r["type"] == "REQUEST"]
+
+    assert requests[2]["message_offset"] == 2
+    assert len(requests[2]["messages"]) == 1
+
+    expected = [
+        [m.content for m in messages[:-1]],
+        [m.content for m in messages],
+        [m.content for m in summarized[:-1]],
+        [m.content for m in summarized],
+    ]
+    for request, contents in zip(requests, expected):
+        rebuilt = reconstruct_request(logger.get_log_file_path(), request["index"])
+        assert [m["content"] for m in rebuilt["messages"]] == contents
+
+
+def test_new_run_starts_full_snapshot(logger):
+    """Test that a new run file starts with a full request again."""
+    print("\n=== Testing New Run Snapshot ===")
+
+    messages = [Message(role="system", content="sys"), Message(role="user", content="task")]
+    logger.log_request(messages)
+    first_file = logger.get_log_file_path()
+
+    logger.start_new_run()
+    messages.append(Message(role="user", content="more"))
+    logger.log_request(messages)
+    logger.flush()
+
+    assert logger.get_log_file_path() != first_file
+    request = [r for r in read_log(logger.get_log_file_path()) if r["type"] == "REQUEST"][0]
+    assert request["base_index"] is None
+    assert len(request["messages"]) == 3
+
+
+def test_reconstruct_unknown_index(logger):
+    """Test error for a missing request index."""
+    logger.log_request([Message(role="system", content="sys")])
+    logger.flush()
+
+    with pytest.raises(ValueError):
+        reconstruct_request(logger.get_log_file_path(), 99)
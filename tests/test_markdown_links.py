@@ -51,9 +51,9 @@ description: Test skill for Markdown link processing
         loader = SkillLoader(skills_dir=str(skills_dir))
         skills = loader.discover_skills()
         
-        # Verify skill was loaded
+        # Verify skill was loaded (the body is processed on first use)
         assert len(skills) == 1
-        skill = skills[0]
+        skill = loader.get_skill(skills[0].name)
         
         # Test 1: Simple filename link
         assert str(doc_file) in skill.content, f"Test 1 failed: Simple filename link not converted"
@@ -0,0 +1,223 @@
+"""Test cases for MCP server startup and the per-server call execution layer."""
+
+import asyncio
+import json
+import sys
+import time
+
+import pytest
+
+from mini_agent.tools import mcp_loader
+from mini_agent.tools.mcp_loader import cleanup_mcp_connections, load_mcp_tools_async
+
+# Minimal stdio MCP server (newline-delimited JSON-RPC) that starts after a delay
+SERVER_SCRIPT = '''
+import json
+import os
+import sys
+import time
+
+time.sleep(float(sys.argv[1]))
+ECHO = {
+    "name": "echo",
+    "description": "Echo text back with the server's process id",
+    "inputSchema": {"type": "object", "properties": {"text": {"type": "string"}}, "required": ["text"]},
+}
+SLEEP = {"name": "sleep", "description": "Sleep", "inputSchema": {"type": "object", "properties": {"seconds": {"type": "number"}}}}
+CRASH = {"name": "crash", "description": "Exit the server", "inputSchema": {"type": "object", "properties": {}}}
+for line in sys.stdin:
+    message = json.loads(line)
+    if "id" not in message:
+        continue
+    method = message.get("method")
+    if method == "initialize":
+        result = {
+            "protocolVersion": message["params"]["protocolVersion"],
+            "capabilities": {"tools": {}},
+            "serverInfo": {"name": "test", "version": "1.0"},
+        }
+    elif method == "tools/list":
+        result = {"tools": [ECHO, SLEEP, CRASH]}
+    elif method == "tools/call":
+        arguments = message["params"]["arguments"]
+        if message["params"]["name"] == "crash":
+            os._exit(1)
+        if message["params"]["name"] == "sleep":
+            time.sleep(arguments["seconds"])
+        text = arguments.get("text", "slept")
+        result = {"content": [{"type": "text", "text": f"{os.getpid()}:{text}"}], "isError": False}
+    else:
+        print(json.dumps({"jsonrpc": "2.0", "id": message["id"], "error": {"code": -32601, "message": method}}), flush=True)
+        continue
+    print(json.dumps({"jsonrpc": "2.0", "id": message["id"], "result": result}), flush=True)
+'''
+
+
+def write_config(tmp_path, delays: dict[str, float], **server_options) -> str:
+    script = tmp_path / "server.py"
+    script.write_text(SERVER_SCRIPT)
+    servers = {
+        name: {"command": sys.executable, "args": [str(script), str(delay)], **server_options.get(name, {})}
+        for name, delay in delays.items()
+    }
+    config = tmp_path / "mcp.json"
+    config.write_text(json.dumps({"mcpServers": servers}))
+    return str(config)
+
+
+@pytest.mark.asyncio
+async def test_servers_start_concurrently(tmp_path):
+    """Test that startup time is that of the slowest server, not the sum."""
+    print("\n=== Testing Concurrent MCP Startup ===")
+
+    config = write_config(tmp_path, {f"server{i}": 1.0 for i in range(4)})
+    try:
+        start = time.monotonic()
+        tools = await load_mcp_tools_async(config, schema_cache_path=tmp_path / "cache.json")
+        elapsed = time.monotonic() - start
+
+        assert [tool.name for tool in tools] == ["echo", "sleep", "crash"] * 4
+        assert elapsed < 3.0  # Sequential startup takes over 4 x 1s
+        result = await tools[0].execute(text="hi")
+        assert result.success and result.content.endswith(":hi")
+    finally:
+        await cleanup_mcp_connections()
+
+
+@pytest.mark.asyncio
+async def test_connect_timeout_skips_server(tmp_path):
+    """Test that a hanging server is dropped after its own timeout."""
+    config = write_config(tmp_path, {"fast": 0, "hanging": 60}, hanging={"connect_timeout": 1})
+    try:
+        start = time.monotonic()
+        tools = await load_mcp_tools_async(config, schema_cache_path=tmp_path / "cache.json")
+        assert len(tools) == 3
+        assert time.monotonic() - start < 10
+        assert [c.name for c in mcp_loader._mcp_connections] == ["fast"]
+    finally:
+        await cleanup_mcp_connections()
+
+
+@pytest.mark.asyncio
+async def test_lazy_start_uses_cached_schemas(tmp_path):
+    """Test that lazy servers are only spawned by the first tool call."""
+    print("\n=== Testing Lazy MCP Startup ===")
+
+    config = write_config(tmp_path, {"lazy_server": 0.5})
+    cache_path = tmp_path / "cache.json"
+    try:
+        # Nothing cached yet: the server is started to fill the cache
+        tools = await load_mcp_tools_async(config, lazy=True, schema_cache_path=cache_path)
+        assert [tool.name for tool in tools] == ["echo", "sleep", "crash"]
+        assert json.loads(cache_path.read_text())
+    finally:
+        await cleanup_mcp_connections()
+
+    try:
+        start = time.monotonic()
+        tools = await load_mcp_tools_async(config, lazy=True, schema_cache_path=cache_path)
+        assert time.monotonic() - start < 0.5
+        assert [tool.name for tool in tools] == ["echo", "sleep", "crash"]
+        assert tools[0].parameters["properties"]["text"]["type"] == "string"
+        connection = mcp_loader._mcp_connections[0]
+        assert connection.session is None
+
+        result = await tools[0].execute(text="lazy")
+        assert result.success and result.content.endswith(":lazy")
+        assert connection.session is not None
+    finally:
+        await cleanup_mcp_connections()
+
+
+async def load_tools(tmp_path, **server_options) -> dict:
+    config = write_config(tmp_path, {"server": 0}, server=server_options)
+    tools = await load_mcp_tools_async(config, schema_cache_path=tmp_path / "cache.json")
+    return {tool.name: tool for tool in tools}
+
+
+@pytest.mark.asyncio
+async def test_call_timeout(tmp_path):
+    """Test that a call past its deadline fails and is counted as a timeout."""
+    print("\n=== Testing MCP Call Timeout ===")
+
+    try:
+        tools = await load_tools(tmp_path, call_timeout=0.5)
+        result = await tools["sleep"].execute(seconds=1)
+        assert not result.success
+        assert "timed out after 0.5s" in result.error
+
+        # The server process is kept and answers again once the sleep ends
+        await asyncio.sleep(0.7)
+        assert (await tools["echo"].execute(text="after")).success
+
+        stats = mcp_loader.get_mcp_stats()[0]
+        assert stats["restarts"] == 0
+        assert stats["tools"]["sleep"]["timeouts"] == 1
+        assert stats["tools"]["echo"]["calls"] == 1 and stats["tools"]["echo"]["errors"] == 0
+    finally:
+        await cleanup_mcp_connections()
+
+
+@pytest.mark.asyncio
+async def test_crashed_server_is_restarted(tmp_path):
+    """Test that the call after a server crash starts a new server process."""
+    print("\n=== Testing MCP Server Restart ===")
+
+    try:
+        tools = await load_tools(tmp_path)
+        before = (await tools["echo"].execute(text="a")).content.split(":")[0]
+
+        result = await tools["crash"].execute()
+        assert not result.success
+        assert "exited during the call" in result.error
+
+        result = await tools["echo"].execute(text="b")
+        assert result.success
+        assert result.content.split(":")[0] != before
+
+        stats = mcp_loader.get_mcp_stats()[0]
+        assert stats["restarts"] == 1
+        assert stats["tools"]["crash"]["errors"] == 1
+    finally:
+        await cleanup_mcp_connections()
+
+
+@pytest.mark.asyncio
+async def test_pool_runs_parallel_calls(tmp_path):
+    """Test that parallel calls to a pooled server run in separate processes."""
+    print("\n=== Testing MCP Server Pool ===")
+
+    try:
+        tools = await load_tools(tmp_path, pool_size=3)
+        start = time.monotonic()
+        results = await asyncio.gather(*(tools["sleep"].execute(seconds=1) for _ in range(3)))
+        elapsed = time.monotonic() - start
+
+        assert all(result.success for result in results)
+        assert len({result.content.split(":")[0] for result in results}) == 3
+        assert elapsed < 2.5  # One process answers one call at a time: 3s
+        assert mcp_loader.get_mcp_stats()[0]["processes"] == 3
+    finally:
+        await cleanup_mcp_connections()
+
+
+@pytest.mark.asyncio
+async def test_max_in_flight_limits_calls(tmp_path):
+    """Test that calls beyond max_in_flight wait instead of spawning processes."""
+    try:
+        tools = await load_tools(tmp_path, pool_size=2, max_in_flight=1)
+        start = time.monotonic()
+        results = await asyncio.gather(*(tools["sleep"].execute(seconds=0.5) for _ in range(2)))
+        assert all(result.success for result in results)
+        assert time.monotonic() - start >= 1.0
+        assert mcp_loader.get_mcp_stats()[0]["processes"] == 1
+    finally:
+        await cleanup_mcp_connections()
+
+
+def test_reconnect_backoff():
+    """Test the restart backoff after consecutive failures."""
+    assert mcp_loader.reconnect_delay(0) == 0
+    assert mcp_loader.reconnect_delay(1) == mcp_loader.MCP_RECONNECT_BACKOFF
+    assert mcp_loader.reconnect_delay(3) == 4 * mcp_loader.MCP_RECONNECT_BACKOFF
+    assert mcp_loader.reconnect_delay(100) == mcp_loader.MCP_RECONNECT_BACKOFF_MAX
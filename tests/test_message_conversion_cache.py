@@ -0,0 +1,103 @@
+"""Test cases for incremental message conversion in LLM clients."""
+
+import pytest
+
+from mini_agent.llm import AnthropicClient, OpenAIClient
+from mini_agent.schema import FunctionCall, Message, ToolCall
+
+
+def make_turn(i: int) -> list[Message]:
+    call = ToolCall(id=f"c{i}", type="function", function=FunctionCall(name="bash", arguments={"command": f"echo {i}"}))
+    return [
+        Message(role="assistant", content="", thinking=f"step {i}", tool_calls=[call]),
+        Message(role="tool", content=f"out {i}", tool_call_id=f"c{i}", name="bash"),
+    ]
+
+
+def counting_client(client_class):
+    """Create a client that counts per-message conversions."""
+    client = client_class(api_key="test-key")
+    client.converted = 0
+    convert = client._convert_message
+
+    def counted(msg):
+        client.converted += 1
+        return convert(msg)
+
+    client._convert_message = counted
+    return client
+
+
+@pytest.mark.parametrize("client_class", [AnthropicClient, OpenAIClient])
+def test_only_new_messages_are_converted(client_class):
+    """Test that appended messages are converted once and match a full conversion."""
+    print(f"\n=== Testing Incremental Conversion ({client_class.__name__}) ===")
+
+    client = counting_client(client_class)
+    messages = [Message(role="system", content="sys"), Message(role="user", content="task")]
+    client._convert_messages(messages)
+    assert client.converted == 2
+
+    for i in range(50):
+        messages.extend(make_turn(i))
+        system, api_messages = client._convert_messages(messages)
+
+    assert client.converted == 2 + 100
+    assert (system, api_messages) == client_class(api_key="test-key")._convert_messages(messages)
+
+
+@pytest.mark.parametrize("client_class", [AnthropicClient, OpenAIClient])
+def test_rewritten_history_is_rebuilt(client_class):
+    """Test that a summarized history only reuses the unchanged prefix."""
+    print(f"\n=== Testing Conversion After Rewrite ({client_class.__name__}) ===")
+
+    client = counting_client(client_class)
+    system = Message(role="system", content="sys")
+    user = Message(role="user", content="task")
+    messages = [system, user] + make_turn(0) + make_turn(1)
+    client._convert_messages(messages)
+
+    summarized = [system, user, Message(role="user", content="[Assistant Execution Summary]\n\nsummary")]
+    client.converted = 0
+    result = client._convert_messages(summarized)
+
+    assert client.converted == 1
+    assert result == client_class(api_key="test-key")._convert_messages(summarized)
+
+    # Dropping the last messages (e.g. a cancelled step) also works
+    result = client._convert_messages(summarized[:2])
+    assert result == client_class(api_key="test-key")._convert_messages(summarized[:2])
+
+
+def test_sessions_keep_separate_caches():
+    """Test that histories with different system messages do not evict each other."""
+    print("\n=== Testing Per-Session Caches ===")
+
+    client = counting_client(OpenAIClient)
+    session_a = [Message(role="system", content="a"), Message(role="user", content="task a")]
+    session_b = [Message(role="system", content="b"), Message(role="user", content="task b")]
+
+    client._convert_messages(session_a)
+    client._convert_messages(session_b)
+    client.converted = 0
+
+    session_a.extend(make_turn(0))
+    session_b.extend(make_turn(0))
+    _, api_a = client._convert_messages(session_a)
+    _, api_b = client._convert_messages(session_b)
+
+    assert client.converted == 4
+    assert api_a[0]["content"] == "a"
+    assert api_b[0]["content"] == "b"
+
+
+def test_returned_list_is_not_shared():
+    """Test that modifying a returned list does not corrupt the cache."""
+    client = AnthropicClient(api_key="test-key")
+    messages = [Message(role="system", content="sys"), Message(role="user", content="task")]
+
+    _, api_messages = client._convert_messages(messages)
+    api_messages.append({"role": "user", "content": "injected"})
+
+    _, api_messages = client._convert_messages(messages)
+    assert api_messages == [{"role": "user", "content": "task"}]
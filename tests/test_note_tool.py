@@ -1,11 +1,16 @@
 """Test cases for Session Note Tool."""
 
+import json
+import multiprocessing
+import sqlite3
 import tempfile
 from pathlib import Path
 
 import pytest
 
-from mini_agent.tools.note_tool import RecallNoteTool, SessionNoteTool
+from mini_agent.tools.note_store import NoteStore
+from mini_agent.tools.note_tool import MAX_RECALL_TOKENS, RecallNoteTool, SessionNoteTool
+from mini_agent.utils.token_utils import estimate_tokens
 
 
 @pytest.mark.asyncio
@@ -55,6 +60,7 @@ async def test_record_and_recall_notes():
 
     finally:
         Path(note_file).unlink(missing_ok=True)
+        Path(note_file).with_suffix(".db").unlink(missing_ok=True)
 
 
 @pytest.mark.asyncio
@@ -81,6 +87,7 @@ async def test_empty_notes():
 
     finally:
         Path(note_file).unlink(missing_ok=True)
+        Path(note_file).with_suffix(".db").unlink(missing_ok=True)
 
 
 @pytest.mark.asyncio
@@ -111,6 +118,118 @@ async def test_note_persistence():
 
     finally:
         Path(note_file).unlink(missing_ok=True)
+        Path(note_file).with_suffix(".db").unlink(missing_ok=True)
+
+
+@pytest.mark.asyncio
+async def test_recall_query_category_limit(tmp_path):
+    """Test relevance search, category filter and limit of recall_notes."""
+    print("\n=== Testing Note Search ===")
+
+    note_file = str(tmp_path / "notes.json")
+    record_tool = SessionNoteTool(memory_file=note_file)
+    recall_tool = RecallNoteTool(memory_file=note_file)
+
+    for i in range(30):
+        await record_tool.execute(content=f"Build step {i} finished", category="log")
+    await record_tool.execute(content="Database runs on PostgreSQL 16", category="project_info")
+    await record_tool.execute(content="User prefers tabs over spaces", category="user_preference")
+
+    result = await recall_tool.execute(query="postgresql database")
+    assert result.content.splitlines()[1] == "1. [project_info] Database runs on PostgreSQL 16"
+    assert "Build step" not in result.content
+
+    result = await recall_tool.execute(query="spaces", category="log")
+    assert result.content.startswith("No notes found")
+
+    # Most recent notes, in chronological order
+    result = await recall_tool.execute(category="log", limit=3)
+    lines = [line for line in result.content.splitlines() if line[:1].isdigit()]
+    assert [line.split("] ")[1] for line in lines] == ["Build step 27 finished", "Build step 28 finished", "Build step 29 finished"]
+    assert "(3 of 30 notes shown" in result.content
+
+
+def _record_notes(note_file: str, worker: int):
+    store = NoteStore(note_file)
+    for i in range(20):
+        store.add(f"worker {worker} note {i}", category=f"worker{worker}")
+
+
+def test_concurrent_writers(tmp_path):
+    """Test that notes appended by several processes are all kept."""
+    print("\n=== Testing Concurrent Note Writers ===")
+
+    note_file = str(tmp_path / "notes.json")
+    NoteStore(note_file).add("first")
+    processes = [multiprocessing.Process(target=_record_notes, args=(note_file, w)) for w in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(60)
+        assert process.exitcode == 0
+
+    store = NoteStore(note_file)
+    assert store.count() == 81
+    assert store.count(category="worker2") == 20
+
+
+@pytest.mark.asyncio
+async def test_legacy_json_notes_imported(tmp_path):
+    """Test that notes of the former JSON file are imported once."""
+    note_file = tmp_path / ".agent_memory.json"
+    note_file.write_text(json.dumps([{"timestamp": "2024-01-01T00:00:00", "category": "decision", "content": "Use uv for packaging"}]))
+
+    result = await RecallNoteTool(memory_file=str(note_file)).execute()
+    assert "[decision] Use uv for packaging" in result.content
+    assert not note_file.exists()
+    assert (tmp_path / ".agent_memory.json.imported").exists()
+
+    await SessionNoteTool(memory_file=str(note_file)).execute(content="Second note")
+    assert NoteStore(note_file).count() == 2
+
+
+def test_full_text_index_covers_existing_notes(tmp_path):
+    """Test that notes stored before the full-text index existed are searchable."""
+    db_path = tmp_path / "notes.db"
+    db = sqlite3.connect(str(db_path))
+    db.execute("CREATE TABLE notes (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL, category TEXT NOT NULL, content TEXT NOT NULL)")
+    db.execute("INSERT INTO notes (timestamp, category, content) VALUES ('2024-01-01', 'general', 'Deploy with blue green rollout')")
+    db.commit()
+    db.close()
+
+    store = NoteStore(db_path)
+    assert [note.content for note in store.search("rollout")] == ["Deploy with blue green rollout"]
+    store.add("Rollout checklist lives in docs/")
+    assert len(store.search("rollout")) == 2
+
+
+@pytest.mark.asyncio
+async def test_recall_truncates_oversized_note(tmp_path):
+    """Test that a single note larger than the output budget is truncated."""
+    note_file = str(tmp_path / "notes.json")
+    NoteStore(note_file).add("log line " * 20000)
+
+    result = await RecallNoteTool(memory_file=note_file).execute()
+    assert result.success
+    assert estimate_tokens(result.content) < MAX_RECALL_TOKENS * 1.2
+
+
+@pytest.mark.asyncio
+async def test_recall_budget_keeps_newest_notes(tmp_path):
+    """Test that the output budget drops the oldest notes, not the newest."""
+    note_file = str(tmp_path / "notes.json")
+    store = NoteStore(note_file)
+    for i in range(6):
+        store.add(f"note{i} " + "detail " * (MAX_RECALL_TOKENS // 8))
+
+    result = await RecallNoteTool(memory_file=note_file).execute()
+    assert result.success
+    assert "note5" in result.content
+    assert "note0" not in result.content
+    # Still shown oldest to newest
+    shown = [i for i in range(6) if f"note{i}" in result.content]
+    assert result.content.index(f"note{shown[0]}") < result.content.index("note5")
+    assert "of 6 notes shown" in result.content
 
 
 async def main():
@@ -0,0 +1,133 @@
+"""Test cases for Anthropic prompt caching breakpoints."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from mini_agent.llm import AnthropicClient
+from mini_agent.retry import RetryConfig
+from mini_agent.schema import FunctionCall, Message, ToolCall
+from mini_agent.tools.base import Tool
+
+
+class DummyTool(Tool):
+    def __init__(self, name: str):
+        self._name = name
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def description(self):
+        return f"{self._name} tool"
+
+    @property
+    def parameters(self):
+        return {"type": "object", "properties": {}}
+
+
+def make_history() -> list[Message]:
+    call = ToolCall(id="c1", type="function", function=FunctionCall(name="read_file", arguments={"path": "a"}))
+    return [
+        Message(role="system", content="system prompt"),
+        Message(role="user", content="task"),
+        Message(role="assistant", content="", thinking="plan", tool_calls=[call]),
+        Message(role="tool", content="file body", tool_call_id="c1", name="read_file"),
+    ]
+
+
+def cache_marked(params) -> list[str]:
+    """Describe where cache_control markers were placed."""
+    marks = []
+    if isinstance(params.get("system"), list) and params["system"][-1].get("cache_control"):
+        marks.append("system")
+    for tool in params.get("tools", []):
+        if "cache_control" in tool:
+            marks.append(f"tool:{tool['name']}")
+    for i, msg in enumerate(params["messages"]):
+        if isinstance(msg["content"], list) and any("cache_control" in b for b in msg["content"]):
+            marks.append(f"message:{i}")
+    return marks
+
+
+@pytest.fixture
+def client():
+    return AnthropicClient(api_key="test-key", retry_config=RetryConfig(enabled=False))
+
+
+def test_breakpoints_on_system_tools_and_history(client):
+    """Test breakpoint placement on system prompt, last tool and rolling history points."""
+    print("\n=== Testing Cache Breakpoint Placement ===")
+
+    system, api_messages = client._convert_messages(make_history())
+    tools = [DummyTool("a"), DummyTool("b")]
+    params = client._build_params(system, api_messages, tools)
+
+    # Last message (tool result) and the message before the last assistant turn (user task)
+    assert cache_marked(params) == ["system", "tool:b", "message:0", "message:2"]
+    assert len(cache_marked(params)) <= 4
+
+    # Input structures are not mutated
+    assert all("cache_control" not in str(m) for m in api_messages)
+    assert "cache_control" not in tools[-1].to_schema()
+
+
+def test_breakpoints_follow_summarized_history(client):
+    """Test that breakpoints are recomputed for a rewritten history."""
+    print("\n=== Testing Breakpoints After Summary ===")
+
+    summarized = [
+        Message(role="system", content="system prompt"),
+        Message(role="user", content="task"),
+        Message(role="user", content="[Assistant Execution Summary]\n\nsummary"),
+    ]
+    system, api_messages = client._convert_messages(summarized)
+    params = client._build_params(system, api_messages, None)
+
+    assert cache_marked(params) == ["system", "message:1"]
+    assert params["messages"][1]["content"][-1]["text"].startswith("[Assistant Execution Summary]")
+
+
+def test_thinking_block_is_never_marked(client):
+    """Test that the breakpoint skips thinking blocks."""
+    marked = client._with_cache_control({"role": "assistant", "content": [{"type": "thinking", "thinking": "x"}]})
+    assert marked is None
+
+    marked = client._with_cache_control(
+        {"role": "assistant", "content": [{"type": "thinking", "thinking": "x"}, {"type": "text", "text": "hi"}]}
+    )
+    assert "cache_control" not in marked["content"][0]
+    assert marked["content"][1]["cache_control"] == {"type": "ephemeral"}
+
+
+def test_caching_disabled(client):
+    """Test that prompt_caching=False sends plain parameters."""
+    client.prompt_caching = False
+    system, api_messages = client._convert_messages(make_history())
+    params = client._build_params(system, api_messages, [DummyTool("a")])
+
+    assert params["system"] == "system prompt"
+    assert cache_marked(params) == []
+
+
+def test_usage_includes_cache_tokens(client):
+    """Test that cached input tokens are tracked and counted as prompt tokens."""
+    print("\n=== Testing Cache Token Usage ===")
+
+    response = SimpleNamespace(
+        content=[SimpleNamespace(type="text", text="ok")],
+        stop_reason="end_turn",
+        usage=SimpleNamespace(
+            input_tokens=10,
+            output_tokens=5,
+            cache_creation_input_tokens=100,
+            cache_read_input_tokens=2000,
+        ),
+    )
+    usage = client._parse_response(response).usage
+
+    assert usage.cache_creation_input_tokens == 100
+    assert usage.cache_read_input_tokens == 2000
+    assert usage.prompt_tokens == 2110
+    assert usage.total_tokens == 2115
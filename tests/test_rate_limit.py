@@ -0,0 +1,285 @@
+"""Test cases for LLM rate limiting and transient-error retries."""
+
+import asyncio
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from mini_agent.llm import AnthropicClient, OpenAIClient, RateLimitConfig, RateLimiter
+from mini_agent.retry import RetryConfig, RetryExhaustedError, async_retry, is_transient_error, parse_retry_after
+from mini_agent.schema import Message
+
+
+class FakeAPIError(Exception):
+    """SDK-like status error carrying a response"""
+
+    def __init__(self, status_code: int, headers: dict | None = None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers=headers or {})
+
+
+def http_library(client):
+    """HTTP library (httpx) the SDK's shared HTTP client is built on"""
+    return sys.modules[type(client.http_client).__mro__[1].__module__.split(".")[0]]
+
+
+class APIConnectionError(Exception):
+    """Named like the SDK connection error"""
+
+
+def test_transient_error_classification():
+    """Test which errors count as transient."""
+    print("\n=== Testing Transient Error Classification ===")
+
+    assert is_transient_error(FakeAPIError(429))
+    assert is_transient_error(FakeAPIError(529))
+    assert is_transient_error(FakeAPIError(503))
+    assert is_transient_error(APIConnectionError())
+    assert is_transient_error(asyncio.TimeoutError())
+    assert not is_transient_error(FakeAPIError(400))
+    assert not is_transient_error(FakeAPIError(401))
+    assert not is_transient_error(ValueError("bad"))
+
+
+def test_parse_retry_after():
+    """Test Retry-After header formats."""
+    assert parse_retry_after({"retry-after": "3"}) == 3.0
+    assert parse_retry_after({"retry-after-ms": "250"}) == 0.25
+    assert parse_retry_after({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0.0
+    assert parse_retry_after({"retry-after": "soon"}) is None
+    assert parse_retry_after({}) is None
+
+
+def test_decorrelated_jitter_bounds():
+    """Test that jittered delays stay within [initial_delay, min(max_delay, 3 * previous)]."""
+    config = RetryConfig(initial_delay=1.0, max_delay=10.0)
+    delay = None
+    for attempt in range(50):
+        previous = delay
+        delay = config.next_delay(attempt, previous)
+        assert 1.0 <= delay <= 10.0
+        assert delay <= max(1.0, (previous or 1.0) * 3)
+
+    assert RetryConfig(jitter=False, initial_delay=1.0).next_delay(2, None) == 4.0
+
+
+@pytest.mark.asyncio
+async def test_retry_only_transient_and_honor_retry_after(monkeypatch):
+    """Test that permanent errors are raised at once and Retry-After is respected."""
+    print("\n=== Testing Transient-only Retry ===")
+
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr("mini_agent.retry.asyncio.sleep", fake_sleep)
+    config = RetryConfig(max_retries=3, initial_delay=0.1, max_delay=1.0)
+
+    calls = []
+
+    @async_retry(config)
+    async def bad_request():
+        calls.append(1)
+        raise FakeAPIError(400)
+
+    with pytest.raises(FakeAPIError):
+        await bad_request()
+    assert len(calls) == 1 and delays == []
+
+    attempts = iter([FakeAPIError(429, {"retry-after": "5"}), FakeAPIError(503)])
+
+    @async_retry(config)
+    async def flaky():
+        error = next(attempts, None)
+        if error:
+            raise error
+        return "ok"
+
+    assert await flaky() == "ok"
+    assert delays[0] == 5.0  # Server asked for more than max_delay
+    assert 0.1 <= delays[1] <= 1.0
+
+    @async_retry(config)
+    async def always_down():
+        raise FakeAPIError(529)
+
+    with pytest.raises(RetryExhaustedError):
+        await always_down()
+
+
+@pytest.mark.asyncio
+async def test_token_budget_and_fair_order():
+    """Test that the token bucket delays callers and serves them in arrival order."""
+    print("\n=== Testing Token Budget ===")
+
+    # 6000 tokens per minute = 100 tokens per second
+    limiter = RateLimiter(RateLimitConfig(tokens_per_minute=6000))
+    await limiter.acquire(6000)
+
+    order = []
+
+    async def caller(name, tokens):
+        await limiter.acquire(tokens)
+        order.append(name)
+
+    start = time.monotonic()
+    await asyncio.gather(caller("first", 20), caller("second", 1), caller("third", 1))
+    elapsed = time.monotonic() - start
+
+    assert order == ["first", "second", "third"]
+    assert elapsed >= 0.2
+
+    # Actual usage lower than estimated gives budget back
+    limiter.record_usage(estimated_tokens=1000, actual_tokens=0)
+    assert limiter.stats()["tokens_available"] > 900
+
+
+@pytest.mark.asyncio
+async def test_concurrency_slot_limit():
+    """Test the in-flight request cap."""
+    limiter = RateLimiter(RateLimitConfig(max_concurrent_requests=2))
+    running = 0
+    peak = 0
+
+    async def request():
+        nonlocal running, peak
+        async with limiter.slot():
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(request() for _ in range(6)))
+    assert peak == 2
+
+
+def test_rate_limit_headers_pause_and_limit():
+    """Test Anthropic and OpenAI rate-limit headers."""
+    print("\n=== Testing Rate Limit Headers ===")
+
+    limiter = RateLimiter(RateLimitConfig(requests_per_minute=100, tokens_per_minute=10000))
+    limiter.update_from_headers({"x-ratelimit-remaining-tokens": "500", "x-ratelimit-remaining-requests": "7"})
+    stats = limiter.stats()
+    assert stats["tokens_available"] <= 501
+    assert stats["requests_available"] <= 7.1
+    assert stats["paused_for"] == 0
+
+    limiter.update_from_headers({"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "1m30s"})
+    assert 85 < limiter.stats()["paused_for"] <= 90
+
+    limiter = RateLimiter()
+    limiter.update_from_headers({"retry-after": "2"})
+    assert 1.5 < limiter.stats()["paused_for"] <= 2
+
+
+@pytest.mark.asyncio
+async def test_client_calls_go_through_limiter(monkeypatch):
+    """Test that client requests consume budget and 429 responses pause the shared limiter."""
+    print("\n=== Testing Client Rate Limiting ===")
+
+    async def no_sleep(delay):
+        return None
+
+    monkeypatch.setattr("mini_agent.retry.asyncio.sleep", no_sleep)
+
+    client = AnthropicClient(
+        api_key="k",
+        api_base="http://limited.test",
+        model="limited-model",
+        retry_config=RetryConfig(initial_delay=0.01, max_delay=0.01),
+        rate_limit_config=RateLimitConfig(requests_per_minute=100),
+    )
+    other = AnthropicClient(api_key="k", api_base="http://limited.test", model="limited-model")
+    assert other.rate_limiter is client.rate_limiter
+
+    responses = iter([FakeAPIError(429, {"retry-after": "0"}), None])
+
+    async def fake_create(**params):
+        error = next(responses)
+        if error:
+            raise error
+        return SimpleNamespace(
+            content=[SimpleNamespace(type="text", text="ok")],
+            stop_reason="end_turn",
+            usage=SimpleNamespace(input_tokens=10, output_tokens=5, cache_creation_input_tokens=0, cache_read_input_tokens=0),
+        )
+
+    client.client = SimpleNamespace(messages=SimpleNamespace(create=fake_create))
+    response = await client.generate([Message(role="user", content="hello")])
+
+    assert response.content == "ok"
+    assert client.rate_limiter.total_requests == 2
+
+    async def forbidden(**params):
+        raise FakeAPIError(403)
+
+    client.client = SimpleNamespace(messages=SimpleNamespace(create=forbidden))
+    with pytest.raises(FakeAPIError):
+        await client.generate([Message(role="user", content="hello")])
+    assert client.rate_limiter.total_requests == 3
+
+
+@pytest.mark.asyncio
+async def test_response_headers_reach_only_the_calling_model():
+    """Test that rate-limit headers on a shared HTTP pool only affect the model that made the request."""
+    print("\n=== Testing Per-Model Header Routing ===")
+
+    model_a = AnthropicClient(api_key="k", api_base="http://shared-host.test", model="model-a")
+    model_b = AnthropicClient(api_key="k", api_base="http://shared-host.test", model="model-b")
+    assert model_a.http_client is model_b.http_client
+    hooks = model_a.http_client.event_hooks["response"]
+
+    async def request():
+        # What httpx does when the response headers arrive
+        for hook in hooks:
+            await hook(SimpleNamespace(headers={"retry-after": "30"}))
+        return "ok"
+
+    assert await model_a._call_api(request) == "ok"
+    assert model_a.rate_limiter.stats()["paused_for"] > 25
+    assert model_b.rate_limiter.stats()["paused_for"] == 0
+
+    # Responses outside an API call (e.g. prewarm) affect no limiter
+    for hook in hooks:
+        await hook(SimpleNamespace(headers={"retry-after": "30"}))
+    assert model_b.rate_limiter.stats()["paused_for"] == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("client_class", [AnthropicClient, OpenAIClient])
+async def test_sdk_does_not_retry_on_its_own(monkeypatch, client_class):
+    """Test that every HTTP attempt goes through the client's own retry loop and limiter."""
+    print(f"\n=== Testing SDK Retries Disabled ({client_class.__name__}) ===")
+
+    async def no_sleep(delay):
+        return None
+
+    monkeypatch.setattr("mini_agent.retry.asyncio.sleep", no_sleep)
+
+    client = client_class(
+        api_key="k",
+        api_base=f"http://{client_class.__name__.lower()}-sdk-retries.test",
+        model="retry-model",
+        retry_config=RetryConfig(max_retries=1, initial_delay=0.01, max_delay=0.01),
+    )
+    assert client.client.max_retries == 0
+
+    httpx = http_library(client)
+    attempts = []
+
+    def handler(request):
+        attempts.append(request)
+        return httpx.Response(429, headers={"retry-after": "0"}, json={"error": {"message": "slow down"}})
+
+    client.http_client._transport = httpx.MockTransport(handler)
+
+    with pytest.raises(RetryExhaustedError):
+        await client.generate([Message(role="user", content="hello")])
+
+    # One first attempt plus one retry, both counted by the limiter
+    assert len(attempts) == 2
+    assert client.rate_limiter.total_requests == 2
@@ -0,0 +1,92 @@
+"""Test cases for streaming ReadTool and the line-offset index."""
+
+import os
+
+import pytest
+
+from mini_agent.tools import ReadTool, file_tools
+from mini_agent.tools.line_index import LINE_INDEX_STRIDE, line_indexes, read_lines
+
+
+@pytest.mark.asyncio
+async def test_offset_and_limit_on_large_file(tmp_path):
+    """Test paging deep into a file with many lines."""
+    print("\n=== Testing ReadTool Paging ===")
+
+    path = tmp_path / "big.log"
+    path.write_text("".join(f"line {i}\n" for i in range(1, 10001)))
+    tool = ReadTool(workspace_dir=str(tmp_path))
+
+    result = await tool.execute(path="big.log", offset=5000, limit=3)
+    assert result.success
+    assert result.content.splitlines() == ["  5000|line 5000", "  5001|line 5001", "  5002|line 5002"]
+
+    # Reading past the end returns nothing
+    result = await tool.execute(path="big.log", offset=20000, limit=3)
+    assert result.success
+    assert result.content == ""
+
+
+def test_index_reused_and_invalidated(tmp_path):
+    """Test that the line index is extended on demand and dropped when the file changes."""
+    print("\n=== Testing Line Index Cache ===")
+
+    path = tmp_path / "data.txt"
+    path.write_text("".join(f"{i}\n" for i in range(3 * LINE_INDEX_STRIDE)))
+
+    assert read_lines(path, 2 * LINE_INDEX_STRIDE, 1, 1024) == ([str(2 * LINE_INDEX_STRIDE).encode()], False)
+    index = line_indexes.get(path.resolve(), os.stat(path))
+    assert len(index.checkpoints) == 3
+    assert read_lines(path, 5, 2, 1024) == ([b"5", b"6"], False)
+    assert line_indexes.get(path.resolve(), os.stat(path)) is index
+
+    path.write_text("changed\nfile\n")
+    assert read_lines(path, 1, None, 1024) == ([b"file"], False)
+    assert line_indexes.get(path.resolve(), os.stat(path)) is not index
+
+
+@pytest.mark.asyncio
+async def test_output_budget_stops_reading(tmp_path, monkeypatch):
+    """Test that reading stops at the budget and tells how to continue."""
+    print("\n=== Testing ReadTool Output Budget ===")
+
+    monkeypatch.setattr(file_tools, "MAX_READ_TOKENS", 100)
+    path = tmp_path / "long.txt"
+    path.write_text("".join(f"this is line number {i}\n" for i in range(1, 1001)))
+    tool = ReadTool(workspace_dir=str(tmp_path))
+
+    result = await tool.execute(path="long.txt")
+    assert result.success
+    lines = [line for line in result.content.splitlines() if "|" in line]
+    assert 0 < len(lines) < 1000
+    next_offset = len(lines) + 1
+    assert f"offset={next_offset}" in result.content
+
+    # Continuing picks up at the first line not shown
+    result = await tool.execute(path="long.txt", offset=next_offset, limit=1)
+    assert result.content == f"{next_offset:6d}|this is line number {next_offset}"
+
+
+@pytest.mark.asyncio
+async def test_line_endings_and_encodings(tmp_path):
+    """Test CRLF, missing trailing newline, invalid UTF-8 and binary files."""
+    print("\n=== Testing ReadTool Encodings ===")
+
+    tool = ReadTool(workspace_dir=str(tmp_path))
+
+    (tmp_path / "crlf.txt").write_bytes(b"first\r\nsecond\r\nlast")
+    result = await tool.execute(path="crlf.txt")
+    assert result.content.splitlines() == ["     1|first", "     2|second", "     3|last"]
+
+    (tmp_path / "latin1.txt").write_bytes("café\n".encode("latin-1"))
+    result = await tool.execute(path="latin1.txt")
+    assert result.success
+    assert result.content == "     1|caf�"
+
+    (tmp_path / "empty.txt").write_bytes(b"")
+    assert (await tool.execute(path="empty.txt")).content == ""
+
+    (tmp_path / "image.bin").write_bytes(b"\x89PNG\r\n\x1a\n\x00\x00\x00")
+    result = await tool.execute(path="image.bin")
+    assert not result.success
+    assert "binary" in result.error
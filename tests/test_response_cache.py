@@ -0,0 +1,142 @@
+"""Test cases for the content-addressed LLM response cache."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from mini_agent.llm import AnthropicClient, OpenAIClient, ResponseCache, ResponseCacheMissError
+from mini_agent.llm.response_cache import response_cache_key
+from mini_agent.schema import LLMResponse, Message
+
+
+def make_response(text: str) -> LLMResponse:
+    return LLMResponse(content=text, finish_reason="stop")
+
+
+def test_cache_key_is_canonical():
+    """Test that keys ignore dict ordering but cover model, messages and tools."""
+    print("\n=== Testing Cache Keys ===")
+
+    base = {"model": "m", "messages": [{"role": "user", "content": "hi"}], "max_tokens": 10}
+    reordered = {"max_tokens": 10, "messages": [{"content": "hi", "role": "user"}], "model": "m"}
+    assert response_cache_key("AnthropicClient", base) == response_cache_key("AnthropicClient", reordered)
+
+    assert response_cache_key("AnthropicClient", base) != response_cache_key("OpenAIClient", base)
+    assert response_cache_key("AnthropicClient", base) != response_cache_key("AnthropicClient", {**base, "model": "other"})
+    assert response_cache_key("AnthropicClient", base) != response_cache_key("AnthropicClient", {**base, "tools": ({"name": "bash"},)})
+
+
+def test_memory_and_disk_tiers(tmp_path):
+    """Test memory LRU, persistence across instances and hit/miss counters."""
+    print("\n=== Testing Cache Tiers ===")
+
+    path = tmp_path / "cache.sqlite"
+    cache = ResponseCache(path=path, memory_entries=1)
+    assert cache.get("a") is None
+    cache.store("a", make_response("A"))
+    cache.store("b", make_response("B"))  # Pushes "a" out of memory
+
+    assert cache.get("b").content == "B"
+    assert cache.get("a").content == "A"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["memory_hits"], stats["disk_hits"]) == (2, 1, 1, 1)
+    cache.close()
+
+    reopened = ResponseCache(path=path)
+    assert reopened.get("a").content == "A"
+    assert reopened.stats()["disk_bytes"] > 0
+    reopened.close()
+
+
+def test_size_bounded_lru_eviction(tmp_path):
+    """Test that the least recently used responses are evicted beyond max_size_mb."""
+    entry_size = len(make_response("x" * 1000).model_dump_json())
+    cache = ResponseCache(path=tmp_path / "cache.sqlite", memory_entries=0, max_size_mb=2.5 * entry_size / (1024 * 1024))
+
+    cache.store("old", make_response("x" * 1000))
+    cache.store("used", make_response("y" * 1000))
+    cache.get("used")
+    cache.store("new", make_response("z" * 1000))
+
+    assert cache.get("old") is None
+    assert cache.get("used") is not None
+    assert cache.get("new") is not None
+    assert cache.stats()["evictions"] == 1
+    cache.close()
+
+
+def test_modes():
+    """Test record and replay modes."""
+    print("\n=== Testing Record/Replay Modes ===")
+
+    record = ResponseCache(mode="record")
+    record.store("k", make_response("recorded"))
+    assert record.lookup("k") is None
+
+    replay = ResponseCache(mode="replay")
+    replay.store("k", make_response("recorded"))
+    assert replay.lookup("k").content == "recorded"
+    with pytest.raises(ResponseCacheMissError):
+        replay.lookup("missing")
+
+    with pytest.raises(ValueError):
+        ResponseCache(mode="sometimes")
+
+
+@pytest.mark.asyncio
+async def test_client_generate_and_stream_use_cache():
+    """Test that repeated identical requests skip the API, also when streaming."""
+    print("\n=== Testing Client Response Caching ===")
+
+    cache = ResponseCache()
+    client = AnthropicClient(api_key="k", api_base="http://cache.test", model="cache-model", response_cache=cache)
+    calls = []
+
+    async def fake_create(**params):
+        calls.append(params)
+        return SimpleNamespace(
+            content=[SimpleNamespace(type="text", text=f"answer {len(calls)}")],
+            stop_reason="end_turn",
+            usage=SimpleNamespace(input_tokens=10, output_tokens=5, cache_creation_input_tokens=0, cache_read_input_tokens=0),
+        )
+
+    client.client = SimpleNamespace(messages=SimpleNamespace(create=fake_create))
+    messages = [Message(role="system", content="sys"), Message(role="user", content="hello")]
+
+    first = await client.generate(messages)
+    second = await client.generate([Message(role="system", content="sys"), Message(role="user", content="hello")])
+    assert first.content == second.content == "answer 1"
+    assert len(calls) == 1
+
+    events = [event async for event in client.stream(messages)]
+    assert [e.type for e in events] == ["text", "done"]
+    assert events[-1].response.content == "answer 1"
+    assert len(calls) == 1
+
+    await client.generate(messages + [Message(role="user", content="more")])
+    assert len(calls) == 2
+    assert cache.stats()["hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_replay_runs_offline(tmp_path):
+    """Test that recorded responses are replayed without any API access."""
+    path = tmp_path / "cache.sqlite"
+    messages = [Message(role="user", content="hello")]
+
+    recorder = OpenAIClient(api_key="k", api_base="http://replay.test/v1", model="replay-model", response_cache=ResponseCache(path=path, mode="record"))
+
+    async def fake_create(**params):
+        message = SimpleNamespace(content="recorded", tool_calls=None, reasoning_details=None)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message, finish_reason="stop")], usage=None)
+
+    recorder.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=fake_create)))
+    await recorder.generate(messages)
+    recorder.response_cache.close()
+
+    replayer = OpenAIClient(api_key="k", api_base="http://replay.test/v1", model="replay-model", response_cache=ResponseCache(path=path, mode="replay"))
+    replayer.client = None  # Any API access would fail
+    assert (await replayer.generate(messages)).content == "recorded"
+    with pytest.raises(ResponseCacheMissError):
+        await replayer.generate([Message(role="user", content="unseen")])
+    replayer.response_cache.close()
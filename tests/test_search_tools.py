@@ -0,0 +1,162 @@
+"""Test cases for indexed workspace search tools."""
+
+import os
+import threading
+import time
+
+import pytest
+
+from mini_agent.tools import GlobFilesTool, SearchFilesTool
+from mini_agent.tools.workspace_index import WorkspaceIndex, required_literals
+
+
+def make_workspace(root):
+    (root / "src" / "pkg").mkdir(parents=True)
+    (root / "src" / "pkg" / "config.py").write_text("def load_config(path):\n    return parse_config(path)\n\n\ndef parse_config(path):\n    pass\n")
+    (root / "src" / "main.py").write_text("from pkg.config import load_config\n\nload_config('a.yaml')\n")
+    (root / "README.md").write_text("# Project\nCall load_config() to start.\n")
+    (root / "build").mkdir()
+    (root / "build" / "generated.py").write_text("load_config = None\n")
+    (root / "debug.log").write_text("load_config failed\n")
+    (root / "image.png").write_bytes(b"\x89PNG\x00load_config")
+    (root / ".gitignore").write_text("build/\n*.log\n")
+
+
+@pytest.mark.asyncio
+async def test_search_files(tmp_path):
+    """Test ranked content search that respects ignore files."""
+    print("\n=== Testing search_files ===")
+
+    make_workspace(tmp_path)
+    tool = SearchFilesTool(workspace_dir=str(tmp_path))
+
+    result = await tool.execute(pattern="load_config")
+    assert result.success
+    lines = result.content.splitlines()
+    # Most matches first; ignored, binary files skipped
+    assert lines[0].startswith("src/main.py:1:")
+    assert "src/pkg/config.py:1:def load_config(path):" in lines
+    assert "README.md:2:Call load_config() to start." in lines
+    assert not any(line.startswith(("build/", "debug.log", "image.png")) for line in lines)
+
+    # Partial words and regular expressions
+    result = await tool.execute(pattern="_conf")
+    assert "src/pkg/config.py:5:def parse_config(path):" in result.content
+    result = await tool.execute(pattern=r"^def \w+_config", regex=True, glob="*.py")
+    assert result.content.splitlines() == ["src/pkg/config.py:1:def load_config(path):", "src/pkg/config.py:5:def parse_config(path):"]
+
+    result = await tool.execute(pattern="LOAD_CONFIG", case_sensitive=True)
+    assert result.content.startswith("No matches found")
+    result = await tool.execute(pattern="load_config", path="src/pkg")
+    assert all(line.startswith("src/pkg/") for line in result.content.splitlines())
+
+    result = await tool.execute(pattern="(", regex=True)
+    assert not result.success
+
+
+def test_index_refresh_is_incremental(tmp_path):
+    """Test that only changed files are re-read and deletions are dropped."""
+    print("\n=== Testing Incremental Index ===")
+
+    make_workspace(tmp_path)
+    index = WorkspaceIndex(tmp_path, refresh_interval=0)
+    index.refresh()
+    assert {path for path, _ in index.search("parse_config")} == {"src/pkg/config.py"}
+
+    generation = index.generation
+    assert not index.refresh()
+    assert index.generation == generation
+
+    main = tmp_path / "src" / "main.py"
+    main.write_text("result = parse_config('b.yaml')\n")
+    os.utime(main, ns=(time.time_ns(), time.time_ns() + 10**9))
+    (tmp_path / "README.md").unlink()
+    assert index.refresh()
+    assert {path for path, _ in index.search("parse_config")} == {"src/pkg/config.py", "src/main.py"}
+    assert "README.md" not in index.files
+
+
+@pytest.mark.asyncio
+async def test_glob_files(tmp_path):
+    """Test glob matching at any depth, path scoping and ignore rules."""
+    print("\n=== Testing glob_files ===")
+
+    make_workspace(tmp_path)
+    tool = GlobFilesTool(workspace_dir=str(tmp_path))
+
+    result = await tool.execute(pattern="*.py")
+    assert sorted(result.content.splitlines()) == ["src/main.py", "src/pkg/config.py"]
+    result = await tool.execute(pattern="src/*.py")
+    assert result.content == "src/main.py"
+    result = await tool.execute(pattern="**/*.py", path="src/pkg")
+    assert result.content == "src/pkg/config.py"
+    result = await tool.execute(pattern="*.rs")
+    assert result.content.startswith("No files found")
+
+
+def test_required_literals():
+    """Test extraction of literals that narrow regex searches."""
+    assert required_literals(r"def \w+_config") == ["def ", "_config"]
+    assert required_literals(r"foo|barbaz") == []
+    assert required_literals(r"import (os|sys)") == ["import "]
+
+
+@pytest.mark.asyncio
+async def test_results_follow_file_tool_writes(tmp_path):
+    """Test that search and glob see writes and edits made in the same step."""
+    print("\n=== Testing Index Updates After Writes ===")
+
+    from mini_agent.tools.file_tools import EditTool, WriteTool
+
+    (tmp_path / "a.py").write_text("def foo():\n    pass\n")
+    search = SearchFilesTool(workspace_dir=str(tmp_path))
+    glob = GlobFilesTool(workspace_dir=str(tmp_path))
+    assert (await glob.execute(pattern="*.py")).content == "a.py"
+    assert (await search.execute(pattern="foo")).content == "a.py:1:def foo():"
+
+    assert (await WriteTool(workspace_dir=str(tmp_path)).execute(path="b.py", content="foo_new = 1\n")).success
+    assert sorted((await glob.execute(pattern="*.py")).content.splitlines()) == ["a.py", "b.py"]
+    assert (await search.execute(pattern="foo_new")).content == "b.py:1:foo_new = 1"
+
+    assert (await EditTool(workspace_dir=str(tmp_path)).execute(path="a.py", old_str="def foo():", new_str="def bar():")).success
+    assert "a.py:1:def foo():" not in (await search.execute(pattern="foo")).content
+    assert (await search.execute(pattern="bar")).content == "a.py:1:def bar():"
+
+    # Changed by other means (e.g. bash): cached line text is not served
+    (tmp_path / "b.py").write_text("foo_new = 22\n")
+    assert (await search.execute(pattern="foo_new")).content == "b.py:1:foo_new = 22"
+
+
+def test_writes_are_not_blocked_by_a_running_search(tmp_path):
+    """Test that re-indexing a written file does not wait for a slow search."""
+    print("\n=== Testing Invalidation During Search ===")
+
+    (tmp_path / "a.py").write_text("needle = 1\n")
+    index = WorkspaceIndex(tmp_path, refresh_interval=60)
+    index.refresh(force=True)
+
+    reading = threading.Event()
+    release = threading.Event()
+    match_file = index._match_file
+
+    def slow_match_file(*args):
+        reading.set()
+        release.wait(5)
+        return match_file(*args)
+
+    index._match_file = slow_match_file
+    search = threading.Thread(target=index.search, args=("needle",))
+    search.start()
+    try:
+        assert reading.wait(5)
+        started = time.monotonic()
+        (tmp_path / "a.py").write_text("needle = 2\n")
+        index.invalidate(tmp_path / "a.py")
+        assert time.monotonic() - started < 1
+    finally:
+        release.set()
+        search.join()
+
+    # Results of the search that raced with the write are not cached
+    index._match_file = match_file
+    assert index.search("needle")[0][1][0].line == "needle = 2"
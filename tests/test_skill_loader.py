@@ -7,6 +7,7 @@ from pathlib import Path
 
 import pytest
 
+from mini_agent.tools import skill_loader
 from mini_agent.tools.skill_loader import Skill, SkillLoader
 
 
@@ -244,3 +245,74 @@ Run the script: python scripts/test_script.py
 
         # Check that script path is converted to absolute
         assert str(skill_dir / "scripts" / "test_script.py") in skill.content
+
+
+def test_index_skips_parsing_unchanged_skills(tmp_path, monkeypatch):
+    """Test that a persisted index is reused and only changed skills are parsed"""
+    skills_dir = tmp_path / "skills"
+    for name in ("alpha", "beta"):
+        (skills_dir / name).mkdir(parents=True)
+        create_test_skill(skills_dir / name, name, f"{name} skill", f"{name} content")
+    index_path = tmp_path / "index.json"
+
+    SkillLoader(str(skills_dir), index_path=index_path).discover_skills()
+    assert index_path.exists()
+
+    parsed = []
+    original = skill_loader.parse_skill_file
+    monkeypatch.setattr(skill_loader, "parse_skill_file", lambda path: parsed.append(path.parent.name) or original(path))
+
+    # A new loader only stats files
+    loader = SkillLoader(str(skills_dir), index_path=index_path)
+    assert sorted(skill.name for skill in loader.discover_skills()) == ["alpha", "beta"]
+    assert parsed == []
+
+    # Changed and new skills are parsed, the others are not
+    create_test_skill(skills_dir / "beta", "beta", "changed description", "new content")
+    (skills_dir / "gamma").mkdir()
+    create_test_skill(skills_dir / "gamma", "gamma", "gamma skill", "gamma content")
+    loader = SkillLoader(str(skills_dir), index_path=index_path)
+    loader.discover_skills()
+    assert sorted(parsed) == ["beta", "gamma"]
+    assert loader.loaded_skills["beta"].description == "changed description"
+
+
+def test_skill_body_loaded_on_first_use(tmp_path, monkeypatch):
+    """Test that skill bodies are only read and processed by get_skill"""
+    skill_dir = tmp_path / "lazy-skill"
+    skill_dir.mkdir()
+    create_test_skill(skill_dir, "lazy-skill", "Lazy", "Lazy content")
+
+    processed = []
+    original = SkillLoader._process_skill_paths
+    monkeypatch.setattr(SkillLoader, "_process_skill_paths", lambda self, content, d: processed.append(d) or original(self, content, d))
+
+    loader = SkillLoader(str(tmp_path))
+    loader.discover_skills()
+    assert processed == []
+
+    skill = loader.get_skill("lazy-skill")
+    assert "Lazy content" in skill.content
+    assert loader.get_skill("lazy-skill") is skill
+    assert len(processed) == 1
+
+
+def test_watch_mode_picks_up_skill_changes(tmp_path):
+    """Test that watch mode finds new and changed skills without a new loader"""
+    (tmp_path / "first").mkdir()
+    create_test_skill(tmp_path / "first", "first", "First", "First content")
+
+    loader = SkillLoader(str(tmp_path), watch=True, watch_interval=0)
+    loader.discover_skills()
+    assert loader.list_skills() == ["first"]
+
+    (tmp_path / "nested" / "second").mkdir(parents=True)
+    create_test_skill(tmp_path / "nested" / "second", "second", "Second", "Second content")
+    assert "Second content" in loader.get_skill("second").content
+
+    create_test_skill(tmp_path / "first", "first", "First", "Rewritten content")
+    assert "Rewritten content" in loader.get_skill("first").content
+
+    (tmp_path / "first" / "SKILL.md").unlink()
+    assert loader.get_skill("first") is None
+    assert loader.list_skills() == ["second"]
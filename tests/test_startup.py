@@ -0,0 +1,45 @@
+"""Test cases for deferred imports and startup profiling."""
+
+import subprocess
+import sys
+
+HEAVY_PACKAGES = ("anthropic", "openai", "mcp", "prompt_toolkit")
+
+
+def loaded_packages(code: str) -> list[str]:
+    """Run code in a fresh interpreter and list the heavy packages it imported"""
+    check = f"import sys; print(','.join(p for p in {HEAVY_PACKAGES!r} if p in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", f"{code}\n{check}"], capture_output=True, text=True, check=True).stdout
+    return [p for p in output.strip().split(",") if p]
+
+
+def test_entry_points_defer_sdk_imports():
+    """Test that importing the CLI or the setup module loads no SDK or UI package."""
+    print("\n=== Testing Deferred Imports ===")
+
+    assert loaded_packages("import mini_agent.cli") == []
+    assert loaded_packages("import mini_agent.bootstrap") == []
+    assert loaded_packages("from mini_agent.tools import ReadTool, mcp_loader") == []
+
+
+def test_only_selected_provider_sdk_is_loaded():
+    """Test that creating an OpenAI-protocol client does not import the Anthropic SDK."""
+    code = "from mini_agent import LLMClient, LLMProvider\nLLMClient(api_key='test', provider=LLMProvider.OPENAI)"
+    assert loaded_packages(code) == ["openai"]
+
+
+def test_startup_profile_times_phases_and_imports():
+    """Test the --profile-startup breakdown."""
+    code = (
+        "from mini_agent.utils.startup_profile import StartupProfile\n"
+        "profile = StartupProfile()\n"
+        "profile.install()\n"
+        "import colorsys\n"
+        "profile.mark('phase one')\n"
+        "profile.uninstall()\n"
+        "print(profile.report())"
+    )
+    report = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert "phase one" in report
+    assert "total (time to prompt)" in report
+    assert "colorsys" in report.split("Slowest imports")[1]
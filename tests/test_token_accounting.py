@@ -0,0 +1,124 @@
+"""Test cases for cached token accounting in Agent."""
+
+import pytest
+
+from mini_agent import agent as agent_module
+from mini_agent.agent import Agent
+from mini_agent.schema import Message
+from mini_agent.utils import token_utils
+
+
+class CountingEncoding:
+    """Fake encoder: one token per whitespace-separated word, records every call."""
+
+    def __init__(self):
+        self.encoded: list[str] = []
+
+    def encode(self, text, disallowed_special=()):
+        self.encoded.append(text)
+        return text.split()
+
+
+@pytest.fixture
+def encoding(monkeypatch):
+    fake = CountingEncoding()
+    monkeypatch.setattr(agent_module, "get_encoding", lambda: fake)
+    return fake
+
+
+@pytest.fixture
+def agent(tmp_path):
+    return Agent(llm_client=None, system_prompt="system prompt", tools=[], workspace_dir=str(tmp_path))
+
+
+def full_count(agent: Agent, encoding: CountingEncoding) -> int:
+    """Recount the whole history without the cache."""
+    return sum(agent._count_message_tokens(msg, encoding) for msg in agent.messages)
+
+
+def test_only_new_messages_are_encoded(agent, encoding):
+    """Test that repeated estimates only encode appended messages."""
+    print("\n=== Testing Incremental Token Counting ===")
+
+    first = agent._estimate_tokens()
+    assert len(encoding.encoded) == 1
+
+    agent.add_user_message("one two three")
+    agent.messages.append(Message(role="assistant", content="four five", thinking="six"))
+    second = agent._estimate_tokens()
+
+    # user content + assistant content + assistant thinking
+    assert len(encoding.encoded) == 4
+    assert second == first + (3 + 4) + (3 + 4)
+
+    # No new messages: nothing is encoded again
+    assert agent._estimate_tokens() == second
+    assert len(encoding.encoded) == 4
+    assert second == full_count(agent, encoding)
+
+
+def test_cache_invalidated_when_history_replaced(agent, encoding):
+    """Test that rewritten or replaced histories are recounted correctly."""
+    print("\n=== Testing Token Cache Invalidation ===")
+
+    for i in range(5):
+        agent.add_user_message(f"message number {i}")
+    agent._estimate_tokens()
+
+    # Replace the list in place of a summary (same system message, new tail)
+    agent.messages = [agent.messages[0], agent.messages[1], Message(role="user", content="summary")]
+    assert agent._estimate_tokens() == full_count(agent, encoding)
+
+    # /clear style reset
+    agent.messages = [agent.messages[0]]
+    assert agent._estimate_tokens() == full_count(agent, encoding)
+
+    # Same length, different last message
+    agent.add_user_message("a b")
+    agent._estimate_tokens()
+    agent.messages[-1] = Message(role="user", content="a b c d e")
+    assert agent._estimate_tokens() == full_count(agent, encoding)
+
+
+@pytest.mark.asyncio
+async def test_summary_invalidates_cache(agent, encoding):
+    """Test that _summarize_messages resets the running total."""
+    print("\n=== Testing Token Cache After Summary ===")
+
+    class SummaryLLM:
+        async def generate(self, messages, tools=None):
+            from mini_agent.schema import LLMResponse
+
+            return LLMResponse(content="short", finish_reason="stop")
+
+    agent.llm = SummaryLLM()
+    agent.token_limit = 10
+    agent.add_user_message("task")
+    agent.messages.append(Message(role="assistant", content=" ".join(["word"] * 50)))
+    assert agent._estimate_tokens() > agent.token_limit
+
+    await agent._summarize_messages()
+
+    assert len(agent.messages) == 3
+    assert agent._estimate_tokens() == full_count(agent, encoding)
+
+
+def test_shared_encoding_is_loaded_once(monkeypatch):
+    """Test that the shared encoder is initialized once per process."""
+    print("\n=== Testing Shared Encoder ===")
+
+    calls = []
+    fake = CountingEncoding()
+
+    def fake_get_encoding(name):
+        calls.append(name)
+        return fake
+
+    monkeypatch.setattr(token_utils, "_encoding", None)
+    monkeypatch.setattr(token_utils, "_encoding_loaded", False)
+    monkeypatch.setattr(token_utils.tiktoken, "get_encoding", fake_get_encoding)
+
+    assert token_utils.get_encoding() is fake
+    assert token_utils.get_encoding() is fake
+    assert token_utils.count_tokens("a b c") == 3
+    assert calls == ["cl100k_base"]
@@ -0,0 +1,95 @@
+"""Test cases for ToolRegistry schema memoization."""
+
+from mini_agent.agent import Agent
+from mini_agent.llm import AnthropicClient, OpenAIClient
+from mini_agent.tools.base import Tool
+from mini_agent.tools.registry import ToolRegistry
+
+
+class CountingTool(Tool):
+    """Tool that counts how often its schema is built."""
+
+    def __init__(self, name: str):
+        self._name = name
+        self.schema_builds = 0
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def description(self):
+        self.schema_builds += 1
+        return f"{self._name} tool"
+
+    @property
+    def parameters(self):
+        return {"type": "object", "properties": {}}
+
+
+def test_schemas_are_memoized_per_provider():
+    """Test that schemas are built once per provider format."""
+    print("\n=== Testing Schema Memoization ===")
+
+    tools = [CountingTool("a"), CountingTool("b")]
+    registry = ToolRegistry(tools)
+
+    first = registry.get_schemas("anthropic")
+    assert registry.get_schemas("anthropic") is first
+    assert [s["name"] for s in first] == ["a", "b"]
+
+    openai_schemas = registry.get_schemas("openai")
+    assert registry.get_schemas("openai") is openai_schemas
+    assert openai_schemas[0]["function"]["name"] == "a"
+
+    # One build per provider format
+    assert all(tool.schema_builds == 2 for tool in tools)
+
+
+def test_registry_change_invalidates_cache():
+    """Test that adding or removing tools rebuilds the schemas."""
+    print("\n=== Testing Schema Cache Invalidation ===")
+
+    registry = ToolRegistry([CountingTool("a")])
+    first = registry.get_schemas("anthropic")
+    version = registry.version
+
+    registry["b"] = CountingTool("b")
+    assert registry.version > version
+    second = registry.get_schemas("anthropic")
+    assert second is not first
+    assert [s["name"] for s in second] == ["a", "b"]
+
+    del registry["a"]
+    assert [s["name"] for s in registry.get_schemas("anthropic")] == ["b"]
+
+    registry.update({"c": CountingTool("c")})
+    assert [s["name"] for s in registry.get_schemas("anthropic")] == ["b", "c"]
+
+
+def test_clients_reuse_registry_schemas():
+    """Test that LLM clients return the memoized schemas for a registry."""
+    print("\n=== Testing Client Schema Reuse ===")
+
+    registry = ToolRegistry([CountingTool("a"), CountingTool("b")])
+
+    anthropic_client = AnthropicClient(api_key="test-key")
+    assert anthropic_client._convert_tools(registry) is registry.get_schemas("anthropic")
+
+    openai_client = OpenAIClient(api_key="test-key")
+    assert openai_client._convert_tools(registry) is registry.get_schemas("openai")
+
+    # Cache breakpoint is added on a copy of the last schema
+    params = anthropic_client._build_params(None, [{"role": "user", "content": "hi"}], registry)
+    assert "cache_control" in params["tools"][-1]
+    assert "cache_control" not in registry.get_schemas("anthropic")[-1]
+
+
+def test_agent_tools_is_registry(tmp_path):
+    """Test that Agent keeps its tools in a ToolRegistry, also after reassignment."""
+    agent = Agent(llm_client=None, system_prompt="system", tools=[CountingTool("a")], workspace_dir=str(tmp_path))
+    assert isinstance(agent.tools, ToolRegistry)
+
+    agent.tools = {"b": CountingTool("b")}
+    assert isinstance(agent.tools, ToolRegistry)
+    assert list(agent.tools) == ["b"]
@@ -0,0 +1,225 @@
+"""Test cases for concurrent tool-call execution in Agent."""
+
+import asyncio
+import time
+
+import pytest
+
+from mini_agent.agent import Agent
+from mini_agent.schema import FunctionCall, LLMResponse, ToolCall
+from mini_agent.tools.base import Tool, ToolResult
+from mini_agent.tools.bash_tool import BashTool
+from mini_agent.tools.file_tools import ReadTool, WriteTool
+from mini_agent.tools.search_tools import GlobFilesTool, SearchFilesTool
+
+
+class SleepTool(Tool):
+    """Tool that sleeps for a given time and records execution order."""
+
+    def __init__(self, events: list):
+        self.events = events
+
+    @property
+    def name(self):
+        return "sleep"
+
+    @property
+    def description(self):
+        return "Sleep helper"
+
+    @property
+    def parameters(self):
+        return {"type": "object", "properties": {"label": {"type": "string"}, "delay": {"type": "number"}}}
+
+    @property
+    def is_mutating(self):
+        return False
+
+    async def execute(self, label: str, delay: float):
+        self.events.append(("start", label))
+        await asyncio.sleep(delay)
+        self.events.append(("end", label))
+        return ToolResult(success=True, content=f"slept:{label}")
+
+
+class ScriptedLLM:
+    """LLM stub that returns the given tool calls once, then finishes."""
+
+    def __init__(self, tool_calls: list[ToolCall]):
+        self.tool_calls = tool_calls
+        self.calls = 0
+
+    async def generate(self, messages, tools=None):
+        self.calls += 1
+        if self.calls == 1:
+            return LLMResponse(content="", tool_calls=self.tool_calls, finish_reason="tool_use")
+        return LLMResponse(content="done", finish_reason="stop")
+
+
+def make_call(call_id: str, name: str, **arguments) -> ToolCall:
+    return ToolCall(id=call_id, type="function", function=FunctionCall(name=name, arguments=arguments))
+
+
+@pytest.mark.asyncio
+async def test_independent_calls_run_concurrently(tmp_path):
+    """Test that independent tool calls overlap and results keep call order."""
+    print("\n=== Testing Concurrent Tool Calls ===")
+
+    events = []
+    calls = [make_call(f"call{i}", "sleep", label=str(i), delay=0.2 - i * 0.03) for i in range(5)]
+    agent = Agent(
+        llm_client=ScriptedLLM(calls),
+        system_prompt="system",
+        tools=[SleepTool(events)],
+        workspace_dir=str(tmp_path),
+        max_concurrent_tools=5,
+    )
+    agent.add_user_message("go")
+
+    start = time.monotonic()
+    result = await agent.run()
+    elapsed = time.monotonic() - start
+
+    assert result == "done"
+    # Sum of delays is ~0.7s, the maximum is 0.2s
+    assert elapsed < 0.5
+    tool_messages = [m for m in agent.messages if m.role == "tool"]
+    assert [m.tool_call_id for m in tool_messages] == [c.id for c in calls]
+    assert [m.content for m in tool_messages] == [f"slept:{i}" for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit(tmp_path):
+    """Test that max_concurrent_tools=1 executes calls sequentially."""
+    print("\n=== Testing Concurrency Limit ===")
+
+    events = []
+    calls = [make_call(f"call{i}", "sleep", label=str(i), delay=0.01) for i in range(3)]
+    agent = Agent(
+        llm_client=ScriptedLLM(calls),
+        system_prompt="system",
+        tools=[SleepTool(events)],
+        workspace_dir=str(tmp_path),
+        max_concurrent_tools=1,
+    )
+
+    results = await agent._execute_tool_calls(calls)
+
+    assert all(r.success for r in results)
+    assert events == [
+        ("start", "0"),
+        ("end", "0"),
+        ("start", "1"),
+        ("end", "1"),
+        ("start", "2"),
+        ("end", "2"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_conflicting_file_calls_keep_order(tmp_path):
+    """Test that writes and reads of the same path are not reordered."""
+    print("\n=== Testing Mutating Call Ordering ===")
+
+    calls = [
+        make_call("w1", "write_file", path="a.txt", content="first"),
+        make_call("r1", "read_file", path="a.txt"),
+        make_call("w2", "write_file", path=str(tmp_path / "a.txt"), content="second"),
+        make_call("r2", "read_file", path="a.txt"),
+        make_call("w3", "write_file", path="b.txt", content="other"),
+    ]
+    agent = Agent(
+        llm_client=ScriptedLLM(calls),
+        system_prompt="system",
+        tools=[ReadTool(workspace_dir=str(tmp_path)), WriteTool(workspace_dir=str(tmp_path))],
+        workspace_dir=str(tmp_path),
+        max_concurrent_tools=8,
+    )
+
+    dependencies = agent._tool_call_dependencies(calls)
+    assert dependencies == [[], [0], [0, 1], [0, 2], []]
+
+    writes = [calls[0], calls[2], calls[4]]
+    results = await agent._execute_tool_calls(writes)
+    assert all(r.success for r in results)
+    assert (tmp_path / "a.txt").read_text() == "second"
+    assert (tmp_path / "b.txt").read_text() == "other"
+
+
+def test_search_waits_for_writes_in_workspace(tmp_path):
+    """Test that workspace searches are ordered after writes to files they cover."""
+    calls = [
+        make_call("w1", "write_file", path="src/a.py", content="x = 1"),
+        make_call("s1", "search_files", pattern="x"),
+        make_call("g1", "glob_files", pattern="*.py", path="docs"),
+        make_call("s2", "search_files", pattern="x", path="src"),
+        make_call("r1", "read_file", path="src/a.py"),
+    ]
+    agent = Agent(
+        llm_client=ScriptedLLM(calls),
+        system_prompt="system",
+        tools=[
+            ReadTool(workspace_dir=str(tmp_path)),
+            WriteTool(workspace_dir=str(tmp_path)),
+            SearchFilesTool(workspace_dir=str(tmp_path)),
+            GlobFilesTool(workspace_dir=str(tmp_path)),
+        ],
+        workspace_dir=str(tmp_path),
+    )
+
+    assert agent._tool_call_dependencies(calls) == [[], [0], [], [0], [0]]
+
+
+@pytest.mark.asyncio
+async def test_bash_is_ordered_against_other_calls(tmp_path):
+    """Test that calls without a resource key, like bash, act as barriers."""
+    print("\n=== Testing Bash Ordering ===")
+
+    calls = [
+        make_call("w1", "write_file", path="x.py", content="print('written')"),
+        make_call("b1", "bash", command="python x.py"),
+        make_call("r1", "read_file", path="y.txt"),
+        make_call("b2", "bash", command="mkdir d"),
+        make_call("w2", "write_file", path="d/f.txt", content="in d"),
+    ]
+    agent = Agent(
+        llm_client=ScriptedLLM(calls),
+        system_prompt="system",
+        tools=[
+            ReadTool(workspace_dir=str(tmp_path)),
+            WriteTool(workspace_dir=str(tmp_path)),
+            BashTool(workspace_dir=str(tmp_path)),
+        ],
+        workspace_dir=str(tmp_path),
+        max_concurrent_tools=8,
+    )
+
+    assert agent._tool_call_dependencies(calls) == [[], [0], [1], [0, 1, 2], [1, 3]]
+
+    results = await agent._execute_tool_calls(calls[:2])
+    assert all(r.success for r in results)
+    assert "written" in results[1].content
+
+
+@pytest.mark.asyncio
+async def test_unknown_tool_does_not_block_others(tmp_path):
+    """Test that an unknown tool fails without affecting other calls."""
+    print("\n=== Testing Unknown Tool in Concurrent Batch ===")
+
+    events = []
+    calls = [
+        make_call("c1", "missing_tool"),
+        make_call("c2", "sleep", label="ok", delay=0.01),
+    ]
+    agent = Agent(
+        llm_client=ScriptedLLM(calls),
+        system_prompt="system",
+        tools=[SleepTool(events)],
+        workspace_dir=str(tmp_path),
+    )
+
+    results = await agent._execute_tool_calls(calls)
+
+    assert not results[0].success
+    assert "Unknown tool" in results[0].error
+    assert results[1].success
@@ -0,0 +1,49 @@
+"""Test cases for token-budget truncation of long outputs."""
+
+from mini_agent.tools.bash_tool import MAX_OUTPUT_TOKENS, BashOutputResult
+from mini_agent.utils import count_tokens, estimate_tokens, truncate_text_by_tokens
+
+
+def make_log(lines: int) -> str:
+    return "".join(f"{i:08d} INFO worker processed request id={i * 7919 % 100003} status=ok\n" for i in range(lines))
+
+
+def test_short_text_unchanged():
+    """Test that texts within the limit are returned as is."""
+    print("\n=== Testing Truncation Pass-through ===")
+
+    assert truncate_text_by_tokens("hello", 10) == "hello"
+    text = make_log(100)
+    assert truncate_text_by_tokens(text, count_tokens(text)) == text
+
+
+def test_estimate_close_to_exact_count():
+    """Test that the sampled estimate follows the exact count on uniform text."""
+    text = make_log(5000)
+    exact = count_tokens(text)
+    assert abs(estimate_tokens(text) - exact) / exact < 0.1
+
+
+def test_long_text_keeps_head_and_tail():
+    """Test that long texts keep whole head and tail lines within the limit."""
+    print("\n=== Testing Head/Tail Truncation ===")
+
+    text = make_log(200_000)  # ~14 MB
+    result = truncate_text_by_tokens(text, 2000)
+
+    head, note, tail = result.partition("\n\n... [Content truncated: ~")
+    assert note
+    assert head.startswith("00000000 INFO")
+    assert tail.endswith("status=ok\n")
+    tail = tail.split("] ...\n\n", 1)[1]
+    assert count_tokens(head) <= 1000
+    assert count_tokens(tail) <= 1000
+    assert all(line.endswith("status=ok") for line in head.splitlines())
+    assert all(line[:8].isdigit() for line in tail.splitlines())
+
+
+def test_bash_output_truncated():
+    """Test that command output returned to the model is bounded."""
+    result = BashOutputResult(success=True, stdout=make_log(50_000), stderr="", exit_code=0)
+    assert len(result.stdout) > len(result.content)
+    assert count_tokens(result.content) <= MAX_OUTPUT_TOKENS + 50